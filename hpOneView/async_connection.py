@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+async_connection.py
+~~~~~~~~~~~~~~~~~~~
+
+This module maintains a non-blocking communication with the appliance on an asyncio event loop.
+
+Requires Python 3.7+.
+"""
+
+import asyncio
+import logging
+import traceback
+
+from urllib.parse import urlsplit
+
+from hpOneView.connection import uri
+from hpOneView.compression import decompress, is_compressed
+from hpOneView.exceptions import HPOneViewException, HPOneViewValueError
+from hpOneView.serializer import JsonSerializer, is_json_content_type
+
+logger = logging.getLogger(__name__)
+
+ASYNC_CONNECTION_PROXY_NOT_SUPPORTED = 'Proxy is not supported by the asyncio connection'
+
+
+class AsyncResponse(object):
+    """
+    HTTP response read by the AsyncConnection. Exposes the same status and getheader interface of http.client.
+    """
+
+    def __init__(self, status, reason, headers, will_close):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.will_close = will_close
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+
+class AsyncConnection(object):
+    """
+    Non-blocking counterpart of the connection.
+
+    The host, the default headers, the session and the SSL context are those of the wrapped connection, so both
+    connections share the same authenticated session. At most `concurrency` requests run at the same time against
+    the appliance, and the idle keep-alive streams are reused by the following requests.
+    """
+    DEFAULT_CONCURRENCY = 10
+
+    def __init__(self, con, concurrency=DEFAULT_CONCURRENCY):
+        if con._doProxy:
+            raise HPOneViewValueError(ASYNC_CONNECTION_PROXY_NOT_SUPPORTED)
+
+        self._connection = con
+        self._concurrency = concurrency
+        self._semaphore = None
+        self._idle_streams = []
+
+        address = urlsplit('//' + con.get_host())
+        self._hostname = address.hostname
+        self._port = address.port or 443
+
+    @property
+    def sync_connection(self):
+        """
+        Gets the blocking connection that holds the session of this connection.
+
+        Returns:
+            connection:
+        """
+        return self._connection
+
+    @property
+    def _apiVersion(self):
+        return self._connection._apiVersion
+
+    def get_host(self):
+        return self._connection.get_host()
+
+    def get_session_id(self):
+        return self._connection.get_session_id()
+
+    def _get_semaphore(self):
+        # Created on first use, so the semaphore belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        return self._semaphore
+
+    async def _open_stream(self):
+        while self._idle_streams:
+            reader, writer = self._idle_streams.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self._hostname, self._port, ssl=self._connection.get_ssl_context(),
+                                    server_hostname=self._hostname),
+            self._connection._timeout)
+        return reader, writer, False
+
+    def _release_stream(self, reader, writer, response):
+        if response.will_close or len(self._idle_streams) >= self._concurrency:
+            writer.close()
+        else:
+            self._idle_streams.append((reader, writer))
+
+    async def close(self):
+        """
+        Closes the idle streams.
+        """
+        while self._idle_streams:
+            _, writer = self._idle_streams.pop()
+            writer.close()
+
+    async def do_http(self, method, path, body, custom_headers=None):
+        http_headers = self._connection._headers.copy()
+        if custom_headers:
+            http_headers.update(custom_headers)
+
+        async with self._get_semaphore():
+            reader, writer, reused = await self._open_stream()
+            try:
+                response, raw_body = await self.__send_request(reader, writer, method, path, body, http_headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused or method.upper() not in self._connection.get_retry_policy().idempotent_methods:
+                    raise
+                # The appliance may close a keep-alive stream while it is idle. The request may have been processed
+                # already, so it is sent again only when that is safe
+                logger.debug('Idle stream to %s is stale. Reconnecting...' % self.get_host())
+                reader, writer, _ = await self._open_stream()
+                try:
+                    response, raw_body = await self.__send_request(reader, writer, method, path, body, http_headers)
+                except Exception:
+                    writer.close()
+                    raise
+            except Exception:
+                writer.close()
+                raise
+
+            self._release_stream(reader, writer, response)
+
+        content_encoding = response.getheader('Content-Encoding')
+        if is_compressed(content_encoding):
+            compressed_size = len(raw_body)
+            raw_body = decompress(raw_body, content_encoding)
+            self._connection.get_compression_stats().record(compressed_size, len(raw_body))
+
+        return response, decode_body(raw_body, response.getheader('Content-Type'), self._connection.get_serializer())
+
+    async def __send_request(self, reader, writer, method, path, body, headers):
+        payload = body.encode('utf-8') if isinstance(body, str) else (body or b'')
+
+        lines = ['%s %s HTTP/1.1' % (method, path), 'Host: %s' % self.get_host()]
+        lines += ['%s: %s' % (name, value) for name, value in headers.items()]
+        lines.append('Content-Length: %d' % len(payload))
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('iso-8859-1') + payload)
+        await asyncio.wait_for(writer.drain(), self._connection._timeout)
+
+        return await asyncio.wait_for(read_response(reader, method), self._connection._timeout)
+
+    ###########################################################################
+    # Utility functions for making requests - the HTTP verbs
+    ###########################################################################
+    async def get(self, uri):
+        resp, body = await self.do_http('GET', uri, '')
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+        if resp.status == 302:
+            body = await self.get(resp.getheader('Location'))
+        return body
+
+    async def delete(self, uri, custom_headers=None):
+        return await self.__do_rest_call('DELETE', uri, {}, custom_headers=custom_headers)
+
+    async def put(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('PUT', uri, body, custom_headers=custom_headers)
+
+    async def post(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('POST', uri, body, custom_headers=custom_headers)
+
+    async def patch(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('PATCH', uri, body, custom_headers=custom_headers)
+
+    def __body_content_is_task(self, body):
+        return isinstance(body, dict) and 'category' in body and body['category'] == 'tasks'
+
+    async def __get_task_from_response(self, response, body):
+        location = response.getheader('Location')
+        if location:
+            task = await self.get(location)
+        elif 'taskState' in body:
+            task = body
+        else:
+            task = None
+        return task
+
+    async def __do_rest_call(self, http_method, uri, body, custom_headers):
+        resp, body = await self.do_http(http_method, uri, self._connection.get_serializer().dumps(body),
+                                        custom_headers=custom_headers)
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+
+        if resp.status == 202:
+            task = await self.__get_task_from_response(resp, body)
+            return task, body
+
+        if self.__body_content_is_task(body):
+            return body, body
+
+        return None, body
+
+    ###########################################################################
+    # Login/Logout to/from appliance
+    ###########################################################################
+    async def validateVersion(self):
+        version = await self.get(uri['version'])
+        if 'minimumVersion' in version:
+            if self._apiVersion < version['minimumVersion']:
+                raise HPOneViewException('Unsupported API Version')
+        if 'currentVersion' in version:
+            if self._apiVersion > version['currentVersion']:
+                raise HPOneViewException('Unsupported API Version')
+        self._connection._validateVersion = True
+
+    async def login(self, cred):
+        try:
+            if self._connection._validateVersion is False:
+                await self.validateVersion()
+        except Exception:
+            raise HPOneViewException('Failure during login attempt.\n %s' % traceback.format_exc())
+
+        cred = dict(cred)
+        try:
+            if cred.get("sessionID"):
+                self._connection.set_session_id(cred["sessionID"])
+                task, body = await self.put(uri['loginSessions'], None)
+            else:
+                cred.pop("sessionID", None)
+                task, body = await self.post(uri['loginSessions'], cred)
+        except HPOneViewException:
+            logger.exception('Login failed')
+            raise
+        self._connection.set_session_id(body['sessionID'])
+        logger.info('Logged in successfully')
+
+    async def logout(self):
+        try:
+            await self.delete(uri['loginSessions'])
+        except HPOneViewException:
+            logger.exception('Logout failed')
+            raise
+        self._connection._set_header('auth', None)
+        self._connection._session = False
+        logger.info('Logged out successfully')
+
+
+async def read_response(reader, method='GET'):
+    """
+    Reads an HTTP/1.1 response from the stream.
+
+    Returns:
+        tuple: AsyncResponse and the raw body bytes.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError('Remote end closed connection without response')
+
+    parts = status_line.decode('iso-8859-1').rstrip('\r\n').split(' ', 2)
+    status = int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ''
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('iso-8859-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    will_close = headers.get('connection', '').lower() == 'close'
+
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        raw_body = b''
+    elif 'chunked' in headers.get('transfer-encoding', '').lower():
+        raw_body = await _read_chunked(reader)
+    elif 'content-length' in headers:
+        raw_body = await reader.readexactly(int(headers['content-length']))
+    else:
+        raw_body = await reader.read()
+        will_close = True
+
+    return AsyncResponse(status, reason, headers, will_close), raw_body
+
+
+async def _read_chunked(reader):
+    chunks = []
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            # Skips the trailer headers
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            return b''.join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+def decode_body(raw_body, content_type=None, serializer=None):
+    """
+    Decodes a response body as the connection does: JSON when possible, text or binary data otherwise.
+
+    Args:
+        raw_body (bytes): Response body.
+        content_type: Content-Type header of the response. A JSON body is parsed straight from the bytes.
+        serializer (JsonSerializer): Serializer of the JSON documents. Defaults to the json module.
+    """
+    serializer = serializer or JsonSerializer()
+    if raw_body and is_json_content_type(content_type):
+        try:
+            return serializer.loads(raw_body)
+        except ValueError:
+            pass
+    try:
+        body = raw_body.decode('utf-8')
+    except UnicodeDecodeError:  # Might be binary data
+        return raw_body
+    if body:
+        try:
+            return serializer.loads(body)
+        except ValueError:
+            pass
+    return body
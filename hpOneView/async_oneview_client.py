@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+This module implements a client for HPE OneView REST API that runs on an asyncio event loop.
+
+Requires Python 3.7+.
+"""
+
+from hpOneView.async_connection import AsyncConnection
+from hpOneView.connection import connection
+from hpOneView.resources.async_resource import AsyncResourceClient
+from hpOneView.resources.async_task_monitor import AsyncTaskMonitor
+from hpOneView.resources.registry import RESOURCES, get_resource_class
+
+# Resource clients available on the AsyncOneViewClient: attribute name -> (module, class) of the resource wrapper
+# whose URI is used
+# The ID pools ranges are bound to a range type, so they have no collection URI of their own
+ASYNC_RESOURCES = dict((name, entry) for name, entry in RESOURCES.items() if entry[1] != 'IdPoolsRanges')
+
+
+class AsyncOneViewClient(object):
+    """
+    Client for HPE OneView REST API whose requests are coroutines.
+
+    The resources are exposed with the same attribute names of the OneViewClient, e.g., client.server_hardware, as
+    AsyncResourceClient instances bound to the URI of the resource. Resource specific operations are available on the
+    OneViewClient only.
+
+    Examples:
+
+        >>> async with AsyncOneViewClient(config) as client:
+        >>>     server_hardware = await client.server_hardware.get_all()
+    """
+    DEFAULT_API_VERSION = 300
+
+    def __init__(self, config):
+        con = connection(config["ip"], config.get('api_version', self.DEFAULT_API_VERSION),
+                         config.get('ssl_certificate', False), config.get('timeout'))
+        self.__connection = AsyncConnection(con, config.get('concurrency', AsyncConnection.DEFAULT_CONCURRENCY))
+        self.__credentials = config["credentials"]
+        self.__resources = {}
+        self.__task_monitor = None
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def login(self):
+        """
+        Creates the session on the appliance with the configured credentials.
+        """
+        await self.__connection.login(self.__credentials)
+
+    async def close(self):
+        """
+        Closes the idle connections to the appliance. The session is kept, so it can be reused by another client.
+        """
+        await self.__connection.close()
+
+    @property
+    def api_version(self):
+        """
+        Gets the OneView API Version.
+
+        Returns:
+            int: API Version.
+        """
+        return self.__connection._apiVersion
+
+    @property
+    def connection(self):
+        """
+        Gets the underlying asyncio connection used by the AsyncOneViewClient.
+
+        Returns:
+            AsyncConnection:
+        """
+        return self.__connection
+
+    @property
+    def task_monitor(self):
+        """
+        Gets the AsyncTaskMonitor.
+
+        Returns:
+            AsyncTaskMonitor:
+        """
+        if not self.__task_monitor:
+            self.__task_monitor = AsyncTaskMonitor(self.__connection)
+        return self.__task_monitor
+
+    def __getattr__(self, name):
+        if name not in ASYNC_RESOURCES:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+        resources = self.__dict__['_AsyncOneViewClient__resources']
+        if name not in resources:
+            resources[name] = AsyncResourceClient(self.__connection, get_resource_class(name).URI)
+        return resources[name]
+
+    def __dir__(self):
+        return sorted(set(dir(type(self))) | set(self.__dict__) | set(ASYNC_RESOURCES))
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+"""
+compression.py
+~~~~~~~~~~~~~~
+
+This module decompresses the response bodies the appliance compresses with gzip or deflate, and keeps count of the
+bytes saved by the compression.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import threading
+import zlib
+
+from past.builtins import basestring
+
+ACCEPT_ENCODING = 'gzip, deflate'
+COMPRESSED_CHUNK_SIZE = 65536  # 64KB
+
+
+def is_compressed(content_encoding):
+    """
+    Checks if a Content-Encoding header describes a body this module can decompress.
+    """
+    if not isinstance(content_encoding, basestring):
+        return False
+    return content_encoding.strip().lower() in ('gzip', 'x-gzip', 'deflate')
+
+
+class ContentDecoder(object):
+    """
+    Decompresses a gzip or deflate body one chunk at a time.
+
+    Deflate bodies are accepted both with the zlib wrapper the HTTP specification requires and as raw deflate data,
+    which some servers send instead.
+    """
+
+    def __init__(self, content_encoding):
+        self._deflate = content_encoding.strip().lower() == 'deflate'
+        self._decompressor = zlib.decompressobj(zlib.MAX_WBITS if self._deflate else 16 + zlib.MAX_WBITS)
+        self._started = False
+
+    def decompress(self, chunk):
+        try:
+            data = self._decompressor.decompress(chunk)
+        except zlib.error:
+            if not self._deflate or self._started:
+                raise
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            data = self._decompressor.decompress(chunk)
+        self._started = True
+        return data
+
+    def flush(self):
+        return self._decompressor.flush()
+
+
+def decompress(body, content_encoding):
+    """
+    Decompresses a whole gzip or deflate body.
+
+    Returns:
+        bytes: The decompressed body.
+    """
+    decoder = ContentDecoder(content_encoding)
+    return decoder.decompress(body) + decoder.flush()
+
+
+class CompressionStats(object):
+    """
+    Counts the compressed responses received from an appliance and the bytes saved by their compression.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._responses = 0
+        self._compressed_bytes = 0
+        self._uncompressed_bytes = 0
+
+    def record(self, compressed_bytes, uncompressed_bytes):
+        """
+        Counts a compressed response.
+
+        Args:
+            compressed_bytes: Size of the body received.
+            uncompressed_bytes: Size of the body once decompressed.
+        """
+        with self._lock:
+            self._responses += 1
+            self._compressed_bytes += compressed_bytes
+            self._uncompressed_bytes += uncompressed_bytes
+
+    @property
+    def responses(self):
+        return self._responses
+
+    @property
+    def compressed_bytes(self):
+        return self._compressed_bytes
+
+    @property
+    def uncompressed_bytes(self):
+        return self._uncompressed_bytes
+
+    @property
+    def bytes_saved(self):
+        with self._lock:
+            return self._uncompressed_bytes - self._compressed_bytes
+
+    def to_dict(self):
+        with self._lock:
+            return {'responses': self._responses,
+                    'compressed_bytes': self._compressed_bytes,
+                    'uncompressed_bytes': self._uncompressed_bytes,
+                    'bytes_saved': self._uncompressed_bytes - self._compressed_bytes}
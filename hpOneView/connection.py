@@ -42,19 +42,86 @@ import http.client
 import json
 import logging
 import shutil  # for shutil.copyfileobj()
-import mmap  # so we can upload the iso without having to load it in memory
 import os
+import socket
 import ssl
+import threading
 import time
 import traceback
 
+from errno import ECONNABORTED, ECONNRESET, EPIPE
+from hpOneView.connection_pool import ConnectionPool
+from hpOneView.compression import ACCEPT_ENCODING, COMPRESSED_CHUNK_SIZE, CompressionStats, ContentDecoder
+from hpOneView.compression import is_compressed
 from hpOneView.exceptions import HPOneViewException
+from hpOneView.instrumentation import RequestEvent, RequestMetrics, DEFAULT_BUCKETS
+from hpOneView.ranged_download import RangedDownload, read_into
+from hpOneView.retry_policy import RetryPolicy
+from hpOneView.serializer import get_serializer, is_json_content_type
 
 logger = logging.getLogger(__name__)
 
+# SSLSession objects and the session argument of SSLContext.wrap_socket are available on Python 3.6+
+TLS_SESSION_RESUMPTION_SUPPORTED = hasattr(ssl, 'SSLSession')
+
+DEFAULT_DOWNLOAD_BUFFER_SIZE = 1048576  # 1MB
+
+# Errors of a pooled connection the appliance closed while it was idle
+STALE_CONNECTION_ERRORS = (ECONNRESET, ECONNABORTED, EPIPE)
+
+
+class HTTPSConnection(http.client.HTTPSConnection):
+    """
+    HTTPS connection that resumes the TLS session negotiated by a previous connection to the same host, so new sockets
+    to the appliance skip the full handshake.
+    """
+
+    def __init__(self, host, port=None, tls_sessions=None, **kwargs):
+        http.client.HTTPSConnection.__init__(self, host, port, **kwargs)
+        self._tls_sessions = tls_sessions if tls_sessions is not None else {}
+
+    def connect(self):
+        start_time = time.time()
+        if not TLS_SESSION_RESUMPTION_SUPPORTED:
+            http.client.HTTPSConnection.connect(self)
+            self.connect_timings = (time.time() - start_time, None)
+            return
+
+        http.client.HTTPConnection.connect(self)
+        connected_time = time.time()
+
+        server_hostname = self._tunnel_host or self.host
+        self.sock = self._context.wrap_socket(self.sock,
+                                              server_hostname=server_hostname,
+                                              session=self._tls_sessions.get(server_hostname))
+        self._tls_sessions[server_hostname] = self.sock.session
+        # Seconds spent opening the TCP connection and on the TLS handshake, reported once by the next request
+        self.connect_timings = (connected_time - start_time, time.time() - connected_time)
+
+
+class PagingState(threading.local):
+    """
+    Paging attributes of the last collection retrieved by the current thread.
+    """
+
+    def __init__(self):
+        self.nextPage = None
+        self.prevPage = None
+        self.numTotalRecords = 0
+        self.numDisplayedRecords = 0
+
 
 class connection(object):
-    def __init__(self, applianceIp, api_version=300, sslBundle=False, timeout=None):
+    """
+    Maintains the communication with the appliance.
+
+    A connection can be shared by many threads: the paging state of the last GET request is kept per thread, the
+    default headers are replaced under a lock instead of being changed in place, and the HTTPS connections come from a
+    thread-safe pool. Hence, a single authenticated session can serve a whole pool of worker threads.
+    """
+
+    def __init__(self, applianceIp, api_version=300, sslBundle=False, timeout=None, connection_pool=None):
+        self._lock = threading.RLock()
         self._session = None
         self._host = applianceIp
         self._cred = None
@@ -69,12 +136,20 @@ class connection(object):
         self._sslTrustAll = True
         self._sslBundle = sslBundle
         self._sslTrustedBundle = self.set_trusted_ssl_bundle(sslBundle)
-        self._nextPage = None
-        self._prevPage = None
-        self._numTotalRecords = 0
-        self._numDisplayedRecords = 0
+        self._paging = PagingState()
         self._validateVersion = False
         self._timeout = timeout
+        self._connection_pool = connection_pool if connection_pool is not None else ConnectionPool()
+        self._page_workers = 1
+        self._response_cache = None
+        self._task_events = None
+        self._download_buffer_size = DEFAULT_DOWNLOAD_BUFFER_SIZE
+        self._download_workers = 1
+        self._retry_policy = RetryPolicy()
+        self._serializer = get_serializer()
+        self._compression_stats = CompressionStats()
+        self._observers = ()
+        self._metrics = None
 
     def validateVersion(self):
         version = self.get(uri['version'])
@@ -94,6 +169,11 @@ class connection(object):
     def set_trusted_ssl_bundle(self, sslBundle):
         if sslBundle:
             self._sslTrustAll = False
+        with self._lock:
+            self._sslTrustedBundle = sslBundle
+            # The SSL context and the TLS sessions are rebuilt with the new trusted bundle
+            self._ssl_context = None
+            self._tls_sessions = {}
         return sslBundle
 
     def get_session(self):
@@ -103,12 +183,184 @@ class connection(object):
         return self._headers.get('auth')
 
     def set_session_id(self, session_id):
-        self._headers['auth'] = session_id
+        self._set_header('auth', session_id)
         self._session = True
 
+    def _set_header(self, name, value):
+        """
+        Sets a default header, or removes it when the value is None.
+
+        The headers dictionary is replaced by an updated copy, so requests being sent by other threads never see a
+        partial change.
+        """
+        with self._lock:
+            headers = self._headers.copy()
+            if value is None:
+                headers.pop(name, None)
+            else:
+                headers[name] = value
+            self._headers = headers
+
     def get_host(self):
         return self._host
 
+    def get_page_workers(self):
+        return self._page_workers
+
+    def set_page_workers(self, page_workers):
+        """
+        Sets the number of pages of a collection that can be retrieved at the same time by get_all.
+
+        Args:
+            page_workers: Number of worker threads. 1 retrieves the pages one at a time.
+        """
+        self._page_workers = max(1, int(page_workers))
+
+    def get_response_cache(self):
+        return self._response_cache
+
+    def set_response_cache(self, response_cache):
+        """
+        Sets the cache used by the resource clients to avoid downloading unchanged resources again.
+
+        Args:
+            response_cache (ResponseCache): The cache, or None to disable it.
+        """
+        self._response_cache = response_cache
+
+    def get_task_events(self):
+        return self._task_events
+
+    def set_task_events(self, task_events):
+        """
+        Sets the source of task completion events the task monitors wait for instead of polling the tasks.
+
+        Args:
+            task_events (TaskEventListener): The events, e.g., of an ScmbSubscriber, or None to poll the tasks.
+        """
+        self._task_events = task_events
+
+    def get_download_buffer_size(self):
+        return self._download_buffer_size
+
+    def set_download_buffer_size(self, download_buffer_size):
+        """
+        Sets the number of bytes read from the appliance at a time by download_to_stream.
+
+        Args:
+            download_buffer_size: Size in bytes of the buffer reused across the reads of a download.
+        """
+        self._download_buffer_size = max(1, int(download_buffer_size))
+
+    def get_download_workers(self):
+        return self._download_workers
+
+    def set_download_workers(self, download_workers):
+        """
+        Sets the number of ranges of a file that can be downloaded at the same time by download_to_file.
+
+        Args:
+            download_workers: Number of worker threads. 1 downloads the file with a single stream.
+        """
+        self._download_workers = max(1, int(download_workers))
+
+    def get_retry_policy(self):
+        return self._retry_policy
+
+    def set_retry_policy(self, retry_policy):
+        """
+        Sets the policy that decides which failed requests are sent again.
+
+        Args:
+            retry_policy (RetryPolicy): The policy, or None to send every request only once.
+        """
+        self._retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+
+    def get_serializer(self):
+        return self._serializer
+
+    def set_serializer(self, serializer):
+        """
+        Sets the serializer of the request and response bodies.
+
+        Args:
+            serializer (JsonSerializer): The serializer. See hpOneView.serializer.get_serializer.
+        """
+        self._serializer = serializer
+
+    def enable_compression(self):
+        """
+        Asks the appliance to compress the response bodies with gzip or deflate. The bodies are decompressed as they
+        are received. Downloaded files are never compressed.
+
+        The compression is disabled by default.
+        """
+        self._set_header('Accept-Encoding', ACCEPT_ENCODING)
+
+    def disable_compression(self):
+        """
+        Stops asking the appliance to compress the response bodies.
+        """
+        self._set_header('Accept-Encoding', None)
+
+    def get_compression_stats(self):
+        """
+        Gets the number of compressed responses received and the bytes saved by their compression.
+
+        Returns:
+            CompressionStats:
+        """
+        return self._compression_stats
+
+    def add_observer(self, observer):
+        """
+        Adds an observer notified before each request is sent, after its response is read and before it is retried.
+
+        Args:
+            observer (RequestObserver): The observer.
+        """
+        with self._lock:
+            self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer):
+        """
+        Removes an observer added by add_observer.
+        """
+        with self._lock:
+            self._observers = tuple(item for item in self._observers if item is not observer)
+
+    def enable_metrics(self, buckets=DEFAULT_BUCKETS):
+        """
+        Starts counting the requests sent by this connection per method and resource collection.
+
+        Args:
+            buckets: Upper bounds in seconds of the buckets of the duration histograms.
+
+        Returns:
+            RequestMetrics: The metrics, which can be exported in the Prometheus text format.
+        """
+        with self._lock:
+            if self._metrics is None:
+                self._metrics = RequestMetrics(buckets, self._compression_stats)
+                self.add_observer(self._metrics)
+            return self._metrics
+
+    def get_metrics(self):
+        """
+        Gets the metrics of the requests sent by this connection.
+
+        Returns:
+            RequestMetrics: The metrics, or None when they were not enabled with enable_metrics.
+        """
+        return self._metrics
+
+    def __notify(self, method_name, *args):
+        for observer in self._observers:
+            try:
+                getattr(observer, method_name)(*args)
+            except Exception:
+                logger.exception('Request observer %r failed' % observer)
+
     def get_by_uri(self, xuri):
         return self.get(xuri)
 
@@ -120,78 +372,266 @@ class connection(object):
         if custom_headers:
             http_headers.update(custom_headers)
 
-        bConnected = False
-        conn = None
-        while bConnected is False:
-            try:
-                conn = self.get_connection()
-                conn.request(method, path, body, http_headers)
-                resp = conn.getresponse()
-                tempbytes = ''
+        events = []
+
+        def send():
+            event = RequestEvent(method, path, attempt=len(events) + 1)
+            events.append(event)
+            return self.__do_http_once(method, path, body, http_headers, event)
+
+        def on_retry(delay):
+            self.__notify('on_retry', events[-1], delay)
+
+        try:
+            return self._retry_policy.execute(method, self._host, send, on_retry=on_retry)
+        except http.client.HTTPException:
+            raise HPOneViewException('Failure during %s request to %s.\n %s' % (method, path, traceback.format_exc()))
+
+    def __do_http_once(self, method, path, body, http_headers, event):
+        event.bytes_out = len(body.encode('utf-8') if isinstance(body, str) else body or b'')
+        self.__notify('on_request', event)
+        start_time = time.time()
+        try:
+            return self.__exchange(method, path, body, http_headers, event, start_time)
+        except Exception as error:
+            event.error = error
+            raise
+        finally:
+            event.total_time = time.time() - start_time
+            self.__notify('on_response', event)
+
+    def __exchange(self, method, path, body, http_headers, event, start_time):
+        conn, reused = self._acquire_connection()
+        event.reused_connection = reused
+        tempbytes = ''
+        try:
+            conn, resp = self.__send_request(conn, reused, method, path, body, http_headers)
+            event.ttfb = time.time() - start_time
+            event.status = resp.status
+            event.connect_time, event.tls_time = self.__pop_connect_timings(conn)
+            tempbytes, event.bytes_in = self.__read_body(resp)
+            if tempbytes and is_json_content_type(resp.getheader('Content-Type')):
+                # Parsed straight from the bytes; a body that is not valid JSON is handled as any other body
                 try:
-                    tempbytes = resp.read()
-                    tempbody = tempbytes.decode('utf-8')
-                except UnicodeDecodeError:  # Might be binary data
-                    tempbody = tempbytes
-                    conn.close()
-                    bConnected = True
-                    return resp, tempbody
-                if tempbody:
-                    try:
-                        body = json.loads(tempbody)
-                    except ValueError:
-                        body = tempbody
+                    body = self._serializer.loads(tempbytes)
+                    self._release_connection(conn, resp)
+                    return resp, body
+                except ValueError:
+                    pass
+            tempbody = tempbytes.decode('utf-8')
+        except UnicodeDecodeError:  # Might be binary data
+            self._release_connection(conn, resp)
+            return resp, tempbytes
+        except Exception:
+            # E.g., a network error or a corrupt compressed body: the connection cannot be reused
+            conn.close()
+            raise
+        if tempbody:
+            try:
+                body = self._serializer.loads(tempbody)
+            except ValueError:
+                body = tempbody
+        self._release_connection(conn, resp)
+        return resp, body
+
+    @staticmethod
+    def __pop_connect_timings(conn):
+        timings = getattr(conn, 'connect_timings', None)
+        if not isinstance(timings, tuple):
+            return None, None
+        conn.connect_timings = None
+        return timings
+
+    def __read_body(self, resp):
+        """
+        Reads a response body, decompressing it when needed.
+
+        Returns:
+            tuple: The body, and its size in bytes as received.
+        """
+        content_encoding = resp.getheader('Content-Encoding')
+        if not is_compressed(content_encoding):
+            body = resp.read()
+            return body, len(body)
+
+        decoder = ContentDecoder(content_encoding)
+        chunks = []
+        compressed_size = 0
+        while True:
+            chunk = resp.read(COMPRESSED_CHUNK_SIZE)
+            if not chunk:
+                break
+            compressed_size += len(chunk)
+            chunks.append(decoder.decompress(chunk))
+        chunks.append(decoder.flush())
+
+        body = b''.join(chunks)
+        self._compression_stats.record(compressed_size, len(body))
+        return body, compressed_size
+
+    def download_to_stream(self, stream_writer, url, body='', method='GET', custom_headers=None, buffer_size=None,
+                           progress_callback=None):
+        """
+        Downloads the response body of a request to a stream.
+
+        The body is read into a single buffer reused for the whole download. When the stream is a file, the buffer is
+        written straight to its file descriptor.
+
+        Args:
+            stream_writer: Writable stream or file opened in binary mode.
+            url: URI of the content to download.
+            body: Request body.
+            method: HTTP method.
+            custom_headers: Headers added to the default ones.
+            buffer_size: Number of bytes read at a time. Defaults to the download buffer size of the connection.
+            progress_callback: Function called after each read with the number of bytes downloaded so far, the total
+                number of bytes (None when the appliance does not report the Content-Length) and the elapsed seconds.
+
+        Returns:
+            bool: Indicates if the content was successfully downloaded.
+        """
+        buffer_size = buffer_size or self._download_buffer_size
+
+        try:
+            # Only the request is retried, since a failure while streaming the body leaves a part of it in the stream
+            conn, resp = self._open_download(url, body, method, custom_headers)
+            try:
+                self.__read_to_stream(resp, stream_writer, buffer_size, progress_callback)
+            except Exception:
+                # The rest of the body is unread, so the connection cannot be reused
                 conn.close()
-                bConnected = True
-            except http.client.BadStatusLine:
-                logger.warning('Bad Status Line. Trying again...')
-                if conn:
-                    conn.close()
-                time.sleep(1)
-                continue
-            except http.client.HTTPException:
-                raise HPOneViewException('Failure during login attempt.\n %s' % traceback.format_exc())
+                raise
+        except http.client.HTTPException:
+            raise HPOneViewException('Failure during download of %s.\n %s' % (url, traceback.format_exc()))
 
-        return resp, body
+        self._release_connection(conn, resp)
+        return True
 
-    def download_to_stream(self, stream_writer, url, body='', method='GET', custom_headers=None):
+    def download_to_file(self, file_path, url, custom_headers=None, workers=None, progress_callback=None):
+        """
+        Downloads the content of a URI to a file, resuming an interrupted download of the same URI to the same file.
+
+        When the appliance accepts HTTP Range requests, the content is split into ranges downloaded concurrently, and
+        an interrupted range is retried from its last byte. See RangedDownload.
+
+        Args:
+            file_path: File path destination.
+            url: URI of the content to download.
+            custom_headers: Headers added to the default ones.
+            workers: Number of ranges downloaded at the same time. Defaults to the download workers of the connection.
+            progress_callback: Function called with the number of bytes downloaded so far, the total number of bytes
+                and the elapsed seconds. It is called from the worker threads when the ranges are downloaded
+                concurrently.
+
+        Returns:
+            bool: Indicates if the file was successfully downloaded.
+        """
+        download = RangedDownload(self, url, file_path,
+                                  workers=workers or self._download_workers,
+                                  custom_headers=custom_headers,
+                                  buffer_size=self._download_buffer_size,
+                                  progress_callback=progress_callback)
+        return download.run()
+
+    def _open_download(self, url, body='', method='GET', custom_headers=None):
+        """
+        Sends a download request, again while it fails for a reason the retry policy considers transient. The body of
+        the response is left unread, so it can be streamed by the caller, which must give the connection back with
+        _release_connection once the body was read.
+
+        Returns:
+            tuple: The connection and the response.
+        """
         http_headers = self._headers.copy()
+        if 'Accept-Encoding' in http_headers:
+            # Downloaded files are written as they are received, so they are never compressed
+            http_headers['Accept-Encoding'] = 'identity'
         if custom_headers:
             http_headers.update(custom_headers)
 
-        chunk_size = 4096
-        conn = None
+        def send():
+            conn, reused = self._acquire_connection()
+            conn, resp = self.__send_request(conn, reused, method, url, body, http_headers)
+            if resp.status >= 400:
+                # The error is read at once, so the connection is closed before the request is sent again
+                return resp, (None, self.__read_download_error(resp, conn))
+            return resp, (conn, None)
+
+        resp, (conn, error) = self._retry_policy.execute(method, self._host, send)
+        if error is not None:
+            raise HPOneViewException(error)
+
+        return conn, resp
+
+    def __read_to_stream(self, resp, stream_writer, buffer_size, progress_callback=None):
+        total = None
+        if progress_callback:
+            content_length = resp.getheader('Content-Length')
+            total = int(content_length) if content_length else None
+
+        fd = self.__get_file_descriptor(stream_writer)
+        if fd is not None:
+            # Anything already written through the file object must reach the file before the raw writes
+            stream_writer.flush()
+
+        buffer = bytearray(buffer_size)
+        buffer_view = memoryview(buffer)
+        downloaded = 0
+        start_time = time.time()
+        while True:
+            read_size = read_into(resp, buffer)
+            if not read_size:
+                break
+            chunk = buffer_view[:read_size]
+            if fd is None:
+                # The buffer is reused by the next read, so the stream gets a copy it can keep
+                stream_writer.write(chunk.tobytes())
+            else:
+                while chunk:
+                    chunk = chunk[os.write(fd, chunk):]
+            downloaded += read_size
+            if progress_callback:
+                progress_callback(downloaded, total, time.time() - start_time)
+
+    @staticmethod
+    def __get_file_descriptor(stream_writer):
+        try:
+            fd = stream_writer.fileno()
+        except (AttributeError, IOError, ValueError):
+            return None
+        return fd if isinstance(fd, int) else None
 
-        successful_connected = False
-        while not successful_connected:
-            try:
-                conn = self.get_connection()
-                conn.request(method, url, body, http_headers)
-                resp = conn.getresponse()
+    def __send_request(self, conn, reused, method, path, body, headers):
+        sent = False
+        try:
+            conn.request(method, path, body, headers)
+            sent = True
+            return conn, conn.getresponse()
+        except (http.client.BadStatusLine, socket.error) as error:
+            conn.close()
+            # The appliance may close a keep-alive connection while it is idle in the pool. The request is only sent
+            # again here when the appliance cannot have processed it; otherwise, the retry policy decides.
+            if not reused or (sent and not self.__is_closed_without_response(method, error)):
+                raise
 
-                if resp.status >= 400:
-                    self.__handle_download_error(resp, conn)
+        logger.debug('Pooled connection to %s is stale. Reconnecting...' % self._host)
+        conn = self.get_connection()
+        try:
+            conn.request(method, path, body, headers)
+            return conn, conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
 
-                tempbytes = True
-                while tempbytes:
-                    tempbytes = resp.read(chunk_size)
-                    if tempbytes:  # filter out keep-alive new chunks
-                        stream_writer.write(tempbytes)
+    def __is_closed_without_response(self, method, error):
+        if method.upper() not in self._retry_policy.idempotent_methods:
+            return False
+        if isinstance(error, http.client.BadStatusLine):
+            # The status line is empty when the connection was closed before any byte of the response
+            return getattr(error, 'line', None) in ('', "''")
+        return getattr(error, 'errno', None) in STALE_CONNECTION_ERRORS
 
-                conn.close()
-                successful_connected = True
-            except http.client.BadStatusLine:
-                logger.warning('Bad Status Line. Trying again...')
-                if conn:
-                    conn.close()
-                time.sleep(1)
-                continue
-            except http.client.HTTPException:
-                raise HPOneViewException('Failure during login attempt.\n %s' % traceback.format_exc())
-
-        return successful_connected
-
-    def __handle_download_error(self, resp, conn):
+    def __read_download_error(self, resp, conn):
         try:
             tempbytes = resp.read()
             tempbody = tempbytes.decode('utf-8')
@@ -206,38 +646,69 @@ class connection(object):
             body = "Error " + str(resp.status)
 
         conn.close()
-        raise HPOneViewException(body)
+        return body
+
+    def get_ssl_context(self):
+        """
+        Gets the SSL context used by the connections to the appliance. The context is built once and reused, so the
+        trusted certificate bundle is only loaded from disk when the context is created.
+
+        Returns:
+            ssl.SSLContext
+        """
+        with self._lock:
+            if self._ssl_context is None:
+                context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+                if self._sslTrustAll is False:
+                    context.verify_mode = ssl.CERT_REQUIRED
+                    context.load_verify_locations(self._sslTrustedBundle)
+                else:
+                    context.verify_mode = ssl.CERT_NONE
+                self._ssl_context = context
+            return self._ssl_context
 
     def get_connection(self):
-        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-        if self._sslTrustAll is False:
-            context.verify_mode = ssl.CERT_REQUIRED
-            context.load_verify_locations(self._sslTrustedBundle)
-            if self._doProxy is False:
-                conn = http.client.HTTPSConnection(self._host,
-                                                   context=context,
-                                                   timeout=self._timeout)
-            else:
-                conn = http.client.HTTPSConnection(self._proxyHost,
-                                                   self._proxyPort,
-                                                   context=context,
-                                                   timeout=self._timeout)
-                conn.set_tunnel(self._host, 443)
+        context = self.get_ssl_context()
+        if self._doProxy is False:
+            conn = HTTPSConnection(self._host,
+                                   context=context,
+                                   timeout=self._timeout,
+                                   tls_sessions=self._tls_sessions)
         else:
-            context.verify_mode = ssl.CERT_NONE
-            if self._doProxy is False:
-                conn = http.client.HTTPSConnection(self._host,
-                                                   context=context,
-                                                   timeout=self._timeout)
-            else:
-                conn = http.client.HTTPSConnection(self._proxyHost,
-                                                   self._proxyPort,
-                                                   context=context,
-                                                   timeout=self._timeout)
-                conn.set_tunnel(self._host, 443)
+            conn = HTTPSConnection(self._proxyHost,
+                                   self._proxyPort,
+                                   context=context,
+                                   timeout=self._timeout,
+                                   tls_sessions=self._tls_sessions)
+            conn.set_tunnel(self._host, 443)
 
         return conn
 
+    def _connection_pool_key(self):
+        return self._host, self._proxyHost, self._proxyPort, self._sslTrustedBundle
+
+    def _acquire_connection(self):
+        """
+        Gets an idle connection from the pool, or a new one when the pool has none for this appliance.
+
+        Returns:
+            tuple: The connection, and whether it was reused from the pool.
+        """
+        conn = self._connection_pool.acquire(self._connection_pool_key())
+        if conn:
+            return conn, True
+        return self.get_connection(), False
+
+    def _release_connection(self, conn, response):
+        """
+        Gives the connection back to the pool after its response was fully read. The connection is closed instead
+        when the appliance did not keep it alive.
+        """
+        if response.will_close or not self._connection_pool.max_size:
+            conn.close()
+        else:
+            self._connection_pool.release(self._connection_pool_key(), conn)
+
     def _open(self, name, mode):
         return open(name, mode)
 
@@ -247,6 +718,9 @@ class connection(object):
         Files is a sequence of (name, filename, value) elements for data
         to be uploaded as files
 
+        Writes the encoded body to a sibling <files>.b64 file. It is no longer used by post_multipart, which streams
+        the file content instead.
+
         Returns: (content_type, body) ready for httplib.HTTP instance
         """
         BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
@@ -271,6 +745,38 @@ class connection(object):
         fin.close()
         return content_type
 
+    def __get_multipart_framing(self, baseName):
+        """
+        Gets the multipart/form-data framing of a file upload.
+
+        Returns: (content_type, preamble, epilogue), the bytes to send before and after the file content
+        """
+        BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
+        CRLF = '\r\n'
+        content_type = 'multipart/form-data; boundary=%s' % BOUNDARY
+        preamble = ''.join(['--' + BOUNDARY + CRLF,
+                            'Content-Disposition: form-data; name="file"; filename="' + baseName + '"' + CRLF,
+                            'Content-Type: application/octet-stream' + CRLF,
+                            CRLF])
+        epilogue = CRLF + '--' + BOUNDARY + '--' + CRLF + CRLF
+        return content_type, bytearray(preamble, 'utf-8'), bytearray(epilogue, 'utf-8')
+
+    def __send_file(self, conn, inputfile, verbose=False):
+        # Send 1MB at a time, reusing the same buffer
+        # NOTE: Be careful raising this value as the read chunk
+        # is stored in RAM
+        chunk = bytearray(1048576)
+        chunk_view = memoryview(chunk)
+        sent = 0
+        while True:
+            readSize = inputfile.readinto(chunk)
+            if not readSize:
+                break
+            conn.send(chunk_view[:readSize])
+            sent += readSize
+            if verbose is True:
+                print('%d bytes sent... \r' % sent)
+
     def post_multipart_with_response_handling(self, uri, file_path, baseName):
         resp, body = self.post_multipart(uri, None, file_path, baseName)
 
@@ -284,12 +790,10 @@ class connection(object):
         return None, body
 
     def post_multipart(self, uri, fields, files, baseName, verbose=False):
-        content_type = self.encode_multipart_formdata(fields, files, baseName,
-                                                      verbose)
-        inputfile = self._open(files + '.b64', 'rb')
-        mappedfile = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
+        content_type, preamble, epilogue = self.__get_multipart_framing(baseName)
         if verbose is True:
             print(('Uploading ' + files + '...'))
+        # Uploads always open a new connection, which is given back to the pool once the response is read
         conn = self.get_connection()
         # conn.set_debuglevel(1)
         conn.connect()
@@ -297,22 +801,20 @@ class connection(object):
         conn.putheader('uploadfilename', baseName)
         conn.putheader('auth', self._headers['auth'])
         conn.putheader('Content-Type', content_type)
-        totalSize = os.path.getsize(files + '.b64')
+        # The file is streamed between the multipart framing, so the body is never written anywhere
+        totalSize = len(preamble) + os.path.getsize(files) + len(epilogue)
         conn.putheader('Content-Length', totalSize)
         conn.putheader('X-API-Version', self._apiVersion)
         conn.endheaders()
 
-        while mappedfile.tell() < mappedfile.size():
-            # Send 1MB at a time
-            # NOTE: Be careful raising this value as the read chunk
-            # is stored in RAM
-            readSize = 1048576
-            conn.send(mappedfile.read(readSize))
-            if verbose is True:
-                print('%d bytes sent... \r' % mappedfile.tell())
-        mappedfile.close()
-        inputfile.close()
-        os.remove(files + '.b64')
+        conn.send(preamble)
+        inputfile = self._open(files, 'rb')
+        try:
+            self.__send_file(conn, inputfile, verbose)
+        finally:
+            inputfile.close()
+        conn.send(epilogue)
+
         response = conn.getresponse()
         body = response.read().decode('utf-8')
 
@@ -322,7 +824,7 @@ class connection(object):
             except ValueError:
                 body = response.read().decode('utf-8')
 
-        conn.close()
+        self._release_connection(conn, response)
 
         if response.status >= 400:
             raise HPOneViewException(body)
@@ -340,30 +842,50 @@ class connection(object):
             body = self.get(resp.getheader('Location'))
         if type(body) is dict:
             if 'nextPageUri' in body:
-                self._nextPage = body['nextPageUri']
+                self._paging.nextPage = body['nextPageUri']
             if 'prevPageUri' in body:
-                self._prevPage = body['prevPageUri']
+                self._paging.prevPage = body['prevPageUri']
             if 'total' in body:
-                self._numTotalRecords = body['total']
+                self._paging.numTotalRecords = body['total']
             if 'count' in body:
-                self._numDisplayedRecords = body['count']
+                self._paging.numDisplayedRecords = body['count']
+        return body
+
+    def get_if_none_match(self, uri, etag):
+        """
+        Gets a resource unless it still matches the given eTag.
+
+        Args:
+            uri: Resource URI.
+            etag: eTag of the copy of the resource the caller already has.
+
+        Returns:
+            The resource, or None when the appliance reports it was not modified.
+        """
+        resp, body = self.do_http('GET', uri, '', custom_headers={'If-None-Match': etag})
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+        if resp.status == 304:
+            return None
+        if resp.status == 302:
+            body = self.get(resp.getheader('Location'))
         return body
 
     def getNextPage(self):
-        body = self.get(self._nextPage)
+        body = self.get(self._paging.nextPage)
         return get_members(body)
 
     def getPrevPage(self):
-        body = self.get(self._prevPage)
+        body = self.get(self._paging.prevPage)
         return get_members(body)
 
     def getLastPage(self):
-        while self._nextPage is not None:
+        while self._paging.nextPage is not None:
             members = self.getNextPage()
         return members
 
     def getFirstPage(self):
-        while self._prevPage is not None:
+        while self._paging.prevPage is not None:
             members = self.getPrevPage()
         return members
 
@@ -398,7 +920,7 @@ class connection(object):
     def __do_rest_call(self, http_method, uri, body, custom_headers):
         resp, body = self.do_http(method=http_method,
                                   path=uri,
-                                  body=json.dumps(body),
+                                  body=self._serializer.dumps(body),
                                   custom_headers=custom_headers)
         if resp.status >= 400:
             raise HPOneViewException(body)
@@ -406,7 +928,7 @@ class connection(object):
         if resp.status == 304:
             if body and not isinstance(body, dict):
                 try:
-                    body = json.loads(body)
+                    body = self._serializer.loads(body)
                 except Exception:
                     pass
         elif resp.status == 202:
@@ -461,7 +983,7 @@ class connection(object):
             raise
         auth = body['sessionID']
         # Add the auth ID to the headers dictionary
-        self._headers['auth'] = auth
+        self._set_header('auth', auth)
         self._session = True
         if verbose is True:
             print(('Session Key: ' + auth))
@@ -477,7 +999,7 @@ class connection(object):
             raise
         if verbose is True:
             print('Logged Out')
-        del self._headers['auth']
+        self._set_header('auth', None)
         self._session = False
         logger.info('Logged out successfully')
         return None
@@ -489,14 +1011,14 @@ class connection(object):
 
         The eTag validation is enabled by default.
         """
-        self._headers.pop('If-Match', None)
+        self._set_header('If-Match', None)
 
     def disable_etag_validation(self):
         """
         Disable the concurrency control for the PUT and DELETE requests. The requests will be forced without specifying
         an explicit ETag. This method sets an If-Match header of "*".
         """
-        self._headers['If-Match'] = '*'
+        self._set_header('If-Match', '*')
 
 
 uri = {
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+connection_pool.py
+~~~~~~~~~~~~~~~~~~
+
+This module keeps idle keep-alive connections to the appliances so they can be reused across requests.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import logging
+import threading
+import time
+
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool(object):
+    """
+    Pool of idle HTTPS connections grouped by host.
+
+    A connection is taken from the pool before a request and given back once its response was fully read. Connections
+    idle for more than idle_timeout seconds are discarded, and at most max_size idle connections are kept per host.
+    A max_size of 0 disables the pooling, so every connection is closed after use.
+
+    The same pool can be shared by several connection objects, e.g., the OneView and the Image Streamer connections.
+    """
+    DEFAULT_MAX_SIZE = 10
+    DEFAULT_IDLE_TIMEOUT = 60
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self._max_size = int(max_size)
+        self._idle_timeout = idle_timeout
+        self._idle_connections = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def idle_timeout(self):
+        return self._idle_timeout
+
+    def acquire(self, key):
+        """
+        Takes an idle connection for the given host key.
+
+        Args:
+            key: Hashable that identifies the host the connection is open to.
+
+        Returns:
+            The most recently released connection, or None when there is no usable idle connection.
+        """
+        expired = []
+        conn = None
+        with self._lock:
+            idle = self._idle_connections.get(key)
+            while idle:
+                candidate, released_at = idle.pop()
+                if self.__is_expired(released_at):
+                    expired.append(candidate)
+                else:
+                    conn = candidate
+                    break
+
+        for stale in expired:
+            logger.debug('Closing idle connection to %s' % str(key))
+            stale.close()
+
+        return conn
+
+    def release(self, key, conn):
+        """
+        Gives a connection back to the pool. The connection is closed when the pool is full for the given host.
+
+        Args:
+            key: Hashable that identifies the host the connection is open to.
+            conn: Connection whose last response was fully read.
+        """
+        with self._lock:
+            idle = self._idle_connections.setdefault(key, deque())
+            if len(idle) < self._max_size:
+                idle.append((conn, time.time()))
+                return
+
+        conn.close()
+
+    def clear(self, key=None):
+        """
+        Closes the idle connections.
+
+        Args:
+            key: Closes only the connections of the given host key. All the connections are closed by default.
+        """
+        with self._lock:
+            if key is None:
+                idle_lists = list(self._idle_connections.values())
+                self._idle_connections = {}
+            else:
+                idle_lists = [self._idle_connections.pop(key, deque())]
+
+        for idle in idle_lists:
+            for conn, _ in idle:
+                conn.close()
+
+    def size(self, key):
+        """
+        Gets the number of idle connections kept for the given host key.
+        """
+        with self._lock:
+            return len(self._idle_connections.get(key, ()))
+
+    def __is_expired(self, released_at):
+        return self._idle_timeout is not None and released_at + self._idle_timeout < time.time()
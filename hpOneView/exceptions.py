@@ -149,3 +149,14 @@ class HPOneViewResourceNotFound(HPOneViewException):
        msg (str): Exception message.
     """
     pass
+
+
+class HPOneViewCircuitOpen(HPOneViewException):
+    """
+    OneView Circuit Open Exception.
+    The exception is raised when the requests to an appliance are suspended after consecutive failures.
+
+    Attributes:
+       msg (str): Exception message.
+    """
+    pass
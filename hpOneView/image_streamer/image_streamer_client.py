@@ -44,8 +44,8 @@ from hpOneView.image_streamer.resources.deployment_groups import DeploymentGroup
 
 
 class ImageStreamerClient(object):
-    def __init__(self, ip, session_id, api_version, sslBundle=False):
-        self.__connection = connection(ip, api_version, sslBundle)
+    def __init__(self, ip, session_id, api_version, sslBundle=False, connection_pool=None):
+        self.__connection = connection(ip, api_version, sslBundle, connection_pool=connection_pool)
         self.__connection.set_session_id(session_id)
         self.__golden_images = None
         self.__plan_scripts = None
@@ -78,6 +78,48 @@ class ArtifactBundles(object):
         """
         return self._client.get_all(start, count, filter=filter, sort=sort)
 
+    def iter_all(self, start=0, count=-1, filter='', sort=''):
+        """
+        Iterates over the items of get_all, retrieving one page at a time.
+
+        Args:
+            start:
+                The first item to return, using 0-based indexing.
+                If not specified, the default is 0 - start with the first available item.
+            count:
+                The number of resources to return. A count of -1 requests all items.
+
+                The actual number of items in the response might differ from the requested
+                count if the sum of start and count exceeds the total number of items.
+            filter (list or str):
+                A general filter/query string to narrow the list of items returned. The
+                default is no filter; all resources are returned.
+            sort:
+                The sort order of the returned data set. By default, the sort order is based
+                on create time with the oldest entry first.
+
+        Returns:
+            generator: The items matching the specified filter.
+        """
+        return self._client.iter_all(start, count, filter=filter, sort=sort)
+
+    def sync(self, snapshot=None, filter=''):
+        """
+        Gets the resources added, updated and deleted since a previous sync. Only the new and changed
+        resources are retrieved in full.
+
+        Args:
+            snapshot (dict):
+                The snapshot of the previous sync. By default, all the resources are reported as added.
+            filter (list or str):
+                A general filter/query string to narrow the list of items returned. The
+                default is no filter; all resources are returned.
+
+        Returns:
+            SyncResult: The changes, and the snapshot to pass to the next sync.
+        """
+        return self._client.sync(snapshot, filter=filter)
+
     def get(self, id_or_uri):
         """
         Retrieves the overview details for the selected Artifact Bundle as per the selected attributes.
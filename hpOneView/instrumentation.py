@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+instrumentation.py
+~~~~~~~~~~~~~~~~~~
+
+This module reports the requests sent by a connection to observers, and aggregates them into metrics that can be
+exported in the Prometheus text format.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import re
+import threading
+
+from urllib.parse import urlsplit
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# A path segment holding a digit is an ID when it is a number or at least 8 characters long, e.g., a UUID or a serial
+ID_SEGMENT = re.compile(r'^(?=.*\d)(\d+|[^/]{8,})$')
+
+
+def get_uri_template(uri):
+    """
+    Gets the URI of a request without its query and with its resource IDs replaced by {id}.
+
+    Args:
+        uri: URI of the request, e.g., '/rest/server-hardware/30303437-3034-4D32-3230-313130304752/utilization'.
+
+    Returns:
+        str: URI template, e.g., '/rest/server-hardware/{id}/utilization'.
+    """
+    segments = urlsplit(uri).path.split('/')
+    return '/'.join('{id}' if ID_SEGMENT.match(segment) else segment for segment in segments)
+
+
+def get_collection(uri):
+    """
+    Gets the name of the resource collection of a URI, e.g., 'server-hardware' for '/rest/server-hardware/1'.
+    """
+    segments = [segment for segment in urlsplit(uri).path.split('/') if segment]
+    if segments and segments[0] == 'rest':
+        segments = segments[1:]
+    return segments[0] if segments else ''
+
+
+class RequestEvent(object):
+    """
+    Attempt to send a request to the appliance. A request retried by the retry policy has one event per attempt.
+
+    Attributes:
+        method: HTTP method.
+        uri: URI of the request.
+        attempt: Number of the attempt, starting at 1.
+        status: Status of the response, or None when no response was received.
+        error: Exception raised by the attempt, or None.
+        bytes_out: Size in bytes of the request body.
+        bytes_in: Size in bytes of the response body, as received.
+        reused_connection: Whether the request was sent on a kept-alive connection.
+        connect_time: Seconds spent resolving the host and opening the TCP connection, or None when the connection was
+            reused. http.client resolves and connects in a single call, so the DNS lookup is part of this time.
+        tls_time: Seconds spent on the TLS handshake, or None when the connection was reused.
+        ttfb: Seconds until the status line and the headers of the response were received.
+        total_time: Seconds until the response body was read.
+    """
+
+    def __init__(self, method, uri, attempt=1):
+        self.method = method
+        self.uri = uri
+        self.attempt = attempt
+        self.status = None
+        self.error = None
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.reused_connection = None
+        self.connect_time = None
+        self.tls_time = None
+        self.ttfb = None
+        self.total_time = None
+
+    @property
+    def uri_template(self):
+        return get_uri_template(self.uri)
+
+    @property
+    def collection(self):
+        return get_collection(self.uri)
+
+
+class RequestObserver(object):
+    """
+    Base class of the observers of the requests sent by a connection. See connection.add_observer.
+
+    The methods are called on the thread that sends the request, so they should return quickly. An exception raised
+    by an observer is logged and does not fail the request.
+    """
+
+    def on_request(self, event):
+        """
+        Called before a request is sent.
+
+        Args:
+            event (RequestEvent): Attempt being sent.
+        """
+        pass
+
+    def on_response(self, event):
+        """
+        Called when the response was read, or when the request failed before, in which case event.error is set.
+
+        Args:
+            event (RequestEvent): Completed attempt.
+        """
+        pass
+
+    def on_retry(self, event, delay):
+        """
+        Called when the retry policy decides to send a request again.
+
+        Args:
+            event (RequestEvent): Attempt that failed.
+            delay: Seconds waited before the next attempt.
+        """
+        pass
+
+
+class Histogram(object):
+    """
+    Cumulative histogram of durations, as in the Prometheus histograms.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.counts[index] += 1
+
+
+class RequestMetrics(RequestObserver):
+    """
+    Counts the requests, retries and bytes per method and resource collection, and keeps histograms of the request
+    durations and of the time to the first byte.
+
+    Args:
+        buckets: Upper bounds in seconds of the histogram buckets.
+        compression_stats (CompressionStats): Compression statistics of the connection, exported with the metrics.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, compression_stats=None):
+        self.buckets = tuple(sorted(buckets))
+        self.compression_stats = compression_stats
+        self._requests = {}
+        self._retries = {}
+        self._bytes_out = {}
+        self._bytes_in = {}
+        self._durations = {}
+        self._ttfbs = {}
+        self._lock = threading.Lock()
+
+    def on_response(self, event):
+        collection = event.collection
+        status = str(event.status) if event.status is not None else 'error'
+        key = (event.method, collection)
+        with self._lock:
+            self._requests[key + (status,)] = self._requests.get(key + (status,), 0) + 1
+            self._bytes_out[key] = self._bytes_out.get(key, 0) + event.bytes_out
+            self._bytes_in[key] = self._bytes_in.get(key, 0) + event.bytes_in
+            self.__get_histogram(self._durations, key).observe(event.total_time or 0)
+            if event.ttfb is not None:
+                self.__get_histogram(self._ttfbs, key).observe(event.ttfb)
+
+    def on_retry(self, event, delay):
+        key = (event.method, event.collection)
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def get_request_count(self, method=None, collection=None, status=None):
+        """
+        Gets the number of requests that match the given method, collection and status. All by default.
+        """
+        status = None if status is None else str(status)
+        with self._lock:
+            return sum(count for (key_method, key_collection, key_status), count in self._requests.items()
+                       if method in (None, key_method) and collection in (None, key_collection) and status in (None, key_status))
+
+    def export(self, callback):
+        """
+        Passes every sample to a callback, e.g., to push the metrics to another monitoring system.
+
+        Args:
+            callback: Function called with the metric name, the labels dict and the value of each sample.
+        """
+        for name, _, _, samples in self.collect():
+            for sample_name, labels, value in samples:
+                callback(sample_name, labels, value)
+
+    def to_prometheus(self):
+        """
+        Gets the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str:
+        """
+        lines = []
+        for name, metric_type, description, samples in self.collect():
+            lines.append('# HELP %s %s' % (name, description))
+            lines.append('# TYPE %s %s' % (name, metric_type))
+            for sample_name, labels, value in samples:
+                lines.append('%s%s %s' % (sample_name, format_labels(labels), format_value(value)))
+        return '\n'.join(lines) + '\n'
+
+    def collect(self):
+        """
+        Gets a snapshot of the metrics.
+
+        Returns:
+            list: Tuples with the name, the type, the description and the samples of each metric. A sample is a tuple
+            with its name, its labels dict and its value.
+        """
+        with self._lock:
+            metrics = [
+                ('hponeview_requests_total', 'counter', 'Requests sent to the appliance.',
+                 [('hponeview_requests_total', {'method': method, 'collection': collection, 'status': status}, count)
+                  for (method, collection, status), count in sorted(self._requests.items())]),
+                ('hponeview_retries_total', 'counter', 'Requests sent again by the retry policy.',
+                 self.__counter_samples('hponeview_retries_total', self._retries)),
+                ('hponeview_request_bytes_total', 'counter', 'Bytes of the request bodies.',
+                 self.__counter_samples('hponeview_request_bytes_total', self._bytes_out)),
+                ('hponeview_response_bytes_total', 'counter', 'Bytes of the response bodies, as received.',
+                 self.__counter_samples('hponeview_response_bytes_total', self._bytes_in)),
+                ('hponeview_request_duration_seconds', 'histogram', 'Time until the response body was read.',
+                 self.__histogram_samples('hponeview_request_duration_seconds', self._durations)),
+                ('hponeview_time_to_first_byte_seconds', 'histogram', 'Time until the response headers were received.',
+                 self.__histogram_samples('hponeview_time_to_first_byte_seconds', self._ttfbs)),
+            ]
+
+        if self.compression_stats is not None:
+            stats = self.compression_stats.to_dict()
+            metrics.append(('hponeview_compression_saved_bytes_total', 'counter',
+                            'Bytes saved by the compression of the response bodies.',
+                            [('hponeview_compression_saved_bytes_total', {}, stats['bytes_saved'])]))
+        return metrics
+
+    def __get_histogram(self, histograms, key):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    @staticmethod
+    def __counter_samples(name, counters):
+        return [(name, {'method': method, 'collection': collection}, value)
+                for (method, collection), value in sorted(counters.items())]
+
+    @staticmethod
+    def __histogram_samples(name, histograms):
+        samples = []
+        for (method, collection), histogram in sorted(histograms.items()):
+            labels = {'method': method, 'collection': collection}
+            for upper_bound, count in zip(histogram.buckets, histogram.counts):
+                samples.append((name + '_bucket', dict(labels, le=format_value(upper_bound)), count))
+            samples.append((name + '_bucket', dict(labels, le='+Inf'), histogram.count))
+            samples.append((name + '_sum', labels, histogram.sum))
+            samples.append((name + '_count', labels, histogram.count))
+        return samples
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = [(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for name, value in sorted(labels.items())]
+    return '{%s}' % ','.join('%s="%s"' % label for label in escaped)
+
+
+def format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return str(value)
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+inventory_store.py
+~~~~~~~~~~~~~~~~~~
+
+This module keeps a persistent copy of the appliance inventory, so a job can start from it and only retrieve the
+resources changed since its last run.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import logging
+import sqlite3
+import threading
+
+from contextlib import contextmanager
+
+from hpOneView.serializer import JsonSerializer
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS resources (
+    uri TEXT PRIMARY KEY,
+    category TEXT,
+    name TEXT COLLATE NOCASE,
+    etag TEXT,
+    modified TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_category ON resources (category);
+CREATE INDEX IF NOT EXISTS resources_name ON resources (name);
+CREATE TABLE IF NOT EXISTS fields (
+    uri TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS fields_value ON fields (field, value);
+CREATE INDEX IF NOT EXISTS fields_uri ON fields (uri);
+CREATE TABLE IF NOT EXISTS indexed_fields (
+    field TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS collections (
+    uri TEXT PRIMARY KEY,
+    last_modified TEXT
+);
+'''
+
+
+class InventoryStore(object):
+    """
+    Resources of the appliance persisted in an SQLite database, keyed by URI.
+
+    Each collection is refreshed incrementally: the first refresh retrieves all its resources, and the following ones
+    only those modified after the latest modification date seen by the previous refresh. The resources can then be
+    looked up locally by URI, name or any of the indexed fields. Name and field lookups are case-insensitive, like the
+    get_by of the resource clients.
+
+    The store can be shared by several threads.
+    """
+
+    def __init__(self, path, indexed_fields=(), serializer=None):
+        """
+        Args:
+            path: Path of the database file, created when it does not exist. Use ':memory:' for a store that is not
+                persisted.
+            indexed_fields (list): Fields of the resources to index, e.g., 'serialNumber' or 'serverHardwareUri'.
+                Nested fields use dots, e.g., 'mpHostInfo.mpHostName'.
+            serializer (JsonSerializer): Serializer of the stored resources. Defaults to the json module.
+        """
+        self._serializer = serializer or JsonSerializer()
+        self._indexed_fields = list(indexed_fields)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self.__transaction() as cursor:
+            cursor.executescript(SCHEMA)
+            self.__update_indexed_fields(cursor)
+
+    @property
+    def indexed_fields(self):
+        return list(self._indexed_fields)
+
+    def refresh(self, resource, prune=False):
+        """
+        Stores the resources of a collection added or changed since the previous refresh.
+
+        Only the resources whose modification date is after the latest one seen by the previous refresh of the
+        collection are retrieved, with a "modified gt" filter. That filter cannot report the deleted resources; with
+        prune, the collection is synchronized by eTag instead, which also removes them.
+
+        Args:
+            resource: Resource of the OneViewClient, e.g., oneview_client.server_hardware. Its get_all must accept a
+                filter, or prune must be used.
+            prune (bool): Lists all the URIs of the collection to find the deleted resources.
+
+        Returns:
+            int: Number of resources stored or removed.
+        """
+        collection = resource.URI
+        last_modified = self.get_last_modified(collection)
+
+        deleted = []
+        if prune:
+            result = resource.sync(self.get_snapshot(collection))
+            changed = result.added + result.updated
+            deleted = result.deleted
+        elif last_modified:
+            changed = resource.get_all(filter="modified gt '%s'" % last_modified)
+        else:
+            changed = resource.get_all()
+
+        changed = [item for item in changed if isinstance(item, dict) and item.get('uri')]
+        modified_dates = [item['modified'] for item in changed if item.get('modified')]
+        if last_modified:
+            modified_dates.append(last_modified)
+
+        with self.__transaction() as cursor:
+            for item in changed:
+                self.__put(cursor, item)
+            for uri in deleted:
+                self.__remove(cursor, uri)
+            # Kept apart from the stored resources: a resource put by another source (e.g., a state-change message)
+            # must not move the starting point of the next refresh past changes not retrieved yet
+            cursor.execute('INSERT OR REPLACE INTO collections (uri, last_modified) VALUES (?, ?)',
+                           (collection, max(modified_dates) if modified_dates else None))
+
+        logger.debug('Refreshed %s: %d resources stored, %d removed' % (collection, len(changed), len(deleted)))
+        return len(changed) + len(deleted)
+
+    def put(self, resource):
+        """
+        Stores a resource, replacing the previous version with the same URI.
+
+        Args:
+            resource (dict): Resource retrieved from the appliance.
+        """
+        with self.__transaction() as cursor:
+            self.__put(cursor, resource)
+
+    def remove(self, uri):
+        """
+        Removes a resource from the store.
+
+        Args:
+            uri: URI of the resource.
+
+        Returns:
+            bool: Whether the resource was stored.
+        """
+        with self.__transaction() as cursor:
+            return self.__remove(cursor, uri)
+
+    def get(self, uri):
+        """
+        Gets a stored resource by its URI.
+
+        Returns:
+            dict: The resource, or None when it is not stored.
+        """
+        rows = self.__query('SELECT body FROM resources WHERE uri = ?', (uri,))
+        return self.__load(rows[0][0]) if rows else None
+
+    def get_by_name(self, name, category=None):
+        """
+        Gets a stored resource by its name.
+
+        Args:
+            name: Resource name.
+            category: Category of the resource, e.g., 'server-hardware'. Any category by default.
+
+        Returns:
+            dict: The resource, or None when it is not stored.
+        """
+        sql, params = self.__filter_category('SELECT body FROM resources WHERE name = ?', (name,), category)
+        rows = self.__query(sql + ' LIMIT 1', params)
+        return self.__load(rows[0][0]) if rows else None
+
+    def get_by(self, field, value, category=None):
+        """
+        Gets the stored resources whose field has the given value.
+
+        The indexed fields, the name and the uri are looked up through an index; any other field is compared on every
+        stored resource of the category.
+
+        Args:
+            field: Field name, with dots for nested fields.
+            value: Value of the field.
+            category: Category of the resources, e.g., 'server-hardware'. Any category by default.
+
+        Returns:
+            list: The matching resources.
+        """
+        if field in ('uri', 'name'):
+            sql, params = 'SELECT body FROM resources WHERE %s = ?' % field, (value,)
+        elif field in self._indexed_fields:
+            sql = 'SELECT body FROM resources WHERE uri IN (SELECT uri FROM fields WHERE field = ? AND value = ?)'
+            params = (field, str(value))
+        else:
+            return [item for item in self.get_all(category)
+                    if str(value).lower() in [str(v).lower() for v in get_field_values(item, field)]]
+
+        sql, params = self.__filter_category(sql, params, category)
+        return [self.__load(body) for body, in self.__query(sql, params)]
+
+    def get_all(self, category=None):
+        """
+        Gets the stored resources.
+
+        Args:
+            category: Category of the resources, e.g., 'server-hardware'. All the resources by default.
+
+        Returns:
+            list: The resources, sorted by URI.
+        """
+        sql, params = self.__filter_category('SELECT body FROM resources WHERE 1 = 1', (), category)
+        return [self.__load(body) for body, in self.__query(sql + ' ORDER BY uri', params)]
+
+    def get_snapshot(self, collection):
+        """
+        Gets the versions of the stored resources of a collection, as expected by the sync of the resource clients.
+
+        Args:
+            collection: URI of the collection, e.g., '/rest/server-hardware'.
+
+        Returns:
+            dict: eTag, or modification date when there is no eTag, keyed by resource URI.
+        """
+        rows = self.__query('SELECT uri, etag, modified FROM resources WHERE uri LIKE ?',
+                            (collection.rstrip('/') + '/%',))
+        return dict((uri, etag or modified) for uri, etag, modified in rows)
+
+    def get_last_modified(self, collection):
+        """
+        Gets the latest modification date seen by the last refresh of a collection.
+
+        Args:
+            collection: URI of the collection, e.g., '/rest/server-hardware'.
+
+        Returns:
+            str: The modification date, or None when the collection was never refreshed.
+        """
+        rows = self.__query('SELECT last_modified FROM collections WHERE uri = ?', (collection,))
+        return rows[0][0] if rows else None
+
+    def get_collections(self):
+        """
+        Gets the collections refreshed at least once.
+
+        Returns:
+            list: URIs of the collections.
+        """
+        return [uri for uri, in self.__query('SELECT uri FROM collections ORDER BY uri')]
+
+    def clear(self):
+        """
+        Removes all the resources and the refresh state of the collections.
+        """
+        with self.__transaction() as cursor:
+            cursor.execute('DELETE FROM resources')
+            cursor.execute('DELETE FROM fields')
+            cursor.execute('DELETE FROM collections')
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        with self._lock:
+            self._db.close()
+
+    def __len__(self):
+        return self.__query('SELECT COUNT(*) FROM resources')[0][0]
+
+    def __contains__(self, uri):
+        return bool(self.__query('SELECT 1 FROM resources WHERE uri = ?', (uri,)))
+
+    @contextmanager
+    def __transaction(self):
+        with self._lock:
+            cursor = self._db.cursor()
+            try:
+                yield cursor
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def __query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def __load(self, body):
+        return self._serializer.loads(body)
+
+    @staticmethod
+    def __filter_category(sql, params, category):
+        if category is None:
+            return sql, params
+        return sql + ' AND category = ?', params + (category,)
+
+    def __put(self, cursor, resource):
+        uri = resource['uri']
+        cursor.execute('INSERT OR REPLACE INTO resources (uri, category, name, etag, modified, body) '
+                       'VALUES (?, ?, ?, ?, ?, ?)',
+                       (uri, resource.get('category'), resource.get('name'), resource.get('eTag'),
+                        resource.get('modified'), self._serializer.dumps(resource)))
+        cursor.execute('DELETE FROM fields WHERE uri = ?', (uri,))
+        self.__index(cursor, uri, resource, self._indexed_fields)
+
+    @staticmethod
+    def __remove(cursor, uri):
+        cursor.execute('DELETE FROM fields WHERE uri = ?', (uri,))
+        cursor.execute('DELETE FROM resources WHERE uri = ?', (uri,))
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def __index(cursor, uri, resource, fields):
+        cursor.executemany('INSERT INTO fields (uri, field, value) VALUES (?, ?, ?)',
+                           [(uri, field, str(value)) for field in fields for value in get_field_values(resource, field)])
+
+    def __update_indexed_fields(self, cursor):
+        # Indexes the resources already stored when the store is opened with other fields
+        stored = set(field for field, in cursor.execute('SELECT field FROM indexed_fields').fetchall())
+        removed = stored - set(self._indexed_fields)
+        added = [field for field in self._indexed_fields if field not in stored]
+
+        for field in removed:
+            cursor.execute('DELETE FROM fields WHERE field = ?', (field,))
+            cursor.execute('DELETE FROM indexed_fields WHERE field = ?', (field,))
+
+        if added:
+            for uri, body in cursor.execute('SELECT uri, body FROM resources').fetchall():
+                self.__index(cursor, uri, self.__load(body), added)
+            cursor.executemany('INSERT INTO indexed_fields (field) VALUES (?)', [(field,) for field in added])
+
+
+def get_field_values(resource, field):
+    """
+    Gets the values of a field of a resource.
+
+    Args:
+        resource (dict): Resource.
+        field: Field name, with dots for nested fields.
+
+    Returns:
+        list: The values of the field; each item when it is a list, and none when it is missing or null.
+    """
+    value = resource
+    for key in field.split('.'):
+        if not isinstance(value, dict):
+            return []
+        value = value.get(key)
+
+    values = value if isinstance(value, list) else [value]
+    return [item for item in values if item is not None and not isinstance(item, (dict, list))]
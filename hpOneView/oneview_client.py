@@ -35,80 +35,13 @@ standard_library.install_aliases()
 import json
 import os
 
-from hpOneView.connection import connection
-from hpOneView.image_streamer.image_streamer_client import ImageStreamerClient
-from hpOneView.resources.security.certificate_authority import CertificateAuthority
-from hpOneView.resources.servers.connections import Connections
-from hpOneView.resources.networking.fc_networks import FcNetworks
-from hpOneView.resources.networking.fcoe_networks import FcoeNetworks
-from hpOneView.resources.networking.ethernet_networks import EthernetNetworks
-from hpOneView.resources.networking.connection_templates import ConnectionTemplates
-from hpOneView.resources.networking.fabrics import Fabrics
-from hpOneView.resources.networking.network_sets import NetworkSets
-from hpOneView.resources.data_services.metric_streaming import MetricStreaming
-from hpOneView.resources.networking.switches import Switches
-from hpOneView.resources.networking.switch_types import SwitchTypes
-from hpOneView.resources.activity.tasks import Tasks
-from hpOneView.resources.settings.restores import Restores
-from hpOneView.resources.settings.scopes import Scopes
-from hpOneView.resources.settings.licenses import Licenses
-from hpOneView.resources.servers.enclosures import Enclosures
-from hpOneView.resources.servers.logical_enclosures import LogicalEnclosures
-from hpOneView.resources.servers.enclosure_groups import EnclosureGroups
-from hpOneView.resources.servers.server_hardware import ServerHardware
-from hpOneView.resources.servers.server_hardware_types import ServerHardwareTypes
-from hpOneView.resources.servers.id_pools_ranges import IdPoolsRanges
-from hpOneView.resources.servers.id_pools_ipv4_ranges import IdPoolsIpv4Ranges
-from hpOneView.resources.servers.id_pools_ipv4_subnets import IdPoolsIpv4Subnets
-from hpOneView.resources.servers.id_pools import IdPools
-from hpOneView.resources.networking.interconnects import Interconnects
-from hpOneView.resources.networking.interconnect_types import InterconnectTypes
-from hpOneView.resources.networking.interconnect_link_topologies import InterconnectLinkTopologies
-from hpOneView.resources.networking.sas_interconnect_types import SasInterconnectTypes
-from hpOneView.resources.networking.internal_link_sets import InternalLinkSets
-from hpOneView.resources.uncategorized.unmanaged_devices import UnmanagedDevices
-from hpOneView.resources.networking.logical_downlinks import LogicalDownlinks
-from hpOneView.resources.facilities.power_devices import PowerDevices
-from hpOneView.resources.facilities.racks import Racks
-from hpOneView.resources.facilities.datacenters import Datacenters
-from hpOneView.resources.fc_sans.managed_sans import ManagedSANs
-from hpOneView.resources.fc_sans.san_managers import SanManagers
-from hpOneView.resources.fc_sans.endpoints import Endpoints
-from hpOneView.resources.networking.logical_interconnects import LogicalInterconnects
-from hpOneView.resources.networking.logical_interconnect_groups import LogicalInterconnectGroups
-from hpOneView.resources.networking.sas_logical_interconnects import SasLogicalInterconnects
-from hpOneView.resources.networking.logical_switch_groups import LogicalSwitchGroups
-from hpOneView.resources.networking.logical_switches import LogicalSwitches
-from hpOneView.resources.networking.sas_interconnects import SasInterconnects
-from hpOneView.resources.servers.server_profiles import ServerProfiles
-from hpOneView.resources.servers.server_profile_templates import ServerProfileTemplate
-from hpOneView.resources.storage.sas_logical_jbods import SasLogicalJbods
-from hpOneView.resources.storage.storage_systems import StorageSystems
-from hpOneView.resources.storage.storage_pools import StoragePools
-from hpOneView.resources.storage.storage_volume_templates import StorageVolumeTemplates
-from hpOneView.resources.storage.storage_volume_attachments import StorageVolumeAttachments
-from hpOneView.resources.storage.drive_enclosures import DriveEnclosures
-from hpOneView.resources.settings.firmware_drivers import FirmwareDrivers
-from hpOneView.resources.settings.firmware_bundles import FirmwareBundles
-from hpOneView.resources.settings.backups import Backups
-from hpOneView.resources.storage.volumes import Volumes
-from hpOneView.resources.storage.sas_logical_jbod_attachments import SasLogicalJbodAttachments
-from hpOneView.resources.networking.uplink_sets import UplinkSets
-from hpOneView.resources.servers.migratable_vc_domains import MigratableVcDomains
-from hpOneView.resources.networking.sas_logical_interconnect_groups import SasLogicalInterconnectGroups
-from hpOneView.resources.search.index_resources import IndexResources
-from hpOneView.resources.search.labels import Labels
-from hpOneView.resources.activity.alerts import Alerts
-from hpOneView.resources.activity.events import Events
-from hpOneView.resources.uncategorized.os_deployment_plans import OsDeploymentPlans
-from hpOneView.resources.uncategorized.os_deployment_servers import OsDeploymentServers
-from hpOneView.resources.security.certificate_rabbitmq import CertificateRabbitMQ
-from hpOneView.resources.security.login_details import LoginDetails
-from hpOneView.resources.security.roles import Roles
-from hpOneView.resources.security.users import Users
-from hpOneView.resources.settings.appliance_node_information import ApplianceNodeInformation
-from hpOneView.resources.settings.appliance_time_and_locale_configuration import ApplianceTimeAndLocaleConfiguration
-from hpOneView.resources.settings.versions import Versions
+from hpOneView.connection import connection, DEFAULT_DOWNLOAD_BUFFER_SIZE
+from hpOneView.connection_pool import ConnectionPool
+from hpOneView.instrumentation import DEFAULT_BUCKETS
+from hpOneView.response_cache import ResponseCache
+from hpOneView.retry_policy import RetryPolicy
+from hpOneView.serializer import get_serializer
+from hpOneView.resources.registry import get_resource_class
 
 ONEVIEW_CLIENT_INVALID_PROXY = 'Invalid Proxy format'
 
@@ -118,84 +51,20 @@ class OneViewClient(object):
 
     def __init__(self, config):
         self.__connection = connection(config["ip"], config.get('api_version', self.DEFAULT_API_VERSION), config.get('ssl_certificate', False),
-                                       config.get('timeout'))
+                                       config.get('timeout'), self.__create_connection_pool(config))
         self.__image_streamer_ip = config.get("image_streamer_ip")
         self.__set_proxy(config)
+        self.__connection.set_page_workers(config.get('page_workers', 1))
+        self.__connection.set_download_buffer_size(config.get('download_buffer_size', DEFAULT_DOWNLOAD_BUFFER_SIZE))
+        self.__connection.set_download_workers(config.get('download_workers', 1))
+        self.__connection.set_retry_policy(self.__create_retry_policy(config))
+        self.__connection.set_serializer(get_serializer(config.get('json_backend')))
+        if config.get('compression'):
+            self.__connection.enable_compression()
+        self.__enable_metrics(config)
+        self.__connection.set_response_cache(self.__create_response_cache(config))
+        self.__resources = {}
         self.__connection.login(config["credentials"])
-        self.__certificate_authority = None
-        self.__connections = None
-        self.__connection_templates = None
-        self.__fc_networks = None
-        self.__fcoe_networks = None
-        self.__ethernet_networks = None
-        self.__fabrics = None
-        self.__network_sets = None
-        self.__switches = None
-        self.__switch_types = None
-        self.__tasks = None
-        self.__scopes = None
-        self.__enclosures = None
-        self.__logical_enclosures = None
-        self.__enclosure_groups = None
-        self.__metric_streaming = None
-        self.__server_hardware = None
-        self.__server_hardware_types = None
-        self.__id_pools_vsn_ranges = None
-        self.__id_pools_vmac_ranges = None
-        self.__id_pools_vwwn_ranges = None
-        self.__id_pools_ipv4_ranges = None
-        self.__id_pools_ipv4_subnets = None
-        self.__id_pools = None
-        self.__interconnects = None
-        self.__interconnect_types = None
-        self.__interconnect_link_topologies = None
-        self.__sas_interconnect_types = None
-        self.__internal_link_sets = None
-        self.__power_devices = None
-        self.__unmanaged_devices = None
-        self.__racks = None
-        self.__roles = None
-        self.__datacenters = None
-        self.__san_managers = None
-        self.__endpoints = None
-        self.__logical_interconnects = None
-        self.__sas_logical_interconnects = None
-        self.__logical_interconnect_groups = None
-        self.__logical_switch_groups = None
-        self.__logical_switches = None
-        self.__logical_downlinks = None
-        self.__restores = None
-        self.__server_profiles = None
-        self.__server_profile_templates = None
-        self.__sas_logical_jbods = None
-        self.__storage_systems = None
-        self.__storage_pools = None
-        self.__storage_volume_templates = None
-        self.__storage_volume_attachments = None
-        self.__firmware_drivers = None
-        self.__firmware_bundles = None
-        self.__uplink_sets = None
-        self.__volumes = None
-        self.__sas_logical_jbod_attachments = None
-        self.__managed_sans = None
-        self.__migratable_vc_domains = None
-        self.__sas_interconnects = None
-        self.__index_resources = None
-        self.__labels = None
-        self.__sas_logical_interconnect_groups = None
-        self.__alerts = None
-        self.__events = None
-        self.__drive_enclures = None
-        self.__os_deployment_plans = None
-        self.__os_deployment_servers = None
-        self.__certificate_rabbitmq = None
-        self.__users = None
-        self.__appliance_time_and_locale_configuration = None
-        self.__appliance_node_information = None
-        self.__versions = None
-        self.__backups = None
-        self.__login_details = None
-        self.__licenses = None
 
     @classmethod
     def from_json_file(cls, file_name):
@@ -245,6 +114,58 @@ class OneViewClient(object):
 
         return cls(config)
 
+    def __create_connection_pool(self, config):
+        """
+        Create the pool of keep-alive connections
+        Args:
+            config: Config dict
+        """
+        pool_config = config.get("connection_pool") or {}
+        return ConnectionPool(max_size=pool_config.get("max_size", ConnectionPool.DEFAULT_MAX_SIZE),
+                              idle_timeout=pool_config.get("idle_timeout", ConnectionPool.DEFAULT_IDLE_TIMEOUT))
+
+    def __create_response_cache(self, config):
+        """
+        Create the cache of resources, which is only enabled when configured
+        Args:
+            config: Config dict
+        """
+        cache_config = config.get("response_cache")
+        if not cache_config:
+            return None
+        if not isinstance(cache_config, dict):
+            cache_config = {}
+        return ResponseCache(max_size=cache_config.get("max_size", ResponseCache.DEFAULT_MAX_SIZE),
+                             ttl=cache_config.get("ttl", ResponseCache.DEFAULT_TTL))
+
+    def __create_retry_policy(self, config):
+        """
+        Create the policy that decides which failed requests are sent again
+        Args:
+            config: Config dict
+        """
+        retry_config = config.get("retry_policy")
+        if retry_config is None:
+            return RetryPolicy()
+        if not retry_config:
+            return None
+        if not isinstance(retry_config, dict):
+            retry_config = {}
+        return RetryPolicy(**retry_config)
+
+    def __enable_metrics(self, config):
+        """
+        Enable the metrics of the requests, which are disabled by default
+        Args:
+            config: Config dict
+        """
+        metrics_config = config.get("metrics")
+        if not metrics_config:
+            return
+        if not isinstance(metrics_config, dict):
+            metrics_config = {}
+        self.__connection.enable_metrics(metrics_config.get("buckets", DEFAULT_BUCKETS))
+
     def __set_proxy(self, config):
         """
         Set proxy if needed
@@ -261,6 +182,19 @@ class OneViewClient(object):
             proxy_port = int(splitted[1])
             self.__connection.set_proxy(proxy_host, proxy_port)
 
+    def __get_resource(self, name, *args):
+        """
+        Get the API client of a resource, which is created and has its module imported on first use
+        Args:
+            name: Resource attribute name
+            args: Arguments passed to the resource class before the connection
+        """
+        resource = self.__resources.get(name)
+        if resource is None:
+            resource_class = get_resource_class(name)
+            resource = self.__resources[name] = resource_class(*(args + (self.__connection,)))
+        return resource
+
     @property
     def api_version(self):
         """
@@ -288,10 +222,13 @@ class OneViewClient(object):
         Returns:
             ImageStreamerClient:
         """
+        from hpOneView.image_streamer.image_streamer_client import ImageStreamerClient
+
         image_streamer = ImageStreamerClient(self.__image_streamer_ip,
                                              self.__connection.get_session_id(),
                                              self.__connection._apiVersion,
-                                             self.__connection._sslBundle)
+                                             self.__connection._sslBundle,
+                                             self.__connection._connection_pool)
 
         return image_streamer
 
@@ -303,9 +240,7 @@ class OneViewClient(object):
         Returns:
             CertificateAuthority:
         """
-        if not self.__certificate_authority:
-            self.__certificate_authority = CertificateAuthority(self.__connection)
-        return self.__certificate_authority
+        return self.__get_resource('certificate_authority')
 
     @property
     def connections(self):
@@ -315,10 +250,7 @@ class OneViewClient(object):
         Returns:
             Connections:
         """
-        if not self.__connections:
-            self.__connections = Connections(
-                self.__connection)
-        return self.__connections
+        return self.__get_resource('connections')
 
     @property
     def connection_templates(self):
@@ -328,10 +260,7 @@ class OneViewClient(object):
         Returns:
             ConnectionTemplates:
         """
-        if not self.__connection_templates:
-            self.__connection_templates = ConnectionTemplates(
-                self.__connection)
-        return self.__connection_templates
+        return self.__get_resource('connection_templates')
 
     @property
     def fc_networks(self):
@@ -341,9 +270,7 @@ class OneViewClient(object):
         Returns:
             FcNetworks:
         """
-        if not self.__fc_networks:
-            self.__fc_networks = FcNetworks(self.__connection)
-        return self.__fc_networks
+        return self.__get_resource('fc_networks')
 
     @property
     def fcoe_networks(self):
@@ -353,9 +280,7 @@ class OneViewClient(object):
         Returns:
             FcoeNetworks:
         """
-        if not self.__fcoe_networks:
-            self.__fcoe_networks = FcoeNetworks(self.__connection)
-        return self.__fcoe_networks
+        return self.__get_resource('fcoe_networks')
 
     @property
     def ethernet_networks(self):
@@ -365,9 +290,7 @@ class OneViewClient(object):
         Returns:
             EthernetNetworks:
         """
-        if not self.__ethernet_networks:
-            self.__ethernet_networks = EthernetNetworks(self.__connection)
-        return self.__ethernet_networks
+        return self.__get_resource('ethernet_networks')
 
     @property
     def fabrics(self):
@@ -377,9 +300,7 @@ class OneViewClient(object):
         Returns:
             Fabrics:
         """
-        if not self.__fabrics:
-            self.__fabrics = Fabrics(self.__connection)
-        return self.__fabrics
+        return self.__get_resource('fabrics')
 
     @property
     def restores(self):
@@ -389,9 +310,7 @@ class OneViewClient(object):
         Returns:
             Restores:
         """
-        if not self.__restores:
-            self.__restores = Restores(self.__connection)
-        return self.__restores
+        return self.__get_resource('restores')
 
     @property
     def scopes(self):
@@ -401,9 +320,7 @@ class OneViewClient(object):
         Returns:
             Scopes:
         """
-        if not self.__scopes:
-            self.__scopes = Scopes(self.__connection)
-        return self.__scopes
+        return self.__get_resource('scopes')
 
     @property
     def datacenters(self):
@@ -413,9 +330,7 @@ class OneViewClient(object):
         Returns:
             Datacenters:
         """
-        if not self.__datacenters:
-            self.__datacenters = Datacenters(self.__connection)
-        return self.__datacenters
+        return self.__get_resource('datacenters')
 
     @property
     def network_sets(self):
@@ -425,9 +340,7 @@ class OneViewClient(object):
         Returns:
             NetworkSets:
         """
-        if not self.__network_sets:
-            self.__network_sets = NetworkSets(self.__connection)
-        return self.__network_sets
+        return self.__get_resource('network_sets')
 
     @property
     def server_hardware(self):
@@ -437,9 +350,7 @@ class OneViewClient(object):
         Returns:
             ServerHardware:
         """
-        if not self.__server_hardware:
-            self.__server_hardware = ServerHardware(self.__connection)
-        return self.__server_hardware
+        return self.__get_resource('server_hardware')
 
     @property
     def server_hardware_types(self):
@@ -449,10 +360,7 @@ class OneViewClient(object):
         Returns:
             ServerHardwareTypes:
         """
-        if not self.__server_hardware_types:
-            self.__server_hardware_types = ServerHardwareTypes(
-                self.__connection)
-        return self.__server_hardware_types
+        return self.__get_resource('server_hardware_types')
 
     @property
     def id_pools_vsn_ranges(self):
@@ -462,9 +370,7 @@ class OneViewClient(object):
         Returns:
             IdPoolsRanges:
         """
-        if not self.__id_pools_vsn_ranges:
-            self.__id_pools_vsn_ranges = IdPoolsRanges('vsn', self.__connection)
-        return self.__id_pools_vsn_ranges
+        return self.__get_resource('id_pools_vsn_ranges', 'vsn')
 
     @property
     def id_pools_vmac_ranges(self):
@@ -474,9 +380,7 @@ class OneViewClient(object):
         Returns:
             IdPoolsRanges:
         """
-        if not self.__id_pools_vmac_ranges:
-            self.__id_pools_vmac_ranges = IdPoolsRanges('vmac', self.__connection)
-        return self.__id_pools_vmac_ranges
+        return self.__get_resource('id_pools_vmac_ranges', 'vmac')
 
     @property
     def id_pools_vwwn_ranges(self):
@@ -486,9 +390,7 @@ class OneViewClient(object):
         Returns:
             IdPoolsRanges:
         """
-        if not self.__id_pools_vwwn_ranges:
-            self.__id_pools_vwwn_ranges = IdPoolsRanges('vwwn', self.__connection)
-        return self.__id_pools_vwwn_ranges
+        return self.__get_resource('id_pools_vwwn_ranges', 'vwwn')
 
     @property
     def id_pools_ipv4_ranges(self):
@@ -498,9 +400,7 @@ class OneViewClient(object):
         Returns:
             IdPoolsIpv4Ranges:
         """
-        if not self.__id_pools_ipv4_ranges:
-            self.__id_pools_ipv4_ranges = IdPoolsIpv4Ranges(self.__connection)
-        return self.__id_pools_ipv4_ranges
+        return self.__get_resource('id_pools_ipv4_ranges')
 
     @property
     def id_pools_ipv4_subnets(self):
@@ -510,9 +410,7 @@ class OneViewClient(object):
         Returns:
             IdPoolsIpv4Subnets:
         """
-        if not self.__id_pools_ipv4_subnets:
-            self.__id_pools_ipv4_subnets = IdPoolsIpv4Subnets(self.__connection)
-        return self.__id_pools_ipv4_subnets
+        return self.__get_resource('id_pools_ipv4_subnets')
 
     @property
     def id_pools(self):
@@ -522,9 +420,7 @@ class OneViewClient(object):
         Returns:
             IdPools:
         """
-        if not self.__id_pools:
-            self.__id_pools = IdPools(self.__connection)
-        return self.__id_pools
+        return self.__get_resource('id_pools')
 
     @property
     def switches(self):
@@ -534,9 +430,7 @@ class OneViewClient(object):
         Returns:
             Switches:
         """
-        if not self.__switches:
-            self.__switches = Switches(self.__connection)
-        return self.__switches
+        return self.__get_resource('switches')
 
     @property
     def roles(self):
@@ -546,9 +440,7 @@ class OneViewClient(object):
         Returns:
             Roles:
         """
-        if not self.__roles:
-            self.__roles = Roles(self.__connection)
-        return self.__roles
+        return self.__get_resource('roles')
 
     @property
     def switch_types(self):
@@ -558,9 +450,7 @@ class OneViewClient(object):
         Returns:
             SwitchTypes:
         """
-        if not self.__switch_types:
-            self.__switch_types = SwitchTypes(self.__connection)
-        return self.__switch_types
+        return self.__get_resource('switch_types')
 
     @property
     def logical_switch_groups(self):
@@ -570,9 +460,7 @@ class OneViewClient(object):
         Returns:
             LogicalSwitchGroups:
         """
-        if not self.__logical_switch_groups:
-            self.__logical_switch_groups = LogicalSwitchGroups(self.__connection)
-        return self.__logical_switch_groups
+        return self.__get_resource('logical_switch_groups')
 
     @property
     def logical_switches(self):
@@ -582,9 +470,7 @@ class OneViewClient(object):
         Returns:
             LogicalSwitches:
         """
-        if not self.__logical_switches:
-            self.__logical_switches = LogicalSwitches(self.__connection)
-        return self.__logical_switches
+        return self.__get_resource('logical_switches')
 
     @property
     def tasks(self):
@@ -594,9 +480,7 @@ class OneViewClient(object):
         Returns:
             Tasks:
         """
-        if not self.__tasks:
-            self.__tasks = Tasks(self.__connection)
-        return self.__tasks
+        return self.__get_resource('tasks')
 
     @property
     def enclosure_groups(self):
@@ -606,9 +490,7 @@ class OneViewClient(object):
         Returns:
             EnclosureGroups:
         """
-        if not self.__enclosure_groups:
-            self.__enclosure_groups = EnclosureGroups(self.__connection)
-        return self.__enclosure_groups
+        return self.__get_resource('enclosure_groups')
 
     @property
     def enclosures(self):
@@ -618,9 +500,7 @@ class OneViewClient(object):
         Returns:
             Enclosures:
         """
-        if not self.__enclosures:
-            self.__enclosures = Enclosures(self.__connection)
-        return self.__enclosures
+        return self.__get_resource('enclosures')
 
     @property
     def logical_enclosures(self):
@@ -630,9 +510,7 @@ class OneViewClient(object):
         Returns:
             LogicalEnclosures:
         """
-        if not self.__logical_enclosures:
-            self.__logical_enclosures = LogicalEnclosures(self.__connection)
-        return self.__logical_enclosures
+        return self.__get_resource('logical_enclosures')
 
     @property
     def metric_streaming(self):
@@ -642,9 +520,7 @@ class OneViewClient(object):
         Returns:
             MetricStreaming:
         """
-        if not self.__metric_streaming:
-            self.__metric_streaming = MetricStreaming(self.__connection)
-        return self.__metric_streaming
+        return self.__get_resource('metric_streaming')
 
     @property
     def interconnects(self):
@@ -654,9 +530,7 @@ class OneViewClient(object):
         Returns:
             Interconnects:
         """
-        if not self.__interconnects:
-            self.__interconnects = Interconnects(self.__connection)
-        return self.__interconnects
+        return self.__get_resource('interconnects')
 
     @property
     def interconnect_types(self):
@@ -666,9 +540,7 @@ class OneViewClient(object):
         Returns:
             InterconnectTypes:
         """
-        if not self.__interconnect_types:
-            self.__interconnect_types = InterconnectTypes(self.__connection)
-        return self.__interconnect_types
+        return self.__get_resource('interconnect_types')
 
     @property
     def interconnect_link_topologies(self):
@@ -678,9 +550,7 @@ class OneViewClient(object):
         Returns:
             InterconnectLinkTopologies:
         """
-        if not self.__interconnect_link_topologies:
-            self.__interconnect_link_topologies = InterconnectLinkTopologies(self.__connection)
-        return self.__interconnect_link_topologies
+        return self.__get_resource('interconnect_link_topologies')
 
     @property
     def sas_interconnect_types(self):
@@ -690,9 +560,7 @@ class OneViewClient(object):
         Returns:
             SasInterconnectTypes:
         """
-        if not self.__sas_interconnect_types:
-            self.__sas_interconnect_types = SasInterconnectTypes(self.__connection)
-        return self.__sas_interconnect_types
+        return self.__get_resource('sas_interconnect_types')
 
     @property
     def internal_link_sets(self):
@@ -702,9 +570,7 @@ class OneViewClient(object):
         Returns:
             InternalLinkSets:
         """
-        if not self.__internal_link_sets:
-            self.__internal_link_sets = InternalLinkSets(self.__connection)
-        return self.__internal_link_sets
+        return self.__get_resource('internal_link_sets')
 
     @property
     def logical_interconnect_groups(self):
@@ -714,10 +580,7 @@ class OneViewClient(object):
         Returns:
             LogicalInterconnectGroups:
         """
-        if not self.__logical_interconnect_groups:
-            self.__logical_interconnect_groups = LogicalInterconnectGroups(
-                self.__connection)
-        return self.__logical_interconnect_groups
+        return self.__get_resource('logical_interconnect_groups')
 
     @property
     def logical_interconnects(self):
@@ -727,10 +590,7 @@ class OneViewClient(object):
         Returns:
             LogicalInterconnects:
         """
-        if not self.__logical_interconnects:
-            self.__logical_interconnects = LogicalInterconnects(
-                self.__connection)
-        return self.__logical_interconnects
+        return self.__get_resource('logical_interconnects')
 
     @property
     def sas_logical_interconnects(self):
@@ -740,9 +600,7 @@ class OneViewClient(object):
         Returns:
             SasLogicalInterconnects:
         """
-        if not self.__sas_logical_interconnects:
-            self.__sas_logical_interconnects = SasLogicalInterconnects(self.__connection)
-        return self.__sas_logical_interconnects
+        return self.__get_resource('sas_logical_interconnects')
 
     @property
     def logical_downlinks(self):
@@ -752,10 +610,7 @@ class OneViewClient(object):
         Returns:
             LogicalDownlinks:
         """
-        if not self.__logical_downlinks:
-            self.__logical_downlinks = LogicalDownlinks(
-                self.__connection)
-        return self.__logical_downlinks
+        return self.__get_resource('logical_downlinks')
 
     @property
     def power_devices(self):
@@ -765,9 +620,7 @@ class OneViewClient(object):
         Returns:
             PowerDevices:
         """
-        if not self.__power_devices:
-            self.__power_devices = PowerDevices(self.__connection)
-        return self.__power_devices
+        return self.__get_resource('power_devices')
 
     @property
     def unmanaged_devices(self):
@@ -777,9 +630,7 @@ class OneViewClient(object):
         Returns:
             UnmanagedDevices:
         """
-        if not self.__unmanaged_devices:
-            self.__unmanaged_devices = UnmanagedDevices(self.__connection)
-        return self.__unmanaged_devices
+        return self.__get_resource('unmanaged_devices')
 
     @property
     def racks(self):
@@ -789,9 +640,7 @@ class OneViewClient(object):
         Returns:
             Racks:
         """
-        if not self.__racks:
-            self.__racks = Racks(self.__connection)
-        return self.__racks
+        return self.__get_resource('racks')
 
     @property
     def san_managers(self):
@@ -801,9 +650,7 @@ class OneViewClient(object):
         Returns:
             SanManagers:
         """
-        if not self.__san_managers:
-            self.__san_managers = SanManagers(self.__connection)
-        return self.__san_managers
+        return self.__get_resource('san_managers')
 
     @property
     def endpoints(self):
@@ -813,9 +660,7 @@ class OneViewClient(object):
         Returns:
             Endpoints:
         """
-        if not self.__endpoints:
-            self.__endpoints = Endpoints(self.__connection)
-        return self.__endpoints
+        return self.__get_resource('endpoints')
 
     @property
     def server_profiles(self):
@@ -825,9 +670,7 @@ class OneViewClient(object):
         Returns:
             ServerProfiles:
         """
-        if not self.__server_profiles:
-            self.__server_profiles = ServerProfiles(self.__connection)
-        return self.__server_profiles
+        return self.__get_resource('server_profiles')
 
     @property
     def server_profile_templates(self):
@@ -837,9 +680,7 @@ class OneViewClient(object):
         Returns:
             ServerProfileTemplate:
         """
-        if not self.__server_profile_templates:
-            self.__server_profile_templates = ServerProfileTemplate(self.__connection)
-        return self.__server_profile_templates
+        return self.__get_resource('server_profile_templates')
 
     @property
     def storage_systems(self):
@@ -849,9 +690,7 @@ class OneViewClient(object):
         Returns:
             StorageSystems:
         """
-        if not self.__storage_systems:
-            self.__storage_systems = StorageSystems(self.__connection)
-        return self.__storage_systems
+        return self.__get_resource('storage_systems')
 
     @property
     def storage_pools(self):
@@ -861,9 +700,7 @@ class OneViewClient(object):
         Returns:
             StoragePools:
         """
-        if not self.__storage_pools:
-            self.__storage_pools = StoragePools(self.__connection)
-        return self.__storage_pools
+        return self.__get_resource('storage_pools')
 
     @property
     def storage_volume_templates(self):
@@ -873,9 +710,7 @@ class OneViewClient(object):
         Returns:
             StorageVolumeTemplates:
         """
-        if not self.__storage_volume_templates:
-            self.__storage_volume_templates = StorageVolumeTemplates(self.__connection)
-        return self.__storage_volume_templates
+        return self.__get_resource('storage_volume_templates')
 
     @property
     def storage_volume_attachments(self):
@@ -885,9 +720,7 @@ class OneViewClient(object):
         Returns:
             StorageVolumeAttachments:
         """
-        if not self.__storage_volume_attachments:
-            self.__storage_volume_attachments = StorageVolumeAttachments(self.__connection)
-        return self.__storage_volume_attachments
+        return self.__get_resource('storage_volume_attachments')
 
     @property
     def firmware_drivers(self):
@@ -897,9 +730,7 @@ class OneViewClient(object):
         Returns:
             FirmwareDrivers:
         """
-        if not self.__firmware_drivers:
-            self.__firmware_drivers = FirmwareDrivers(self.__connection)
-        return self.__firmware_drivers
+        return self.__get_resource('firmware_drivers')
 
     @property
     def firmware_bundles(self):
@@ -909,9 +740,7 @@ class OneViewClient(object):
         Returns:
             FirmwareBundles:
         """
-        if not self.__firmware_bundles:
-            self.__firmware_bundles = FirmwareBundles(self.__connection)
-        return self.__firmware_bundles
+        return self.__get_resource('firmware_bundles')
 
     @property
     def uplink_sets(self):
@@ -921,9 +750,7 @@ class OneViewClient(object):
         Returns:
             UplinkSets:
         """
-        if not self.__uplink_sets:
-            self.__uplink_sets = UplinkSets(self.__connection)
-        return self.__uplink_sets
+        return self.__get_resource('uplink_sets')
 
     @property
     def volumes(self):
@@ -933,9 +760,7 @@ class OneViewClient(object):
         Returns:
             Volumes:
         """
-        if not self.__volumes:
-            self.__volumes = Volumes(self.__connection)
-        return self.__volumes
+        return self.__get_resource('volumes')
 
     @property
     def sas_logical_jbod_attachments(self):
@@ -945,9 +770,7 @@ class OneViewClient(object):
         Returns:
             SasLogicalJbodAttachments:
         """
-        if not self.__sas_logical_jbod_attachments:
-            self.__sas_logical_jbod_attachments = SasLogicalJbodAttachments(self.__connection)
-        return self.__sas_logical_jbod_attachments
+        return self.__get_resource('sas_logical_jbod_attachments')
 
     @property
     def managed_sans(self):
@@ -957,9 +780,7 @@ class OneViewClient(object):
         Returns:
             ManagedSANs:
         """
-        if not self.__managed_sans:
-            self.__managed_sans = ManagedSANs(self.__connection)
-        return self.__managed_sans
+        return self.__get_resource('managed_sans')
 
     @property
     def migratable_vc_domains(self):
@@ -969,9 +790,7 @@ class OneViewClient(object):
         Returns:
             MigratableVcDomains:
         """
-        if not self.__migratable_vc_domains:
-            self.__migratable_vc_domains = MigratableVcDomains(self.__connection)
-        return self.__migratable_vc_domains
+        return self.__get_resource('migratable_vc_domains')
 
     @property
     def sas_interconnects(self):
@@ -981,9 +800,7 @@ class OneViewClient(object):
         Returns:
             SasInterconnects:
         """
-        if not self.__sas_interconnects:
-            self.__sas_interconnects = SasInterconnects(self.__connection)
-        return self.__sas_interconnects
+        return self.__get_resource('sas_interconnects')
 
     @property
     def sas_logical_interconnect_groups(self):
@@ -993,9 +810,7 @@ class OneViewClient(object):
         Returns:
             SasLogicalInterconnectGroups:
         """
-        if not self.__sas_logical_interconnect_groups:
-            self.__sas_logical_interconnect_groups = SasLogicalInterconnectGroups(self.__connection)
-        return self.__sas_logical_interconnect_groups
+        return self.__get_resource('sas_logical_interconnect_groups')
 
     @property
     def drive_enclosures(self):
@@ -1005,9 +820,7 @@ class OneViewClient(object):
         Returns:
             DriveEnclosures:
         """
-        if not self.__drive_enclures:
-            self.__drive_enclures = DriveEnclosures(self.__connection)
-        return self.__drive_enclures
+        return self.__get_resource('drive_enclosures')
 
     @property
     def sas_logical_jbods(self):
@@ -1017,9 +830,7 @@ class OneViewClient(object):
         Returns:
             SasLogicalJbod:
         """
-        if not self.__sas_logical_jbods:
-            self.__sas_logical_jbods = SasLogicalJbods(self.__connection)
-        return self.__sas_logical_jbods
+        return self.__get_resource('sas_logical_jbods')
 
     @property
     def labels(self):
@@ -1029,9 +840,7 @@ class OneViewClient(object):
         Returns:
             Labels:
         """
-        if not self.__labels:
-            self.__labels = Labels(self.__connection)
-        return self.__labels
+        return self.__get_resource('labels')
 
     @property
     def index_resources(self):
@@ -1041,9 +850,7 @@ class OneViewClient(object):
         Returns:
             IndexResources:
         """
-        if not self.__index_resources:
-            self.__index_resources = IndexResources(self.__connection)
-        return self.__index_resources
+        return self.__get_resource('index_resources')
 
     @property
     def alerts(self):
@@ -1053,9 +860,7 @@ class OneViewClient(object):
         Returns:
             Alerts:
         """
-        if not self.__alerts:
-            self.__alerts = Alerts(self.__connection)
-        return self.__alerts
+        return self.__get_resource('alerts')
 
     @property
     def events(self):
@@ -1065,9 +870,7 @@ class OneViewClient(object):
         Returns:
             Events:
         """
-        if not self.__events:
-            self.__events = Events(self.__connection)
-        return self.__events
+        return self.__get_resource('events')
 
     @property
     def os_deployment_plans(self):
@@ -1077,9 +880,7 @@ class OneViewClient(object):
         Returns:
             OsDeploymentPlans:
         """
-        if not self.__os_deployment_plans:
-            self.__os_deployment_plans = OsDeploymentPlans(self.__connection)
-        return self.__os_deployment_plans
+        return self.__get_resource('os_deployment_plans')
 
     @property
     def os_deployment_servers(self):
@@ -1089,9 +890,7 @@ class OneViewClient(object):
         Returns:
             OsDeploymentServers:
         """
-        if not self.__os_deployment_servers:
-            self.__os_deployment_servers = OsDeploymentServers(self.__connection)
-        return self.__os_deployment_servers
+        return self.__get_resource('os_deployment_servers')
 
     @property
     def certificate_rabbitmq(self):
@@ -1101,9 +900,7 @@ class OneViewClient(object):
         Returns:
             CertificateRabbitMQ:
         """
-        if not self.__certificate_rabbitmq:
-            self.__certificate_rabbitmq = CertificateRabbitMQ(self.__connection)
-        return self.__certificate_rabbitmq
+        return self.__get_resource('certificate_rabbitmq')
 
     @property
     def users(self):
@@ -1113,9 +910,7 @@ class OneViewClient(object):
         Returns:
             Users:
         """
-        if not self.__users:
-            self.__users = Users(self.__connection)
-        return self.__users
+        return self.__get_resource('users')
 
     @property
     def appliance_node_information(self):
@@ -1125,9 +920,7 @@ class OneViewClient(object):
         Returns:
             ApplianceNodeInformation:
         """
-        if not self.__appliance_node_information:
-            self.__appliance_node_information = ApplianceNodeInformation(self.__connection)
-        return self.__appliance_node_information
+        return self.__get_resource('appliance_node_information')
 
     @property
     def appliance_time_and_locale_configuration(self):
@@ -1137,9 +930,7 @@ class OneViewClient(object):
         Returns:
             ApplianceTimeAndLocaleConfiguration:
         """
-        if not self.__appliance_time_and_locale_configuration:
-            self.__appliance_time_and_locale_configuration = ApplianceTimeAndLocaleConfiguration(self.__connection)
-        return self.__appliance_time_and_locale_configuration
+        return self.__get_resource('appliance_time_and_locale_configuration')
 
     @property
     def versions(self):
@@ -1149,9 +940,7 @@ class OneViewClient(object):
         Returns:
             Version:
         """
-        if not self.__versions:
-            self.__versions = Versions(self.__connection)
-        return self.__versions
+        return self.__get_resource('versions')
 
     @property
     def backups(self):
@@ -1161,9 +950,7 @@ class OneViewClient(object):
         Returns:
             Backups:
         """
-        if not self.__backups:
-            self.__backups = Backups(self.__connection)
-        return self.__backups
+        return self.__get_resource('backups')
 
     @property
     def login_details(self):
@@ -1173,9 +960,7 @@ class OneViewClient(object):
         Returns:
         List of login details
         """
-        if not self.__login_details:
-            self.__login_details = LoginDetails(self.__connection)
-        return self.__login_details
+        return self.__get_resource('login_details')
 
     @property
     def licenses(self):
@@ -1184,6 +969,4 @@ class OneViewClient(object):
         Returns:
         List of licenses
         """
-        if not self.__licenses:
-            self.__licenses = Licenses(self.__connection)
-        return self.__licenses
+        return self.__get_resource('licenses')
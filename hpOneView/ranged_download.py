@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+"""
+ranged_download.py
+~~~~~~~~~~~~~~~~~~
+
+This module downloads files from the appliance with HTTP Range requests, so a download can be split across concurrent
+connections and resumed after a failure.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import http.client
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+
+from hpOneView.exceptions import HPOneViewException
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_MAX_ATTEMPTS = 3
+DOWNLOAD_MIN_PART_SIZE = 8388608  # 8MB
+DOWNLOAD_BUFFER_SIZE = 1048576  # 1MB
+PARTIAL_FILE_SUFFIX = '.part'
+STATE_FILE_SUFFIX = '.part.json'
+
+DOWNLOAD_RANGE_NOT_RETURNED = 'The appliance did not return the requested range of %s'
+DOWNLOAD_CONTENT_CHANGED = 'The content of %s changed during the download'
+DOWNLOAD_SIZE_MISMATCH = 'Downloaded %d bytes of %s, but %d bytes were expected'
+DOWNLOAD_RANGES_MISSING = '%d bytes of %s were not downloaded'
+
+CONTENT_RANGE_PATTERN = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+)')
+
+
+def read_into(resp, buffer):
+    """
+    Reads the next bytes of the body of a response into a buffer.
+
+    Args:
+        resp: HTTP response.
+        buffer (bytearray): Buffer filled from its start.
+
+    Returns:
+        int: Number of bytes read, 0 at the end of the body.
+    """
+    readinto = getattr(resp, 'readinto', None)
+    if readinto is not None:
+        return readinto(buffer)
+
+    # The HTTPResponse of Python 2.7 cannot read into a buffer
+    data = resp.read(len(buffer))
+    buffer[:len(data)] = data
+    return len(data)
+
+
+class RangedDownload(object):
+    """
+    Downloads the content of a URI to a file.
+
+    The first request asks for a single byte to find out whether the appliance accepts ranges and the size of the
+    content. When it does, the content is split into up to `workers` ranges downloaded concurrently over the
+    connection pool into a preallocated file. When it does not, the response of the first request already has the
+    whole content, which is downloaded with a single stream.
+
+    The content is downloaded to `<file_path>.part` and the ranges still missing are saved to `<file_path>.part.json`
+    when the download stops. An interrupted range is retried from its last byte up to `max_attempts` times, and a
+    later download of the same URI to the same file resumes from the saved ranges. The file is moved to `file_path`
+    once its size matches the size reported by the appliance.
+
+    The ETag, or else the Last-Modified date, of the first response identifies the content. A download is only resumed
+    when the appliance reports the same one, and the range requests are conditional on it (If-Range), so the bytes of
+    different versions of the content are never mixed in the file.
+    """
+
+    def __init__(self, con, url, file_path, workers=1, custom_headers=None, buffer_size=DOWNLOAD_BUFFER_SIZE,
+                 progress_callback=None, max_attempts=DOWNLOAD_MAX_ATTEMPTS):
+        self._connection = con
+        self._url = url
+        self._file_path = file_path
+        self._partial_path = file_path + PARTIAL_FILE_SUFFIX
+        self._state_path = file_path + STATE_FILE_SUFFIX
+        self._workers = max(1, int(workers))
+        self._custom_headers = custom_headers or {}
+        self._buffer_size = buffer_size
+        self._progress_callback = progress_callback
+        self._max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._downloaded = 0
+        self._total = None
+        self._validator = None
+        self._start_time = None
+
+    def run(self):
+        """
+        Downloads the content, resuming a previous download of the same URI to the same file when there is one.
+
+        Returns:
+            bool: Indicates if the file was successfully downloaded.
+        """
+        self._start_time = time.time()
+
+        probe = self.__retry(self.__probe)
+        if probe is None:
+            # The whole content was downloaded with the probe
+            return True
+        total, validator = probe
+
+        state = self.__load_state(total, validator)
+        if state is None:
+            state = self.__create_state(total, validator)
+
+        self._validator = validator
+        self._total = state['total']
+        ranges = state['ranges']
+        pending = [byte_range for byte_range in ranges if byte_range[0] <= byte_range[1]]
+        self._downloaded = self._total - sum(end - start + 1 for start, end in pending)
+
+        try:
+            if len(pending) > 1 and self._workers > 1:
+                # Imported here, since the connection module imports this one and must stay cheap to import
+                from multiprocessing.pool import ThreadPool
+
+                pool = ThreadPool(min(self._workers, len(pending)))
+                try:
+                    pool.map(self.__download_range, pending)
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                for byte_range in pending:
+                    self.__download_range(byte_range)
+        finally:
+            self.__save_state(state)
+
+        self.__complete(self._total, ranges)
+        return True
+
+    def __probe(self):
+        conn, resp = self.__open(0, 0)
+        content_range = CONTENT_RANGE_PATTERN.match(resp.getheader('Content-Range') or '')
+
+        if resp.status == 206 and content_range:
+            resp.read()
+            self._connection._release_connection(conn, resp)
+            return int(content_range.group(3)), self.__get_validator(resp)
+
+        logger.debug('Ranges are not supported for %s. Downloading with a single stream...' % self._url)
+        content_length = resp.getheader('Content-Length')
+        self._total = int(content_length) if content_length else None
+        self._downloaded = 0
+        try:
+            with open(self._partial_path, 'wb') as partial_file:
+                self.__write_response(resp, partial_file)
+        except Exception:
+            conn.close()
+            raise
+        self._connection._release_connection(conn, resp)
+
+        if self._total is not None:
+            self.__complete(self._total)
+        else:
+            self.__move_partial_file()
+        return None
+
+    @staticmethod
+    def __get_validator(resp):
+        # A weak ETag cannot be used in an If-Range header
+        etag = resp.getheader('ETag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return resp.getheader('Last-Modified')
+
+    def __create_state(self, total, validator):
+        part_count = max(1, min(self._workers, total // DOWNLOAD_MIN_PART_SIZE))
+        part_size = -(-total // part_count)
+        ranges = [[start, min(start + part_size, total) - 1] for start in range(0, total, part_size)]
+
+        with open(self._partial_path, 'wb') as partial_file:
+            partial_file.truncate(total)
+
+        state = {'url': self._url, 'total': total, 'validator': validator, 'ranges': ranges}
+        self.__save_state(state)
+        return state
+
+    def __load_state(self, total, validator):
+        try:
+            with open(self._state_path, 'r') as state_file:
+                state = json.load(state_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+        partial_size = os.path.getsize(self._partial_path) if os.path.exists(self._partial_path) else None
+        if state.get('url') != self._url or state.get('total') != total or partial_size != total:
+            logger.debug('Ignoring the partial download of %s' % self._file_path)
+            return None
+
+        if validator is None or state.get('validator') != validator:
+            # Without the same ETag or Last-Modified date, the content may have changed since the partial download
+            logger.debug('Ignoring the partial download of %s, since its content may have changed' % self._file_path)
+            return None
+
+        logger.debug('Resuming the download of %s' % self._url)
+        return state
+
+    def __save_state(self, state):
+        with self._lock:
+            content = json.dumps(state)
+        with open(self._state_path, 'w') as state_file:
+            state_file.write(content)
+
+    def __download_range(self, byte_range):
+        self.__retry(self.__download_remaining, byte_range)
+
+    def __download_remaining(self, byte_range):
+        start, end = byte_range
+        if start > end:
+            return
+
+        conn, resp = self.__open(start, end, self._validator)
+        if resp.status != 206:
+            conn.close()
+            if resp.status == 200 and self._validator is not None:
+                # The If-Range condition failed
+                raise HPOneViewException(DOWNLOAD_CONTENT_CHANGED % self._url)
+            raise HPOneViewException(DOWNLOAD_RANGE_NOT_RETURNED % self._url)
+
+        content_range = CONTENT_RANGE_PATTERN.match(resp.getheader('Content-Range') or '')
+        if not content_range or int(content_range.group(1)) != start or int(content_range.group(2)) > end:
+            conn.close()
+            raise HPOneViewException(DOWNLOAD_RANGE_NOT_RETURNED % self._url)
+        if int(content_range.group(3)) != self._total:
+            conn.close()
+            raise HPOneViewException(DOWNLOAD_CONTENT_CHANGED % self._url)
+
+        try:
+            with open(self._partial_path, 'r+b') as partial_file:
+                partial_file.seek(start)
+                self.__write_response(resp, partial_file, byte_range)
+        except Exception:
+            conn.close()
+            raise
+        self._connection._release_connection(conn, resp)
+
+        if byte_range[0] <= end:
+            raise http.client.IncompleteRead(b'', end - byte_range[0] + 1)
+
+    def __open(self, start, end, validator=None):
+        headers = dict(self._custom_headers)
+        headers['Range'] = 'bytes=%d-%d' % (start, end)
+        if validator is not None:
+            headers['If-Range'] = validator
+        return self._connection._open_download(self._url, custom_headers=headers)
+
+    def __write_response(self, resp, output_file, byte_range=None):
+        buffer = bytearray(self._buffer_size)
+        buffer_view = memoryview(buffer)
+        while True:
+            read_size = read_into(resp, buffer)
+            if not read_size:
+                break
+            output_file.write(buffer_view[:read_size])
+            with self._lock:
+                if byte_range is not None:
+                    byte_range[0] += read_size
+                self._downloaded += read_size
+                downloaded = self._downloaded
+            if self._progress_callback:
+                self._progress_callback(downloaded, self._total, time.time() - self._start_time)
+
+    def __retry(self, function, *args):
+        attempt = 1
+        while True:
+            try:
+                return function(*args)
+            except (socket.error, http.client.HTTPException) as e:
+                if attempt >= self._max_attempts:
+                    raise
+                logger.warning('Download of %s interrupted: %s. Trying again...' % (self._url, repr(e)))
+                attempt += 1
+                time.sleep(1)
+
+    def __complete(self, total, ranges=None):
+        # The partial file is preallocated, so its size does not tell whether all the ranges were downloaded
+        missing = sum(end - start + 1 for start, end in ranges or [] if start <= end)
+        if missing:
+            raise HPOneViewException(DOWNLOAD_RANGES_MISSING % (missing, self._url))
+
+        size = os.path.getsize(self._partial_path)
+        if size != total:
+            raise HPOneViewException(DOWNLOAD_SIZE_MISMATCH % (size, self._url, total))
+        self.__move_partial_file()
+
+    def __move_partial_file(self):
+        if os.path.exists(self._file_path):
+            os.remove(self._file_path)
+        os.rename(self._partial_path, self._file_path)
+        if os.path.exists(self._state_path):
+            os.remove(self._state_path)
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+Non-blocking counterpart of the ResourceClient. Requires Python 3.7+.
+"""
+
+import logging
+
+from hpOneView.exceptions import HPOneViewUnknownType
+from hpOneView.resources.async_task_monitor import AsyncTaskMonitor
+from hpOneView.resources.resource import ResourceClient, RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED
+from hpOneView.resources.resource import RESOURCE_CLIENT_INVALID_FIELD, RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResourceClient(object):
+    """
+    This class implements the common functions of the ResourceClient as coroutines.
+
+    The URIs are built by a ResourceClient for the same collection, so both clients accept the same arguments.
+    """
+
+    def __init__(self, con, uri):
+        self._connection = con
+        self._uri = uri
+        self._uri_builder = ResourceClient(con, uri)
+        self._task_monitor = AsyncTaskMonitor(con)
+
+    def build_query_uri(self, *args, **kwargs):
+        return self._uri_builder.build_query_uri(*args, **kwargs)
+
+    def build_uri(self, id_or_uri):
+        return self._uri_builder.build_uri(id_or_uri)
+
+    def build_subresource_uri(self, *args, **kwargs):
+        return self._uri_builder.build_subresource_uri(*args, **kwargs)
+
+    async def get_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None,
+                      scope_uris=''):
+        """
+        Gets all items according with the given arguments.
+
+        See ResourceClient.get_all for the description of the arguments.
+
+        Returns:
+            list: A list of items matching the specified filter.
+        """
+        uri = self.build_query_uri(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                   fields=fields, uri=uri, scope_uris=scope_uris)
+
+        logger.debug('Getting all resources with uri: {0}'.format(uri))
+
+        items = []
+        while uri:
+            response = await self._connection.get(uri)
+            members = (response.get('members') or []) if response else []
+            items += members
+            uri = self.__get_next_page(response, items, count)
+
+        return items
+
+    async def get(self, id_or_uri):
+        """
+        Args:
+            id_or_uri: Can be either the resource ID or the resource URI.
+
+        Returns:
+             The requested resource.
+        """
+        uri = self.build_uri(id_or_uri)
+        logger.debug('Get resource (uri = %s, ID = %s)' % (uri, str(id_or_uri)))
+        return await self._connection.get(uri)
+
+    async def get_by(self, field, value, uri=None, count=-1, fields='', exact=False):
+        """
+        This function uses get_all passing a filter.
+
+        See ResourceClient.get_by for the description of the arguments.
+
+        Returns:
+            dict
+        """
+        if not field:
+            logger.exception(RESOURCE_CLIENT_INVALID_FIELD)
+            raise ValueError(RESOURCE_CLIENT_INVALID_FIELD)
+
+        filter = "\"{0}='{1}'\"".format(field, value)
+        uri = uri or self._uri
+
+        if exact:
+            return await self.get_all(count=count, filter=filter, fields=fields, uri=uri)
+
+        # Workaround when the OneView filter does not work, it will filter again
+        filter_again = "." not in field
+        if fields and filter_again and field not in fields.split(','):
+            fields += ',' + field
+
+        query_uri = self.build_query_uri(filter=filter, fields=fields, uri=uri)
+        results = []
+        while query_uri:
+            response = await self._connection.get(query_uri)
+            members = (response.get('members') or []) if response else []
+            results += [item for item in members
+                        if not filter_again or str(item.get(field, '')).lower() == str(value).lower()]
+            if count != -1 and len(results) >= count:
+                return results[:count]
+            query_uri = self.__get_next_page(response, results, -1)
+
+        return results
+
+    async def get_by_name(self, name, fields='', exact=False):
+        """
+        Retrieve a resource by its name.
+
+        See ResourceClient.get_by_name for the description of the arguments.
+
+        Returns:
+            dict
+        """
+        result = await self.get_by('name', name, count=1, fields=fields, exact=exact)
+        return result[0] if result else None
+
+    async def create(self, resource, uri=None, timeout=-1, custom_headers=None, default_values={}):
+        """
+        Makes a POST request to create a resource when a request body is required.
+
+        See ResourceClient.create for the description of the arguments.
+
+        Returns:
+            Created resource.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        resource = self._uri_builder.merge_default_values(resource, default_values)
+
+        task, entity = await self._connection.post(uri or self._uri, resource, custom_headers=custom_headers)
+        return await self.__wait_for_task(task, entity, timeout)
+
+    async def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None, default_values={}):
+        """
+        Makes a PUT request to update a resource when a request body is required.
+
+        See ResourceClient.update for the description of the arguments.
+
+        Returns:
+            Updated resource.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        if not uri:
+            uri = resource['uri']
+
+        if force:
+            uri += '?force=True'
+
+        resource = self._uri_builder.merge_default_values(resource, default_values)
+
+        task, body = await self._connection.put(uri, resource, custom_headers=custom_headers)
+        return await self.__wait_for_task(task, body, timeout)
+
+    async def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None):
+        """
+        Uses the PATCH to update a resource.
+
+        See ResourceClient.patch for the description of the arguments.
+
+        Returns:
+            Updated resource.
+        """
+        patch_request_body = [{'op': operation, 'path': path, 'value': value}]
+
+        return await self.patch_request(id_or_uri, patch_request_body, timeout=timeout, custom_headers=custom_headers)
+
+    async def patch_request(self, id_or_uri, body, timeout=-1, custom_headers=None):
+        """
+        Uses the PATCH to update a resource.
+
+        See ResourceClient.patch_request for the description of the arguments.
+
+        Returns:
+            Updated resource.
+        """
+        uri = self.build_uri(id_or_uri)
+
+        custom_headers_copy = custom_headers.copy() if custom_headers else {}
+        if self._connection._apiVersion >= 300 and 'Content-Type' not in custom_headers_copy:
+            custom_headers_copy['Content-Type'] = 'application/json-patch+json'
+
+        task, entity = await self._connection.patch(uri, body, custom_headers=custom_headers_copy)
+        return await self.__wait_for_task(task, entity, timeout)
+
+    async def delete(self, resource, force=False, timeout=-1, custom_headers=None):
+        """
+        Deletes a resource.
+
+        See ResourceClient.delete for the description of the arguments.
+
+        Returns:
+            bool: Indicates if the resource was successfully deleted.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        if isinstance(resource, dict):
+            if 'uri' in resource and resource['uri']:
+                uri = resource['uri']
+            else:
+                logger.exception(RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE)
+                raise HPOneViewUnknownType(RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE)
+        else:
+            uri = self.build_uri(resource)
+
+        if force:
+            uri += '?force=True'
+
+        task, body = await self._connection.delete(uri, custom_headers=custom_headers)
+
+        if not task:
+            # 204 NO CONTENT
+            return True
+
+        return await self._task_monitor.wait_for_task(task, timeout=timeout)
+
+    async def __wait_for_task(self, task, entity, timeout):
+        if not task:
+            return entity
+
+        return await self._task_monitor.wait_for_task(task, timeout)
+
+    def __get_next_page(self, response, items, requested_count):
+        if not response or (len(items) >= requested_count and requested_count != -1):
+            return None
+
+        next_page = response.get('nextPageUri')
+        if next_page is None or next_page == response.get('uri'):
+            return None
+        return next_page
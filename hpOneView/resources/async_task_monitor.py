@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+Non-blocking counterpart of the TaskMonitor. Requires Python 3.7+.
+"""
+
+import asyncio
+import logging
+import time
+
+from hpOneView.exceptions import HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewUnknownType
+from hpOneView.resources.task_monitor import TaskMonitor, TASK_PENDING_STATES, UNLIMITED_TIMEOUT, is_delete_task
+from hpOneView.resources.task_monitor import MSG_INVALID_TASK, MSG_TASK_TYPE_UNRECONIZED, MSG_TIMEOUT
+from hpOneView.resources.task_monitor import MSG_UNKNOWN_OBJECT_TYPE
+from hpOneView.resources.task_polling import AdaptivePolling
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTaskMonitor(object):
+    """
+    Waits for OneView tasks on an asyncio event loop, so many tasks can be awaited without a thread per task.
+    """
+
+    def __init__(self, con, polling=None):
+        self._connection = con
+        self._polling = polling or AdaptivePolling()
+
+    async def wait_for_task(self, task, timeout=-1, polling=None):
+        """
+        Wait for task execution and return associated resource.
+
+        Args:
+            task: task dict
+            timeout: timeout in seconds
+            polling (PollingStrategy): Overrides the polling strategy of the monitor for this task.
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+        """
+        await self.__wait_task_completion(task, timeout, polling)
+
+        task = await self.get(task)
+
+        TaskMonitor.raise_for_task_error(task)
+
+        if is_delete_task(task):
+            return True
+
+        if 'type' in task and task['type'].startswith('Task'):
+            task, entity = await self.get_associated_resource(task)
+            return entity
+
+        logger.warning('Task completed, unknown response: ' + str(task))
+        return task
+
+    async def get_completed_task(self, task, timeout=-1, polling=None):
+        """
+        Waits until the task is completed and returns the task resource.
+
+        Args:
+            task: TaskResource
+            timeout: Timeout in seconds
+            polling (PollingStrategy): Overrides the polling strategy of the monitor for this task.
+
+        Returns:
+            dict: TaskResource
+        """
+        await self.__wait_task_completion(task, timeout, polling)
+
+        return await self.get(task)
+
+    async def __wait_task_completion(self, task, timeout, polling=None):
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        polling = polling or self._polling
+        start_time = TaskMonitor.get_current_seconds()
+        polling_start_time = time.time()
+
+        attempt = 0
+        while 'uri' in task:
+            task = await self.get(task)
+            if task.get('taskState') not in TASK_PENDING_STATES:
+                break
+            attempt += 1
+            await asyncio.sleep(polling.next_delay(attempt, task, time.time() - polling_start_time))
+            if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < TaskMonitor.get_current_seconds()):
+                raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+
+    async def is_task_running(self, task):
+        """
+        Check if a task is running according to: TASK_PENDING_STATES ['New', 'Starting',
+        'Pending', 'Running', 'Suspended', 'Stopping']
+
+        Args:
+            task (dict): OneView Task resource.
+
+        Returns:
+            True when in TASK_PENDING_STATES; False when not.
+        """
+        if 'uri' in task:
+            task = await self.get(task)
+            return 'taskState' in task and task['taskState'] in TASK_PENDING_STATES
+        return False
+
+    async def get(self, task):
+        """
+        Retrieve a task by its uri.
+
+        Args:
+            task: task dict, must have 'uri' key.
+
+        Returns:
+            task dict
+        """
+        return await self._connection.get(task['uri'])
+
+    async def get_associated_resource(self, task):
+        """
+        Retrieve a resource associated with a task.
+
+        Args:
+            task: task dict
+
+        Returns:
+            tuple: task (updated), the entity found (dict)
+        """
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        if task['category'] != 'tasks' and task['category'] != 'backups':
+            raise HPOneViewUnknownType(MSG_UNKNOWN_OBJECT_TYPE)
+
+        if task['type'] == 'TaskResourceV2':
+            resource_uri = task['associatedResource']['resourceUri']
+
+            if resource_uri and resource_uri.startswith("/rest/appliance/support-dumps/"):
+                # Specific for support dumps
+                return task, resource_uri
+
+        elif task['type'] == 'BACKUP':
+            task = await self._connection.get(task['taskUri'])
+            resource_uri = task['uri']
+        else:
+            raise HPOneViewInvalidResource(MSG_TASK_TYPE_UNRECONIZED % task['type'])
+
+        entity = {}
+
+        if resource_uri:
+            entity = await self._connection.get(resource_uri)
+
+        return task, entity
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+registry.py
+~~~~~~~~~~~
+
+This module maps the resource attributes of the clients to the modules that implement them, so a resource module is
+only imported when its attribute is first used.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import importlib
+
+RESOURCES = {
+    'certificate_authority': ('hpOneView.resources.security.certificate_authority', 'CertificateAuthority'),
+    'connections': ('hpOneView.resources.servers.connections', 'Connections'),
+    'connection_templates': ('hpOneView.resources.networking.connection_templates', 'ConnectionTemplates'),
+    'fc_networks': ('hpOneView.resources.networking.fc_networks', 'FcNetworks'),
+    'fcoe_networks': ('hpOneView.resources.networking.fcoe_networks', 'FcoeNetworks'),
+    'ethernet_networks': ('hpOneView.resources.networking.ethernet_networks', 'EthernetNetworks'),
+    'fabrics': ('hpOneView.resources.networking.fabrics', 'Fabrics'),
+    'restores': ('hpOneView.resources.settings.restores', 'Restores'),
+    'scopes': ('hpOneView.resources.settings.scopes', 'Scopes'),
+    'datacenters': ('hpOneView.resources.facilities.datacenters', 'Datacenters'),
+    'network_sets': ('hpOneView.resources.networking.network_sets', 'NetworkSets'),
+    'server_hardware': ('hpOneView.resources.servers.server_hardware', 'ServerHardware'),
+    'server_hardware_types': ('hpOneView.resources.servers.server_hardware_types', 'ServerHardwareTypes'),
+    'id_pools_vsn_ranges': ('hpOneView.resources.servers.id_pools_ranges', 'IdPoolsRanges'),
+    'id_pools_vmac_ranges': ('hpOneView.resources.servers.id_pools_ranges', 'IdPoolsRanges'),
+    'id_pools_vwwn_ranges': ('hpOneView.resources.servers.id_pools_ranges', 'IdPoolsRanges'),
+    'id_pools_ipv4_ranges': ('hpOneView.resources.servers.id_pools_ipv4_ranges', 'IdPoolsIpv4Ranges'),
+    'id_pools_ipv4_subnets': ('hpOneView.resources.servers.id_pools_ipv4_subnets', 'IdPoolsIpv4Subnets'),
+    'id_pools': ('hpOneView.resources.servers.id_pools', 'IdPools'),
+    'switches': ('hpOneView.resources.networking.switches', 'Switches'),
+    'roles': ('hpOneView.resources.security.roles', 'Roles'),
+    'switch_types': ('hpOneView.resources.networking.switch_types', 'SwitchTypes'),
+    'logical_switch_groups': ('hpOneView.resources.networking.logical_switch_groups', 'LogicalSwitchGroups'),
+    'logical_switches': ('hpOneView.resources.networking.logical_switches', 'LogicalSwitches'),
+    'tasks': ('hpOneView.resources.activity.tasks', 'Tasks'),
+    'enclosure_groups': ('hpOneView.resources.servers.enclosure_groups', 'EnclosureGroups'),
+    'enclosures': ('hpOneView.resources.servers.enclosures', 'Enclosures'),
+    'logical_enclosures': ('hpOneView.resources.servers.logical_enclosures', 'LogicalEnclosures'),
+    'metric_streaming': ('hpOneView.resources.data_services.metric_streaming', 'MetricStreaming'),
+    'interconnects': ('hpOneView.resources.networking.interconnects', 'Interconnects'),
+    'interconnect_types': ('hpOneView.resources.networking.interconnect_types', 'InterconnectTypes'),
+    'interconnect_link_topologies': ('hpOneView.resources.networking.interconnect_link_topologies', 'InterconnectLinkTopologies'),
+    'sas_interconnect_types': ('hpOneView.resources.networking.sas_interconnect_types', 'SasInterconnectTypes'),
+    'internal_link_sets': ('hpOneView.resources.networking.internal_link_sets', 'InternalLinkSets'),
+    'logical_interconnect_groups': ('hpOneView.resources.networking.logical_interconnect_groups', 'LogicalInterconnectGroups'),
+    'logical_interconnects': ('hpOneView.resources.networking.logical_interconnects', 'LogicalInterconnects'),
+    'sas_logical_interconnects': ('hpOneView.resources.networking.sas_logical_interconnects', 'SasLogicalInterconnects'),
+    'logical_downlinks': ('hpOneView.resources.networking.logical_downlinks', 'LogicalDownlinks'),
+    'power_devices': ('hpOneView.resources.facilities.power_devices', 'PowerDevices'),
+    'unmanaged_devices': ('hpOneView.resources.uncategorized.unmanaged_devices', 'UnmanagedDevices'),
+    'racks': ('hpOneView.resources.facilities.racks', 'Racks'),
+    'san_managers': ('hpOneView.resources.fc_sans.san_managers', 'SanManagers'),
+    'endpoints': ('hpOneView.resources.fc_sans.endpoints', 'Endpoints'),
+    'server_profiles': ('hpOneView.resources.servers.server_profiles', 'ServerProfiles'),
+    'server_profile_templates': ('hpOneView.resources.servers.server_profile_templates', 'ServerProfileTemplate'),
+    'storage_systems': ('hpOneView.resources.storage.storage_systems', 'StorageSystems'),
+    'storage_pools': ('hpOneView.resources.storage.storage_pools', 'StoragePools'),
+    'storage_volume_templates': ('hpOneView.resources.storage.storage_volume_templates', 'StorageVolumeTemplates'),
+    'storage_volume_attachments': ('hpOneView.resources.storage.storage_volume_attachments', 'StorageVolumeAttachments'),
+    'firmware_drivers': ('hpOneView.resources.settings.firmware_drivers', 'FirmwareDrivers'),
+    'firmware_bundles': ('hpOneView.resources.settings.firmware_bundles', 'FirmwareBundles'),
+    'uplink_sets': ('hpOneView.resources.networking.uplink_sets', 'UplinkSets'),
+    'volumes': ('hpOneView.resources.storage.volumes', 'Volumes'),
+    'sas_logical_jbod_attachments': ('hpOneView.resources.storage.sas_logical_jbod_attachments', 'SasLogicalJbodAttachments'),
+    'managed_sans': ('hpOneView.resources.fc_sans.managed_sans', 'ManagedSANs'),
+    'migratable_vc_domains': ('hpOneView.resources.servers.migratable_vc_domains', 'MigratableVcDomains'),
+    'sas_interconnects': ('hpOneView.resources.networking.sas_interconnects', 'SasInterconnects'),
+    'sas_logical_interconnect_groups': ('hpOneView.resources.networking.sas_logical_interconnect_groups', 'SasLogicalInterconnectGroups'),
+    'drive_enclosures': ('hpOneView.resources.storage.drive_enclosures', 'DriveEnclosures'),
+    'sas_logical_jbods': ('hpOneView.resources.storage.sas_logical_jbods', 'SasLogicalJbods'),
+    'labels': ('hpOneView.resources.search.labels', 'Labels'),
+    'index_resources': ('hpOneView.resources.search.index_resources', 'IndexResources'),
+    'alerts': ('hpOneView.resources.activity.alerts', 'Alerts'),
+    'events': ('hpOneView.resources.activity.events', 'Events'),
+    'os_deployment_plans': ('hpOneView.resources.uncategorized.os_deployment_plans', 'OsDeploymentPlans'),
+    'os_deployment_servers': ('hpOneView.resources.uncategorized.os_deployment_servers', 'OsDeploymentServers'),
+    'certificate_rabbitmq': ('hpOneView.resources.security.certificate_rabbitmq', 'CertificateRabbitMQ'),
+    'users': ('hpOneView.resources.security.users', 'Users'),
+    'appliance_node_information': ('hpOneView.resources.settings.appliance_node_information', 'ApplianceNodeInformation'),
+    'appliance_time_and_locale_configuration': ('hpOneView.resources.settings.appliance_time_and_locale_configuration', 'ApplianceTimeAndLocaleConfiguration'),
+    'versions': ('hpOneView.resources.settings.versions', 'Versions'),
+    'backups': ('hpOneView.resources.settings.backups', 'Backups'),
+    'login_details': ('hpOneView.resources.security.login_details', 'LoginDetails'),
+    'licenses': ('hpOneView.resources.settings.licenses', 'Licenses'),
+}
+
+
+def get_resource_class(name):
+    """
+    Gets the class of a resource, importing its module on the first call.
+
+    Args:
+        name: Attribute name of the resource in the OneViewClient, e.g., 'server_hardware'.
+
+    Returns:
+        type: Resource class.
+    """
+    module_name, class_name = RESOURCES[name]
+    return getattr(importlib.import_module(module_name), class_name)
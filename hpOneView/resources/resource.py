@@ -33,9 +33,13 @@ standard_library.install_aliases()
 
 import logging
 import os
+import re
 
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 from urllib.parse import quote
 from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.task_scheduler import TaskHandle, get_task_scheduler
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewException
 from hpOneView.exceptions import HPOneViewValueError
 
@@ -47,6 +51,12 @@ UNRECOGNIZED_URI = 'Unrecognized URI for this resource'
 RESOURCE_CLIENT_TASK_EXPECTED = "Failed: Expected a TaskResponse."
 RESOURCE_ID_OR_URI_REQUIRED = 'It is required to inform the Resource ID or URI.'
 
+GET_MANY_WORKERS = 8
+GET_MANY_BATCH_SIZE = 50
+
+# Fields listed by ResourceClient.sync to detect the changed resources
+SYNC_FIELDS = 'uri,eTag,modified'
+
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +96,34 @@ def merge_default_values(resource_list, default_values):
     return lmap(merge_item, resource_list)
 
 
+class SyncResult(object):
+    """
+    Changes of a collection since a previous ResourceClient.sync.
+
+    Attributes:
+        added (list): Resources that were not in the previous snapshot.
+        updated (list): Resources whose eTag or modification date changed since the previous snapshot.
+        deleted (list): URIs of the resources of the previous snapshot that are no longer in the collection.
+        unchanged (list): URIs of the resources that did not change.
+        snapshot (dict): Versions of the resources keyed by URI, to be passed to the next sync. It can be serialized to
+            JSON, so it can be kept between runs.
+    """
+
+    def __init__(self, added, updated, deleted, unchanged, snapshot):
+        self.added = added
+        self.updated = updated
+        self.deleted = deleted
+        self.unchanged = unchanged
+        self.snapshot = snapshot
+
+    @property
+    def changed(self):
+        """
+        Gets whether any resource was added, updated or deleted.
+        """
+        return bool(self.added or self.updated or self.deleted)
+
+
 class ResourceClient(object):
     """
     This class implements common functions for HpOneView API rest
@@ -214,6 +252,129 @@ class ResourceClient(object):
 
         return result
 
+    def iter_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None, scope_uris=''):
+        """
+        Iterates over the items of get_all without holding the whole collection in memory.
+
+        The items are yielded page by page, and the next page is retrieved in the background while the current one is
+        consumed, so the memory used depends on the page size instead of the collection size.
+
+        Args:
+            start:
+                The first item to return, using 0-based indexing.
+                If not specified, the default is 0 - start with the first available item.
+            count:
+                The number of resources to return. A count of -1 requests all items (default).
+            filter (list or str):
+                A general filter/query string to narrow the list of items returned. The default is no
+                filter; all resources are returned.
+            query:
+                A single query parameter can do what would take multiple parameters or multiple GET requests using
+                filter. Use query for more complex queries. NOTE: This parameter is experimental for OneView 2.0.
+            sort:
+                The sort order of the returned data set. By default, the sort order is based on create time with the
+                oldest entry first.
+            view:
+                Returns a specific subset of the attributes of the resource or collection by specifying the name of a
+                predefined view. The default view is expand (show all attributes of the resource and all elements of
+                the collections or resources).
+            fields:
+                Name of the fields.
+            uri:
+                A specific URI (optional)
+            scope_uris:
+                An expression to restrict the resources returned according to the scopes to
+                which they are assigned.
+
+        Returns:
+            generator: The items matching the specified filter.
+        """
+        uri = self.build_query_uri(start=start, count=count, filter=filter,
+                                   query=query, sort=sort, view=view, fields=fields, uri=uri, scope_uris=scope_uris)
+
+        logger.debug('Iterating over resources with uri: {0}'.format(uri))
+
+        items_count = 0
+        pool = ThreadPool(1)
+        try:
+            response = self._connection.get(uri)
+            while response:
+                members = self.__get_members(response)
+                items_count += len(members)
+
+                next_page = self.__get_next_page(response, items_count, count)
+                next_response = pool.apply_async(self._connection.get, (next_page,)) if next_page else None
+
+                for member in members:
+                    yield member
+
+                response = next_response.get() if next_response else None
+        finally:
+            pool.close()
+            pool.join()
+
+    def sync(self, snapshot=None, filter='', query='', uri=None, scope_uris='', workers=GET_MANY_WORKERS):
+        """
+        Gets the resources added, updated and deleted since a previous sync.
+
+        The collection is listed with only the uri, eTag and modified fields, which are compared with the snapshot of
+        the previous sync, and only the new and changed resources are retrieved in full, with get_many. A resource
+        without eTag nor modification date is always reported as updated. A resource deleted after the collection was
+        listed is reported as deleted when it was in the snapshot, and left out otherwise.
+
+        Args:
+            snapshot (dict):
+                The snapshot of the previous sync. By default, all the resources are reported as added.
+            filter (list or str):
+                A general filter/query string to narrow the list of items returned. The default is no
+                filter; all resources are returned.
+            query:
+                A single query parameter can do what would take multiple parameters or multiple GET requests using
+                filter. Use query for more complex queries. NOTE: This parameter is experimental for OneView 2.0.
+            uri:
+                A specific URI (optional)
+            scope_uris:
+                An expression to restrict the resources returned according to the scopes to
+                which they are assigned.
+            workers: Maximum number of concurrent requests to retrieve the changed resources.
+
+        Returns:
+            SyncResult: The changes, and the snapshot to pass to the next sync.
+        """
+        snapshot = snapshot or {}
+        members = self.get_all(filter=filter, query=query, fields=SYNC_FIELDS, uri=uri, scope_uris=scope_uris)
+
+        versions = OrderedDict()
+        for member in members:
+            if isinstance(member, dict) and member.get('uri'):
+                versions[member['uri']] = self.__get_version(member)
+
+        changed_uris = [resource_uri for resource_uri, version in versions.items()
+                        if version is None or snapshot.get(resource_uri) != version]
+        logger.debug('Sync of %s: %d resources listed, %d changed' % (uri or self._uri, len(versions),
+                                                                      len(changed_uris)))
+        resources = self.get_many(changed_uris, workers, ignore_missing=True) if changed_uris else {}
+
+        added = []
+        updated = []
+        for resource_uri in changed_uris:
+            resource = resources.get(resource_uri)
+            if resource is None:
+                # Deleted after the collection was listed
+                del versions[resource_uri]
+                continue
+            # The resource may have changed again since the collection was listed
+            versions[resource_uri] = self.__get_version(resource) or versions[resource_uri]
+            (updated if resource_uri in snapshot else added).append(resource)
+
+        changed = set(changed_uris)
+        deleted = [resource_uri for resource_uri in snapshot if resource_uri not in versions]
+        return SyncResult(added=added,
+                          updated=updated,
+                          deleted=deleted,
+                          unchanged=[resource_uri for resource_uri in versions if resource_uri not in changed],
+                          snapshot=dict(versions))
+
     def delete_all(self, filter, force=False, timeout=-1):
         """
         Deletes all resources from the appliance that match the provided filter.
@@ -235,6 +396,10 @@ class ResourceClient(object):
         logger.debug("Delete all resources (uri = %s)" % uri)
 
         task, body = self._connection.delete(uri)
+        # Any resource of the collection may have matched the filter
+        cache = self._connection.get_response_cache()
+        if cache is not None:
+            cache.invalidate_prefix(self._uri)
 
         if not task:
             # 204 NO CONTENT
@@ -243,8 +408,25 @@ class ResourceClient(object):
 
         return self._task_monitor.wait_for_task(task, timeout=timeout)
 
-    def delete(self, resource, force=False, timeout=-1, custom_headers=None):
+    def delete(self, resource, force=False, timeout=-1, custom_headers=None, wait=True):
+        """
+        Deletes a resource.
+
+        Args:
+            resource: Resource dictionary, ID or URI.
+            force: Forces the removal when set to True.
+            timeout:
+                Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
+                in OneView; it just stops waiting for its completion.
+            custom_headers:
+                Allows set specific HTTP headers.
+            wait:
+                Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
+        Returns:
+            bool: Indicates if the resource was successfully deleted.
+        """
         if not resource:
             logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
             raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
@@ -265,6 +447,10 @@ class ResourceClient(object):
                      (self._uri, str(resource)))
 
         task, body = self._connection.delete(uri, custom_headers=custom_headers)
+        self.__invalidate_cached(uri)
+
+        if not wait:
+            return self.__submit_task(task, True)
 
         if not task:
             # 204 NO CONTENT
@@ -291,7 +477,46 @@ class ResourceClient(object):
         uri = self.build_uri(id_or_uri)
         logger.debug('Get resource (uri = %s, ID = %s)' %
                      (uri, str(id_or_uri)))
-        return self._connection.get(uri)
+        return self.__get_resource(uri)
+
+    def get_many(self, ids_or_uris, workers=GET_MANY_WORKERS, ignore_missing=False):
+        """
+        Gets many resources at once.
+
+        The URIs are grouped by collection, and each group is retrieved with a GET request to the collection filtered
+        by uri. The resources not returned by their collection are retrieved with individual GET requests. The requests
+        run concurrently.
+
+        Args:
+            ids_or_uris (list): IDs of resources of this type, or URIs of resources of any type.
+            workers: Maximum number of concurrent requests.
+            ignore_missing: Leaves the resources that are not found out of the result, instead of raising an exception.
+
+        Returns:
+            dict: The resources, keyed by URI.
+        """
+        uris = list(OrderedDict.fromkeys(id_or_uri if '/' in id_or_uri else self.build_uri(id_or_uri)
+                                         for id_or_uri in ids_or_uris))
+        if not uris:
+            return {}
+
+        logger.debug('Get many resources (count = %d)' % len(uris))
+
+        pool = ThreadPool(min(workers, len(uris)))
+        try:
+            resources = {}
+            for batch_resources in pool.map(self.__get_batch, self.__make_batches(uris)):
+                resources.update(batch_resources)
+
+            missing_uris = [uri for uri in uris if uri not in resources]
+            get_resource = self.__get_resource_if_found if ignore_missing else self.__get_resource
+            resources.update((uri, resource) for uri, resource in zip(missing_uris, pool.map(get_resource, missing_uris))
+                             if resource is not None)
+        finally:
+            pool.close()
+            pool.join()
+
+        return resources
 
     def get_collection(self, id_or_uri, filter=''):
         """
@@ -318,7 +543,7 @@ class ResourceClient(object):
         response = self._connection.get(uri)
         return self.__get_members(response)
 
-    def update_with_zero_body(self, uri, timeout=-1, custom_headers=None):
+    def update_with_zero_body(self, uri, timeout=-1, custom_headers=None, wait=True):
         """
         Makes a PUT request to update a resource when no request body is required.
 
@@ -330,15 +555,18 @@ class ResourceClient(object):
                 in OneView; it just stops waiting for its completion.
             custom_headers:
                 Allows set specific HTTP headers.
+            wait:
+                Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
         Returns:
             Updated resource.
         """
         logger.debug('Update with zero length body (uri = %s)' % uri)
 
-        return self.__do_put(uri, None, timeout, custom_headers)
+        return self.__do_put(uri, None, timeout, custom_headers, wait)
 
-    def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None, default_values={}):
+    def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None, default_values={}, wait=True):
         """
         Makes a PUT request to update a resource when a request body is required.
 
@@ -364,6 +592,9 @@ class ResourceClient(object):
                         '200': {"type": "logical-switch-group"},
                         '300': {"type": "logical-switch-groupV300"}
                     }
+            wait:
+                Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
         Returns:
             Updated resource.
@@ -383,9 +614,9 @@ class ResourceClient(object):
 
         resource = self.merge_default_values(resource, default_values)
 
-        return self.__do_put(uri, resource, timeout, custom_headers)
+        return self.__do_put(uri, resource, timeout, custom_headers, wait)
 
-    def create_with_zero_body(self, uri=None, timeout=-1, custom_headers=None):
+    def create_with_zero_body(self, uri=None, timeout=-1, custom_headers=None, wait=True):
         """
         Makes a POST request to create a resource when no request body is required.
 
@@ -397,6 +628,9 @@ class ResourceClient(object):
                 in OneView; it just stops waiting for its completion.
             custom_headers:
                 Allows set specific HTTP headers.
+            wait:
+                Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
         Returns:
             Created resource.
@@ -406,9 +640,9 @@ class ResourceClient(object):
 
         logger.debug('Create with zero body (uri = %s)' % uri)
 
-        return self.__do_post(uri, {}, timeout, custom_headers)
+        return self.__do_post(uri, {}, timeout, custom_headers, wait)
 
-    def create(self, resource, uri=None, timeout=-1, custom_headers=None, default_values={}):
+    def create(self, resource, uri=None, timeout=-1, custom_headers=None, default_values={}, wait=True):
         """
         Makes a POST request to create a resource when a request body is required.
 
@@ -431,6 +665,9 @@ class ResourceClient(object):
                         '200': {"type": "logical-switch-group"},
                         '300': {"type": "logical-switch-groupV300"}
                     }
+            wait:
+                Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
         Returns:
             Created resource.
@@ -447,9 +684,9 @@ class ResourceClient(object):
 
         resource = self.merge_default_values(resource, default_values)
 
-        return self.__do_post(uri, resource, timeout, custom_headers)
+        return self.__do_post(uri, resource, timeout, custom_headers, wait)
 
-    def upload(self, file_path, uri=None, timeout=-1):
+    def upload(self, file_path, uri=None, timeout=-1, wait=True):
         """
         Makes a multipart request.
 
@@ -461,6 +698,9 @@ class ResourceClient(object):
             timeout:
                 Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait:
+                Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
         Returns:
             dict: Response body.
@@ -470,13 +710,17 @@ class ResourceClient(object):
 
         upload_file_name = os.path.basename(file_path)
         task, entity = self._connection.post_multipart_with_response_handling(uri, file_path, upload_file_name)
+        self.__invalidate_cached(uri)
+
+        if not wait:
+            return self.__submit_task(task, entity)
 
         if not task:
             return entity
 
         return self._task_monitor.wait_for_task(task, timeout)
 
-    def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None):
+    def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None, wait=True):
         """
         Uses the PATCH to update a resource.
 
@@ -489,6 +733,8 @@ class ResourceClient(object):
             value: Value
             timeout: Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait: Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
         Returns:
             Updated resource.
@@ -498,9 +744,10 @@ class ResourceClient(object):
         return self.patch_request(id_or_uri=id_or_uri,
                                   body=patch_request_body,
                                   timeout=timeout,
-                                  custom_headers=custom_headers)
+                                  custom_headers=custom_headers,
+                                  wait=wait)
 
-    def patch_request(self, id_or_uri, body, timeout=-1, custom_headers=None):
+    def patch_request(self, id_or_uri, body, timeout=-1, custom_headers=None, wait=True):
         """
         Uses the PATCH to update a resource.
 
@@ -511,6 +758,8 @@ class ResourceClient(object):
             body: Patch request body
             timeout: Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait: Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
         Returns:
             Updated resource.
@@ -524,22 +773,33 @@ class ResourceClient(object):
             custom_headers_copy['Content-Type'] = 'application/json-patch+json'
 
         task, entity = self._connection.patch(uri, body, custom_headers=custom_headers_copy)
+        self.__invalidate_cached(uri)
+
+        if not wait:
+            return self.__submit_task(task, entity)
 
         if not task:
             return entity
 
         return self._task_monitor.wait_for_task(task, timeout)
 
-    def get_by(self, field, value, uri=None):
+    def get_by(self, field, value, uri=None, count=-1, fields='', exact=False):
         """
         This function uses get_all passing a filter.
 
-        The search is case-insensitive.
+        The search is case-insensitive. As some collections do not apply the filter, the returned items are filtered
+        again by the value of the field, unless exact is set.
 
         Args:
             field: Field name to filter.
             value: Value to filter.
             uri: Resource uri.
+            count: Maximum number of items to return. The pages of the collection are only retrieved until that many
+                items match. A count of -1 returns all the matching items (default).
+            fields: Name of the fields to return, e.g., 'name,uri'. The filtered field is added when the items are
+                filtered again.
+            exact: Trusts the filter of the appliance, so count items are requested in a single request and they are
+                not filtered again.
 
         Returns:
             dict
@@ -556,26 +816,35 @@ class ResourceClient(object):
                      (uri, field, str(value)))
 
         filter = "\"{0}='{1}'\"".format(field, value)
+
+        if exact:
+            return self.get_all(count=count, filter=filter, fields=fields, uri=uri)
+
+        if count != -1 or fields:
+            return self.__find_by(field, value, filter, fields, uri, count)
+
         results = self.get_all(filter=filter, uri=uri)
 
         # Workaround when the OneView filter does not work, it will filter again
         if "." not in field:
             # This filter only work for the first level
-            results = [item for item in results if str(item.get(field, '')).lower() == value.lower()]
+            results = [item for item in results if self.__field_matches(item, field, value)]
 
         return results
 
-    def get_by_name(self, name):
+    def get_by_name(self, name, fields='', exact=False):
         """
         Retrieve a resource by its name.
 
         Args:
             name: Resource name.
+            fields: Name of the fields to return, e.g., 'name,uri'. All the fields by default.
+            exact: Trusts the filter of the appliance, so the resource is retrieved with a single request for one item.
 
         Returns:
             dict
         """
-        result = self.get_by('name', name)
+        result = self.get_by('name', name, count=1, fields=fields, exact=exact)
         if not result:
             return None
         else:
@@ -671,7 +940,7 @@ class ResourceClient(object):
 
         return self._connection.get(uri)
 
-    def create_report(self, uri, timeout=-1):
+    def create_report(self, uri, timeout=-1, wait=True):
         """
         Creates a report and returns the output.
 
@@ -680,6 +949,9 @@ class ResourceClient(object):
             timeout:
                 Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait:
+                Waits for the task completion by default. When False, returns a TaskHandle as soon as the appliance
+                accepts the request.
 
         Returns:
             list:
@@ -690,6 +962,9 @@ class ResourceClient(object):
         if not task:
             raise HPOneViewException(RESOURCE_CLIENT_TASK_EXPECTED)
 
+        if not wait:
+            return get_task_scheduler(self._connection).submit(task, lambda completed_task: completed_task['taskOutput'])
+
         task = self._task_monitor.get_completed_task(task, timeout)
 
         return task['taskOutput']
@@ -722,19 +997,23 @@ class ResourceClient(object):
 
             return uri
 
-    def download(self, uri, file_path):
+    def download(self, uri, file_path, progress_callback=None):
         """
-        Downloads the contents of the requested URI to a stream.
+        Downloads the contents of the requested URI to a file.
+
+        An interrupted download is resumed by the next download of the same URI to the same file. See
+        connection.download_to_file.
 
         Args:
             uri: URI
             file_path: File path destination
+            progress_callback: Function called with the bytes downloaded so far, the total bytes and the elapsed
+                seconds.
 
         Returns:
             bool: Indicates if the file was successfully downloaded.
         """
-        with open(file_path, 'wb') as file:
-            return self._connection.download_to_stream(file, uri)
+        return self._connection.download_to_file(file_path, uri, progress_callback=progress_callback)
 
     def __validate_resource_uri(self, path):
         if self._uri not in path:
@@ -755,16 +1034,24 @@ class ResourceClient(object):
         else:
             return []
 
-    def __do_post(self, uri, resource, timeout, custom_headers):
+    def __do_post(self, uri, resource, timeout, custom_headers, wait=True):
         task, entity = self._connection.post(uri, resource, custom_headers=custom_headers)
+        self.__invalidate_cached(uri)
+
+        if not wait:
+            return self.__submit_task(task, entity)
 
         if not task:
             return entity
 
         return self._task_monitor.wait_for_task(task, timeout)
 
-    def __do_put(self, uri, resource, timeout, custom_headers):
+    def __do_put(self, uri, resource, timeout, custom_headers, wait=True):
         task, body = self._connection.put(uri, resource, custom_headers=custom_headers)
+        self.__invalidate_cached(uri)
+
+        if not wait:
+            return self.__submit_task(task, body)
 
         if not task:
             return body
@@ -781,17 +1068,171 @@ class ResourceClient(object):
             items += members
 
             logger.debug("Response getAll: nextPageUri = {0}, members list length: {1}".format(uri, str(len(members))))
-            uri = self.__get_next_page(response, items, requested_count)
+            next_page = self.__get_next_page(response, len(items), requested_count)
+
+            if next_page and len(items) == len(members) and self._connection.get_page_workers() > 1:
+                remaining_pages = self.__get_remaining_pages(uri, response, members, requested_count)
+                if remaining_pages:
+                    items += self.__do_parallel_requests_to_getall(remaining_pages)
+                    break
+
+            uri = next_page
 
         logger.debug('Total # of members found = {0}'.format(str(len(items))))
         return items
 
-    def __get_next_page(self, response, items, requested_count):
+    def __submit_task(self, task, entity):
+        if not task:
+            return TaskHandle.completed(entity)
+
+        return get_task_scheduler(self._connection).submit(task, self._task_monitor.get_task_response)
+
+    def __get_resource(self, uri):
+        if self._connection.get_response_cache() is None:
+            return self._connection.get(uri)
+
+        return self.__get_cached(uri)
+
+    def __get_resource_if_found(self, uri):
+        try:
+            return self.__get_resource(uri)
+        except HPOneViewException as exception:
+            response = exception.oneview_response
+            if not isinstance(response, dict) or response.get('errorCode') != 'RESOURCE_NOT_FOUND':
+                raise
+            logger.debug('Resource not found (uri = %s)' % uri)
+            return None
+
+    @staticmethod
+    def __get_version(resource):
+        return resource.get('eTag') or resource.get('modified') if isinstance(resource, dict) else None
+
+    def __make_batches(self, uris):
+        collections = OrderedDict()
+        for uri in uris:
+            collections.setdefault(uri.rsplit('/', 1)[0], []).append(uri)
+
+        # A single resource of a collection is retrieved directly
+        return [(collection, collection_uris[i:i + GET_MANY_BATCH_SIZE])
+                for collection, collection_uris in collections.items() if len(collection_uris) > 1
+                for i in range(0, len(collection_uris), GET_MANY_BATCH_SIZE)]
+
+    def __get_batch(self, batch):
+        collection, uris = batch
+        filter = '"{0}"'.format(' OR '.join("uri='{0}'".format(uri) for uri in uris))
+
+        # Only the first page is read, so a collection that ignores the filter costs a single request
+        query_uri = ResourceClient(self._connection, collection).build_query_uri(count=len(uris), filter=filter)
+
+        try:
+            members = self.__get_members(self._connection.get(query_uri))
+        except HPOneViewException as exception:
+            logger.debug('Collection %s cannot be filtered by uri: %s' % (collection, exception.msg))
+            return {}
+
+        uris = set(uris)
+        return dict((member['uri'], member) for member in members if isinstance(member, dict) and member.get('uri') in uris)
+
+    def __get_cached(self, uri):
+        cache = self._connection.get_response_cache()
+        key = (uri, self._connection._apiVersion)
+
+        resource, fresh = cache.get(key)
+        if resource is not None and fresh:
+            logger.debug('Resource served from cache (uri = %s)' % uri)
+            return resource
+
+        if isinstance(resource, dict) and resource.get('eTag'):
+            modified = self._connection.get_if_none_match(uri, resource['eTag'])
+            if modified is None:
+                logger.debug('Resource not modified (uri = %s)' % uri)
+                cache.refresh(key)
+                return resource
+            resource = modified
+        else:
+            resource = self._connection.get(uri)
+
+        if isinstance(resource, dict) and resource.get('eTag'):
+            cache.set(key, resource)
+        return resource
+
+    def __invalidate_cached(self, uri):
+        # A write to a sub-resource, e.g., the power state, also changes the resource it belongs to
+        cache = self._connection.get_response_cache()
+        if cache is not None:
+            cache.invalidate_path(uri)
+
+    def __get_remaining_pages(self, uri, response, members, requested_count):
+        """
+        Computes the URIs of the pages after the first one from the total of items it reports.
+
+        Returns:
+            list: The page URIs, in order, or None when the first page does not report the total.
+        """
+        total = response.get('total')
+        start = re.search(r'[?&]start=(\d+)', uri)
+        page_size = len(members)
+
+        if total is None or not start or not page_size:
+            return None
+
+        first_item = int(start.group(1))
+        last_item = total if requested_count == -1 else min(total, first_item + requested_count)
+
+        return [self.__set_page_window(uri, page_start, min(page_size, last_item - page_start))
+                for page_start in range(first_item + page_size, last_item, page_size)]
+
+    def __set_page_window(self, uri, start, count):
+        uri = re.sub(r'([?&])start=\d+', r'\g<1>start={0}'.format(start), uri, count=1)
+        return re.sub(r'([?&])count=-?\d+', r'\g<1>count={0}'.format(count), uri, count=1)
+
+    def __do_parallel_requests_to_getall(self, page_uris):
+        workers = min(self._connection.get_page_workers(), len(page_uris))
+        logger.debug('Making {0} HTTP requests with {1} workers to get the remaining pages'.format(len(page_uris), workers))
+
+        pool = ThreadPool(workers)
+        try:
+            responses = pool.map(self._connection.get, page_uris)
+        finally:
+            pool.close()
+            pool.join()
+
+        items = []
+        for response in responses:
+            items += self.__get_members(response)
+        return items
+
+    def __find_by(self, field, value, filter, fields, uri, count):
+        filter_again = "." not in field
+        if fields and filter_again and field not in fields.split(','):
+            fields += ',' + field
+
+        query_uri = self.build_query_uri(filter=filter, fields=fields, uri=uri)
+        logger.debug('Finding resources with uri: {0}'.format(query_uri))
+
+        results = []
+        items_count = 0
+        while query_uri:
+            response = self._connection.get(query_uri)
+            members = self.__get_members(response)
+            items_count += len(members)
+            results += [item for item in members if not filter_again or self.__field_matches(item, field, value)]
+            if count != -1 and len(results) >= count:
+                return results[:count]
+            query_uri = self.__get_next_page(response, items_count, -1) if response else None
+
+        return results
+
+    @staticmethod
+    def __field_matches(item, field, value):
+        return str(item.get(field, '')).lower() == str(value).lower()
+
+    def __get_next_page(self, response, items_count, requested_count):
         next_page_is_empty = response.get('nextPageUri') is None
         has_different_next_page = not response.get('uri') == response.get('nextPageUri')
         has_next_page = not next_page_is_empty and has_different_next_page
 
-        if len(items) >= requested_count and requested_count != -1:
+        if items_count >= requested_count and requested_count != -1:
             return None
 
         return response.get('nextPageUri') if has_next_page else None
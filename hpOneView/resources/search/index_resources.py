@@ -85,21 +85,51 @@ class IndexResources(object):
         Returns:
             list: A list of index resources.
         """
-        uri = self.URI + '?'
+        uri = self.__build_query_uri(category, fields, filter, padding, query, reference_uri, sort, user_query, view)
 
-        uri += self.__list_or_str_to_query(category, 'category')
-        uri += self.__list_or_str_to_query(fields, 'fields')
-        uri += self.__list_or_str_to_query(filter, 'filter')
-        uri += self.__list_or_str_to_query(padding, 'padding')
-        uri += self.__list_or_str_to_query(query, 'query')
-        uri += self.__list_or_str_to_query(reference_uri, 'referenceUri')
-        uri += self.__list_or_str_to_query(sort, 'sort')
-        uri += self.__list_or_str_to_query(user_query, 'userQuery')
-        uri += self.__list_or_str_to_query(view, 'view')
+        return self._client.get_all(start=start, count=count, uri=uri)
 
-        uri = uri.replace('?&', '?')
+    def iter_all(self, category='', count=-1, fields='', filter='', padding=0, query='', reference_uri='',
+                 sort='', start=0, user_query='', view=''):
+        """
+        Iterates over the index resources of get_all, retrieving one page at a time.
 
-        return self._client.get_all(start=start, count=count, uri=uri)
+        Args:
+            category (str or list):
+                 Category of resources. Multiple Category parameters are applied with OR condition.
+            count (int):
+                The number of resources to return. A count of -1 requests all items.
+                The actual number of items in the response might differ from the requested
+                count if the sum of start and count exceeds the total number of items.
+            fields (str):
+                Specifies which fields should be returned in the result set.
+            filter (list or str):
+                A general filter/query string to narrow the list of items returned. The
+                default is no filter; all resources are returned.
+            padding (int):
+                Number of resources to be returned before the reference URI resource.
+            query (str):
+                 A general query string to narrow the list of resources returned.
+                 The default is no query - all resources are returned.
+            reference_uri (str):
+                Load one page of resources, pagination is applied with reference to referenceUri provided.
+            sort (str):
+                The sort order of the returned data set. By default, the sort order is based
+                on create time with the oldest entry first.
+            start (int):
+                The first item to return, using 0-based indexing.
+                If not specified, the default is 0 - start with the first available item.
+            user_query (str):
+                Free text Query string to search the resources. This will match the string in any field that is indexed.
+            view (str):
+                Return a specific subset of the attributes of the resource or collection, by specifying the name of a predefined view.
+
+        Returns:
+            generator: The index resources.
+        """
+        uri = self.__build_query_uri(category, fields, filter, padding, query, reference_uri, sort, user_query, view)
+
+        return self._client.iter_all(start=start, count=count, uri=uri)
 
     def get(self, uri):
         """
@@ -153,6 +183,21 @@ class IndexResources(object):
 
         return self._client.get(uri)
 
+    def __build_query_uri(self, category, fields, filter, padding, query, reference_uri, sort, user_query, view):
+        uri = self.URI + '?'
+
+        uri += self.__list_or_str_to_query(category, 'category')
+        uri += self.__list_or_str_to_query(fields, 'fields')
+        uri += self.__list_or_str_to_query(filter, 'filter')
+        uri += self.__list_or_str_to_query(padding, 'padding')
+        uri += self.__list_or_str_to_query(query, 'query')
+        uri += self.__list_or_str_to_query(reference_uri, 'referenceUri')
+        uri += self.__list_or_str_to_query(sort, 'sort')
+        uri += self.__list_or_str_to_query(user_query, 'userQuery')
+        uri += self.__list_or_str_to_query(view, 'view')
+
+        return uri.replace('?&', '?')
+
     def __list_or_str_to_query(self, list_or_str, field_name):
         formated_query = ''
         if list_or_str:
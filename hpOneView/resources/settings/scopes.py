@@ -80,6 +80,51 @@ class Scopes(object):
         """
         return self._client.get_all(start, count, sort=sort, query=query, view=view)
 
+    def iter_all(self, start=0, count=-1, sort='', query='', view=''):
+        """
+        Iterates over the items of get_all, retrieving one page at a time.
+
+        Args:
+            start:
+                The first item to return, using 0-based indexing.
+                If not specified, the default is 0 - start with the first available item.
+            count:
+                The number of resources to return. A count of -1 requests all items.
+                The actual number of items in the response might differ from the requested
+                count if the sum of start and count exceeds the total number of items.
+            sort:
+                The sort order of the returned data set. By default, the sort order is based
+                on create time with the oldest entry first.
+            query:
+                A general query string to narrow the list of resources returned. The default
+                is no query - all resources are returned.
+            view:
+                 Returns a specific subset of the attributes of the resource or collection, by
+                 specifying the name of a predefined view. The default view is expand (show all
+                 attributes of the resource and all elements of collections of resources).
+
+        Returns:
+            generator: The items matching the specified filter.
+        """
+        return self._client.iter_all(start, count, sort=sort, query=query, view=view)
+
+    def sync(self, snapshot=None, query=''):
+        """
+        Gets the resources added, updated and deleted since a previous sync. Only the new and changed
+        resources are retrieved in full.
+
+        Args:
+            snapshot (dict):
+                The snapshot of the previous sync. By default, all the resources are reported as added.
+            query:
+                A general query string to narrow the list of resources returned. The default
+                is no query - all resources are returned.
+
+        Returns:
+            SyncResult: The changes, and the snapshot to pass to the next sync.
+        """
+        return self._client.sync(snapshot, query=query)
+
     def get(self, id_or_uri):
         """
         Gets the Scope with the specified ID or URI.
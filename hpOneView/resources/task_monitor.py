@@ -34,8 +34,12 @@ standard_library.install_aliases()
 import logging
 import time
 
+from collections import OrderedDict
 from errno import ECONNABORTED, ETIMEDOUT, ENOEXEC, EINVAL, ENETUNREACH, ECONNRESET, ENETDOWN, ECONNREFUSED
+from urllib.parse import quote
 from hpOneView.exceptions import HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError, HPOneViewUnknownType
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.resources.task_polling import AdaptivePolling
 
 TASK_PENDING_STATES = ['New', 'Starting', 'Pending', 'Running', 'Suspended', 'Stopping']
 TASK_ERROR_STATES = ['Error', 'Warning', 'Terminated', 'Killed']
@@ -49,9 +53,26 @@ MSG_INVALID_TASK = 'Invalid task was provided'
 
 UNLIMITED_TIMEOUT = -1
 
+TASKS_URI = '/rest/tasks'
+
+# Maximum number of tasks retrieved by a single filtered request
+TASKS_BATCH_SIZE = 50
+
+DELETED_TASK_NAMES = ['Delete',
+                      'Remove',
+                      'Delete server hardware type',
+                      'Remove SAN manager']
+
 logger = logging.getLogger(__name__)
 
 
+def is_delete_task(task):
+    """
+    Checks if the task deletes its associated resource, in which case there is no resource to return.
+    """
+    return 'name' in task and task['name'] in DELETED_TASK_NAMES
+
+
 class TaskMonitor(object):
     # Seconds to wait when a network failure occurs
     CONNECTION_FAILURE_TIMEOUT = 90
@@ -60,79 +81,263 @@ class TaskMonitor(object):
     CONNECTION_FAILURE_ERROR_NUMBERS = [ENOEXEC, EINVAL, ENETUNREACH, ETIMEDOUT, ECONNRESET,
                                         ECONNABORTED, ENETUNREACH, ENETDOWN, ECONNREFUSED]
 
-    def __init__(self, con):
+    def __init__(self, con, polling=None):
         self._connection = con
+        self._polling = polling or AdaptivePolling()
 
     @staticmethod
     def get_current_seconds():
         return int(time.time())
 
-    def wait_for_task(self, task, timeout=-1):
+    def wait_for_task(self, task, timeout=-1, polling=None):
         """
         Wait for task execution and return associated resource.
 
         Args:
             task: task dict
             timeout: timeout in seconds
+            polling (PollingStrategy): Overrides the polling strategy of the monitor for this task.
 
         Returns:
             Associated resource when creating or updating; True when deleting.
         """
-        self.__wait_task_completion(task, timeout)
+        self.__wait_task_completion(task, timeout, polling)
 
         task = self.get(task)
 
         logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
         logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
 
-        task_response = self.__get_task_response(task)
+        task_response = self.get_task_response(task)
         logger.debug('Task completed')
         return task_response
 
-    def get_completed_task(self, task, timeout=-1):
+    def get_completed_task(self, task, timeout=-1, polling=None):
         """
         Waits until the task is completed and returns the task resource.
 
         Args:
             task: TaskResource
             timeout: Timeout in seconds
+            polling (PollingStrategy): Overrides the polling strategy of the monitor for this task.
 
         Returns:
             dict: TaskResource
         """
-        self.__wait_task_completion(task, timeout)
+        self.__wait_task_completion(task, timeout, polling)
 
         return self.get(task)
 
-    def __wait_task_completion(self, task, timeout):
+    def wait_for_tasks(self, tasks, timeout=-1, polling=None):
+        """
+        Waits for many tasks at once and yields each task resource as soon as it is completed.
+
+        All the pending tasks are checked together on each polling cycle, with a request to the tasks collection
+        filtered by uri for up to 50 tasks. The tasks the collection does not return are checked individually.
+
+        Args:
+            tasks (list): Task resources.
+            timeout: Timeout in seconds to wait for all the tasks.
+            polling (PollingStrategy): Overrides the polling strategy of the monitor.
+
+        Returns:
+            generator: The completed task resources, in order of completion.
+
+        Raises:
+            HPOneViewTimeout: When the timeout is reached before all the tasks are completed.
+        """
+        if tasks is None or not all(tasks):
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        polling = polling or self._polling
+
+        start_time = self.get_current_seconds()
+        polling_start_time = time.time()
+        last_success = self.get_current_seconds()
+
+        pending_tasks = OrderedDict()
+        for task in tasks:
+            if 'uri' in task:
+                pending_tasks[task['uri']] = task
+            else:
+                yield task
+
+        attempt = 0
+        while pending_tasks:
+            try:
+                current_tasks = self.get_tasks(list(pending_tasks))
+                last_success = self.get_current_seconds()
+            except Exception as error:
+                logger.error('; '.join(str(e) for e in error.args) + ' when waiting for tasks')
+                if getattr(error, 'errno', None) not in self.CONNECTION_FAILURE_ERROR_NUMBERS:
+                    raise
+                if last_success + self.CONNECTION_FAILURE_TIMEOUT < self.get_current_seconds():
+                    # Timeout reached
+                    raise
+                current_tasks = []
+
+            for task in current_tasks:
+                if task.get('taskState') in TASK_PENDING_STATES:
+                    pending_tasks[task['uri']] = task
+                elif pending_tasks.pop(task['uri'], None) is not None:
+                    yield task
+
+            if not pending_tasks:
+                break
+
+            if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
+                raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+
+            logger.debug('Waiting for %d tasks' % len(pending_tasks))
+
+            # The progress of the task closest to completion sets the time of the next check
+            most_advanced_task = max(pending_tasks.values(), key=lambda task: task.get('computedPercentComplete') or 0)
+
+            attempt += 1
+            self.wait_for_change(list(pending_tasks),
+                                 polling.next_delay(attempt, most_advanced_task, time.time() - polling_start_time),
+                                 self.__get_deadline(start_time, timeout))
+
+    def wait_for_change(self, uris, delay, deadline=None, wakeup=None):
+        """
+        Waits before the next check of pending tasks.
+
+        When the connection has task events available, e.g., from an ScmbSubscriber, this waits until one of the tasks
+        is reported completed, or for the safety interval of the events at most. Otherwise, it sleeps for the polling
+        delay.
+
+        Args:
+            uris (list): URIs of the pending tasks.
+            delay: Seconds to wait when polling.
+            deadline: Time, in get_current_seconds, after which the events are no longer awaited.
+            wakeup (threading.Event): Ends the wait early when it is set with wake, e.g., when a new task is pending.
+
+        Returns:
+            dict: The tasks reported completed by the events, keyed by URI.
+        """
+        task_events = self._connection.get_task_events()
+        if task_events is None or not task_events.available:
+            if wakeup is None:
+                time.sleep(delay)
+            else:
+                wakeup.wait(delay)
+            return {}
+
+        wait_time = task_events.safety_interval
+        if deadline is not None:
+            # Waits a second past the deadline, so it is detected by the next check
+            wait_time = min(wait_time, deadline - self.get_current_seconds() + 1)
+        if wakeup is None:
+            return task_events.wait(uris, max(wait_time, 0))
+        return task_events.wait(uris, max(wait_time, 0), wakeup)
+
+    def wake(self, wakeup):
+        """
+        Sets a wakeup event and ends the waits for change given that event.
+
+        Args:
+            wakeup (threading.Event): The event passed to wait_for_change.
+        """
+        wakeup.set()
+        task_events = self._connection.get_task_events()
+        if task_events is not None:
+            task_events.interrupt()
+
+    def get_tasks(self, uris):
+        """
+        Retrieves many tasks with as few requests as possible.
+
+        Args:
+            uris (list): Task URIs.
+
+        Returns:
+            list: The task resources, in the order of the URIs.
+        """
+        tasks = []
+        for i in range(0, len(uris), TASKS_BATCH_SIZE):
+            batch = uris[i:i + TASKS_BATCH_SIZE]
+            found_tasks = self.__get_tasks_batch(batch) if len(batch) > 1 else {}
+            tasks += [found_tasks[uri] if uri in found_tasks else self._connection.get(uri) for uri in batch]
+        return tasks
+
+    def __get_tasks_batch(self, uris):
+        filter = '"{0}"'.format(' OR '.join("uri='{0}'".format(uri) for uri in uris))
+        uri = '{0}?filter={1}&start=0&count={2}'.format(TASKS_URI, quote(filter), len(uris))
+
+        try:
+            response = self._connection.get(uri)
+        except HPOneViewException as exception:
+            logger.debug('Tasks cannot be filtered by uri: %s' % exception.msg)
+            return {}
+
+        uris = set(uris)
+        return dict((task['uri'], task) for task in (response or {}).get('members') or [] if task.get('uri') in uris)
+
+    def __wait_task_completion(self, task, timeout, polling=None):
         if not task:
             raise HPOneViewUnknownType(MSG_INVALID_TASK)
 
         logger.debug('Waiting for task completion...')
 
+        polling = polling or self._polling
+
         # gets current cpu second for timeout
         start_time = self.get_current_seconds()
-        connection_failure_control = dict(last_success=self.get_current_seconds())
+        polling_start_time = time.time()
+        connection_failure_control = dict(last_success=self.get_current_seconds(), last_task=task)
 
-        i = 0
+        attempt = 0
         while self.is_task_running(task, connection_failure_control):
-            # wait 1 to 10 seconds
-            # the value increases to avoid flooding server with requests
-            i = i + 1 if i < 10 else 10
-
-            logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
-            logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
-
-            time.sleep(i)
+            attempt += 1
+            last_task = connection_failure_control['last_task']
+
+            logger.debug("Waiting for task. Percentage complete: " + str(last_task.get('computedPercentComplete')))
+            logger.debug("Waiting for task. Task state: " + str(last_task.get('taskState')))
+
+            completed_tasks = self.wait_for_change([task['uri']],
+                                                   polling.next_delay(attempt, last_task, time.time() - polling_start_time),
+                                                   self.__get_deadline(start_time, timeout))
+            if task['uri'] in completed_tasks:
+                logger.debug('Task completion received from the task events')
+                break
             if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
                 raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
 
-    def __get_task_response(self, task):
-        deleted_states = ['Delete',
-                          'Remove',
-                          'Delete server hardware type',
-                          'Remove SAN manager']
+    @staticmethod
+    def __get_deadline(start_time, timeout):
+        return None if timeout == UNLIMITED_TIMEOUT else start_time + timeout
+
+    def get_task_response(self, task):
+        """
+        Gets the result of a completed task.
+
+        Args:
+            task (dict): Completed task resource.
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+        """
+        self.raise_for_task_error(task)
 
+        if is_delete_task(task):
+            return True
+
+        if 'type' in task and task['type'].startswith('Task'):
+            # get associated resource when is not a delete task
+            task, entity = self.get_associated_resource(task)
+            return entity
+
+        logger.warning('Task completed, unknown response: ' + str(task))
+        return task
+
+    @staticmethod
+    def raise_for_task_error(task):
+        """
+        Raises an HPOneViewTaskError when the task finished in an error state.
+
+        Args:
+            task (dict): OneView Task resource.
+        """
         if task['taskState'] in TASK_ERROR_STATES and task['taskState'] != 'Warning':
             msg = None
             error_code = None
@@ -150,17 +355,6 @@ class TaskMonitor(object):
             else:
                 raise HPOneViewTaskError(MSG_UNKNOWN_EXCEPTION, error_code)
 
-        if 'name' in task and task['name'] in deleted_states:
-            return True
-
-        if 'type' in task and task['type'].startswith('Task'):
-            # get associated resource when is not a delete task
-            task, entity = self.get_associated_resource(task)
-            return entity
-
-        logger.warning('Task completed, unknown response: ' + str(task))
-        return task
-
     def is_task_running(self, task, connection_failure_control=None):
         """
         Check if a task is running according to: TASK_PENDING_STATES ['New', 'Starting',
@@ -169,7 +363,8 @@ class TaskMonitor(object):
         Args:
             task (dict): OneView Task resource.
             connection_failure_control (dict):
-                A dictionary instance that contains last_success for error tolerance control.
+                A dictionary instance that contains last_success for error tolerance control. The task retrieved is
+                kept in its last_task key.
 
         Examples:
 
@@ -186,6 +381,7 @@ class TaskMonitor(object):
                 if connection_failure_control:
                     # Updates last success
                     connection_failure_control['last_success'] = self.get_current_seconds()
+                    connection_failure_control['last_task'] = task
                 if 'taskState' in task and task['taskState'] in TASK_PENDING_STATES:
                     return True
 
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+"""
+Strategies that decide how long the TaskMonitor waits between two requests to check the state of a task.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import random
+
+
+class PollingStrategy(object):
+    """
+    Base class of the polling strategies.
+    """
+
+    def next_delay(self, attempt, task, elapsed):
+        """
+        Gets the time to wait before checking the task again.
+
+        Args:
+            attempt (int): Number of times the task was found running, starting at 1.
+            task (dict): Last task resource retrieved.
+            elapsed (float): Seconds since the monitor started waiting for the task.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        raise NotImplementedError()
+
+
+class LinearPolling(PollingStrategy):
+    """
+    Waits 1 second more after each check, up to max_delay seconds.
+    """
+
+    def __init__(self, max_delay=10):
+        self.max_delay = max_delay
+
+    def next_delay(self, attempt, task, elapsed):
+        return min(attempt, self.max_delay)
+
+
+class AdaptivePolling(PollingStrategy):
+    """
+    Checks the task again after initial_delay seconds, then backs off exponentially up to max_delay seconds.
+
+    While the task reports its computedPercentComplete, the completion time is estimated from its progress rate, and
+    the task is checked at the estimated completion when that comes sooner than the backoff delay. A random jitter
+    of +/- jitter times the delay spreads the requests of tasks started together.
+    """
+
+    def __init__(self, initial_delay=0.25, max_delay=30, multiplier=2, jitter=0.1):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def next_delay(self, attempt, task, elapsed):
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+
+        estimated_remaining = self.estimate_remaining_time(task, elapsed)
+        if estimated_remaining is not None:
+            delay = max(self.initial_delay, min(delay, estimated_remaining))
+
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    @staticmethod
+    def estimate_remaining_time(task, elapsed):
+        """
+        Estimates the seconds left to complete a task from its progress rate.
+
+        Args:
+            task (dict): Task resource.
+            elapsed (float): Seconds during which the task made its current progress.
+
+        Returns:
+            float: Estimated seconds, or None when the task does not report a partial progress.
+        """
+        percent_complete = (task or {}).get('computedPercentComplete')
+        if not percent_complete or percent_complete >= 100 or elapsed <= 0:
+            return None
+
+        return elapsed * (100 - percent_complete) / percent_complete
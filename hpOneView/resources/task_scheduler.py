@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+"""
+Non-blocking waiting for tasks: the tasks submitted through a connection are tracked by a single background thread,
+and each caller gets a TaskHandle to check its task or wait for its result.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+from hpOneView.exceptions import HPOneViewTimeout
+from hpOneView.resources.task_monitor import TaskMonitor, TASK_PENDING_STATES, MSG_TIMEOUT
+from hpOneView.resources.task_polling import AdaptivePolling
+
+logger = logging.getLogger(__name__)
+
+_schedulers = WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_task_scheduler(con):
+    """
+    Gets the task scheduler shared by all the resource clients of a connection.
+
+    Args:
+        con (connection): Connection to the appliance.
+
+    Returns:
+        TaskScheduler:
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(con)
+        if scheduler is None:
+            scheduler = _schedulers[con] = TaskScheduler(TaskMonitor(con))
+        return scheduler
+
+
+def get_percent_complete(task):
+    return (task or {}).get('computedPercentComplete') or 0
+
+
+class TaskHandle(object):
+    """
+    Future-like handle of a task that was submitted without waiting for its completion.
+    """
+
+    def __init__(self, task=None, get_result=None):
+        self._task = task
+        self._get_result = get_result
+        self._completed = threading.Event()
+        self._lock = threading.Lock()
+        self._has_result = False
+        self._result = None
+        self._exception = None
+
+    @classmethod
+    def completed(cls, result):
+        """
+        Creates a handle for an operation the appliance completed synchronously.
+
+        Args:
+            result: Result of the operation.
+
+        Returns:
+            TaskHandle:
+        """
+        handle = cls()
+        handle._result = result
+        handle._has_result = True
+        handle._completed.set()
+        return handle
+
+    @property
+    def task(self):
+        """
+        Gets the last task resource retrieved, or None when the operation did not start a task.
+        """
+        return self._task
+
+    def progress(self):
+        """
+        Gets the percentage of completion of the task.
+
+        Returns:
+            int: computedPercentComplete of the last task resource retrieved; 100 when the task is completed.
+        """
+        if self.done():
+            return 100
+        return get_percent_complete(self._task)
+
+    def done(self):
+        """
+        Returns:
+            bool: True when the task is completed.
+        """
+        return self._completed.is_set()
+
+    def result(self, timeout=None):
+        """
+        Waits for the task completion and returns its result.
+
+        Args:
+            timeout: Timeout in seconds. Waits for the completion by default.
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+
+        Raises:
+            HPOneViewTimeout: When the task is not completed after timeout seconds.
+            HPOneViewTaskError: When the task failed.
+        """
+        if not self._completed.wait(timeout):
+            raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+
+        with self._lock:
+            if not self._has_result and self._exception is None:
+                try:
+                    self._result = self._get_result(self._task)
+                    self._has_result = True
+                except Exception as exception:
+                    self._exception = exception
+
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def _set_task(self, task):
+        self._task = task
+        if task.get('taskState') not in TASK_PENDING_STATES:
+            self._completed.set()
+
+    def _set_exception(self, exception):
+        self._exception = exception
+        self._completed.set()
+
+
+class TaskScheduler(object):
+    """
+    Tracks the submitted tasks from a single background thread.
+
+    On each polling cycle, all the pending tasks are retrieved together with TaskMonitor.get_tasks. The thread stops
+    when there are no pending tasks left, and starts again with the next submission.
+    """
+
+    def __init__(self, task_monitor, polling=None):
+        self._task_monitor = task_monitor
+        self._polling = polling or AdaptivePolling()
+        self._pending_handles = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._restart_polling = False
+        # Set by submit, so the polling thread stops waiting and checks the new task
+        self._wakeup = threading.Event()
+
+    def submit(self, task, get_result=None):
+        """
+        Starts tracking a task.
+
+        Args:
+            task (dict): Task resource returned by the appliance.
+            get_result: Function that gets the result from the completed task resource. By default, it is the
+                associated resource, as returned by TaskMonitor.wait_for_task.
+
+        Returns:
+            TaskHandle:
+        """
+        handle = TaskHandle(task, get_result or self._task_monitor.get_task_response)
+
+        if 'uri' not in task:
+            handle._completed.set()
+            return handle
+
+        with self._lock:
+            self._pending_handles.setdefault(task['uri'], []).append(handle)
+            # A new task is checked soon, regardless of the backoff reached by the others
+            self._restart_polling = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name='TaskScheduler')
+                self._thread.daemon = True
+                self._thread.start()
+
+        self._task_monitor.wake(self._wakeup)
+        return handle
+
+    def pending_count(self):
+        """
+        Returns:
+            int: Number of tasks not completed yet.
+        """
+        with self._lock:
+            return len(self._pending_handles)
+
+    def __run(self):
+        attempt = 0
+        polling_start_time = time.time()
+        last_success = TaskMonitor.get_current_seconds()
+
+        while True:
+            with self._lock:
+                if not self._pending_handles:
+                    self._thread = None
+                    return
+                if self._restart_polling:
+                    self._restart_polling = False
+                    attempt = 0
+                    polling_start_time = time.time()
+                # A task submitted from now on ends the next wait, and the URIs are listed again
+                self._wakeup.clear()
+                uris = list(self._pending_handles)
+
+            try:
+                tasks = self._task_monitor.get_tasks(uris)
+                last_success = TaskMonitor.get_current_seconds()
+            except Exception as error:
+                logger.error('; '.join(str(e) for e in error.args) + ' when waiting for the submitted tasks')
+                if getattr(error, 'errno', None) not in TaskMonitor.CONNECTION_FAILURE_ERROR_NUMBERS:
+                    self.__fail(uris, error)
+                elif last_success + TaskMonitor.CONNECTION_FAILURE_TIMEOUT < TaskMonitor.get_current_seconds():
+                    # Timeout reached
+                    self.__fail(uris, error)
+                tasks = []
+
+            most_advanced_task = None
+            with self._lock:
+                for task in tasks:
+                    handles = self._pending_handles.get(task['uri'], [])
+                    for handle in handles:
+                        handle._set_task(task)
+                    if task.get('taskState') not in TASK_PENDING_STATES:
+                        self._pending_handles.pop(task['uri'], None)
+                    elif get_percent_complete(task) >= get_percent_complete(most_advanced_task):
+                        # The progress of the task closest to completion sets the time of the next check
+                        most_advanced_task = task
+
+                if not self._pending_handles:
+                    continue
+
+            attempt += 1
+            self._task_monitor.wait_for_change(
+                uris, self._polling.next_delay(attempt, most_advanced_task, time.time() - polling_start_time),
+                wakeup=self._wakeup)
+
+    def __fail(self, uris, error):
+        with self._lock:
+            for uri in uris:
+                for handle in self._pending_handles.pop(uri, []):
+                    handle._set_exception(error)
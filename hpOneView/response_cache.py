@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+"""
+response_cache.py
+~~~~~~~~~~~~~~~~~
+
+This module keeps the resources retrieved from the appliance so they can be revalidated by eTag instead of downloaded
+again.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import copy
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class ResponseCache(object):
+    """
+    Least recently used cache of resources, keyed by URI and API version.
+
+    A resource is served from the cache for ttl seconds after it was retrieved or revalidated. After that, it must be
+    revalidated with the appliance using its eTag. At most max_size resources are kept; the least recently used
+    one is evicted first.
+
+    The cache keeps and returns copies of the resources, so the callers can change the dictionaries they get.
+    """
+    DEFAULT_MAX_SIZE = 256
+    DEFAULT_TTL = 30
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        self._max_size = int(max_size)
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def ttl(self):
+        return self._ttl
+
+    def get(self, key):
+        """
+        Gets a cached resource.
+
+        Args:
+            key: Tuple with the resource URI and the API version.
+
+        Returns:
+            tuple: A copy of the resource, or None when it is not cached, and whether it is still fresh.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self.__move_to_end(key, entry)
+            resource, stored_at = entry
+
+        return copy.deepcopy(resource), stored_at + self._ttl >= time.time()
+
+    def set(self, key, resource):
+        """
+        Caches a resource, evicting the least recently used ones when the cache is full.
+
+        Args:
+            key: Tuple with the resource URI and the API version.
+            resource (dict): Resource retrieved from the appliance.
+        """
+        if self._max_size <= 0:
+            return
+
+        resource = copy.deepcopy(resource)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (resource, time.time())
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key):
+        """
+        Restarts the time to live of a resource the appliance reported as not modified.
+
+        Args:
+            key: Tuple with the resource URI and the API version.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], time.time())
+
+    def invalidate(self, key):
+        """
+        Removes a resource from the cache.
+
+        Args:
+            key: Tuple with the resource URI and the API version.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_uri(self, uri):
+        """
+        Removes a resource from the cache for all the API versions.
+
+        Args:
+            uri: URI of the resource.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == uri]:
+                del self._entries[key]
+
+    def invalidate_path(self, uri):
+        """
+        Removes a resource from the cache for all the API versions, along with the resources that contain it. For
+        example, a write to /rest/server-hardware/1/powerState also removes /rest/server-hardware/1.
+
+        Args:
+            uri: URI of the resource written.
+        """
+        uri = uri.split('?')[0]
+        with self._lock:
+            for key in [key for key in self._entries if uri == key[0] or uri.startswith(key[0].rstrip('/') + '/')]:
+                del self._entries[key]
+
+    def invalidate_prefix(self, uri):
+        """
+        Removes a collection from the cache for all the API versions, along with all the resources under it. For
+        example, a bulk delete from /rest/ethernet-networks removes /rest/ethernet-networks/1 and its sub-resources.
+
+        Args:
+            uri: URI of the collection.
+        """
+        prefix = uri.split('?')[0].rstrip('/')
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == prefix or key[0].startswith(prefix + '/')]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Removes all the resources from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __move_to_end(self, key, entry):
+        # OrderedDict.move_to_end is not available on Python 2.7
+        del self._entries[key]
+        self._entries[key] = entry
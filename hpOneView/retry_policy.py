@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+"""
+retry_policy.py
+~~~~~~~~~~~~~~~
+
+This module decides which failed requests to the appliance are sent again, and when.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import http.client
+import logging
+import random
+import socket
+import threading
+import time
+
+from email.utils import mktime_tz, parsedate_tz
+from errno import ECONNREFUSED
+
+from hpOneView.exceptions import HPOneViewCircuitOpen
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+RETRIABLE_STATUSES = (429, 503)
+UNAVAILABLE_STATUSES = (502, 503, 504)
+
+CIRCUIT_OPEN = 'Requests to %s are suspended for %d seconds after %d consecutive failures'
+
+
+class CircuitBreaker(object):
+    """
+    Stops sending requests to an appliance that keeps failing.
+
+    After failure_threshold consecutive failures, the circuit opens and requests fail immediately for reset_timeout
+    seconds. Then a single request is let through: the circuit closes when it succeeds and opens again when it fails.
+    """
+
+    def __init__(self, key, failure_threshold=5, reset_timeout=30):
+        self._key = key
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_request(self):
+        """
+        Checks that a request can be sent.
+
+        Raises:
+            HPOneViewCircuitOpen: When the circuit is open.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self._reset_timeout - time.time()
+            if remaining <= 0 and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return
+        raise HPOneViewCircuitOpen(CIRCUIT_OPEN % (self._key, max(0, remaining), self._failures))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_progress or self._failures >= self._failure_threshold:
+                if self._opened_at is None:
+                    logger.warning('Suspending the requests to %s after %d consecutive failures' %
+                                   (self._key, self._failures))
+                self._opened_at = time.time()
+                self._trial_in_progress = False
+
+
+class RetryPolicy(object):
+    """
+    Sends a request again when it failed for a reason that may be transient.
+
+    A request is attempted up to max_attempts times, and is not retried when the next attempt would start more than
+    deadline seconds after the first one. The delay between two attempts starts at initial_delay seconds and backs off
+    exponentially up to max_delay seconds, with a random jitter of +/- jitter times the delay. A Retry-After header
+    sent by the appliance replaces the computed delay.
+
+    Network errors are only retried for idempotent methods, since a POST or a PATCH may have been processed before
+    the connection failed. The exception is a refused connection, which never reached the appliance. Responses with
+    a status in retry_statuses, 429 and 503 by default, are retried for every method, since the appliance did not
+    process the request.
+
+    When circuit_failure_threshold is set, a CircuitBreaker per appliance stops sending requests to an appliance
+    after that number of consecutive network errors or 502, 503 and 504 responses, for circuit_reset_timeout seconds.
+
+    The same policy can be shared by several connections.
+    """
+    DEFAULT_MAX_ATTEMPTS = 5
+    DEFAULT_DEADLINE = 120
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, deadline=DEFAULT_DEADLINE, initial_delay=1, max_delay=30,
+                 multiplier=2, jitter=0.1, retry_statuses=RETRIABLE_STATUSES, idempotent_methods=IDEMPOTENT_METHODS,
+                 circuit_failure_threshold=None, circuit_reset_timeout=30):
+        self.max_attempts = max(1, int(max_attempts))
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_statuses = tuple(retry_statuses)
+        self.idempotent_methods = tuple(method.upper() for method in idempotent_methods)
+        self.circuit_failure_threshold = circuit_failure_threshold
+        self.circuit_reset_timeout = circuit_reset_timeout
+        self._circuit_breakers = {}
+        self._lock = threading.Lock()
+
+    def get_circuit_breaker(self, key):
+        """
+        Gets the circuit breaker of an appliance.
+
+        Args:
+            key: Hashable that identifies the appliance.
+
+        Returns:
+            CircuitBreaker: The circuit breaker, or None when the circuit breakers are disabled.
+        """
+        if not self.circuit_failure_threshold:
+            return None
+        with self._lock:
+            circuit_breaker = self._circuit_breakers.get(key)
+            if circuit_breaker is None:
+                circuit_breaker = CircuitBreaker(key, self.circuit_failure_threshold, self.circuit_reset_timeout)
+                self._circuit_breakers[key] = circuit_breaker
+            return circuit_breaker
+
+    def execute(self, method, key, send, on_retry=None):
+        """
+        Sends a request, and sends it again while it fails for a reason that may be transient.
+
+        Args:
+            method: HTTP method of the request.
+            key: Hashable that identifies the appliance.
+            send: Function that sends the request once and returns a tuple with the response and its body.
+            on_retry: Function called with the delay in seconds before the request is sent again.
+
+        Returns:
+            tuple: The response and the body of the last attempt.
+
+        Raises:
+            HPOneViewCircuitOpen: When the circuit of the appliance is open.
+            Exception: The error of the last attempt, when it was not retried.
+        """
+        circuit_breaker = self.get_circuit_breaker(key)
+        start_time = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            if circuit_breaker:
+                circuit_breaker.before_request()
+
+            try:
+                resp, body = send()
+            except (http.client.HTTPException, socket.error) as error:
+                if circuit_breaker:
+                    circuit_breaker.record_failure()
+                delay = self.next_delay(attempt)
+                if not self.is_retriable_error(method, error) or not self.__can_retry(attempt, start_time, delay):
+                    raise
+                logger.warning('%s request to %s failed: %s. Trying again in %.1f seconds...' %
+                               (method, key, repr(error), delay))
+            else:
+                if circuit_breaker:
+                    if resp.status in UNAVAILABLE_STATUSES:
+                        circuit_breaker.record_failure()
+                    else:
+                        circuit_breaker.record_success()
+                if resp.status not in self.retry_statuses:
+                    return resp, body
+                delay = self.next_delay(attempt, resp.getheader('Retry-After'))
+                if not self.__can_retry(attempt, start_time, delay):
+                    return resp, body
+                logger.warning('%s request to %s returned %d. Trying again in %.1f seconds...' %
+                               (method, key, resp.status, delay))
+
+            if on_retry:
+                on_retry(delay)
+            time.sleep(delay)
+
+    def is_retriable_error(self, method, error):
+        """
+        Checks if a request that failed with a network error can be sent again.
+
+        Args:
+            method: HTTP method of the request.
+            error: Network error.
+
+        Returns:
+            bool: True when the method is idempotent or the connection was refused.
+        """
+        if getattr(error, 'errno', None) == ECONNREFUSED:
+            return True
+        return method.upper() in self.idempotent_methods
+
+    def next_delay(self, attempt, retry_after=None):
+        """
+        Gets the time to wait before the next attempt.
+
+        Args:
+            attempt (int): Number of attempts made, starting at 1.
+            retry_after (str): Value of the Retry-After header of the last response, in seconds or as an HTTP date.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        requested_delay = parse_retry_after(retry_after)
+        if requested_delay is not None:
+            return requested_delay
+
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def __can_retry(self, attempt, start_time, delay):
+        if attempt >= self.max_attempts:
+            return False
+        return self.deadline is None or time.time() + delay - start_time <= self.deadline
+
+
+def parse_retry_after(retry_after):
+    """
+    Parses the value of a Retry-After header.
+
+    Returns:
+        float: Seconds to wait, or None when there is no valid value.
+    """
+    if not retry_after:
+        return None
+    try:
+        return max(0, float(retry_after))
+    except ValueError:
+        pass
+    date = parsedate_tz(retry_after)
+    if date is None:
+        return None
+    return max(0, mktime_tz(date) - time.time())
@@ -0,0 +1,532 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+scmb.py
+~~~~~~~
+
+This module subscribes to the State-Change Message Bus (SCMB) of the appliance, an AMQP exchange where OneView
+publishes a message for every resource created, updated or deleted. The messages keep the response cache and the
+inventory stores up to date without polling the appliance.
+
+Connecting to the appliance requires the amqp package.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import logging
+import os
+import socket
+import ssl
+import threading
+import time
+
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.resources.task_monitor import TASK_COMPLETED_STATES, TASKS_URI
+from hpOneView.serializer import JsonSerializer
+
+logger = logging.getLogger(__name__)
+
+SCMB_EXCHANGE = 'scmb'
+SCMB_TASKS_ROUTING_KEY = 'scmb.tasks.#'
+SCMB_PORT = 5671
+SCMB_AMQP_NOT_INSTALLED = 'The amqp package is required to connect to the State-Change Message Bus'
+
+CHANGE_TYPE_CREATED = 'Created'
+CHANGE_TYPE_UPDATED = 'Updated'
+CHANGE_TYPE_DELETED = 'Deleted'
+
+CA_FILE_NAME = 'caroot.pem'
+CERT_FILE_NAME = 'client.pem'
+KEY_FILE_NAME = 'key.pem'
+
+
+class ScmbMessage(object):
+    """
+    State change of a resource published on the SCMB.
+
+    Attributes:
+        change_type: Created, Updated or Deleted.
+        resource_uri: URI of the changed resource.
+        etag: eTag of the resource after the change.
+        resource (dict): The resource after the change, when the message includes it.
+        routing_key: Routing key of the message, e.g., scmb.server-hardware.Updated./rest/server-hardware/1.
+        timestamp: Date of the change.
+        body (dict): The decoded message.
+    """
+
+    def __init__(self, change_type, resource_uri, etag=None, resource=None, routing_key=None, timestamp=None,
+                 body=None):
+        self.change_type = change_type
+        self.resource_uri = resource_uri
+        self.etag = etag
+        self.resource = resource
+        self.routing_key = routing_key
+        self.timestamp = timestamp
+        self.body = body
+
+    @property
+    def category(self):
+        """
+        Gets the category of the changed resource, e.g., server-hardware.
+        """
+        if isinstance(self.resource, dict) and self.resource.get('category'):
+            return self.resource['category']
+        if self.routing_key and self.routing_key.count('.') >= 2:
+            return self.routing_key.split('.')[1]
+        return None
+
+
+class ScmbListener(object):
+    """
+    Receives the messages of an ScmbSubscriber. The methods do nothing by default, so subclasses only override those
+    they need.
+    """
+
+    def on_message(self, message):
+        """
+        Called for each message received.
+
+        Args:
+            message (ScmbMessage): The message.
+        """
+        pass
+
+    def on_connected(self):
+        """
+        Called when the subscriber starts consuming the messages.
+        """
+        pass
+
+    def on_connection_lost(self):
+        """
+        Called when the subscriber stops consuming the messages because the connection was lost or closed, so
+        messages may be missed.
+        """
+        pass
+
+
+class ResponseCacheInvalidator(ScmbListener):
+    """
+    Removes the changed resources from a response cache.
+
+    The cached resources are removed rather than replaced, since the resource in a message is not necessarily in the
+    API version of the cached one. The whole cache is cleared when the connection is lost.
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+
+    def on_message(self, message):
+        self._cache.invalidate_uri(message.resource_uri)
+
+    def on_connection_lost(self):
+        self._cache.clear()
+
+
+class InventoryStoreUpdater(ScmbListener):
+    """
+    Applies the changes to an inventory store.
+
+    Created and updated resources are stored when they are already in the store or belong to one of its refreshed
+    collections. A change whose message does not include the resource removes the stored one, so the next refresh of
+    its collection retrieves it again.
+    """
+
+    def __init__(self, store):
+        self._store = store
+
+    def on_message(self, message):
+        uri = message.resource_uri
+        if not uri:
+            return
+
+        if message.change_type == CHANGE_TYPE_DELETED:
+            self._store.remove(uri)
+        elif uri in self._store or uri.rsplit('/', 1)[0] in self._store.get_collections():
+            resource = message.resource
+            if isinstance(resource, dict) and resource.get('uri') == uri:
+                self._store.put(resource)
+            else:
+                self._store.remove(uri)
+
+
+class TaskEventListener(ScmbListener):
+    """
+    Reports the tasks completed according to the scmb.tasks messages, so the task monitors of a connection wait for
+    the tasks instead of polling them. See connection.set_task_events.
+
+    The most recent completed tasks are kept, so a task completed just before a monitor starts waiting for it is
+    reported as well. While the message bus is unavailable, the monitors go back to polling.
+    """
+    DEFAULT_SAFETY_INTERVAL = 60
+    MAX_COMPLETED_TASKS = 10000
+
+    def __init__(self, safety_interval=DEFAULT_SAFETY_INTERVAL):
+        """
+        Args:
+            safety_interval: Maximum number of seconds a monitor waits for a message before checking its tasks anyway,
+                in case a message was missed.
+        """
+        self.safety_interval = safety_interval
+        self._available = False
+        self._completed_tasks = OrderedDict()
+        self._condition = threading.Condition()
+
+    @property
+    def available(self):
+        """
+        Gets whether the subscriber is connected to the message bus.
+        """
+        return self._available
+
+    def on_connected(self):
+        with self._condition:
+            self._available = True
+
+    def on_connection_lost(self):
+        with self._condition:
+            self._available = False
+            self._condition.notify_all()
+
+    def on_message(self, message):
+        uri = message.resource_uri
+        if not uri or not uri.startswith(TASKS_URI + '/') or not isinstance(message.resource, dict):
+            return
+        if message.resource.get('taskState') not in TASK_COMPLETED_STATES:
+            return
+
+        with self._condition:
+            self._completed_tasks.pop(uri, None)
+            self._completed_tasks[uri] = message.resource
+            while len(self._completed_tasks) > self.MAX_COMPLETED_TASKS:
+                self._completed_tasks.popitem(last=False)
+            self._condition.notify_all()
+
+    def wait(self, uris, timeout, wakeup=None):
+        """
+        Waits until one of the tasks is completed.
+
+        Args:
+            uris (list): URIs of the tasks.
+            timeout: Maximum number of seconds to wait.
+            wakeup (threading.Event): Ends the wait when it is set. It must be set before calling interrupt.
+
+        Returns:
+            dict: The completed tasks keyed by URI, as reported by the messages. It is empty when the timeout is
+            reached, the wakeup event is set or the message bus becomes unavailable first.
+        """
+        deadline = time.time() + timeout
+        with self._condition:
+            while True:
+                completed = dict((uri, self._completed_tasks[uri]) for uri in uris if uri in self._completed_tasks)
+                remaining = deadline - time.time()
+                if completed or not self._available or remaining <= 0 or (wakeup is not None and wakeup.is_set()):
+                    return completed
+                self._condition.wait(remaining)
+
+    def interrupt(self):
+        """
+        Makes the waiting threads check their wakeup events.
+        """
+        with self._condition:
+            self._condition.notify_all()
+
+
+class ScmbSubscriber(object):
+    """
+    Consumes the messages of the SCMB and passes them to the listeners.
+
+    A queue exclusive to the subscriber is bound to the scmb exchange with the given routing keys, e.g.,
+    scmb.server-hardware.# for the server hardware changes only. When the connection is lost, the listeners are
+    notified and the subscriber reconnects.
+    """
+    DEFAULT_ROUTING_KEYS = ('scmb.#',)
+    POLL_INTERVAL = 1
+    RECONNECT_DELAY = 5
+
+    def __init__(self, host, ssl_context=None, routing_keys=DEFAULT_ROUTING_KEYS, connection_factory=None,
+                 serializer=None):
+        """
+        Args:
+            host: Appliance hostname or IP address.
+            ssl_context (ssl.SSLContext): Context with the RabbitMQ client certificate. See create_ssl_context.
+            routing_keys (list): Routing keys of the messages to receive.
+            connection_factory: Function that takes the host and the SSL context and returns an AMQP connection with
+                the interface of amqp.Connection. Defaults to create_amqp_connection.
+            serializer (JsonSerializer): Serializer of the messages. Defaults to the json module.
+        """
+        self._host = host
+        self._ssl_context = ssl_context
+        self._routing_keys = list(routing_keys)
+        self._connection_factory = connection_factory or create_amqp_connection
+        self._serializer = serializer or JsonSerializer()
+        self._listeners = []
+        self._amqp_connection = None
+        self._channel = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_client(cls, oneview_client, directory, routing_keys=DEFAULT_ROUTING_KEYS, alias_name='default'):
+        """
+        Creates a subscriber for the appliance of a client, with the RabbitMQ client certificate of the appliance.
+
+        The response cache of the client, when enabled, is kept coherent with the changes, and the task monitors of
+        the client wait for the scmb.tasks messages instead of polling the tasks. The tasks routing key is added when
+        the given ones do not include it.
+
+        Args:
+            oneview_client (OneViewClient): Client logged in to the appliance.
+            directory: Directory where the certificates are saved. See create_ssl_context.
+            routing_keys (list): Routing keys of the messages to receive.
+            alias_name: Alias of the RabbitMQ client key pair.
+
+        Returns:
+            ScmbSubscriber:
+        """
+        connection = oneview_client.connection
+        if not any(key in ('#', 'scmb.#') or key.startswith('scmb.tasks.') for key in routing_keys):
+            routing_keys = list(routing_keys) + [SCMB_TASKS_ROUTING_KEY]
+
+        subscriber = cls(urlsplit('//' + connection.get_host()).hostname,
+                         create_ssl_context(oneview_client, directory, alias_name),
+                         routing_keys=routing_keys, serializer=connection.get_serializer())
+
+        cache = connection.get_response_cache()
+        if cache is not None:
+            subscriber.add_listener(ResponseCacheInvalidator(cache))
+
+        task_events = TaskEventListener()
+        subscriber.add_listener(task_events)
+        connection.set_task_events(task_events)
+        return subscriber
+
+    def add_listener(self, listener):
+        """
+        Adds a listener of the messages.
+
+        Args:
+            listener (ScmbListener): The listener.
+        """
+        self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener):
+        """
+        Removes a listener of the messages.
+
+        Args:
+            listener (ScmbListener): The listener.
+        """
+        self._listeners = [item for item in self._listeners if item is not listener]
+
+    def connect(self):
+        """
+        Connects to the message bus and starts consuming the messages.
+        """
+        self._amqp_connection = self._connection_factory(self._host, self._ssl_context)
+        self._amqp_connection.connect()
+        self._channel = self._amqp_connection.channel()
+
+        queue, _, _ = self._channel.queue_declare(exclusive=True)
+        for routing_key in self._routing_keys:
+            self._channel.queue_bind(queue, SCMB_EXCHANGE, routing_key)
+        self._channel.basic_consume(queue, callback=self.__on_amqp_message)
+        logger.info('Subscribed to the SCMB of %s with %s' % (self._host, ', '.join(self._routing_keys)))
+        self.__notify('on_connected')
+
+    def close(self):
+        """
+        Closes the connection to the message bus.
+        """
+        connection, self._amqp_connection, self._channel = self._amqp_connection, None, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                logger.debug('Failed to close the SCMB connection', exc_info=True)
+            self.__notify('on_connection_lost')
+
+    def run(self):
+        """
+        Receives the messages until stop is called, reconnecting when the connection is lost.
+        """
+        while not self._stopped.is_set():
+            try:
+                if self._amqp_connection is None:
+                    self.connect()
+                self._amqp_connection.drain_events(timeout=self.POLL_INTERVAL)
+            except socket.timeout:
+                continue
+            except Exception:
+                logger.exception('Lost the connection to the SCMB of %s' % self._host)
+                self.close()
+                self._stopped.wait(self.RECONNECT_DELAY)
+        self.close()
+
+    def start(self):
+        """
+        Receives the messages on a background thread.
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, name='scmb-subscriber')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops receiving the messages and waits for the background thread to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait for the thread.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def handle(self, message):
+        """
+        Passes a message to the listeners. An error of a listener is logged and does not prevent the others from
+        receiving the message.
+
+        Args:
+            message (ScmbMessage): The message.
+        """
+        self.__notify('on_message', message)
+
+    def __notify(self, method, *args):
+        for listener in self._listeners:
+            try:
+                getattr(listener, method)(*args)
+            except Exception:
+                logger.exception('SCMB listener %r failed' % listener)
+
+    def __on_amqp_message(self, amqp_message):
+        try:
+            routing_key = amqp_message.delivery_info.get('routing_key')
+            self.handle(decode_message(amqp_message.body, routing_key, self._serializer))
+        except Exception:
+            logger.exception('Invalid SCMB message')
+        finally:
+            self._channel.basic_ack(amqp_message.delivery_tag)
+
+
+def decode_message(body, routing_key=None, serializer=None):
+    """
+    Decodes a message of the SCMB.
+
+    Args:
+        body: JSON document of the message, as bytes or text.
+        routing_key: Routing key of the message.
+        serializer (JsonSerializer): Serializer of the message. Defaults to the json module.
+
+    Returns:
+        ScmbMessage: The decoded message.
+    """
+    decoded = (serializer or JsonSerializer()).loads(body)
+    if not isinstance(decoded, dict):
+        raise HPOneViewException('Invalid SCMB message: %r' % decoded)
+
+    resource = decoded.get('resource')
+    resource_uri = decoded.get('resourceUri') or (resource.get('uri') if isinstance(resource, dict) else None)
+    return ScmbMessage(change_type=decoded.get('changeType'),
+                       resource_uri=resource_uri,
+                       etag=decoded.get('eTag'),
+                       resource=resource,
+                       routing_key=routing_key,
+                       timestamp=decoded.get('timestamp'),
+                       body=decoded)
+
+
+def create_ssl_context(oneview_client, directory, alias_name='default'):
+    """
+    Creates an SSL context with the RabbitMQ client certificate of the appliance.
+
+    The certificate of the internal CA and the RabbitMQ client key pair are saved in the directory. The key pair is
+    generated on the appliance when it does not exist yet.
+
+    Args:
+        oneview_client (OneViewClient): Client logged in to the appliance.
+        directory: Directory where the certificates are saved.
+        alias_name: Alias of the RabbitMQ client key pair.
+
+    Returns:
+        ssl.SSLContext:
+    """
+    ca_file = os.path.join(directory, CA_FILE_NAME)
+    cert_file = os.path.join(directory, CERT_FILE_NAME)
+    key_file = os.path.join(directory, KEY_FILE_NAME)
+
+    try:
+        key_pair = oneview_client.certificate_rabbitmq.get_key_pair(alias_name)
+    except HPOneViewException:
+        logger.info('Generating the RabbitMQ client certificate %s' % alias_name)
+        oneview_client.certificate_rabbitmq.generate({'commonName': alias_name, 'type': 'RabbitMqClientCertV2'})
+        key_pair = oneview_client.certificate_rabbitmq.get_key_pair(alias_name)
+
+    _write_file(ca_file, oneview_client.certificate_authority.get())
+    _write_file(cert_file, key_pair['base64SSLCertData'])
+    _write_file(key_file, key_pair['base64SSLKeyData'])
+
+    context = ssl.create_default_context(cafile=ca_file)
+    # The certificate is checked against the internal CA, but the appliance may be reached by an address it was not
+    # issued for
+    context.check_hostname = False
+    context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+def create_amqp_connection(host, ssl_context):
+    """
+    Creates a connection to the SCMB, authenticated by the RabbitMQ client certificate.
+
+    Args:
+        host: Appliance hostname or IP address.
+        ssl_context (ssl.SSLContext): Context with the RabbitMQ client certificate.
+
+    Returns:
+        amqp.Connection: The connection, not connected yet.
+    """
+    try:
+        import amqp
+    except ImportError:
+        raise HPOneViewException(SCMB_AMQP_NOT_INSTALLED)
+
+    return amqp.Connection('%s:%d' % (host, SCMB_PORT), login_method='EXTERNAL', ssl=ssl_context)
+
+
+def _write_file(path, content):
+    # The private key must only be readable by the user
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as file:
+        file.write(content)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+"""
+serializer.py
+~~~~~~~~~~~~~
+
+This module encodes the request bodies and decodes the response bodies exchanged with the appliance. The fastest JSON
+library installed is used: orjson, ujson, or the json module of the standard library.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import json
+
+from past.builtins import basestring
+
+from hpOneView.exceptions import HPOneViewValueError
+
+JSON_BACKEND_AUTO = 'auto'
+JSON_BACKEND_NOT_INSTALLED = 'The JSON backend %s is not installed'
+JSON_BACKEND_UNKNOWN = 'Unknown JSON backend %s. Use one of: auto, orjson, ujson, json'
+
+
+class JsonSerializer(object):
+    """
+    Serializer based on the json module of the standard library.
+    """
+    name = 'json'
+
+    def loads(self, data):
+        """
+        Decodes a JSON document.
+
+        Args:
+            data: Document as bytes or text.
+
+        Returns:
+            The decoded value.
+
+        Raises:
+            ValueError: When the document is not valid JSON.
+        """
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def dumps(self, value):
+        """
+        Encodes a value as a JSON document.
+
+        Returns:
+            str: The document.
+        """
+        return json.dumps(value)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """
+    Serializer based on orjson, which parses the response bytes without decoding them to text first.
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+    def dumps(self, value):
+        try:
+            return self._orjson.dumps(value, option=self._orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            # Types orjson does not handle, e.g., the subclasses of str from the future package
+            return json.dumps(value)
+
+
+class UjsonSerializer(JsonSerializer):
+    """
+    Serializer based on ujson.
+    """
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+    def dumps(self, value):
+        try:
+            return self._ujson.dumps(value, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return json.dumps(value)
+
+
+SERIALIZERS = [OrjsonSerializer, UjsonSerializer, JsonSerializer]
+
+
+def get_serializer(backend=JSON_BACKEND_AUTO):
+    """
+    Gets a serializer for the given JSON backend.
+
+    Args:
+        backend: One of orjson, ujson or json. With auto, the first one installed in that order is used.
+
+    Returns:
+        JsonSerializer:
+    """
+    backend = backend or JSON_BACKEND_AUTO
+    for serializer_class in SERIALIZERS:
+        if backend not in (JSON_BACKEND_AUTO, serializer_class.name):
+            continue
+        try:
+            return serializer_class()
+        except ImportError:
+            if backend != JSON_BACKEND_AUTO:
+                raise HPOneViewValueError(JSON_BACKEND_NOT_INSTALLED % backend)
+
+    raise HPOneViewValueError(JSON_BACKEND_UNKNOWN % backend)
+
+
+def is_json_content_type(content_type):
+    """
+    Checks if a Content-Type header describes a JSON document, e.g., application/json or application/problem+json.
+    """
+    if not isinstance(content_type, basestring):
+        return False
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type == 'application/json' or media_type.endswith('+json')
@@ -35,4 +35,5 @@ setup(name='hpOneView',
       license='MIT',
       packages=find_packages(exclude=['examples*', 'tests*']),
       keywords=['oneview', 'hpe'],
-      install_requires=['future>=0.15.2'])
+      install_requires=['future>=0.15.2'],
+      extras_require={'orjson': ['orjson'], 'ujson': ['ujson'], 'scmb': ['amqp>=2.1.4']})
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+In-process fake of the OneView REST API used by the benchmarks.
+
+It serves a paginated, filterable and projectable collection of server hardware, tasks that complete after a number
+of polls, multipart uploads and binary downloads, with an optional latency added to every response. The server talks
+plain HTTP, so the TLS handshakes are left out of the measures and the results reflect the cost of the SDK itself.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import http.client
+import json
+import re
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+from hpOneView.connection import connection
+from hpOneView.connection_pool import ConnectionPool
+
+SERVER_HARDWARE_URI = '/rest/server-hardware'
+TASKS_URI = '/rest/tasks'
+UPLOAD_URI = '/rest/firmware-bundles'
+DOWNLOAD_URI = '/rest/appliance/support-dumps/benchmark.sdmp'
+
+CHUNK_SIZE = 65536
+
+
+class PlainConnection(connection):
+    """
+    Connection to the fake appliance over plain HTTP.
+    """
+
+    def get_connection(self):
+        return http.client.HTTPConnection(self._host, timeout=self._timeout)
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeAppliance(object):
+    """
+    Fake appliance listening on a random local port.
+
+    Args:
+        collection_size: Number of server hardware resources in the collection.
+        page_size: Maximum number of members returned by a page.
+        task_polls: Number of times a task is reported as running before it completes.
+        download_size: Size in bytes of the downloaded file.
+        latency: Seconds waited before each response is sent.
+    """
+
+    def __init__(self, collection_size=1000, page_size=100, task_polls=3, download_size=16 * 1024 * 1024, latency=0):
+        self.collection_size = collection_size
+        self.page_size = page_size
+        self.task_polls = task_polls
+        self.download_size = download_size
+        self.latency = latency
+        self.requests = 0
+        self.members = [self.__build_server_hardware(index) for index in range(collection_size)]
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._download_chunk = bytes(bytearray(index % 256 for index in range(CHUNK_SIZE)))
+        self._connection_pool = ConnectionPool()
+        self._server = None
+        self._thread = None
+
+    @property
+    def host(self):
+        return '%s:%d' % self._server.server_address[:2]
+
+    def start(self):
+        appliance = self
+
+        class Handler(RequestHandler):
+            pass
+
+        Handler.appliance = appliance
+        self._server = ThreadingServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._connection_pool.clear()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def connect(self, api_version=800):
+        """
+        Creates a connection logged in to the fake appliance. Its idle connections are closed when the appliance stops.
+
+        Returns:
+            PlainConnection:
+        """
+        con = PlainConnection(self.host, api_version, connection_pool=self._connection_pool)
+        con.login({'userName': 'administrator', 'password': 'password'})
+        return con
+
+    def get_page(self, path, query):
+        members = self.members
+        filters = query.get('filter')
+        if filters:
+            for field, value in re.findall(r"(\w+)='([^']*)'", filters[0]):
+                members = [member for member in members if str(member.get(field, '')).lower() == value.lower()]
+
+        start = int(query.get('start', ['0'])[0])
+        count = int(query.get('count', ['-1'])[0])
+        count = self.page_size if count < 0 else min(count, self.page_size)
+        page = members[start:start + count]
+        fields = query.get('fields')
+        if fields:
+            names = fields[0].split(',')
+            page = [dict((name, member[name]) for name in names if name in member) for member in page]
+
+        next_page_uri = None
+        if start + len(page) < len(members):
+            next_page_uri = re.sub(r'start=\d+', 'start=%d' % (start + len(page)), path)
+            if 'start=' not in next_page_uri:
+                next_page_uri += '%sstart=%d' % ('&' if '?' in path else '?', start + len(page))
+
+        return {'type': 'server-hardware-list-8', 'category': 'server-hardware', 'uri': path, 'start': start,
+                'count': len(page), 'total': len(members), 'members': page, 'nextPageUri': next_page_uri,
+                'prevPageUri': None}
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def create_task(self, resource_uri):
+        with self._lock:
+            task_id = len(self._tasks) + 1
+            self._tasks[task_id] = {'polls': 0, 'resourceUri': resource_uri}
+        return self.get_task(task_id, poll=False)
+
+    def get_task(self, task_id, poll=True):
+        with self._lock:
+            state = self._tasks[task_id]
+            if poll:
+                state['polls'] += 1
+            completed = state['polls'] > self.task_polls
+
+        return {'type': 'TaskResourceV2', 'category': 'tasks', 'uri': '%s/%d' % (TASKS_URI, task_id),
+                'taskState': 'Completed' if completed else 'Running',
+                'computedPercentComplete': 100 if completed else 50,
+                'associatedResource': {'resourceUri': state['resourceUri']}}
+
+    @staticmethod
+    def __build_server_hardware(index):
+        return {'type': 'server-hardware-8', 'category': 'server-hardware', 'name': 'server-%05d' % index,
+                'uri': '%s/%d' % (SERVER_HARDWARE_URI, index), 'serialNumber': 'SN%08d' % index,
+                'model': 'SY 480 Gen10', 'powerState': 'On', 'status': 'OK', 'state': 'NoProfileApplied',
+                'memoryMb': 262144, 'processorCount': 2, 'processorCoreCount': 28,
+                'eTag': '2018-01-01T00:00:00.000Z', 'created': '2018-01-01T00:00:00.000Z',
+                'modified': '2018-01-01T00:00:00.000Z'}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Each response is flushed at once, so its headers and its body do not wait for the delayed ACK of the client
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    appliance = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.__read_body()
+        url = urlsplit(self.path)
+        if url.path == '/rest/version':
+            self.__send_json(200, {'minimumVersion': 120, 'currentVersion': 800})
+        elif url.path == SERVER_HARDWARE_URI:
+            self.__send_json(200, self.appliance.get_page(self.path, parse_qs(url.query)))
+        elif url.path.startswith(SERVER_HARDWARE_URI + '/'):
+            self.__send_json(200, self.appliance.members[int(url.path.rsplit('/', 1)[1])])
+        elif url.path.startswith(TASKS_URI + '/'):
+            self.__send_json(200, self.appliance.get_task(int(url.path.rsplit('/', 1)[1])))
+        elif url.path == DOWNLOAD_URI:
+            self.__send_download()
+        else:
+            self.__send_json(404, {'errorCode': 'RESOURCE_NOT_FOUND', 'message': 'Not found: %s' % url.path})
+
+    def do_POST(self):
+        self.__read_body()
+        if self.path == '/rest/login-sessions':
+            self.__send_json(200, {'sessionID': 'benchmark-session'})
+        elif self.path == SERVER_HARDWARE_URI:
+            task = self.appliance.create_task('%s/0' % SERVER_HARDWARE_URI)
+            self.__send_json(202, task, {'Location': task['uri']})
+        elif self.path == UPLOAD_URI:
+            self.__send_json(200, {'uri': UPLOAD_URI + '/benchmark', 'size': self.body_size})
+        else:
+            self.__send_json(404, {'errorCode': 'RESOURCE_NOT_FOUND', 'message': 'Not found: %s' % self.path})
+
+    def do_DELETE(self):
+        self.__read_body()
+        self.__send_json(204, None)
+
+    def __read_body(self):
+        self.appliance.count_request()
+        remaining = int(self.headers.get('Content-Length') or 0)
+        self.body_size = remaining
+        while remaining > 0:
+            chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+    def __send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        if self.appliance.latency:
+            time.sleep(self.appliance.latency)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def __send_download(self):
+        size = self.appliance.download_size
+        chunk = self.appliance._download_chunk
+        if self.appliance.latency:
+            time.sleep(self.appliance.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(size))
+        self.end_headers()
+        sent = 0
+        while sent < size:
+            data = chunk[:size - sent]
+            self.wfile.write(data)
+            sent += len(data)
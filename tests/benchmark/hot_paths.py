@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+Benchmark of the SDK hot paths against the in-process fake appliance.
+
+Each scenario is run for a number of iterations to report its latency percentiles and throughput, then once more
+under tracemalloc to report its peak memory. The results can be saved as JSON and compared with the results of
+another commit, which fails when a scenario is slower than the threshold.
+
+Usage:
+    python -m tests.benchmark.hot_paths [--iterations 20] [--latency 5] [--output results.json]
+    python -m tests.benchmark.hot_paths --compare baseline.json --threshold 10
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+from collections import OrderedDict
+from timeit import default_timer as timer
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.task_polling import LinearPolling
+from tests.benchmark.fake_appliance import FakeAppliance, DOWNLOAD_URI, SERVER_HARDWARE_URI, UPLOAD_URI
+from tests.benchmark.startup import percentile
+
+MEGABYTE = 1024 * 1024
+
+
+class Scenario(object):
+    """
+    Operation measured by the benchmark.
+
+    Args:
+        name: Name of the scenario in the results.
+        unit: Unit of the throughput, e.g., 'members/s'.
+    """
+
+    def __init__(self, name, unit):
+        self.name = name
+        self.unit = unit
+
+    def setup(self, con, appliance, options):
+        pass
+
+    def run(self):
+        """
+        Runs the operation once.
+
+        Returns:
+            float: Amount of work done, in the unit of the throughput without the '/s'.
+        """
+        raise NotImplementedError()
+
+    def teardown(self):
+        pass
+
+
+class GetAll(Scenario):
+    def __init__(self):
+        super(GetAll, self).__init__('get_all', 'members/s')
+
+    def setup(self, con, appliance, options):
+        self.client = ResourceClient(con, SERVER_HARDWARE_URI)
+
+    def run(self):
+        return len(self.client.get_all())
+
+
+class GetBy(Scenario):
+    def __init__(self):
+        super(GetBy, self).__init__('get_by', 'requests/s')
+
+    def setup(self, con, appliance, options):
+        self.client = ResourceClient(con, SERVER_HARDWARE_URI)
+        self.name = appliance.members[-1]['name']
+
+    def run(self):
+        self.client.get_by('name', self.name)
+        return 1
+
+
+class GetByNameExact(Scenario):
+    def __init__(self):
+        super(GetByNameExact, self).__init__('get_by_name_exact', 'requests/s')
+
+    def setup(self, con, appliance, options):
+        self.client = ResourceClient(con, SERVER_HARDWARE_URI)
+        self.name = appliance.members[-1]['name']
+
+    def run(self):
+        self.client.get_by_name(self.name, fields='name,uri', exact=True)
+        return 1
+
+
+class WaitForTask(Scenario):
+    def __init__(self):
+        super(WaitForTask, self).__init__('wait_for_task', 'tasks/s')
+
+    def setup(self, con, appliance, options):
+        self.connection = con
+        self.task_monitor = TaskMonitor(con, LinearPolling(max_delay=0))
+
+    def run(self):
+        task, _ = self.connection.post(SERVER_HARDWARE_URI, {'name': 'benchmark'})
+        self.task_monitor.wait_for_task(task)
+        return 1
+
+
+class PostMultipart(Scenario):
+    def __init__(self):
+        super(PostMultipart, self).__init__('post_multipart', 'MB/s')
+
+    def setup(self, con, appliance, options):
+        self.connection = con
+        self.size = options.upload_size * MEGABYTE
+        upload_file = tempfile.NamedTemporaryFile(suffix='.zip', delete=False)
+        with upload_file:
+            chunk = b'\0' * MEGABYTE
+            for start in range(0, self.size, MEGABYTE):
+                upload_file.write(chunk[:self.size - start])
+        self.file_path = upload_file.name
+
+    def run(self):
+        self.connection.post_multipart(UPLOAD_URI, None, self.file_path, 'benchmark.zip')
+        return self.size / MEGABYTE
+
+    def teardown(self):
+        os.remove(self.file_path)
+
+
+class DownloadToStream(Scenario):
+    def __init__(self):
+        super(DownloadToStream, self).__init__('download_to_stream', 'MB/s')
+
+    def setup(self, con, appliance, options):
+        self.connection = con
+        self.size = appliance.download_size
+
+    def run(self):
+        with open(os.devnull, 'wb') as stream:
+            self.connection.download_to_stream(stream, DOWNLOAD_URI)
+        return self.size / MEGABYTE
+
+
+SCENARIOS = OrderedDict((scenario.name, scenario) for scenario in
+                        [GetAll(), GetBy(), GetByNameExact(), WaitForTask(), PostMultipart(), DownloadToStream()])
+
+
+def measure(scenario, con, appliance, options):
+    """
+    Runs a scenario and summarizes its latencies in milliseconds, its throughput and its peak memory in KB.
+    """
+    scenario.setup(con, appliance, options)
+    try:
+        scenario.run()  # Warm up, e.g., imports and keep-alive connections
+
+        latencies = []
+        work = 0
+        for _ in range(options.iterations):
+            start = timer()
+            work += scenario.run()
+            latencies.append(timer() - start)
+
+        peak_memory = None
+        if tracemalloc:
+            tracemalloc.start()
+            try:
+                scenario.run()
+                peak_memory = tracemalloc.get_traced_memory()[1] / 1024
+            finally:
+                tracemalloc.stop()
+    finally:
+        scenario.teardown()
+
+    milliseconds = [latency * 1000 for latency in latencies]
+    return OrderedDict([
+        ('iterations', options.iterations),
+        ('p50', percentile(milliseconds, 50)),
+        ('p95', percentile(milliseconds, 95)),
+        ('p99', percentile(milliseconds, 99)),
+        ('max', max(milliseconds)),
+        ('throughput', work / sum(latencies)),
+        ('unit', scenario.unit),
+        ('peak_memory_kb', peak_memory),
+    ])
+
+
+def run(options):
+    """
+    Runs the selected scenarios against a new fake appliance.
+
+    Returns:
+        dict: Results with the environment and the configuration of the run.
+    """
+    appliance = FakeAppliance(collection_size=options.collection_size, page_size=options.page_size,
+                              task_polls=options.task_polls, download_size=options.download_size * MEGABYTE,
+                              latency=options.latency / 1000.0)
+    scenarios = OrderedDict()
+    with appliance:
+        con = appliance.connect()
+        con.set_page_workers(options.page_workers)
+        for name in options.scenarios:
+            scenarios[name] = measure(SCENARIOS[name], con, appliance, options)
+
+    return OrderedDict([
+        ('commit', get_commit()),
+        ('python', platform.python_version()),
+        ('options', OrderedDict((name, getattr(options, name)) for name in sorted(vars(options))
+                                if name not in ('output', 'compare', 'threshold'))),
+        ('scenarios', scenarios),
+    ])
+
+
+def get_commit():
+    try:
+        with open(os.devnull, 'wb') as devnull:
+            output = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=devnull)
+        return output.decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares the median latency of the scenarios with a baseline.
+
+    Returns:
+        tuple: Names of the scenarios whose median latency grew by more than threshold percent, and the lines of the
+        report.
+    """
+    regressions = []
+    lines = ['', 'Compared with %s:' % (baseline.get('commit') or 'the baseline')]
+    for name, stats in results['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if not base:
+            continue
+        change = (stats['p50'] - base['p50']) * 100.0 / base['p50']
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        lines.append('%-20s p50 %+7.1f%%   throughput %+7.1f%%%s' % (
+            name, change, (stats['throughput'] - base['throughput']) * 100.0 / base['throughput'],
+            '   REGRESSION' if regressed else ''))
+    return regressions, lines
+
+
+def print_results(results):
+    print('%-20s %10s %10s %10s %10s %20s %12s' % ('scenario', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms', 'throughput',
+                                                   'peak KB'))
+    for name, stats in results['scenarios'].items():
+        peak_memory = '%.0f' % stats['peak_memory_kb'] if stats['peak_memory_kb'] is not None else '-'
+        print('%-20s %10.2f %10.2f %10.2f %10.2f %20s %12s' % (
+            name, stats['p50'], stats['p95'], stats['p99'], stats['max'],
+            '%.1f %s' % (stats['throughput'], stats['unit']), peak_memory))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the SDK hot paths against a fake appliance')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--iterations', type=int, default=20, help='Number of measured runs of each scenario')
+    parser.add_argument('--latency', type=float, default=0, help='Milliseconds added to each response')
+    parser.add_argument('--collection-size', type=int, default=1000, help='Number of resources in the collection')
+    parser.add_argument('--page-size', type=int, default=100, help='Maximum number of members in a page')
+    parser.add_argument('--page-workers', type=int, default=1, help='Number of pages requested at the same time')
+    parser.add_argument('--task-polls', type=int, default=3, help='Number of polls before a task completes')
+    parser.add_argument('--upload-size', type=int, default=16, help='Size in MB of the uploaded file')
+    parser.add_argument('--download-size', type=int, default=16, help='Size in MB of the downloaded file')
+    parser.add_argument('--output', help='Writes the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=10,
+                        help='Percentage of growth of a median latency reported as a regression')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    results = run(options)
+    print_results(results)
+
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions, lines = compare(results, baseline, options.threshold)
+        print('\n'.join(lines))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
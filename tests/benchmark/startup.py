@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+Startup benchmark of the SDK.
+
+Each sample runs in a fresh interpreter and measures the import of the package, the import of the OneViewClient
+module, the creation of the client and the first call to a resource, which imports the resource module. The login
+and the requests are mocked, so the benchmark does not need an appliance.
+
+Usage:
+    python -m tests.benchmark.startup [--samples 20] [--output results.json]
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import json
+import subprocess
+import sys
+
+SAMPLE_CODE = '''
+import json
+from timeit import default_timer as timer
+
+start = timer()
+import hpOneView
+package_imported = timer()
+from hpOneView.oneview_client import OneViewClient
+client_imported = timer()
+
+import mock
+from hpOneView.connection import connection
+
+config = {"ip": "172.16.102.59", "credentials": {"userName": "administrator", "password": "password"}}
+with mock.patch.object(connection, "login"), mock.patch.object(connection, "get", return_value={"members": []}):
+    client_start = timer()
+    client = OneViewClient(config)
+    client_created = timer()
+    client.server_hardware.get_all()
+    first_call = timer()
+
+print(json.dumps({
+    "import_package": package_imported - start,
+    "import_client": client_imported - package_imported,
+    "create_client": client_created - client_start,
+    "first_call": first_call - client_created,
+}))
+'''
+
+
+def run_sample():
+    output = subprocess.check_output([sys.executable, '-c', SAMPLE_CODE])
+    return json.loads(output.decode('utf-8'))
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = int(round((len(values) - 1) * percent / 100.0))
+    return values[index]
+
+
+def summarize(samples):
+    """
+    Gets the median, the 95th percentile and the maximum of each measure, in milliseconds.
+    """
+    summary = {}
+    for measure in samples[0]:
+        values = [sample[measure] * 1000 for sample in samples]
+        summary[measure] = {'p50': percentile(values, 50), 'p95': percentile(values, 95), 'max': max(values)}
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measures the startup time of the SDK')
+    parser.add_argument('--samples', type=int, default=20, help='Number of fresh interpreters to run')
+    parser.add_argument('--output', help='Writes the summary as JSON to this file')
+    args = parser.parse_args(argv)
+
+    summary = summarize([run_sample() for _ in range(args.samples)])
+
+    for measure, stats in sorted(summary.items()):
+        print('%-16s p50 %8.2f ms   p95 %8.2f ms   max %8.2f ms' % (measure, stats['p50'], stats['p95'], stats['max']))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(summary, output_file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
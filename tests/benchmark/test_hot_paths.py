@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import unittest
+
+from hpOneView.resources.resource import ResourceClient
+from tests.benchmark import hot_paths
+from tests.benchmark.fake_appliance import FakeAppliance, SERVER_HARDWARE_URI
+
+
+class FakeApplianceTest(unittest.TestCase):
+    def setUp(self):
+        self.appliance = FakeAppliance(collection_size=25, page_size=10).start()
+        self.client = ResourceClient(self.appliance.connect(), SERVER_HARDWARE_URI)
+
+    def tearDown(self):
+        self.appliance.stop()
+
+    def test_get_all_follows_the_pages(self):
+        self.assertEqual(len(self.client.get_all()), 25)
+
+    def test_get_by_filters_the_collection(self):
+        self.assertEqual(self.client.get_by('name', 'server-00012'), [self.appliance.members[12]])
+
+    def test_get_by_name_exact_projects_the_fields(self):
+        self.assertEqual(self.client.get_by_name('server-00012', fields='name,uri', exact=True),
+                         {'name': 'server-00012', 'uri': self.appliance.members[12]['uri']})
+
+
+class HotPathsTest(unittest.TestCase):
+    def test_run_all_scenarios(self):
+        options = hot_paths.parse_args(['--iterations', '2', '--collection-size', '30', '--page-size', '10',
+                                        '--upload-size', '1', '--download-size', '1', '--task-polls', '1'])
+
+        results = hot_paths.run(options)
+
+        self.assertEqual(list(results['scenarios']), list(hot_paths.SCENARIOS))
+        for stats in results['scenarios'].values():
+            self.assertEqual(stats['iterations'], 2)
+            self.assertGreater(stats['throughput'], 0)
+
+    def test_compare_reports_regressions(self):
+        baseline = {'commit': 'abc',
+                    'scenarios': {'get_all': {'p50': 10.0, 'throughput': 100.0},
+                                  'get_by': {'p50': 10.0, 'throughput': 100.0}}}
+        results = {'scenarios': {'get_all': {'p50': 12.0, 'throughput': 80.0},
+                                 'get_by': {'p50': 10.5, 'throughput': 95.0}}}
+
+        regressions, lines = hot_paths.compare(results, baseline, threshold=10)
+
+        self.assertEqual(regressions, ['get_all'])
+        self.assertEqual(lines[:2], ['', 'Compared with abc:'])
+        self.assertEqual(sorted(lines[2:]), ['get_all              p50   +20.0%   throughput   -20.0%   REGRESSION',
+                                             'get_by               p50    +5.0%   throughput    -5.0%'])
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import asyncio
+import json
+import unittest
+import zlib
+
+from mock import patch, Mock
+from hpOneView.async_connection import AsyncConnection, read_response, decode_body
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException, HPOneViewValueError
+
+
+class FakeWriter(object):
+    def __init__(self):
+        self.data = b''
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def is_closing(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+def make_stream(*responses):
+    reader = asyncio.StreamReader()
+    for response in responses:
+        reader.feed_data(response)
+    return reader, FakeWriter()
+
+
+def make_response(status, body, headers=None):
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    lines = ['HTTP/1.1 %d Reason' % status, 'Content-Length: %d' % len(payload)]
+    lines += ['%s: %s' % item for item in (headers or {}).items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('iso-8859-1') + payload
+
+
+class AsyncConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.sync_connection = connection('127.0.0.1')
+        self.connection = AsyncConnection(self.sync_connection)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def mock_open_connection(self, mock_open_connection, *streams):
+        async def open_connection(*args, **kwargs):
+            return streams_iter.pop(0)
+
+        streams_iter = list(streams)
+        mock_open_connection.side_effect = open_connection
+
+    def test_proxy_is_not_supported(self):
+        self.sync_connection.set_proxy('10.0.0.1', 3128)
+        self.assertRaises(HPOneViewValueError, AsyncConnection, self.sync_connection)
+
+    def test_host_with_port(self):
+        con = AsyncConnection(connection('127.0.0.1:8443'))
+        self.assertEqual((con._hostname, con._port), ('127.0.0.1', 8443))
+
+    @patch('asyncio.open_connection')
+    def test_get_should_send_default_headers(self, mock_open_connection):
+        reader, writer = make_stream(make_response(200, {'name': 'resource'}))
+        self.mock_open_connection(mock_open_connection, (reader, writer))
+        self.sync_connection.set_session_id('123')
+
+        body = self.run_async(self.connection.get('/rest/resource'))
+
+        self.assertEqual(body, {'name': 'resource'})
+        request = writer.data.decode('iso-8859-1')
+        self.assertTrue(request.startswith('GET /rest/resource HTTP/1.1\r\nHost: 127.0.0.1\r\n'))
+        self.assertIn('auth: 123\r\n', request)
+        self.assertIn('X-API-Version: 300\r\n', request)
+        self.assertIn('Content-Length: 0\r\n', request)
+        mock_open_connection.assert_called_once_with('127.0.0.1', 443, ssl=self.sync_connection.get_ssl_context(),
+                                                     server_hostname='127.0.0.1')
+
+    @patch('asyncio.open_connection')
+    def test_get_should_decompress_deflate_body(self, mock_open_connection):
+        payload = zlib.compress(json.dumps({'name': 'resource'}).encode('utf-8'))
+        response = ('HTTP/1.1 200 OK\r\nContent-Length: %d\r\nContent-Encoding: deflate\r\n'
+                    'Content-Type: application/json\r\n\r\n' % len(payload)).encode('iso-8859-1') + payload
+        reader, writer = make_stream(response)
+        self.mock_open_connection(mock_open_connection, (reader, writer))
+
+        body = self.run_async(self.connection.get('/rest/resource'))
+
+        self.assertEqual(body, {'name': 'resource'})
+        self.assertEqual(self.sync_connection.get_compression_stats().compressed_bytes, len(payload))
+
+    @patch('asyncio.open_connection')
+    def test_get_should_reuse_kept_alive_stream(self, mock_open_connection):
+        reader, writer = make_stream(make_response(200, {'id': 1}), make_response(200, {'id': 2}))
+        self.mock_open_connection(mock_open_connection, (reader, writer))
+
+        self.assertEqual(self.run_async(self.connection.get('/rest/resource/1')), {'id': 1})
+        self.assertEqual(self.run_async(self.connection.get('/rest/resource/2')), {'id': 2})
+
+        mock_open_connection.assert_called_once()
+        self.assertFalse(writer.closed)
+
+    @patch('asyncio.open_connection')
+    def test_get_should_close_stream_when_response_will_close(self, mock_open_connection):
+        reader, writer = make_stream(make_response(200, {}, {'Connection': 'close'}))
+        self.mock_open_connection(mock_open_connection, (reader, writer))
+
+        self.run_async(self.connection.get('/rest/resource'))
+
+        self.assertTrue(writer.closed)
+        self.assertEqual(self.connection._idle_streams, [])
+
+    @patch('asyncio.open_connection')
+    def test_get_should_reconnect_when_idle_stream_is_stale(self, mock_open_connection):
+        stale_reader, stale_writer = make_stream(make_response(200, {'id': 1}))
+        reader, writer = make_stream(make_response(200, {'id': 2}))
+        self.mock_open_connection(mock_open_connection, (stale_reader, stale_writer), (reader, writer))
+
+        self.run_async(self.connection.get('/rest/resource/1'))
+        stale_writer.write = Mock(side_effect=ConnectionResetError(104, 'Connection reset by peer'))
+        self.assertEqual(self.run_async(self.connection.get('/rest/resource/2')), {'id': 2})
+
+        self.assertTrue(stale_writer.closed)
+        self.assertEqual(mock_open_connection.call_count, 2)
+
+    @patch('asyncio.open_connection')
+    def test_post_should_not_resend_when_idle_stream_is_stale(self, mock_open_connection):
+        stale_reader, stale_writer = make_stream(make_response(200, {'id': 1}))
+        self.mock_open_connection(mock_open_connection, (stale_reader, stale_writer), make_stream())
+
+        self.run_async(self.connection.get('/rest/resource/1'))
+        stale_writer.write = Mock(side_effect=ConnectionResetError(104, 'Connection reset by peer'))
+
+        self.assertRaises(ConnectionResetError, self.run_async, self.connection.post('/rest/resource', {}))
+        self.assertTrue(stale_writer.closed)
+        mock_open_connection.assert_called_once()
+
+    @patch('asyncio.open_connection')
+    def test_get_should_time_out_when_the_response_does_not_arrive(self, mock_open_connection):
+        reader, writer = make_stream()
+        self.mock_open_connection(mock_open_connection, (reader, writer))
+        self.connection = AsyncConnection(connection('127.0.0.1', timeout=0.01))
+
+        self.assertRaises(asyncio.TimeoutError, self.run_async, self.connection.get('/rest/resource'))
+        self.assertTrue(writer.closed)
+        self.assertEqual(self.connection._idle_streams, [])
+
+    @patch('asyncio.open_connection')
+    def test_get_should_time_out_when_the_stream_cannot_be_opened(self, mock_open_connection):
+        async def open_connection(*args, **kwargs):
+            await asyncio.sleep(5)
+
+        mock_open_connection.side_effect = open_connection
+        self.connection = AsyncConnection(connection('127.0.0.1', timeout=0.01))
+
+        self.assertRaises(asyncio.TimeoutError, self.run_async, self.connection.get('/rest/resource'))
+
+    @patch('asyncio.open_connection')
+    def test_get_should_raise_exception_when_status_not_found(self, mock_open_connection):
+        self.mock_open_connection(mock_open_connection, make_stream(make_response(404, {'message': 'Not found'})))
+
+        with self.assertRaises(HPOneViewException) as context:
+            self.run_async(self.connection.get('/rest/resource'))
+
+        self.assertEqual(context.exception.msg, 'Not found')
+
+    @patch('asyncio.open_connection')
+    def test_post_should_return_task_when_status_accepted(self, mock_open_connection):
+        task = {'category': 'tasks', 'uri': '/rest/tasks/1'}
+        reader, writer = make_stream(make_response(202, {}, {'Location': '/rest/tasks/1'}), make_response(200, task))
+        self.mock_open_connection(mock_open_connection, (reader, writer))
+
+        result = self.run_async(self.connection.post('/rest/resource', {'name': 'new'}))
+
+        self.assertEqual(result, (task, {}))
+        dumped_body = self.connection.sync_connection.get_serializer().dumps({'name': 'new'}).encode('utf-8')
+        self.assertIn(b'\r\n\r\n' + dumped_body, writer.data)
+
+    @patch('asyncio.open_connection')
+    def test_post_should_return_body_when_status_ok(self, mock_open_connection):
+        self.mock_open_connection(mock_open_connection, make_stream(make_response(200, {'name': 'new'})))
+
+        result = self.run_async(self.connection.post('/rest/resource', {'name': 'new'}))
+
+        self.assertEqual(result, (None, {'name': 'new'}))
+
+    def test_concurrency_is_bounded(self):
+        running = []
+        max_running = []
+        self.connection = AsyncConnection(self.sync_connection, concurrency=2)
+
+        async def open_stream():
+            running.append(1)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            return make_stream(make_response(200, {})) + (False,)
+
+        self.connection._open_stream = open_stream
+
+        async def get_many():
+            await asyncio.gather(*[self.connection.get('/rest/resource') for _ in range(6)])
+
+        self.run_async(get_many())
+
+        self.assertEqual(max(max_running), 2)
+
+    @patch('asyncio.open_connection')
+    def test_login(self, mock_open_connection):
+        reader, writer = make_stream(make_response(200, {'minimumVersion': 200, 'currentVersion': 600}),
+                                     make_response(200, {'sessionID': 'abc'}))
+        self.mock_open_connection(mock_open_connection, (reader, writer))
+
+        self.run_async(self.connection.login({'userName': 'admin', 'password': 'secret'}))
+
+        self.assertEqual(self.sync_connection.get_session_id(), 'abc')
+        self.assertEqual(self.connection.get_session_id(), 'abc')
+
+    @patch('asyncio.open_connection')
+    def test_login_with_unsupported_api_version(self, mock_open_connection):
+        self.mock_open_connection(mock_open_connection,
+                                  make_stream(make_response(200, {'minimumVersion': 500, 'currentVersion': 600})))
+
+        self.assertRaises(HPOneViewException, self.run_async, self.connection.login({}))
+
+    def test_read_response_chunked(self):
+        reader, _ = make_stream(b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+                                b'4\r\n{"a"\r\n4\r\n: 1}\r\n0\r\n\r\n')
+
+        response, body = self.run_async(read_response(reader))
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b'{"a": 1}')
+        self.assertFalse(response.will_close)
+
+    def test_read_response_without_length_reads_until_eof(self):
+        reader, _ = make_stream(b'HTTP/1.1 200 OK\r\n\r\ndata')
+        reader.feed_eof()
+
+        response, body = self.run_async(read_response(reader))
+
+        self.assertEqual(body, b'data')
+        self.assertTrue(response.will_close)
+
+    def test_read_response_headers_are_case_insensitive(self):
+        reader, _ = make_stream(make_response(202, {}, {'Location': '/rest/tasks/1'}))
+
+        response, _ = self.run_async(read_response(reader))
+
+        self.assertEqual(response.getheader('location'), '/rest/tasks/1')
+        self.assertEqual(response.getheader('LOCATION'), '/rest/tasks/1')
+
+    def test_decode_body(self):
+        self.assertEqual(decode_body(b'{"a": 1}'), {'a': 1})
+        self.assertEqual(decode_body(b'text'), 'text')
+        self.assertEqual(decode_body(b'\xff\xfe'), b'\xff\xfe')
+        self.assertEqual(decode_body(b''), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
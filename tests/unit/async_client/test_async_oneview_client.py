@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import asyncio
+import unittest
+
+from mock import patch
+from hpOneView.async_connection import AsyncConnection
+from hpOneView.async_oneview_client import AsyncOneViewClient, ASYNC_RESOURCES
+from hpOneView.resources.async_resource import AsyncResourceClient
+from hpOneView.resources.async_task_monitor import AsyncTaskMonitor
+from hpOneView.resources.servers.server_hardware import ServerHardware
+from tests.unit.async_client.test_async_resource import async_results
+
+
+class AsyncOneViewClientTest(unittest.TestCase):
+    def setUp(self):
+        self.config = {"ip": "172.16.102.59",
+                       "api_version": 600,
+                       "concurrency": 4,
+                       "credentials": {"userName": "administrator", "password": "password"}}
+        self.client = AsyncOneViewClient(self.config)
+
+    def test_connection(self):
+        self.assertIsInstance(self.client.connection, AsyncConnection)
+        self.assertEqual(self.client.connection.get_host(), "172.16.102.59")
+        self.assertEqual(self.client.connection._concurrency, 4)
+        self.assertEqual(self.client.api_version, 600)
+
+    def test_resource_client_uses_resource_uri(self):
+        self.assertIsInstance(self.client.server_hardware, AsyncResourceClient)
+        self.assertEqual(self.client.server_hardware._uri, ServerHardware.URI)
+
+    def test_resource_client_lazy_loading(self):
+        self.assertIs(self.client.enclosures, self.client.enclosures)
+
+    def test_all_resources_have_uri(self):
+        for name in ASYNC_RESOURCES:
+            self.assertTrue(getattr(self.client, name)._uri.startswith('/rest/'), name)
+
+    def test_unknown_attribute(self):
+        self.assertRaises(AttributeError, getattr, self.client, 'unknown_resource')
+
+    def test_dir_lists_resources(self):
+        self.assertIn('server_hardware', dir(self.client))
+
+    def test_task_monitor(self):
+        self.assertIsInstance(self.client.task_monitor, AsyncTaskMonitor)
+
+    @patch.object(AsyncConnection, 'close')
+    @patch.object(AsyncConnection, 'login')
+    def test_context_manager_logs_in_and_closes(self, mock_login, mock_close):
+        mock_login.side_effect = async_results(None)
+        mock_close.side_effect = async_results(None)
+
+        async def use_client():
+            async with self.client as client:
+                return client
+
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertIs(loop.run_until_complete(use_client()), self.client)
+        finally:
+            loop.close()
+
+        mock_login.assert_called_once_with(self.config['credentials'])
+        mock_close.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
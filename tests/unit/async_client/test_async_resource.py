@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import asyncio
+import unittest
+
+from mock import Mock, call
+from hpOneView.resources.async_resource import AsyncResourceClient
+from hpOneView.exceptions import HPOneViewUnknownType
+
+
+def async_results(*results):
+    results = list(results)
+
+    async def side_effect(*args, **kwargs):
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return side_effect
+
+
+class AsyncResourceClientTest(unittest.TestCase):
+    URI = "/rest/testuri"
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.connection = Mock(_apiVersion=300)
+        self.resource_client = AsyncResourceClient(self.connection, self.URI)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_get_all_should_follow_next_page_uri(self):
+        self.connection.get = Mock(side_effect=async_results(
+            {'members': [{'id': 1}, {'id': 2}], 'nextPageUri': self.URI + '?start=2&count=2'},
+            {'members': [{'id': 3}], 'nextPageUri': None}))
+
+        result = self.run_async(self.resource_client.get_all(filter="name='x'"))
+
+        self.assertEqual(result, [{'id': 1}, {'id': 2}, {'id': 3}])
+        self.connection.get.assert_has_calls([call("/rest/testuri?start=0&count=-1&filter=name%3D%27x%27"),
+                                              call(self.URI + '?start=2&count=2')])
+
+    def test_get_all_should_stop_at_requested_count(self):
+        self.connection.get = Mock(side_effect=async_results(
+            {'members': [{'id': 1}, {'id': 2}], 'nextPageUri': self.URI + '?start=2&count=2'}))
+
+        result = self.run_async(self.resource_client.get_all(count=2))
+
+        self.assertEqual(result, [{'id': 1}, {'id': 2}])
+        self.connection.get.assert_called_once_with(self.URI + '?start=0&count=2')
+
+    def test_get_all_should_return_empty_list_when_no_members(self):
+        self.connection.get = Mock(side_effect=async_results({'members': None}))
+
+        self.assertEqual(self.run_async(self.resource_client.get_all()), [])
+
+    def test_get_by_id(self):
+        self.connection.get = Mock(side_effect=async_results({'id': '12'}))
+
+        self.assertEqual(self.run_async(self.resource_client.get('12')), {'id': '12'})
+        self.connection.get.assert_called_once_with(self.URI + '/12')
+
+    def test_get_by_name_should_filter_on_client(self):
+        self.connection.get = Mock(side_effect=async_results(
+            {'members': [{'name': 'Other'}, {'name': 'Name'}]}))
+
+        self.assertEqual(self.run_async(self.resource_client.get_by_name('name')), {'name': 'Name'})
+
+    def test_get_by_name_should_return_none_when_not_found(self):
+        self.connection.get = Mock(side_effect=async_results({'members': []}))
+
+        self.assertIsNone(self.run_async(self.resource_client.get_by_name('name')))
+
+    def test_get_by_name_should_stop_at_the_first_match(self):
+        self.connection.get = Mock(side_effect=async_results(
+            {'nextPageUri': self.URI + '?start=1&count=1', 'members': [{'name': 'Name'}]}))
+
+        self.assertEqual(self.run_async(self.resource_client.get_by_name('name')), {'name': 'Name'})
+        self.assertEqual(self.connection.get.call_count, 1)
+
+    def test_get_by_name_exact_should_request_one_item(self):
+        self.connection.get = Mock(side_effect=async_results({'members': [{'name': 'Name'}]}))
+
+        self.run_async(self.resource_client.get_by_name('Name', fields='name', exact=True))
+
+        self.connection.get.assert_called_once_with(self.URI + '?start=0&count=1&filter=%22name%3D%27Name%27%22'
+                                                    '&fields=name')
+
+    def test_create_should_return_entity_when_no_task(self):
+        self.connection.post = Mock(side_effect=async_results((None, {'name': 'new'})))
+
+        result = self.run_async(self.resource_client.create({'name': 'new'}, default_values={'300': {'type': 'T'}}))
+
+        self.assertEqual(result, {'name': 'new'})
+        self.connection.post.assert_called_once_with(self.URI, {'name': 'new', 'type': 'T'}, custom_headers=None)
+
+    def test_create_should_wait_for_task(self):
+        task = {'uri': '/rest/tasks/1'}
+        self.connection.post = Mock(side_effect=async_results((task, {})))
+        self.resource_client._task_monitor.wait_for_task = Mock(side_effect=async_results({'name': 'created'}))
+
+        result = self.run_async(self.resource_client.create({'name': 'new'}, timeout=30))
+
+        self.assertEqual(result, {'name': 'created'})
+        self.resource_client._task_monitor.wait_for_task.assert_called_once_with(task, 30)
+
+    def test_create_without_resource(self):
+        self.assertRaises(ValueError, self.run_async, self.resource_client.create(None))
+
+    def test_update_with_force(self):
+        self.connection.put = Mock(side_effect=async_results((None, {'name': 'updated'})))
+
+        self.run_async(self.resource_client.update({'uri': self.URI + '/1'}, force=True))
+
+        self.connection.put.assert_called_once_with(self.URI + '/1?force=True', {'uri': self.URI + '/1'},
+                                                    custom_headers=None)
+
+    def test_patch_should_use_json_patch_content_type(self):
+        self.connection.patch = Mock(side_effect=async_results((None, {'name': 'patched'})))
+
+        result = self.run_async(self.resource_client.patch('1', 'replace', '/name', 'patched'))
+
+        self.assertEqual(result, {'name': 'patched'})
+        self.connection.patch.assert_called_once_with(self.URI + '/1',
+                                                      [{'op': 'replace', 'path': '/name', 'value': 'patched'}],
+                                                      custom_headers={'Content-Type': 'application/json-patch+json'})
+
+    def test_delete_should_return_true_when_no_task(self):
+        self.connection.delete = Mock(side_effect=async_results((None, {})))
+
+        self.assertTrue(self.run_async(self.resource_client.delete({'uri': self.URI + '/1'})))
+        self.connection.delete.assert_called_once_with(self.URI + '/1', custom_headers=None)
+
+    def test_delete_should_wait_for_task(self):
+        task = {'uri': '/rest/tasks/1'}
+        self.connection.delete = Mock(side_effect=async_results((task, {})))
+        self.resource_client._task_monitor.wait_for_task = Mock(side_effect=async_results(True))
+
+        self.assertTrue(self.run_async(self.resource_client.delete('1', force=True)))
+        self.connection.delete.assert_called_once_with(self.URI + '/1?force=True', custom_headers=None)
+
+    def test_delete_dict_without_uri(self):
+        self.assertRaises(HPOneViewUnknownType, self.run_async, self.resource_client.delete({'name': 'x'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import asyncio
+import unittest
+
+from mock import Mock, patch
+from hpOneView.resources.async_task_monitor import AsyncTaskMonitor
+from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.task_polling import LinearPolling
+from hpOneView.exceptions import HPOneViewTaskError, HPOneViewTimeout, HPOneViewUnknownType
+from tests.unit.async_client.test_async_resource import async_results
+
+
+class AsyncTaskMonitorTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.connection = Mock()
+        self.task_monitor = AsyncTaskMonitor(self.connection, LinearPolling())
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    @patch('asyncio.sleep')
+    def test_wait_for_task_should_return_associated_resource(self, mock_sleep):
+        mock_sleep.side_effect = async_results(None)
+        task = {'uri': '/rest/tasks/1', 'category': 'tasks', 'type': 'TaskResourceV2',
+                'associatedResource': {'resourceUri': '/rest/resources/1'}}
+        self.connection.get = Mock(side_effect=async_results(dict(task, taskState='Running'),
+                                                             dict(task, taskState='Completed'),
+                                                             dict(task, taskState='Completed'),
+                                                             {'name': 'resource'}))
+
+        result = self.run_async(self.task_monitor.wait_for_task(task))
+
+        self.assertEqual(result, {'name': 'resource'})
+        mock_sleep.assert_called_once_with(1)
+
+    def test_wait_for_task_should_return_true_for_delete_tasks(self):
+        task = {'uri': '/rest/tasks/1', 'name': 'Delete', 'taskState': 'Completed'}
+        self.connection.get = Mock(side_effect=async_results(task, task))
+
+        self.assertTrue(self.run_async(self.task_monitor.wait_for_task(task)))
+
+    def test_wait_for_task_should_raise_task_error(self):
+        task = {'uri': '/rest/tasks/1', 'taskState': 'Error',
+                'taskErrors': [{'message': 'Failed', 'errorCode': 'ERR'}]}
+        self.connection.get = Mock(side_effect=async_results(task, task))
+
+        with self.assertRaises(HPOneViewTaskError) as context:
+            self.run_async(self.task_monitor.wait_for_task(task))
+
+        self.assertEqual(context.exception.msg, 'Failed')
+        self.assertEqual(context.exception.error_code, 'ERR')
+
+    @patch('asyncio.sleep')
+    def test_wait_for_task_should_raise_timeout(self, mock_sleep):
+        mock_sleep.side_effect = async_results(None, None)
+        task = {'uri': '/rest/tasks/1', 'taskState': 'Running'}
+        self.connection.get = Mock(side_effect=async_results(task, task))
+
+        with patch.object(TaskMonitor, 'get_current_seconds', side_effect=[0, 1, 11]):
+            self.assertRaises(HPOneViewTimeout, self.run_async, self.task_monitor.wait_for_task(task, timeout=10))
+
+    def test_wait_for_task_without_task(self):
+        self.assertRaises(HPOneViewUnknownType, self.run_async, self.task_monitor.wait_for_task(None))
+
+    def test_get_completed_task(self):
+        task = {'uri': '/rest/tasks/1', 'taskState': 'Completed', 'taskOutput': ['output']}
+        self.connection.get = Mock(side_effect=async_results(task, task))
+
+        self.assertEqual(self.run_async(self.task_monitor.get_completed_task(task)), task)
+
+    def test_get_associated_resource_for_backups(self):
+        task = {'category': 'backups', 'type': 'BACKUP', 'taskUri': '/rest/tasks/1'}
+        self.connection.get = Mock(side_effect=async_results({'uri': '/rest/backups/1'}, {'name': 'backup'}))
+
+        result = self.run_async(self.task_monitor.get_associated_resource(task))
+
+        self.assertEqual(result, ({'uri': '/rest/backups/1'}, {'name': 'backup'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
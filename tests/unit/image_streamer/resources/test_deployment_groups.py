@@ -67,4 +67,4 @@ class DeploymentGroupsTest(TestCase):
     def test_get_by_name_called_once(self, mock_get_by):
         self._client.get_by_name('OSS')
 
-        mock_get_by.assert_called_once_with('name', 'OSS')
+        mock_get_by.assert_called_once_with('name', 'OSS', count=1, fields='', exact=False)
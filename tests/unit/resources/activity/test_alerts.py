@@ -45,6 +45,20 @@ class AlertsTest(TestCase):
                                          filter="name='name'",
                                          query='', sort='name:ascending', start=0, view='day')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/alerts/1': '"1"'}
+
+        self._client.sync(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all(self, mock_iter_all):
+        self._client.iter_all(filter="name='name'", sort='name:ascending')
+        mock_iter_all.assert_called_once_with(count=-1, filter="name='name'", query='', sort='name:ascending',
+                                              start=0, view='')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_specific(self, mock_get):
         self._client.get('35323930-4936-4450-5531-303153474820')
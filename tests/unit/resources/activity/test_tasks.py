@@ -36,6 +36,17 @@ class TasksTest(TestCase):
         self.connection = connection(self.host)
         self._client = Tasks(self.connection)
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all(self, mock_iter_all):
+        self._client.iter_all(fields='name', filter="taskState='Running'")
+        mock_iter_all.assert_called_once_with(count=-1, fields='name', filter="taskState='Running'", query='', sort='',
+                                              start=0, view='')
+
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync(self, mock_sync):
+        self._client.sync(filter="taskState='Running'")
+        mock_sync.assert_called_once_with(None, filter="taskState='Running'", query='')
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all(self, mock_get):
         self._client.get_all(fields='parentTaskUri,owner,name',
@@ -50,6 +50,21 @@ class DatacenterTest(TestCase):
         self._datacenters.get_all()
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='', query='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/datacenters/1': '"1"'}
+
+        self._datacenters.sync(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._datacenters.iter_all(2, 500, filter="name='TestName'", query="name eq 'TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", query="name eq 'TestName'",
+                                              sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         datacenter_id = "f0a0a113-ec97-41b4-83ce-d7c92b900e7c"
@@ -67,6 +67,20 @@ class SanManagersTest(TestCase):
         self._resource.get_all(start=2, count=500, query=query_filter, sort=sort)
         mock_get_all.assert_called_once_with(start=2, count=500, query=query_filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/fc-sans/device-managers/1': '"1"'}
+
+        self._resource.sync(snapshot, query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._resource.iter_all(2, 500, query="name eq 'TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, query="name eq 'TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id(self, mock_get):
         id = "6fee02f3-b7c7-42bd-a528-04341e16bad6"
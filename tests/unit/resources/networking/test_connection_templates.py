@@ -52,6 +52,20 @@ class ConnectionTemplatesTest(unittest.TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/connection-templates/1': '"1"'}
+
+        self._connection_templates.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._connection_templates.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._connection_templates.get_by(
@@ -45,6 +45,20 @@ class EthernetNetworksTest(TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/ethernet-networks/1': '"1"'}
+
+        self._ethernet_networks.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._ethernet_networks.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'create')
     def test_create_should_use_given_values(self, mock_create):
         resource = {
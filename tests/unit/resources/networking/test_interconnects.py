@@ -98,6 +98,20 @@ class InterconnectsTest(unittest.TestCase):
         self._interconnects.get_all(2, 5, filter, sort)
         mock_get_all.assert_called_once_with(2, 5, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/interconnects/1': '"1"'}
+
+        self._interconnects.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._interconnects.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'patch')
     def test_patch_interconnect_should_return_the_task(self, mock_patch):
         interconnect_id = '5v8f3ec0-52t4-475a-84g4-c4iod72d2c20'
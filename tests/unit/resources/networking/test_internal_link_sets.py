@@ -61,6 +61,22 @@ class InternalLinkSetsTest(TestCase):
         self._client.get_all()
         mock_get_all.assert_called_once_with(start=0, count=-1, filter='', sort='', query='', fields='', view='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/internal-link-sets/1': '"1"'}
+
+        self._client.sync(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._client.iter_all(2, 500, filter="name='TestName'", query="name eq 'TestName'", sort='name:ascending',
+                              view='expand', fields='name')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, filter="name='TestName'", query="name eq 'TestName'",
+                                              sort='name:ascending', view='expand', fields='name')
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_by_called_once(self, mock_get_all):
         mock_get_all.return_value = INTERNAL_LINK_SETS
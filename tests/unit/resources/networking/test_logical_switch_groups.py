@@ -50,6 +50,20 @@ class LogicalSwitchGroupsTest(unittest.TestCase):
         self._lsg.get_all()
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/logical-switch-groups/1': '"1"'}
+
+        self._lsg.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._lsg.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         lsg_id = "f0a0a113-ec97-41b4-83ce-d7c92b900e7c"
@@ -43,6 +43,20 @@ class SasInterconnectTypesTest(unittest.TestCase):
 
         self._sas_interconnect_types.get_all(2, 500, filter, sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/sas-interconnect-types/1': '"1"'}
+
+        self._sas_interconnect_types.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._sas_interconnect_types.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._sas_interconnect_types.get_by('name', 'SAS Interconnect Type 1')
@@ -45,6 +45,22 @@ class SasInterconnectsTest(unittest.TestCase):
         self._sas_interconnects.get_all(2, 500, filter=filter, sort=sort)
         mock_get_all.assert_called_once_with(start=2, count=500, filter=filter, sort=sort, query='', view='', fields='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/sas-interconnects/1': '"1"'}
+
+        self._sas_interconnects.sync(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._sas_interconnects.iter_all(2, 500, fields='name', filter="name='TestName'", query="name eq 'TestName'",
+                                         sort='name:ascending', view='expand')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, fields='name', filter="name='TestName'",
+                                              query="name eq 'TestName'", sort='name:ascending', view='expand')
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         sas_interconnect_name = "0000A66103, interconnect 4"
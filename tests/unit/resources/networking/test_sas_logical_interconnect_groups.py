@@ -46,6 +46,24 @@ class SasLogicalInterconnectGroupsTest(unittest.TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort, scope_uris=scope_uris)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/sas-logical-interconnect-groups/1': '"1"'}
+
+        self._resource.sync(snapshot, filter="name='TestName'",
+                            scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'",
+                                          scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._resource.iter_all(2, 500, filter="name='TestName'", sort='name:ascending',
+                                scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending',
+                                              scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         self._resource.get('3518be0e-17c1-4189-8f81-83f3724f6155')
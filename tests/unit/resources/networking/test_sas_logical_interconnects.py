@@ -49,6 +49,22 @@ class SasLogicalInterconnectsTest(unittest.TestCase):
         self._client.get_all()
         mock_get_all.assert_called_once_with(count=-1, fields='', filter='', query='', sort='', start=0, view='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/sas-logical-interconnects/1': '"1"'}
+
+        self._client.sync(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._client.iter_all(2, 500, fields='name', filter="name='TestName'", query="name eq 'TestName'",
+                              sort='name:ascending', view='expand')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, fields='name', filter="name='TestName'",
+                                              query="name eq 'TestName'", sort='name:ascending', view='expand')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         logical_interconnect_id = "f0a0a113-ec97-41b4-83ce-d7c92b900e7c"
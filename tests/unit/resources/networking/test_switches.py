@@ -74,6 +74,20 @@ class SwitchesTest(unittest.TestCase):
         self._switches.get_all()
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/switches/1': '"1"'}
+
+        self._switches.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._switches.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_environmental_configuration_called_once_when_id_provided(self, mock_get):
         switches_id = "f0a0a113-ec97-41b4-83ce-d7c92b900e7c"
@@ -49,6 +49,20 @@ class UplinkSetsTest(unittest.TestCase):
         self._uplink_sets.get_all()
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/uplink-sets/1': '"1"'}
+
+        self._uplink_sets.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._uplink_sets.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._uplink_sets.get_by('name', 'OneViewSDK Test Uplink Set')
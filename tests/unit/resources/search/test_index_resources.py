@@ -70,6 +70,13 @@ class IndexResourcesTest(unittest.TestCase):
         self._resource.get_all(start=2, count=500, filter=filter, sort=sort)
         mock_get_all.assert_called_once_with(start=2, count=500, uri=expected_uri)
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        expected_uri = '/rest/index/resources?category=server-hardware&sort=name:ascending'
+
+        self._resource.iter_all(category='server-hardware', count=500, sort='name:ascending')
+        mock_iter_all.assert_called_once_with(start=0, count=500, uri=expected_uri)
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_called_once(self, mock_get):
         index_uri = "/rest/server-hardwares/fake"
@@ -59,6 +59,20 @@ class LabelsTest(unittest.TestCase):
         self._resource.get_all(2, 500, filter, sort)
         mock_get_all.assert_called_once_with(start=2, count=500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/labels/1': '"1"'}
+
+        self._resource.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._resource.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_called_once(self, mock_get):
         label_uri = "/rest/labels/2"
@@ -56,6 +56,22 @@ class ConnectionsTest(TestCase):
         mock_get_all.assert_called_once_with(
             0, -1, filter='', sort='', view='', fields='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/connections/1': '"1"'}
+
+        self._connections.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._connections.iter_all(2, 500, filter="name='TestName'", sort='name:ascending', view='expand',
+                                   fields='name')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending', view='expand',
+                                              fields='name')
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._connections.get_by('name', 'OneViewSDK-Test-Connection')
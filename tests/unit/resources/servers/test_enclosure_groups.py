@@ -82,6 +82,24 @@ class EnclosureGroupsTest(unittest.TestCase):
         self.client.get_all()
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='', scope_uris='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/enclosure-groups/1': '"1"'}
+
+        self.client.sync(snapshot, filter="name='TestName'",
+                         scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'",
+                                          scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self.client.iter_all(2, 500, filter="name='TestName'", sort='name:ascending',
+                             scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending',
+                                              scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         id = "f0a0a113-ec97-41b4-83ce-d7c92b900e7c"
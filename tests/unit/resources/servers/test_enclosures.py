@@ -46,12 +46,29 @@ class EnclosuresTest(TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort, scope_uris=scope_uris)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/enclosures/1': '"1"'}
+        scope_uris = 'rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a'
+
+        self._enclosures.sync(snapshot, 'name=TestName', scope_uris)
+
+        mock_sync.assert_called_once_with(snapshot, filter='name=TestName', scope_uris=scope_uris)
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_once_with_default_values(self, mock_get_all):
         self._enclosures.get_all()
 
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='', scope_uris='')
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._enclosures.iter_all(2, 500, filter="name='TestName'", sort='name:ascending',
+                                  scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending',
+                                              scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._enclosures.get_by('name', 'OneViewSDK-Test-Enclosure')
@@ -63,6 +63,20 @@ class TestIdPoolsIpv4Subnets(unittest.TestCase):
         self.client.get_all(self.example_uri)
         mock_get.assert_called_once_with(self.example_uri, -1, filter='', sort='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/id-pools/ipv4/subnets/1': '"1"'}
+
+        self.client.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self.client.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'delete')
     def test_delete_called_once(self, mock_delete):
         self.client.delete({'uri': '/rest/uri'}, force=True, timeout=50)
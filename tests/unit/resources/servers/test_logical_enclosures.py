@@ -83,6 +83,24 @@ class LogicalEnclosuresTest(TestCase):
 
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='', scope_uris='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/logical-enclosures/1': '"1"'}
+
+        self._logical_enclosures.sync(snapshot, filter="name='TestName'",
+                                      scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'",
+                                          scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._logical_enclosures.iter_all(2, 500, filter="name='TestName'", sort='name:ascending',
+                                          scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending',
+                                              scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._logical_enclosures.get_by('name', 'OneViewSDK-Test-Logical-Enclosure')
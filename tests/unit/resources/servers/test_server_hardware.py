@@ -62,6 +62,14 @@ class ServerHardwareTest(TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/server-hardware/1': '"1"'}
+
+        self._server_hardware.sync(snapshot, filter='name=TestName')
+
+        mock_sync.assert_called_once_with(snapshot, filter='name=TestName')
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_once_with_default_values(self, mock_get_all):
         self._server_hardware.get_all()
@@ -324,6 +332,12 @@ class ServerHardwareTest(TestCase):
         mock_get.assert_called_once_with(2, 5, "name='name'", 'query', 'sort', '', '',
                                          '/rest/server-hardware/*/firmware')
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._server_hardware.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_firmware_by_id(self, mock_get):
         id = 'ad28cf21-8b15-4f92-bdcf-51cb2042db32'
@@ -48,6 +48,20 @@ class ServerHardwareTypesTest(unittest.TestCase):
         self._server_hardware_types.get_all(2, 500, filter, sort)
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/server-hardware-types/1': '"1"'}
+
+        self._server_hardware_types.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._server_hardware_types.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         server_hardware_type_id = "f0a0a113-ec97-41b4-83ce-d7c92b900e7c"
@@ -49,6 +49,24 @@ class ServerProfileTemplateTest(TestCase):
         mock_get_all.assert_called_once_with(
             start=2, count=500, filter=query_filter, sort=sort, scope_uris=scope_uris)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/server-profile-templates/1': '"1"'}
+
+        self._resource.sync(snapshot, filter="name='TestName'",
+                            scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'",
+                                          scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._resource.iter_all(2, 500, filter="name='TestName'", sort='name:ascending',
+                                scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, filter="name='TestName'", sort='name:ascending',
+                                              scope_uris='rest/scopes/cd237b60-09e2-45c4-829e-082e318a6d2a')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id(self, mock_get):
         template_id = "6fee02f3-b7c7-42bd-a528-04341e16bad6"
@@ -46,6 +46,17 @@ class ServerProfilesTest(TestCase):
         self._resource.get_all(start=2, count=500, filter=query_filter, sort=sort)
         mock_get_all.assert_called_once_with(start=2, count=500, filter=query_filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._resource.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, filter="name='TestName'", sort='name:ascending')
+
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync(self, mock_sync):
+        self._resource.sync()
+        mock_sync.assert_called_once_with(None, filter='')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id(self, mock_get):
         id = "6fee02f3-b7c7-42bd-a528-04341e16bad6"
@@ -58,6 +58,20 @@ class FirmwareDriversTest(TestCase):
         self.resource.get_all(2, 500, filter_by, sort)
         mock_get_all.assert_called_once_with(2, 500, filter=filter_by, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/firmware-drivers/1': '"1"'}
+
+        self.resource.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self.resource.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_by(self, mock_get_all):
         property_name = 'name'
@@ -46,6 +46,20 @@ class ScopesTest(TestCase):
         self.resource.get_all(2, 500, sort, query, view)
         mock_get_all.assert_called_once_with(2, 500, sort=sort, query=query, view=view)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/scopes/1': '"1"'}
+
+        self.resource.sync(snapshot, query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self.resource.iter_all(2, 500, sort='name:ascending', query="name eq 'TestName'", view='expand')
+
+        mock_iter_all.assert_called_once_with(2, 500, sort='name:ascending', query="name eq 'TestName'", view='expand')
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_by_name_should_return_scope_when_found(self, mock_get_all):
         mock_get_all.return_value = [
@@ -54,6 +54,20 @@ class DriveEnclosuresTest(unittest.TestCase):
         self._drive_enclosures.get_all()
         mock_get_all.assert_called_once_with(start=0, count=-1, filter='', sort='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/drive-enclosures/1': '"1"'}
+
+        self._drive_enclosures.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._drive_enclosures.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         self._drive_enclosures.get(self.DRIVE_ENCLOSURE_ID)
@@ -43,6 +43,20 @@ class SasLogicalJbodAttachmentsTest(unittest.TestCase):
 
         self._sas_logical_jbod_attachments.get_all(2, 500, filter, sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/sas-logical-jbod-attachments/1': '"1"'}
+
+        self._sas_logical_jbod_attachments.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._sas_logical_jbod_attachments.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._sas_logical_jbod_attachments.get_by('name', 'SAS Logical JBOD Attachment Name')
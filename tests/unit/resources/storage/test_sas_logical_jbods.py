@@ -52,6 +52,20 @@ class SasLogicalJbodsTest(unittest.TestCase):
         self._resource.get_all(**args)
         mock_get_all.assert_called_once_with(**args)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/sas-logical-jbods/1': '"1"'}
+
+        self._resource.sync(snapshot, filter="name='TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._resource.iter_all(2, 500, filter="name='TestName'", sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(start=2, count=500, filter="name='TestName'", sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_called_once(self, mock_get):
         self._resource.get(id_or_uri=self.SAS_LOGICAL_JBOD_ID)
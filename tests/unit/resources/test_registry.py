@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import subprocess
+import sys
+import unittest
+
+from hpOneView.oneview_client import OneViewClient
+from hpOneView.resources.registry import RESOURCES, get_resource_class
+from hpOneView.resources.servers.server_hardware import ServerHardware
+
+
+class RegistryTest(unittest.TestCase):
+    def test_get_resource_class(self):
+        self.assertIs(get_resource_class('server_hardware'), ServerHardware)
+
+    def test_get_resource_class_with_unknown_name(self):
+        self.assertRaises(KeyError, get_resource_class, 'unknown')
+
+    def test_all_resource_classes_can_be_imported(self):
+        for name, (_, class_name) in RESOURCES.items():
+            self.assertEqual(get_resource_class(name).__name__, class_name)
+
+    def test_all_client_resources_are_registered(self):
+        properties = [name for name, value in vars(OneViewClient).items() if isinstance(value, property)]
+
+        self.assertEqual(sorted(set(properties) - set(RESOURCES)), ['api_version', 'connection'])
+
+    def test_client_module_does_not_import_resources(self):
+        code = ("import sys, hpOneView.oneview_client; "
+                "print(len([m for m in sys.modules if m.startswith('hpOneView.resources.') and "
+                "m != 'hpOneView.resources.registry']))")
+
+        output = subprocess.check_output([sys.executable, '-c', code])
+
+        self.assertEqual(output.strip(), b'0')
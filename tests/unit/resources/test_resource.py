@@ -20,14 +20,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 ###
-import io
 import unittest
 import mock
 
 from mock import call
-from tests.test_utils import mock_builtin
 
 from hpOneView.connection import connection
+from hpOneView.response_cache import ResponseCache
+from hpOneView.resources.task_scheduler import TaskHandle, TaskScheduler
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewException, HPOneViewValueError
 from hpOneView.resources.resource import merge_resources, merge_default_values
 from hpOneView.resources.resource import ResourceClient, RESOURCE_CLIENT_INVALID_ID, UNRECOGNIZED_URI, TaskMonitor, \
@@ -247,6 +247,119 @@ class ResourceClientTest(unittest.TestCase):
         self.assertSequenceEqual(result, members)
         mock_get.assert_called_once_with(uri)
 
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_request_remaining_pages_in_parallel(self, mock_get):
+        self.connection.set_page_workers(4)
+        responses = {
+            '/rest/testuri?start=0&count=-1': {'total': 8, 'nextPageUri': '/rest/testuri?start=3&count=3',
+                                               'members': [{'id': '1'}, {'id': '2'}, {'id': '3'}]},
+            '/rest/testuri?start=3&count=3': {'total': 8, 'members': [{'id': '4'}, {'id': '5'}, {'id': '6'}]},
+            '/rest/testuri?start=6&count=2': {'total': 8, 'members': [{'id': '7'}, {'id': '8'}]}
+        }
+        mock_get.side_effect = lambda uri: responses[uri]
+
+        result = self.resource_client.get_all()
+
+        expected_items = [{'id': str(i)} for i in range(1, 9)]
+        self.assertEqual(result, expected_items)
+        self.assertEqual(sorted(c[0][0] for c in mock_get.call_args_list), sorted(responses.keys()))
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_limit_parallel_pages_to_requested_count(self, mock_get):
+        self.connection.set_page_workers(4)
+        responses = {
+            '/rest/testuri?start=2&count=5&filter=name%3Dx': {'total': 20, 'nextPageUri': '/rest/testuri?start=4&count=2',
+                                                              'members': [{'id': '3'}, {'id': '4'}]},
+            '/rest/testuri?start=4&count=2&filter=name%3Dx': {'members': [{'id': '5'}, {'id': '6'}]},
+            '/rest/testuri?start=6&count=1&filter=name%3Dx': {'members': [{'id': '7'}]}
+        }
+        mock_get.side_effect = lambda uri: responses[uri]
+
+        result = self.resource_client.get_all(start=2, count=5, filter='name=x')
+
+        self.assertEqual(result, [{'id': str(i)} for i in range(3, 8)])
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_follow_next_page_when_total_is_unknown(self, mock_get):
+        self.connection.set_page_workers(4)
+        mock_get.side_effect = [{'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+                                {'nextPageUri': None, 'members': [{'id': '2'}]}]
+
+        result = self.resource_client.get_all()
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}])
+        self.assertEqual(mock_get.call_args_list, [call('/rest/testuri?start=0&count=-1'),
+                                                   call('/rest/testuri?start=1&count=1')])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_raise_when_parallel_page_fails(self, mock_get):
+        self.connection.set_page_workers(2)
+        first_page = {'total': 4, 'nextPageUri': '/rest/testuri?start=2&count=2', 'members': [{'id': '1'}, {'id': '2'}]}
+        mock_get.side_effect = [first_page, HPOneViewException('error')]
+
+        self.assertRaises(HPOneViewException, self.resource_client.get_all)
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_yield_items_of_all_pages(self, mock_get):
+        uri_list = ['/rest/testuri?start=0&count=-1',
+                    '/rest/testuri?start=3&count=3',
+                    '/rest/testuri?start=6&count=3']
+
+        results = [{'nextPageUri': uri_list[1], 'members': [{'id': '1'}, {'id': '2'}, {'id': '3'}]},
+                   {'nextPageUri': uri_list[2], 'members': [{'id': '4'}, {'id': '5'}, {'id': '6'}]},
+                   {'nextPageUri': None, 'members': [{'id': '7'}]}]
+
+        mock_get.side_effect = results
+
+        result = list(self.resource_client.iter_all())
+
+        self.assertEqual(result, [{'id': str(i)} for i in range(1, 8)])
+        self.assertEqual(mock_get.call_args_list, [call(uri_list[0]), call(uri_list[1]), call(uri_list[2])])
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_not_request_pages_before_iteration(self, mock_get):
+        self.resource_client.iter_all()
+
+        mock_get.assert_not_called()
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_prefetch_only_the_next_page(self, mock_get):
+        uri_list = ['/rest/testuri?start=0&count=-1',
+                    '/rest/testuri?start=1&count=1',
+                    '/rest/testuri?start=2&count=1']
+
+        results = [{'nextPageUri': uri_list[1], 'members': [{'id': '1'}]},
+                   {'nextPageUri': uri_list[2], 'members': [{'id': '2'}]},
+                   {'nextPageUri': None, 'members': [{'id': '3'}]}]
+
+        mock_get.side_effect = results
+
+        items = self.resource_client.iter_all()
+        self.assertEqual(next(items), {'id': '1'})
+        items.close()
+
+        self.assertEqual(mock_get.call_args_list, [call(uri_list[0]), call(uri_list[1])])
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_stop_when_requested_count_reached(self, mock_get):
+        mock_get.return_value = {'nextPageUri': '/rest/testuri?start=2&count=2', 'members': [{'id': '1'}, {'id': '2'}]}
+
+        result = list(self.resource_client.iter_all(count=2, filter="name='x'"))
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}])
+        mock_get.assert_called_once_with("/rest/testuri?start=0&count=2&filter=name%3D%27x%27")
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_raise_when_next_page_fails(self, mock_get):
+        mock_get.side_effect = [{'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+                                HPOneViewException('error')]
+
+        items = self.resource_client.iter_all()
+
+        self.assertEqual(next(items), {'id': '1'})
+        self.assertRaises(HPOneViewException, next, items)
+
     @mock.patch.object(connection, 'get')
     def test_get_all_should_return_empty_list_when_response_has_no_items(self, mock_get):
         mock_get.return_value = {'nextPageUri': None, 'members': []}
@@ -342,14 +455,14 @@ class ResourceClientTest(unittest.TestCase):
         mock_get_by.return_value = [{"name": "value"}]
         response = self.resource_client.get_by_name('Resource Name,')
         self.assertEqual(response, {"name": "value"})
-        mock_get_by.assert_called_once_with("name", 'Resource Name,')
+        mock_get_by.assert_called_once_with("name", 'Resource Name,', count=1, fields='', exact=False)
 
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_name_without_result(self, mock_get_by):
         mock_get_by.return_value = []
         response = self.resource_client.get_by_name('Resource Name,')
         self.assertIsNone(response)
-        mock_get_by.assert_called_once_with("name", 'Resource Name,')
+        mock_get_by.assert_called_once_with("name", 'Resource Name,', count=1, fields='', exact=False)
 
     @mock.patch.object(connection, 'get')
     def test_get_collection_uri(self, mock_get):
@@ -408,6 +521,46 @@ class ResourceClientTest(unittest.TestCase):
         self.assertEqual(response, [{'name': 'expected'}, {'name': 'not expected'}])
         mock_get_all.assert_called_once_with(filter="\"connection.name='expected'\"", uri='/rest/testuri')
 
+    @mock.patch.object(connection, 'get')
+    def test_get_by_with_count_should_stop_at_the_page_with_enough_matches(self, mock_get):
+        mock_get.side_effect = [{'nextPageUri': '/rest/testuri?start=2&count=2', 'members': [{'name': 'other'}]},
+                                {'nextPageUri': '/rest/testuri?start=4&count=2', 'members': [{'name': 'Expected'}]}]
+
+        response = self.resource_client.get_by('name', 'expected', count=1)
+
+        self.assertEqual(response, [{'name': 'Expected'}])
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_by_with_fields_should_request_the_filtered_field(self, mock_get):
+        mock_get.return_value = {'members': [{'name': 'expected', 'uri': '/rest/testuri/1'}]}
+
+        response = self.resource_client.get_by('name', 'expected', fields='uri')
+
+        self.assertEqual(response, [{'name': 'expected', 'uri': '/rest/testuri/1'}])
+        mock_get.assert_called_once_with("/rest/testuri?start=0&count=-1&filter=%22name%3D%27expected%27%22"
+                                         "&fields=uri%2Cname")
+
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_get_by_exact_should_trust_the_filter(self, mock_get_all):
+        mock_get_all.return_value = [{'name': 'filtered by the appliance'}]
+
+        response = self.resource_client.get_by('name', 'expected', count=1, fields='name,uri', exact=True)
+
+        self.assertEqual(response, [{'name': 'filtered by the appliance'}])
+        mock_get_all.assert_called_once_with(count=1, filter="\"name='expected'\"", fields='name,uri',
+                                             uri='/rest/testuri')
+
+    @mock.patch.object(connection, 'get')
+    def test_get_by_name_exact_should_send_a_single_request_for_one_item(self, mock_get):
+        mock_get.return_value = {'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'name': 'Name'}]}
+
+        response = self.resource_client.get_by_name('Name', fields='name,uri', exact=True)
+
+        self.assertEqual(response, {'name': 'Name'})
+        mock_get.assert_called_once_with("/rest/testuri?start=0&count=1&filter=%22name%3D%27Name%27%22"
+                                         "&fields=name%2Curi")
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_by_property_with_uri(self, mock_get_all):
         self.resource_client.get_by('name', 'MyFibreNetwork', uri='/rest/testuri/5435534/sub')
@@ -929,6 +1082,346 @@ class ResourceClientTest(unittest.TestCase):
 
         mock_get.assert_called_once_with(uri)
 
+    @mock.patch.object(connection, 'get_if_none_match')
+    @mock.patch.object(connection, 'get')
+    def test_get_should_serve_fresh_resource_from_cache(self, mock_get, mock_get_if_none_match):
+        self.connection.set_response_cache(ResponseCache())
+        mock_get.return_value = {'uri': self.URI + '/1', 'eTag': '1'}
+
+        self.resource_client.get('1')
+        result = self.resource_client.get('1')
+
+        self.assertEqual(result, {'uri': self.URI + '/1', 'eTag': '1'})
+        mock_get.assert_called_once_with(self.URI + '/1')
+        mock_get_if_none_match.assert_not_called()
+
+    @mock.patch.object(connection, 'get_if_none_match')
+    @mock.patch.object(connection, 'get')
+    def test_get_should_revalidate_expired_resource(self, mock_get, mock_get_if_none_match):
+        self.connection.set_response_cache(ResponseCache(ttl=0))
+        mock_get.return_value = {'uri': self.URI + '/1', 'eTag': '1'}
+        mock_get_if_none_match.return_value = None
+
+        self.resource_client.get('1')
+        with mock.patch('hpOneView.response_cache.time.time', return_value=10 ** 10):
+            result = self.resource_client.get('1')
+
+        self.assertEqual(result, {'uri': self.URI + '/1', 'eTag': '1'})
+        mock_get.assert_called_once_with(self.URI + '/1')
+        mock_get_if_none_match.assert_called_once_with(self.URI + '/1', '1')
+
+    @mock.patch.object(connection, 'get_if_none_match')
+    @mock.patch.object(connection, 'get')
+    def test_get_should_cache_modified_resource(self, mock_get, mock_get_if_none_match):
+        cache = ResponseCache(ttl=0)
+        self.connection.set_response_cache(cache)
+        mock_get.return_value = {'uri': self.URI + '/1', 'eTag': '1'}
+        mock_get_if_none_match.return_value = {'uri': self.URI + '/1', 'eTag': '2'}
+
+        self.resource_client.get('1')
+        with mock.patch('hpOneView.response_cache.time.time', return_value=10 ** 10):
+            result = self.resource_client.get('1')
+
+        self.assertEqual(result['eTag'], '2')
+        self.assertEqual(cache.get((self.URI + '/1', 300))[0]['eTag'], '2')
+
+    @mock.patch.object(connection, 'get')
+    def test_get_should_not_cache_resource_without_etag(self, mock_get):
+        self.connection.set_response_cache(ResponseCache())
+        mock_get.return_value = {'uri': self.URI + '/1'}
+
+        self.resource_client.get('1')
+        self.resource_client.get('1')
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'put')
+    @mock.patch.object(connection, 'get')
+    def test_update_should_invalidate_cached_resource(self, mock_get, mock_put):
+        self.connection.set_response_cache(ResponseCache())
+        mock_get.return_value = {'uri': self.URI + '/1', 'eTag': '1'}
+        mock_put.return_value = None, {'uri': self.URI + '/1', 'eTag': '2'}
+
+        resource = self.resource_client.get('1')
+        self.resource_client.update(resource, force=True)
+        self.resource_client.get('1')
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'put')
+    @mock.patch.object(connection, 'get')
+    def test_update_of_sub_resource_should_invalidate_cached_resource(self, mock_get, mock_put):
+        self.connection.set_response_cache(ResponseCache())
+        mock_get.side_effect = [{'uri': self.URI + '/1', 'eTag': '1', 'powerState': 'Off'},
+                                {'uri': self.URI + '/1', 'eTag': '2', 'powerState': 'On'}]
+        mock_put.return_value = None, {}
+
+        self.resource_client.get('1')
+        self.resource_client.update({'powerState': 'On'}, self.URI + '/1/powerState')
+        result = self.resource_client.get('1')
+
+        self.assertEqual(result['powerState'], 'On')
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'post')
+    @mock.patch.object(connection, 'get')
+    def test_create_in_sub_resource_should_invalidate_cached_resource(self, mock_get, mock_post):
+        self.connection.set_response_cache(ResponseCache())
+        mock_get.return_value = {'uri': self.URI + '/1', 'eTag': '1'}
+        mock_post.return_value = None, {}
+
+        self.resource_client.get('1')
+        self.resource_client.create_with_zero_body(self.URI + '/1/actions')
+        self.resource_client.get('1')
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'patch')
+    @mock.patch.object(connection, 'get')
+    def test_patch_should_invalidate_cached_resource(self, mock_get, mock_patch):
+        self.connection.set_response_cache(ResponseCache())
+        mock_get.return_value = {'uri': self.URI + '/1', 'eTag': '1'}
+        mock_patch.return_value = None, {}
+
+        self.resource_client.get('1')
+        self.resource_client.patch('1', 'replace', '/name', 'new name')
+        self.resource_client.get('1')
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'delete')
+    @mock.patch.object(connection, 'get')
+    def test_delete_should_invalidate_cached_resource(self, mock_get, mock_delete):
+        cache = ResponseCache()
+        self.connection.set_response_cache(cache)
+        mock_get.return_value = {'uri': self.URI + '/1', 'eTag': '1'}
+        mock_delete.return_value = None, {}
+
+        self.resource_client.get('1')
+        self.resource_client.delete('1')
+
+        self.assertEqual(len(cache), 0)
+
+    @mock.patch.object(connection, 'delete')
+    @mock.patch.object(connection, 'get')
+    def test_delete_all_should_invalidate_cached_resources_of_the_collection(self, mock_get, mock_delete):
+        cache = ResponseCache()
+        self.connection.set_response_cache(cache)
+        mock_get.side_effect = lambda uri: {'uri': uri, 'eTag': '1'}
+        mock_delete.return_value = None, {}
+        cache.set(('/rest/other/1', 300), {'uri': '/rest/other/1', 'eTag': '1'})
+
+        self.resource_client.get('1')
+        self.resource_client.get('2')
+        self.resource_client.delete_all(filter="name='Test'")
+
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.get(('/rest/other/1', 300))[0])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_filter_collections_by_uri(self, mock_get):
+        mock_get.return_value = {'members': [{'uri': '/rest/ethernet-networks/1'}, {'uri': '/rest/ethernet-networks/2'}]}
+
+        result = self.resource_client.get_many(['/rest/ethernet-networks/1', '/rest/ethernet-networks/2'])
+
+        self.assertEqual(result, {'/rest/ethernet-networks/1': {'uri': '/rest/ethernet-networks/1'},
+                                  '/rest/ethernet-networks/2': {'uri': '/rest/ethernet-networks/2'}})
+        mock_get.assert_called_once_with("/rest/ethernet-networks?start=0&count=2&filter=%22uri%3D%27"
+                                         "/rest/ethernet-networks/1%27%20OR%20uri%3D%27/rest/ethernet-networks/2%27%22")
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_read_one_page_of_collection_ignoring_filter(self, mock_get):
+        def get(uri):
+            if '?' in uri:
+                return {'members': [{'uri': '/rest/alerts/8'}, {'uri': '/rest/alerts/9'}], 'total': 20,
+                        'nextPageUri': '/rest/alerts?start=2&count=2'}
+            return {'uri': uri}
+        mock_get.side_effect = get
+
+        result = self.resource_client.get_many(['/rest/alerts/1', '/rest/alerts/2'])
+
+        self.assertEqual(result, {'/rest/alerts/1': {'uri': '/rest/alerts/1'}, '/rest/alerts/2': {'uri': '/rest/alerts/2'}})
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_get_single_resources_individually(self, mock_get):
+        mock_get.side_effect = lambda uri: {'uri': uri}
+
+        result = self.resource_client.get_many(['1', '/rest/fc-networks/2', '1'])
+
+        self.assertEqual(result, {self.URI + '/1': {'uri': self.URI + '/1'},
+                                  '/rest/fc-networks/2': {'uri': '/rest/fc-networks/2'}})
+        self.assertEqual(sorted(c[0][0] for c in mock_get.call_args_list), ['/rest/fc-networks/2', self.URI + '/1'])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_get_resources_missing_from_collection(self, mock_get):
+        def get(uri):
+            if '?' in uri:
+                return {'members': [{'uri': self.URI + '/1'}]}
+            return {'uri': uri, 'individual': True}
+        mock_get.side_effect = get
+
+        result = self.resource_client.get_many(['1', '2'])
+
+        self.assertEqual(result, {self.URI + '/1': {'uri': self.URI + '/1'},
+                                  self.URI + '/2': {'uri': self.URI + '/2', 'individual': True}})
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_fall_back_when_collection_cannot_be_filtered(self, mock_get):
+        def get(uri):
+            if '?' in uri:
+                raise HPOneViewException({'message': 'Invalid filter'})
+            return {'uri': uri}
+        mock_get.side_effect = get
+
+        result = self.resource_client.get_many(['1', '2'])
+
+        self.assertEqual(result, {self.URI + '/1': {'uri': self.URI + '/1'}, self.URI + '/2': {'uri': self.URI + '/2'}})
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch('hpOneView.resources.resource.GET_MANY_BATCH_SIZE', 2)
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_split_large_collections_in_batches(self, mock_get):
+        mock_get.side_effect = lambda uri: {'members': [{'uri': self.URI + '/' + i} for i in '12345']}
+
+        result = self.resource_client.get_many(['1', '2', '3', '4', '5'])
+
+        self.assertEqual(len(result), 5)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_raise_when_resource_is_not_found(self, mock_get):
+        mock_get.side_effect = HPOneViewException({'errorCode': 'RESOURCE_NOT_FOUND', 'message': 'Resource not found.'})
+
+        self.assertRaises(HPOneViewException, self.resource_client.get_many, ['1'])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_leave_out_resources_not_found_when_ignoring_missing(self, mock_get):
+        def get(uri):
+            if uri.endswith('/1'):
+                raise HPOneViewException({'errorCode': 'RESOURCE_NOT_FOUND', 'message': 'Resource not found.'})
+            return {'uri': uri}
+        mock_get.side_effect = get
+
+        result = self.resource_client.get_many(['1', '/rest/fc-networks/2'], ignore_missing=True)
+
+        self.assertEqual(result, {'/rest/fc-networks/2': {'uri': '/rest/fc-networks/2'}})
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_raise_other_errors_when_ignoring_missing(self, mock_get):
+        mock_get.side_effect = HPOneViewException({'errorCode': 'AUTHORIZATION', 'message': 'Not authorized.'})
+
+        self.assertRaises(HPOneViewException, self.resource_client.get_many, ['1'], ignore_missing=True)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_return_empty_dict_without_uris(self, mock_get):
+        self.assertEqual(self.resource_client.get_many([]), {})
+        mock_get.assert_not_called()
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_list_only_the_versions_of_the_resources(self, mock_get_all, mock_get_many):
+        mock_get_all.return_value = []
+
+        self.resource_client.sync(filter="name='a'", scope_uris='/rest/scopes/1')
+
+        mock_get_all.assert_called_once_with(filter="name='a'", query='', fields='uri,eTag,modified', uri=None,
+                                             scope_uris='/rest/scopes/1')
+        mock_get_many.assert_not_called()
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_without_snapshot_should_report_all_resources_as_added(self, mock_get_all, mock_get_many):
+        mock_get_all.return_value = [{'uri': '/rest/1', 'eTag': 'a'}, {'uri': '/rest/2', 'eTag': 'b'}]
+        mock_get_many.return_value = {'/rest/1': {'uri': '/rest/1', 'eTag': 'a'},
+                                      '/rest/2': {'uri': '/rest/2', 'eTag': 'b'}}
+
+        result = self.resource_client.sync()
+
+        self.assertEqual(result.added, [{'uri': '/rest/1', 'eTag': 'a'}, {'uri': '/rest/2', 'eTag': 'b'}])
+        self.assertEqual(result.updated, [])
+        self.assertEqual(result.deleted, [])
+        self.assertEqual(result.snapshot, {'/rest/1': 'a', '/rest/2': 'b'})
+        self.assertTrue(result.changed)
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_get_only_the_changed_resources(self, mock_get_all, mock_get_many):
+        mock_get_all.return_value = [{'uri': '/rest/1', 'eTag': 'a'}, {'uri': '/rest/2', 'eTag': 'c'},
+                                     {'uri': '/rest/4', 'eTag': 'd'}]
+        mock_get_many.return_value = {'/rest/2': {'uri': '/rest/2', 'eTag': 'c'},
+                                      '/rest/4': {'uri': '/rest/4', 'eTag': 'd'}}
+
+        result = self.resource_client.sync({'/rest/1': 'a', '/rest/2': 'b', '/rest/3': 'x'})
+
+        mock_get_many.assert_called_once_with(['/rest/2', '/rest/4'], 8, ignore_missing=True)
+        self.assertEqual(result.added, [{'uri': '/rest/4', 'eTag': 'd'}])
+        self.assertEqual(result.updated, [{'uri': '/rest/2', 'eTag': 'c'}])
+        self.assertEqual(result.deleted, ['/rest/3'])
+        self.assertEqual(result.unchanged, ['/rest/1'])
+        self.assertEqual(result.snapshot, {'/rest/1': 'a', '/rest/2': 'c', '/rest/4': 'd'})
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_report_no_change_when_versions_match(self, mock_get_all, mock_get_many):
+        mock_get_all.return_value = [{'uri': '/rest/1', 'modified': '2018-01-01T00:00:00.000Z'}]
+
+        result = self.resource_client.sync({'/rest/1': '2018-01-01T00:00:00.000Z'})
+
+        mock_get_many.assert_not_called()
+        self.assertFalse(result.changed)
+        self.assertEqual(result.unchanged, ['/rest/1'])
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_keep_the_version_of_the_retrieved_resource(self, mock_get_all, mock_get_many):
+        mock_get_all.return_value = [{'uri': '/rest/1', 'eTag': 'a'}]
+        mock_get_many.return_value = {'/rest/1': {'uri': '/rest/1', 'eTag': 'b'}}
+
+        result = self.resource_client.sync()
+
+        self.assertEqual(result.snapshot, {'/rest/1': 'b'})
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_report_resources_deleted_after_the_listing(self, mock_get_all, mock_get_many):
+        mock_get_all.return_value = [{'uri': '/rest/1', 'eTag': 'b'}, {'uri': '/rest/2', 'eTag': 'a'}]
+        mock_get_many.return_value = {}
+
+        result = self.resource_client.sync({'/rest/1': 'a'})
+
+        self.assertEqual(result.added, [])
+        self.assertEqual(result.updated, [])
+        # /rest/2 was never in the snapshot, so it was neither added nor deleted
+        self.assertEqual(result.deleted, ['/rest/1'])
+        self.assertEqual(result.snapshot, {})
+
+    @mock.patch.object(connection, 'get')
+    def test_sync_should_not_fail_when_a_resource_is_deleted_before_it_is_retrieved(self, mock_get):
+        def get(uri):
+            if 'fields=' in uri:
+                return {'members': [{'uri': self.URI + '/1', 'eTag': 'a'}, {'uri': self.URI + '/2', 'eTag': 'a'}]}
+            if '?' in uri:
+                return {'members': [{'uri': self.URI + '/2', 'eTag': 'a'}]}
+            raise HPOneViewException({'errorCode': 'RESOURCE_NOT_FOUND', 'message': 'Resource not found.'})
+        mock_get.side_effect = get
+
+        result = self.resource_client.sync()
+
+        self.assertEqual(result.added, [{'uri': self.URI + '/2', 'eTag': 'a'}])
+        self.assertEqual(result.deleted, [])
+        self.assertEqual(result.snapshot, {self.URI + '/2': 'a'})
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_always_get_resources_without_version(self, mock_get_all, mock_get_many):
+        mock_get_all.return_value = [{'uri': '/rest/1'}]
+        mock_get_many.return_value = {'/rest/1': {'uri': '/rest/1', 'name': 'a'}}
+
+        result = self.resource_client.sync({'/rest/1': None})
+
+        self.assertEqual(result.updated, [{'uri': '/rest/1', 'name': 'a'}])
+
     def test_get_with_uri_with_incompatible_url_shoud_fail(self):
         message = "Unrecognized URI for this resource"
         uri = "/rest/interconnects/ad28cf21-8b15-4f92-bdcf-51cb2042db32"
@@ -1104,6 +1597,58 @@ class ResourceClientTest(unittest.TestCase):
         else:
             self.fail("Expected Exception was not raised")
 
+    @mock.patch.object(TaskScheduler, 'submit')
+    @mock.patch.object(connection, 'post')
+    @mock.patch.object(TaskMonitor, 'wait_for_task')
+    def test_create_without_wait_should_submit_task(self, mock_wait4task, mock_post, mock_submit):
+        task = {'uri': '/rest/tasks/1', 'taskState': 'Running'}
+        mock_post.return_value = task, {}
+        handle = TaskHandle(task)
+        mock_submit.return_value = handle
+
+        result = self.resource_client.create({'name': 'resource'}, wait=False)
+
+        self.assertIs(result, handle)
+        mock_submit.assert_called_once_with(task, self.resource_client._task_monitor.get_task_response)
+        mock_wait4task.assert_not_called()
+
+    @mock.patch.object(connection, 'put')
+    def test_update_without_wait_should_return_completed_handle_without_task(self, mock_put):
+        mock_put.return_value = None, self.response_body
+
+        result = self.resource_client.update({'uri': self.URI + '/1'}, wait=False)
+
+        self.assertTrue(result.done())
+        self.assertEqual(result.result(), self.response_body)
+
+    @mock.patch.object(connection, 'delete')
+    def test_delete_without_wait_should_return_completed_handle_without_task(self, mock_delete):
+        mock_delete.return_value = None, {}
+
+        result = self.resource_client.delete('1', wait=False)
+
+        self.assertTrue(result.result())
+
+    @mock.patch.object(TaskScheduler, 'submit')
+    @mock.patch.object(connection, 'patch')
+    def test_patch_without_wait_should_submit_task(self, mock_patch, mock_submit):
+        mock_patch.return_value = self.task, {}
+
+        self.resource_client.patch('1', 'replace', '/name', 'new name', wait=False)
+
+        mock_submit.assert_called_once_with(self.task, mock.ANY)
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(connection, 'post')
+    def test_create_report_without_wait_should_return_output(self, mock_post, mock_get):
+        task = {'uri': '/rest/tasks/1', 'taskState': 'Running'}
+        mock_post.return_value = task, {}
+        mock_get.return_value = {'uri': '/rest/tasks/1', 'taskState': 'Completed', 'taskOutput': ['output']}
+
+        handle = self.resource_client.create_report("/rest/path/create-report", wait=False)
+
+        self.assertEqual(handle.result(5), ['output'])
+
     @mock.patch.object(connection, 'post')
     @mock.patch.object(TaskMonitor, 'get_completed_task')
     def test_create_report_should_do_post_request(self, mock_get_completed_task, mock_post):
@@ -1278,49 +1823,48 @@ class ResourceClientTest(unittest.TestCase):
 
         self.assertEqual(result, fake_response_body)
 
-    @mock.patch.object(connection, 'download_to_stream')
-    @mock.patch(mock_builtin('open'))
-    def test_download_should_call_download_to_stream_with_given_uri(self, mock_open, mock_download_to_stream):
+    @mock.patch.object(connection, 'download_to_file')
+    def test_download_should_call_download_to_file_with_given_uri(self, mock_download_to_file):
         file_path = "~/archive.log"
         uri = '/rest/testuri/3ec91dd2-0ebb-4484-8b2d-90d065114315'
-        mock_open.return_value = io.StringIO()
 
         self.resource_client.download(uri, file_path)
 
-        mock_download_to_stream.assert_called_once_with(mock.ANY, uri)
+        mock_download_to_file.assert_called_once_with(mock.ANY, uri, progress_callback=None)
 
-    @mock.patch.object(connection, 'download_to_stream')
-    @mock.patch(mock_builtin('open'))
-    def test_download_should_call_download_to_stream_with_open_file(self, mock_open, mock_download_to_stream):
+    @mock.patch.object(connection, 'download_to_file')
+    def test_download_should_call_download_to_file_with_given_file_path(self, mock_download_to_file):
         file_path = "~/archive.log"
         uri = '/rest/testuri/3ec91dd2-0ebb-4484-8b2d-90d065114315'
-        fake_file = io.StringIO()
-        mock_open.return_value = fake_file
 
         self.resource_client.download(uri, file_path)
 
-        mock_open.assert_called_once_with(file_path, 'wb')
-        mock_download_to_stream.assert_called_once_with(fake_file, mock.ANY)
+        mock_download_to_file.assert_called_once_with(file_path, mock.ANY, progress_callback=None)
+
+    @mock.patch.object(connection, 'download_to_file')
+    def test_download_should_pass_the_progress_callback(self, mock_download_to_file):
+        uri = '/rest/testuri/3ec91dd2-0ebb-4484-8b2d-90d065114315'
+        progress_callback = mock.Mock()
+
+        self.resource_client.download(uri, "~/archive.log", progress_callback=progress_callback)
+
+        mock_download_to_file.assert_called_once_with(mock.ANY, uri, progress_callback=progress_callback)
 
-    @mock.patch.object(connection, 'download_to_stream')
-    @mock.patch(mock_builtin('open'))
-    def test_download_should_return_true_when_success(self, mock_open, mock_download_to_stream):
+    @mock.patch.object(connection, 'download_to_file')
+    def test_download_should_return_true_when_success(self, mock_download_to_file):
         file_path = "~/archive.log"
         uri = '/rest/testuri/3ec91dd2-0ebb-4484-8b2d-90d065114315'
-        mock_download_to_stream.return_value = True
-        mock_open.return_value = io.StringIO()
+        mock_download_to_file.return_value = True
 
         result = self.resource_client.download(uri, file_path)
 
         self.assertTrue(result)
 
-    @mock.patch.object(connection, 'download_to_stream')
-    @mock.patch(mock_builtin('open'))
-    def test_download_should_return_false_when_error(self, mock_open, mock_download_to_stream):
+    @mock.patch.object(connection, 'download_to_file')
+    def test_download_should_return_false_when_error(self, mock_download_to_file):
         file_path = "~/archive.log"
         uri = '/rest/testuri/3ec91dd2-0ebb-4484-8b2d-90d065114315'
-        mock_download_to_stream.return_value = False
-        mock_open.return_value = io.StringIO()
+        mock_download_to_file.return_value = False
 
         result = self.resource_client.download(uri, file_path)
 
@@ -21,14 +21,19 @@
 # THE SOFTWARE.
 ###
 
+import threading
+import time
 import unittest
 from mock import mock, call
 from errno import ETIMEDOUT, ECONNABORTED
+from urllib.parse import unquote
 
 from hpOneView.connection import connection
 from hpOneView.resources.task_monitor import TaskMonitor, MSG_UNKNOWN_OBJECT_TYPE, MSG_TASK_TYPE_UNRECONIZED, \
-    MSG_TIMEOUT, MSG_UNKNOWN_EXCEPTION, MSG_INVALID_TASK
+    MSG_TIMEOUT, MSG_UNKNOWN_EXCEPTION, MSG_INVALID_TASK, TASKS_URI
+from hpOneView.resources.task_polling import AdaptivePolling, LinearPolling
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError
+from hpOneView.exceptions import HPOneViewException
 
 ERR_MSG = "Message error"
 
@@ -235,13 +240,211 @@ class TaskMonitorTest(unittest.TestCase):
                  call(8), call(9), call(10), call(10), call(10)]
 
         try:
-            self.task_monitor.wait_for_task({"uri": "uri"}, timeout)
+            self.task_monitor.wait_for_task({"uri": "uri"}, timeout, polling=LinearPolling())
         except HPOneViewTimeout as e:
             mock_sleep.assert_has_calls(calls)
             self.assertEqual(MSG_TIMEOUT % timeout, e.msg)
         else:
             self.fail()
 
+    @mock.patch.object(TaskMonitor, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_task_polls_short_tasks_quickly(self, mock_sleep, mock_get):
+        task = {"uri": "uri", "name": "Delete"}
+        mock_get.side_effect = [dict(task, taskState="Running"), dict(task, taskState="Completed"),
+                                dict(task, taskState="Completed")]
+        self.task_monitor = TaskMonitor(self.connection, AdaptivePolling(initial_delay=0.2, jitter=0))
+
+        self.assertTrue(self.task_monitor.wait_for_task(task))
+        mock_sleep.assert_called_once_with(0.2)
+
+    @mock.patch.object(TaskMonitor, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_task_uses_polling_of_the_call(self, mock_sleep, mock_get):
+        task = {"uri": "uri", "name": "Delete"}
+        mock_get.side_effect = [dict(task, taskState="Running"), dict(task, taskState="Running"),
+                                dict(task, taskState="Completed"), dict(task, taskState="Completed")]
+
+        self.task_monitor.wait_for_task(task, polling=LinearPolling())
+
+        self.assertEqual(mock_sleep.call_args_list, [call(1), call(2)])
+
+    @mock.patch.object(TaskMonitor, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_task_gives_last_task_to_polling(self, mock_sleep, mock_get):
+        task = {"uri": "uri", "name": "Delete"}
+        running_task = dict(task, taskState="Running", computedPercentComplete=50)
+        mock_get.side_effect = [running_task, dict(task, taskState="Completed"), dict(task, taskState="Completed")]
+        polling = mock.Mock()
+        polling.next_delay.return_value = 0
+
+        self.task_monitor.get_completed_task(task, polling=polling)
+
+        polling.next_delay.assert_called_once_with(1, running_task, mock.ANY)
+
+    def set_task_events(self, completed_tasks, available=True):
+        task_events = mock.Mock(available=available, safety_interval=60)
+        task_events.wait.return_value = completed_tasks
+        self.connection.set_task_events(task_events)
+        return task_events
+
+    @mock.patch.object(TaskMonitor, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_task_waits_for_task_events_instead_of_polling(self, mock_sleep, mock_get):
+        task = {"uri": "/rest/tasks/1", "name": "Delete"}
+        mock_get.side_effect = [dict(task, taskState="Running"), dict(task, taskState="Completed")]
+        task_events = self.set_task_events({"/rest/tasks/1": dict(task, taskState="Completed")})
+
+        self.assertTrue(self.task_monitor.wait_for_task(task))
+
+        task_events.wait.assert_called_once_with(["/rest/tasks/1"], 60)
+        self.assertEqual(mock_get.call_count, 2)
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(TaskMonitor, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_task_polls_while_task_events_are_unavailable(self, mock_sleep, mock_get):
+        task = {"uri": "/rest/tasks/1", "name": "Delete"}
+        mock_get.side_effect = [dict(task, taskState="Running"), dict(task, taskState="Completed"),
+                                dict(task, taskState="Completed")]
+        task_events = self.set_task_events({}, available=False)
+
+        self.task_monitor.wait_for_task(task, polling=LinearPolling())
+
+        task_events.wait.assert_not_called()
+        mock_sleep.assert_called_once_with(1)
+
+    @mock.patch.object(TaskMonitor, 'get_current_seconds')
+    def test_wait_for_change_does_not_wait_past_the_deadline(self, mock_get_current_seconds):
+        mock_get_current_seconds.return_value = 100
+        task_events = self.set_task_events({})
+
+        self.task_monitor.wait_for_change(["/rest/tasks/1"], 1, deadline=110)
+
+        task_events.wait.assert_called_once_with(["/rest/tasks/1"], 11)
+
+    def test_wait_for_change_passes_the_wakeup_event_to_task_events(self):
+        task_events = self.set_task_events({})
+        wakeup = threading.Event()
+
+        self.task_monitor.wait_for_change(["/rest/tasks/1"], 1, wakeup=wakeup)
+
+        task_events.wait.assert_called_once_with(["/rest/tasks/1"], 60, wakeup)
+
+    @mock.patch('time.sleep')
+    def test_wait_for_change_polling_ends_when_the_wakeup_event_is_set(self, mock_sleep):
+        self.set_task_events({}, available=False)
+        wakeup = threading.Event()
+        self.task_monitor.wake(wakeup)
+        started = time.time()
+
+        self.task_monitor.wait_for_change(["/rest/tasks/1"], 30, wakeup=wakeup)
+
+        self.assertLess(time.time() - started, 5)
+        mock_sleep.assert_not_called()
+
+    def test_wake_sets_the_event_and_interrupts_task_events(self):
+        task_events = self.set_task_events({})
+        wakeup = threading.Event()
+
+        self.task_monitor.wake(wakeup)
+
+        self.assertTrue(wakeup.is_set())
+        task_events.interrupt.assert_called_once_with()
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_tasks_waits_for_task_events(self, mock_sleep, mock_get):
+        self.mock_tasks_collection(mock_get, {'/rest/tasks/1': ['Running', 'Completed'],
+                                              '/rest/tasks/2': ['Running', 'Running']})
+        task_events = self.set_task_events({'/rest/tasks/1': {'uri': '/rest/tasks/1', 'taskState': 'Completed'}})
+
+        tasks = self.task_monitor.wait_for_tasks([{'uri': '/rest/tasks/1'}, {'uri': '/rest/tasks/2'}])
+
+        self.assertEqual(next(tasks), {'uri': '/rest/tasks/1', 'taskState': 'Completed'})
+        task_events.wait.assert_called_once_with(['/rest/tasks/1', '/rest/tasks/2'], 60)
+        mock_sleep.assert_not_called()
+
+    def mock_tasks_collection(self, mock_get, states):
+        """
+        Answers the filtered requests to the tasks collection with the next state of each task.
+        """
+        states = dict((uri, list(task_states)) for uri, task_states in states.items())
+
+        def get(uri):
+            if uri.startswith(TASKS_URI + '?'):
+                uris = [task_uri for task_uri in states if "uri='%s'" % task_uri in unquote(uri)]
+                return {'members': [{'uri': task_uri, 'taskState': states[task_uri].pop(0)} for task_uri in uris]}
+            return {'uri': uri, 'taskState': states[uri].pop(0)}
+
+        mock_get.side_effect = get
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_tasks_yields_tasks_as_they_complete(self, mock_sleep, mock_get):
+        self.mock_tasks_collection(mock_get, {'/rest/tasks/1': ['Running', 'Running', 'Completed'],
+                                              '/rest/tasks/2': ['Running', 'Error'],
+                                              '/rest/tasks/3': ['Completed']})
+        tasks = [{'uri': '/rest/tasks/1'}, {'uri': '/rest/tasks/2'}, {'uri': '/rest/tasks/3'}]
+
+        completed = list(self.task_monitor.wait_for_tasks(tasks, polling=LinearPolling()))
+
+        self.assertEqual(completed, [{'uri': '/rest/tasks/3', 'taskState': 'Completed'},
+                                     {'uri': '/rest/tasks/2', 'taskState': 'Error'},
+                                     {'uri': '/rest/tasks/1', 'taskState': 'Completed'}])
+        self.assertEqual(mock_sleep.call_args_list, [call(1), call(2)])
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_tasks_uses_one_request_per_cycle(self, mock_sleep, mock_get):
+        self.mock_tasks_collection(mock_get, {'/rest/tasks/1': ['Running', 'Completed'],
+                                              '/rest/tasks/2': ['Running', 'Completed']})
+
+        list(self.task_monitor.wait_for_tasks([{'uri': '/rest/tasks/1'}, {'uri': '/rest/tasks/2'}]))
+
+        self.assertEqual(mock_get.call_count, 2)
+        for request in mock_get.call_args_list:
+            self.assertTrue(request[0][0].startswith(TASKS_URI + '?filter='))
+            self.assertIn('count=2', request[0][0])
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_tasks_gets_tasks_missing_from_collection(self, mock_sleep, mock_get):
+        def get(uri):
+            if uri.startswith(TASKS_URI + '?'):
+                raise HPOneViewException({'message': 'Invalid filter'})
+            return {'uri': uri, 'taskState': 'Completed'}
+        mock_get.side_effect = get
+
+        completed = list(self.task_monitor.wait_for_tasks([{'uri': '/rest/tasks/1'}, {'uri': '/rest/backups/1'}]))
+
+        self.assertEqual([task['uri'] for task in completed], ['/rest/tasks/1', '/rest/backups/1'])
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_tasks_timeout(self, mock_sleep, mock_get):
+        self.mock_tasks_collection(mock_get, {'/rest/tasks/1': ['Completed'],
+                                              '/rest/tasks/2': ['Running', 'Running']})
+        tasks = self.task_monitor.wait_for_tasks([{'uri': '/rest/tasks/1'}, {'uri': '/rest/tasks/2'}], timeout=10)
+
+        with mock.patch.object(TaskMonitor, 'get_current_seconds', side_effect=[0, 0, 1, 5, 6, 11]):
+            self.assertEqual(next(tasks)['uri'], '/rest/tasks/1')
+            self.assertRaises(HPOneViewTimeout, next, tasks)
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_tasks_ignores_network_failure(self, mock_sleep, mock_get):
+        mock_get.side_effect = [EnvironmentError(ETIMEDOUT, ERR_MSG), {'uri': '/rest/tasks/1', 'taskState': 'Completed'}]
+
+        completed = list(self.task_monitor.wait_for_tasks([{'uri': '/rest/tasks/1'}]))
+
+        self.assertEqual(completed, [{'uri': '/rest/tasks/1', 'taskState': 'Completed'}])
+
+    def test_wait_for_tasks_without_tasks(self):
+        self.assertEqual(list(self.task_monitor.wait_for_tasks([])), [])
+        self.assertRaises(HPOneViewUnknownType, list, self.task_monitor.wait_for_tasks([{}]))
+
     @mock.patch.object(TaskMonitor, 'is_task_running')
     @mock.patch.object(TaskMonitor, 'get')
     def test_wait_for_task_with_error_message(self, mock_get, mock_is_running):
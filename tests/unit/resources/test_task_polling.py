@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import unittest
+
+from mock import patch
+from hpOneView.resources.task_polling import AdaptivePolling, LinearPolling
+
+
+class LinearPollingTest(unittest.TestCase):
+    def test_next_delay_increases_up_to_max_delay(self):
+        polling = LinearPolling(max_delay=3)
+
+        self.assertEqual([polling.next_delay(attempt, {}, 0) for attempt in range(1, 6)], [1, 2, 3, 3, 3])
+
+
+class AdaptivePollingTest(unittest.TestCase):
+    def setUp(self):
+        self.polling = AdaptivePolling(initial_delay=0.25, max_delay=30, multiplier=2, jitter=0)
+
+    def test_next_delay_backs_off_exponentially(self):
+        delays = [self.polling.next_delay(attempt, {}, 0) for attempt in range(1, 10)]
+
+        self.assertEqual(delays, [0.25, 0.5, 1, 2, 4, 8, 16, 30, 30])
+
+    def test_next_delay_polls_at_estimated_completion(self):
+        task = {'computedPercentComplete': 80}
+
+        self.assertEqual(self.polling.next_delay(8, task, 40), 10)
+
+    def test_next_delay_keeps_backoff_when_completion_is_far(self):
+        task = {'computedPercentComplete': 10}
+
+        self.assertEqual(self.polling.next_delay(3, task, 10), 1)
+
+    def test_next_delay_is_not_shorter_than_initial_delay(self):
+        task = {'computedPercentComplete': 99}
+
+        self.assertEqual(self.polling.next_delay(8, task, 1), 0.25)
+
+    @patch('hpOneView.resources.task_polling.random.uniform')
+    def test_next_delay_applies_jitter(self, mock_uniform):
+        mock_uniform.return_value = 1.1
+        polling = AdaptivePolling(initial_delay=1, jitter=0.1)
+
+        self.assertAlmostEqual(polling.next_delay(1, {}, 0), 1.1)
+        mock_uniform.assert_called_once_with(0.9, 1.1)
+
+    def test_estimate_remaining_time(self):
+        self.assertEqual(AdaptivePolling.estimate_remaining_time({'computedPercentComplete': 25}, 30), 90)
+
+    def test_estimate_remaining_time_without_progress(self):
+        self.assertIsNone(AdaptivePolling.estimate_remaining_time({'computedPercentComplete': 0}, 30))
+        self.assertIsNone(AdaptivePolling.estimate_remaining_time({'computedPercentComplete': 100}, 30))
+        self.assertIsNone(AdaptivePolling.estimate_remaining_time({}, 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
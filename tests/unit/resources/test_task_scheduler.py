@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import threading
+import time
+import unittest
+
+from mock import ANY, Mock, patch
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException, HPOneViewTaskError, HPOneViewTimeout
+from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.task_polling import LinearPolling
+from hpOneView.resources.task_scheduler import TaskHandle, TaskScheduler, get_task_scheduler
+from hpOneView.scmb import ScmbMessage, TaskEventListener
+
+
+class TaskHandleTest(unittest.TestCase):
+    def test_completed(self):
+        handle = TaskHandle.completed({'name': 'resource'})
+
+        self.assertTrue(handle.done())
+        self.assertEqual(handle.progress(), 100)
+        self.assertIsNone(handle.task)
+        self.assertEqual(handle.result(), {'name': 'resource'})
+
+    def test_progress_of_running_task(self):
+        handle = TaskHandle({'uri': '/rest/tasks/1', 'taskState': 'Running', 'computedPercentComplete': 40})
+
+        self.assertFalse(handle.done())
+        self.assertEqual(handle.progress(), 40)
+
+    def test_result_timeout(self):
+        handle = TaskHandle({'uri': '/rest/tasks/1', 'taskState': 'Running'})
+
+        self.assertRaises(HPOneViewTimeout, handle.result, 0.01)
+
+    def test_result_is_computed_once(self):
+        get_result = Mock(return_value={'name': 'resource'})
+        handle = TaskHandle({'uri': '/rest/tasks/1'}, get_result)
+        handle._set_task({'uri': '/rest/tasks/1', 'taskState': 'Completed'})
+
+        self.assertEqual(handle.result(), {'name': 'resource'})
+        self.assertEqual(handle.result(), {'name': 'resource'})
+        get_result.assert_called_once_with({'uri': '/rest/tasks/1', 'taskState': 'Completed'})
+
+    def test_result_raises_task_error(self):
+        handle = TaskHandle({'uri': '/rest/tasks/1'}, Mock(side_effect=HPOneViewTaskError('Failed')))
+        handle._set_task({'uri': '/rest/tasks/1', 'taskState': 'Error'})
+
+        self.assertRaises(HPOneViewTaskError, handle.result)
+        self.assertRaises(HPOneViewTaskError, handle.result)
+
+
+class TaskSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.task_monitor = Mock()
+        self.task_monitor.get_task_response.side_effect = lambda task: task['uri'].replace('tasks', 'resources')
+        self.task_monitor.wait_for_change.side_effect = lambda uris, delay, wakeup: wakeup.wait(delay)
+        self.task_monitor.wake.side_effect = lambda wakeup: wakeup.set()
+        self.scheduler = TaskScheduler(self.task_monitor, LinearPolling(max_delay=0.01))
+
+    def test_submitted_tasks_are_polled_together(self):
+        submitted = threading.Event()
+        polled = []
+
+        def get_tasks(uris):
+            # The first poll may start before the second task is submitted
+            submitted.wait(5)
+            polled.append(uris)
+            # Task 2 completes at once, task 1 on the poll after both were polled together
+            polled_together = ['/rest/tasks/1', '/rest/tasks/2'] in polled[:-1]
+            return [{'uri': uri, 'taskState': 'Completed' if uri == '/rest/tasks/2' or polled_together else 'Running'}
+                    for uri in uris]
+
+        self.task_monitor.get_tasks.side_effect = get_tasks
+
+        handles = [self.scheduler.submit({'uri': '/rest/tasks/1'}), self.scheduler.submit({'uri': '/rest/tasks/2'})]
+        submitted.set()
+
+        self.assertEqual([handle.result(5) for handle in handles], ['/rest/resources/1', '/rest/resources/2'])
+        self.assertIn(['/rest/tasks/1', '/rest/tasks/2'], polled)
+        self.assertEqual(polled[-1], ['/rest/tasks/1'])
+        self.assertEqual(self.scheduler.pending_count(), 0)
+
+    def test_pending_tasks_are_awaited_through_the_task_monitor(self):
+        self.task_monitor.get_tasks.side_effect = [[{'uri': '/rest/tasks/1', 'taskState': 'Running'}],
+                                                   [{'uri': '/rest/tasks/1', 'taskState': 'Completed'}]]
+
+        self.scheduler.submit({'uri': '/rest/tasks/1'}).result(5)
+
+        self.task_monitor.wait_for_change.assert_called_once_with(['/rest/tasks/1'], 0.01, wakeup=ANY)
+
+    def test_task_submitted_while_waiting_is_polled_at_once(self):
+        scheduler = TaskScheduler(self.task_monitor, LinearPolling(max_delay=30))
+        waiting = threading.Event()
+        completed = set()
+
+        def wait_for_change(uris, delay, wakeup):
+            waiting.set()
+            wakeup.wait(delay)
+
+        self.task_monitor.wait_for_change.side_effect = wait_for_change
+        self.task_monitor.get_tasks.side_effect = lambda uris: [
+            {'uri': uri, 'taskState': 'Completed' if uri in completed else 'Running'} for uri in uris]
+
+        first = scheduler.submit({'uri': '/rest/tasks/1'})
+        self.assertTrue(waiting.wait(5))
+        completed.update(['/rest/tasks/1', '/rest/tasks/2'])
+        started = time.time()
+
+        self.assertEqual(scheduler.submit({'uri': '/rest/tasks/2'}).result(5), '/rest/resources/2')
+        self.assertEqual(first.result(5), '/rest/resources/1')
+        self.assertLess(time.time() - started, 5)
+
+    def test_task_submitted_while_waiting_for_task_events_is_noticed(self):
+        task_events = TaskEventListener(safety_interval=60)
+        task_events.on_connected()
+        con = connection('127.0.0.1')
+        con.set_task_events(task_events)
+        states = {'/rest/tasks/1': 'Running', '/rest/tasks/2': 'Running'}
+        waiting = threading.Event()
+        monitor = TaskMonitor(con)
+        wait = task_events.wait
+
+        def wait_for_events(*args):
+            waiting.set()
+            return wait(*args)
+
+        scheduler = TaskScheduler(monitor, LinearPolling(max_delay=0.01))
+        with patch.object(TaskMonitor, 'get_tasks', side_effect=lambda uris: [
+                {'uri': uri, 'taskState': states[uri]} for uri in uris]), \
+                patch.object(task_events, 'wait', side_effect=wait_for_events):
+            first = scheduler.submit({'uri': '/rest/tasks/1'})
+            self.assertTrue(waiting.wait(5))
+            waiting.clear()
+            second = scheduler.submit({'uri': '/rest/tasks/2'}, lambda task: task['uri'])
+            self.assertTrue(waiting.wait(5))
+
+            states['/rest/tasks/2'] = 'Completed'
+            task_events.on_message(ScmbMessage('Updated', '/rest/tasks/2',
+                                               resource={'uri': '/rest/tasks/2', 'taskState': 'Completed'}))
+
+            self.assertEqual(second.result(5), '/rest/tasks/2')
+            self.assertFalse(first.done())
+            states['/rest/tasks/1'] = 'Completed'
+            task_events.on_message(ScmbMessage('Updated', '/rest/tasks/1',
+                                               resource={'uri': '/rest/tasks/1', 'taskState': 'Completed'}))
+            first.result(5)
+
+    def test_custom_result(self):
+        self.task_monitor.get_tasks.return_value = [{'uri': '/rest/tasks/1', 'taskState': 'Completed',
+                                                     'taskOutput': ['output']}]
+
+        handle = self.scheduler.submit({'uri': '/rest/tasks/1'}, lambda task: task['taskOutput'])
+
+        self.assertEqual(handle.result(5), ['output'])
+
+    def test_task_without_uri_is_completed(self):
+        handle = self.scheduler.submit({'taskState': 'Completed'})
+
+        self.assertTrue(handle.done())
+        self.task_monitor.get_tasks.assert_not_called()
+
+    def test_request_error_fails_handles(self):
+        self.task_monitor.get_tasks.side_effect = HPOneViewException('error')
+
+        handle = self.scheduler.submit({'uri': '/rest/tasks/1'})
+
+        self.assertRaises(HPOneViewException, handle.result, 5)
+
+    def test_scheduler_is_shared_by_connection(self):
+        con = connection('127.0.0.1')
+
+        self.assertIs(get_task_scheduler(con), get_task_scheduler(con))
+        self.assertIsNot(get_task_scheduler(con), get_task_scheduler(connection('127.0.0.1')))
+        self.assertIsInstance(get_task_scheduler(con)._task_monitor, TaskMonitor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -53,6 +53,22 @@ class OsDeploymentPlansTest(TestCase):
         self._os_deployment_plans.get_all()
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='', query='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/os-deployment-plans//1': '"1"'}
+
+        self._os_deployment_plans.sync(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._os_deployment_plans.iter_all(2, 500, filter="name='TestName'", query="name eq 'TestName'",
+                                           sort='name:ascending')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", query="name eq 'TestName'",
+                                              sort='name:ascending')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         self._os_deployment_plans.get(self.RESOURCE_ID)
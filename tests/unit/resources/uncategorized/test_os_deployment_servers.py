@@ -56,6 +56,22 @@ class OsDeploymentServersTest(TestCase):
         self._os_deployment_servers.get_all()
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='', fields='', view='', query='')
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        snapshot = {'/rest/deployment-servers/1': '"1"'}
+
+        self._os_deployment_servers.sync(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+        mock_sync.assert_called_once_with(snapshot, filter="name='TestName'", query="name eq 'TestName'")
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        self._os_deployment_servers.iter_all(2, 500, filter="name='TestName'", fields='name',
+                                             query="name eq 'TestName'", sort='name:ascending', view='expand')
+
+        mock_iter_all.assert_called_once_with(2, 500, filter="name='TestName'", fields='name',
+                                              query="name eq 'TestName'", sort='name:ascending', view='expand')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id_called_once(self, mock_get):
         self._os_deployment_servers.get(self.RESOURCE_ID)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import os
+import sys
+from fnmatch import fnmatch
+
+ASYNC_TESTS_DIR = os.path.join(os.path.dirname(__file__), 'async_client')
+
+
+def load_tests(loader, tests, pattern):
+    # The asyncio client needs Python 3.7+ and its test modules don't compile on older versions, so they are kept in a
+    # directory that test discovery doesn't enter and are only loaded from here
+    if sys.version_info < (3, 7):
+        return tests
+    names = sorted(os.path.splitext(name)[0] for name in os.listdir(ASYNC_TESTS_DIR) if fnmatch(name, pattern or 'test*.py'))
+    tests.addTests(loader.loadTestsFromNames(['tests.unit.async_client.' + name for name in names]))
+    return tests
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import gzip
+import io
+import unittest
+import zlib
+
+from hpOneView.compression import CompressionStats, ContentDecoder, decompress, is_compressed
+
+
+class CompressionTest(unittest.TestCase):
+    def setUp(self):
+        self.content = b'{"members": [' + b', '.join([b'{"name": "enclosure"}'] * 1000) + b']}'
+
+    def __gzip(self, content):
+        compressed = io.BytesIO()
+        with gzip.GzipFile(fileobj=compressed, mode='wb') as gzip_file:
+            gzip_file.write(content)
+        return compressed.getvalue()
+
+    def test_is_compressed(self):
+        self.assertTrue(is_compressed('gzip'))
+        self.assertTrue(is_compressed('Deflate'))
+        self.assertTrue(is_compressed('x-gzip'))
+        self.assertFalse(is_compressed('identity'))
+        self.assertFalse(is_compressed('br'))
+        self.assertFalse(is_compressed(None))
+
+    def test_decompress_gzip(self):
+        self.assertEqual(decompress(self.__gzip(self.content), 'gzip'), self.content)
+
+    def test_decompress_deflate(self):
+        self.assertEqual(decompress(zlib.compress(self.content), 'deflate'), self.content)
+
+    def test_decompress_raw_deflate(self):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        raw = compressor.compress(self.content) + compressor.flush()
+
+        self.assertEqual(decompress(raw, 'deflate'), self.content)
+
+    def test_decoder_decompresses_one_chunk_at_a_time(self):
+        compressed = self.__gzip(self.content)
+        decoder = ContentDecoder('gzip')
+
+        chunks = [decoder.decompress(compressed[i:i + 10]) for i in range(0, len(compressed), 10)]
+        chunks.append(decoder.flush())
+
+        self.assertEqual(b''.join(chunks), self.content)
+
+    def test_decoder_raises_on_invalid_data(self):
+        self.assertRaises(zlib.error, decompress, b'not compressed', 'gzip')
+
+
+class CompressionStatsTest(unittest.TestCase):
+    def test_record(self):
+        stats = CompressionStats()
+
+        stats.record(100, 1000)
+        stats.record(50, 450)
+
+        self.assertEqual(stats.to_dict(), {'responses': 2, 'compressed_bytes': 150, 'uncompressed_bytes': 1450,
+                                           'bytes_saved': 1300})
+        self.assertEqual(stats.bytes_saved, 1300)
@@ -21,17 +21,26 @@
 # THE SOFTWARE.
 ###
 import json
+import socket
 import ssl
+import threading
 import unittest
-import mmap
+import gzip
+import io
 import os
 import shutil
+import tempfile
+import zlib
 import os.path
 
 from mock import patch, call, Mock, ANY
 from http.client import HTTPSConnection, BadStatusLine, HTTPException
-from hpOneView.connection import connection
-from hpOneView.exceptions import HPOneViewException
+from hpOneView.connection import connection, HTTPSConnection as ResumableHTTPSConnection
+from hpOneView.connection import TLS_SESSION_RESUMPTION_SUPPORTED
+from hpOneView.connection_pool import ConnectionPool
+from hpOneView.ranged_download import RangedDownload
+from hpOneView.retry_policy import RetryPolicy
+from hpOneView.exceptions import HPOneViewException, HPOneViewCircuitOpen
 
 
 class ConnectionTest(unittest.TestCase):
@@ -61,7 +70,7 @@ class ConnectionTest(unittest.TestCase):
         self.request_body = {"request body": "content"}
         self.response_body = {"response body": "content",
                               "message": "An error occurred."}
-        self.dumped_request_body = json.dumps(self.request_body.copy())
+        self.dumped_request_body = self.connection.get_serializer().dumps(self.request_body.copy())
         self.expected_response_body = self.response_body.copy()
 
     def __make_http_response(self, status):
@@ -71,12 +80,22 @@ class ConnectionTest(unittest.TestCase):
             mock_response.getheader.return_value = '/task/uri'
         return mock_response
 
-    def __create_fake_mapped_file(self):
-        mock_mapped_file = Mock()
-        mock_mapped_file.tell.side_effect = [0, 1048576, 2097152, 2621440]  # 0, 1MB, 2MB 2.5MB
-        mock_mapped_file.size.return_value = 2621440  # 2.5MB
-        mock_mapped_file.read.side_effect = ['data chunck 1', 'data chunck 2', 'data chunck 3']
-        return mock_mapped_file
+    def __fake_readinto(self, chunks):
+        chunks = list(chunks)
+
+        def readinto(buffer):
+            if not chunks:
+                return 0
+            data = chunks.pop(0)
+            buffer[:len(data)] = data
+            return len(data)
+
+        return readinto
+
+    def __create_fake_file(self, size=2621440):  # 2.5MB
+        fake_file = io.BytesIO(b'x' * size)
+        fake_file.close = Mock()
+        return fake_file
 
     def __prepare_connection_to_post_multipart(self, response_status=200):
         fake_connection = Mock()
@@ -87,13 +106,10 @@ class ConnectionTest(unittest.TestCase):
         self.connection.get_connection.return_value = fake_connection
 
         self.connection._open = Mock()
+        self.connection._open.return_value = self.__create_fake_file()
 
         self.connection._headers['auth'] = 'LTIxNjUzMjc0OTUzzHoF7eEkZLEUWVA-fuOZP4VGA3U8e67E'
 
-        encode_multipart = "multipart/form-data; boundary=----------ThIs_Is_tHe_bouNdaRY_$"
-        self.connection.encode_multipart_formdata = Mock()
-        self.connection.encode_multipart_formdata.return_value = encode_multipart
-
     def test_default_headers(self):
         self.assertEqual(self.default_headers, self.connection._headers)
 
@@ -536,7 +552,7 @@ class ConnectionTest(unittest.TestCase):
 
         mock_response = mock_conn.getresponse.return_value
         # Stops at the fourth read call
-        mock_response.read.side_effect = ['111', '222', '333', None]
+        mock_response.readinto.side_effect = self.__fake_readinto([b'111', b'222', b'333'])
         mock_response.status = 200
 
         mock_stream = Mock()
@@ -544,7 +560,151 @@ class ConnectionTest(unittest.TestCase):
         result = self.connection.download_to_stream(mock_stream, '/rest/download.zip')
 
         self.assertTrue(result)
-        mock_stream.write.assert_has_calls([call('111'), call('222'), call('333')])
+        mock_stream.write.assert_has_calls([call(b'111'), call(b'222'), call(b'333')])
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_check_the_status_of_the_response(self, mock_get_conn):
+        mock_conn = mock_get_conn.return_value = Mock(spec=ResumableHTTPSConnection)
+        mock_response = mock_conn.getresponse.return_value
+        mock_response.status = 200
+        mock_response.readinto.side_effect = self.__fake_readinto([b'111'])
+
+        result = self.connection.download_to_stream(Mock(), '/rest/download.zip')
+
+        self.assertTrue(result)
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_read_into_a_buffer_of_the_given_size(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        buffers = []
+
+        def readinto(buffer):
+            buffers.append(buffer)
+            return 0
+
+        mock_response.readinto.side_effect = readinto
+
+        self.connection.download_to_stream(Mock(), '/rest/download.zip', buffer_size=8192)
+
+        self.assertEqual(len(buffers[0]), 8192)
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_read_into_a_buffer_of_the_connection_size_by_default(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        mock_response.readinto.return_value = 0
+        self.connection.set_download_buffer_size(4194304)
+
+        self.connection.download_to_stream(Mock(), '/rest/download.zip')
+
+        self.assertEqual(len(mock_response.readinto.call_args[0][0]), 4194304)
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_write_to_the_file_descriptor_of_a_file(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        mock_response.readinto.side_effect = self.__fake_readinto([b'111', b'222', b'333'])
+
+        with tempfile.TemporaryFile() as stream:
+            stream.write(b'000')
+            with patch.object(os, 'write', wraps=os.write) as mock_write:
+                self.connection.download_to_stream(stream, '/rest/download.zip')
+            stream.seek(0)
+
+            self.assertEqual(stream.read(), b'000111222333')
+            self.assertEqual(mock_write.call_count, 3)
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_report_progress(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        mock_response.getheader.return_value = '9'
+        mock_response.readinto.side_effect = self.__fake_readinto([b'111', b'222', b'333'])
+        progress_callback = Mock()
+
+        self.connection.download_to_stream(Mock(), '/rest/download.zip', progress_callback=progress_callback)
+
+        mock_response.getheader.assert_called_once_with('Content-Length')
+        self.assertEqual([args[:2] for args, _ in progress_callback.call_args_list], [(3, 9), (6, 9), (9, 9)])
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_report_progress_without_content_length(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        mock_response.getheader.return_value = None
+        mock_response.readinto.side_effect = self.__fake_readinto([b'111'])
+        progress_callback = Mock()
+
+        self.connection.download_to_stream(Mock(), '/rest/download.zip', progress_callback=progress_callback)
+
+        progress_callback.assert_called_once_with(3, None, ANY)
+
+    @patch.object(RangedDownload, 'run')
+    @patch.object(RangedDownload, '__init__')
+    def test_download_to_file_should_use_the_connection_settings(self, mock_init, mock_run):
+        mock_init.return_value = None
+        mock_run.return_value = True
+        progress_callback = Mock()
+        self.connection.set_download_workers(4)
+        self.connection.set_download_buffer_size(65536)
+
+        result = self.connection.download_to_file('/tmp/backup.bkp', '/rest/backups/archive/backup',
+                                                  progress_callback=progress_callback)
+
+        self.assertTrue(result)
+        mock_init.assert_called_once_with(self.connection, '/rest/backups/archive/backup', '/tmp/backup.bkp',
+                                          workers=4, custom_headers=None, buffer_size=65536,
+                                          progress_callback=progress_callback)
+
+    @patch.object(RangedDownload, 'run')
+    @patch.object(RangedDownload, '__init__')
+    def test_download_to_file_with_given_workers(self, mock_init, mock_run):
+        mock_init.return_value = None
+
+        self.connection.download_to_file('/tmp/backup.bkp', '/rest/backups/archive/backup', workers=8)
+
+        self.assertEqual(mock_init.call_args[1]['workers'], 8)
+
+    @patch.object(connection, 'get_connection')
+    def test_open_download_should_send_the_custom_headers_and_leave_the_body_unread(self, mock_get_conn):
+        mock_conn = mock_get_conn.return_value
+        mock_conn.getresponse.return_value.status = 206
+
+        conn, resp = self.connection._open_download('/rest/download.zip', custom_headers={'Range': 'bytes=0-0'})
+
+        expected_headers = dict(self.default_headers, Range='bytes=0-0')
+        mock_conn.request.assert_called_once_with('GET', '/rest/download.zip', '', expected_headers)
+        self.assertIs(conn, mock_conn)
+        resp.read.assert_not_called()
+
+    @patch.object(connection, 'get_connection')
+    def test_open_download_should_raise_exception_when_error_status(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 404
+        mock_response.read.return_value = json.dumps('not found').encode('utf-8')
+
+        self.assertRaises(HPOneViewException, self.connection._open_download, '/rest/download.zip')
+
+    def test_set_download_workers(self):
+        self.connection.set_download_workers('4')
+
+        self.assertEqual(self.connection.get_download_workers(), 4)
+
+    def test_set_download_workers_should_be_at_least_one(self):
+        self.connection.set_download_workers(0)
+
+        self.assertEqual(self.connection.get_download_workers(), 1)
+
+    def test_set_download_buffer_size(self):
+        self.connection.set_download_buffer_size('65536')
+
+        self.assertEqual(self.connection.get_download_buffer_size(), 65536)
+
+    def test_set_download_buffer_size_should_be_at_least_one_byte(self):
+        self.connection.set_download_buffer_size(0)
+
+        self.assertEqual(self.connection.get_download_buffer_size(), 1)
 
     @patch('time.sleep')
     @patch.object(connection, 'get_connection')
@@ -604,12 +764,12 @@ class ConnectionTest(unittest.TestCase):
         else:
             self.fail()
 
+    @patch('time.sleep')
     @patch.object(connection, 'get_connection')
-    def test_download_to_stream_with_timeout_error(self, mock_get_connection):
+    def test_download_to_stream_with_timeout_error(self, mock_get_connection, mock_sleep):
 
         mock_conn = mock_get_connection.return_value = Mock()
-        mock_response = Mock()
-        mock_conn.getresponse.side_effect = [HTTPException('timed out'), mock_response]
+        mock_conn.getresponse.side_effect = HTTPException('timed out')
 
         mock_stream = Mock()
 
@@ -618,13 +778,10 @@ class ConnectionTest(unittest.TestCase):
 
         self.assertTrue('timed out' in context.exception.msg)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_put_request(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_put_request(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
@@ -634,13 +791,9 @@ class ConnectionTest(unittest.TestCase):
         internal_conn = self.connection.get_connection.return_value
         internal_conn.putrequest.assert_called_once_with('POST', '/rest/resources/')
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_put_headers(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_put_headers(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
         mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
@@ -648,80 +801,96 @@ class ConnectionTest(unittest.TestCase):
                                        files="/a/path/filename.zip",
                                        baseName="archive.zip")
 
+        # 147 bytes of multipart preamble + 2.5 MB of content + 42 bytes of epilogue
         expected_putheader_calls = [
             call('uploadfilename', 'archive.zip'),
             call('auth', 'LTIxNjUzMjc0OTUzzHoF7eEkZLEUWVA-fuOZP4VGA3U8e67E'),
             call('Content-Type', 'multipart/form-data; boundary=----------ThIs_Is_tHe_bouNdaRY_$'),
-            call('Content-Length', 2621440),
+            call('Content-Length', 147 + 2621440 + 42),
             call('X-API-Version', 300)]
 
         internal_conn = self.connection.get_connection.return_value
         internal_conn.putheader.assert_has_calls(expected_putheader_calls)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_read_file_in_chunks_of_1mb(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_send_multipart_framing_around_the_file(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
                                        files="/a/path/filename.zip",
                                        baseName="archive.zip")
 
-        expected_mmap_read_calls = [
-            call(1048576),
-            call(1048576),
-            call(1048576)]
-
-        mock_mmap.return_value.read.assert_has_calls(expected_mmap_read_calls)
+        internal_conn = self.connection.get_connection.return_value
+        sent = internal_conn.send.call_args_list
+        self.assertEqual(sent[0], call(bytearray(b'------------ThIs_Is_tHe_bouNdaRY_$\r\n'
+                                                 b'Content-Disposition: form-data; name="file"; '
+                                                 b'filename="archive.zip"\r\n'
+                                                 b'Content-Type: application/octet-stream\r\n'
+                                                 b'\r\n')))
+        self.assertEqual(sent[-1], call(bytearray(b'\r\n------------ThIs_Is_tHe_bouNdaRY_$--\r\n\r\n')))
+        self.assertEqual(sum(len(args[0]) for args, _ in sent), 147 + 2621440 + 42)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_send_file_in_chuncks_of_1mb(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_send_file_in_chuncks_of_1mb(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
                                        files="/a/path/filename.zip",
                                        baseName="archive.zip")
 
-        expected_conn_send_calls = [
-            call('data chunck 1'),
-            call('data chunck 2'),
-            call('data chunck 3')]
-
         internal_conn = self.connection.get_connection.return_value
-        internal_conn.send.assert_has_calls(expected_conn_send_calls)
+        chunk_sizes = [len(args[0]) for args, _ in internal_conn.send.call_args_list[1:-1]]
+        self.assertEqual(chunk_sizes, [1048576, 1048576, 524288])
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_remove_temp_encoded_file(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_read_the_original_file_and_close_it(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
                                        files="/a/path/filename.zip",
                                        baseName="archive.zip")
 
-        mock_rm.assert_called_once_with('/a/path/filename.zip.b64')
+        self.connection._open.assert_called_once_with('/a/path/filename.zip', 'rb')
+        self.connection._open.return_value.close.assert_called_once_with()
+        mock_path_size.assert_called_once_with('/a/path/filename.zip')
 
-    @patch.object(mmap, 'mmap')
     @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
     @patch.object(os, 'remove')
-    def test_post_multipart_should_raise_exception_when_response_status_400(self, mock_rm, mock_path_size, mock_copy,
-                                                                            mock_mmap):
+    def test_post_multipart_should_not_write_temp_encoded_file(self, mock_rm, mock_path_size, mock_copy):
+        self.__prepare_connection_to_post_multipart()
+        mock_path_size.return_value = 2621440  # 2.5 MB
+
+        self.connection.post_multipart(uri='/rest/resources/',
+                                       fields=None,
+                                       files="/a/path/filename.zip",
+                                       baseName="archive.zip")
+
+        mock_copy.assert_not_called()
+        mock_rm.assert_not_called()
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_close_the_file_when_sending_fails(self, mock_path_size):
+        self.__prepare_connection_to_post_multipart()
+        mock_path_size.return_value = 2621440  # 2.5 MB
+        internal_conn = self.connection.get_connection.return_value
+        internal_conn.send.side_effect = [None, socket.error('Broken pipe')]
+
+        self.assertRaises(socket.error, self.connection.post_multipart, uri='/rest/resources/', fields=None,
+                          files="/a/path/filename.zip", baseName="archive.zip")
+
+        self.connection._open.return_value.close.assert_called_once_with()
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_raise_exception_when_response_status_400(self, mock_path_size):
         self.__prepare_connection_to_post_multipart(response_status=400)
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         try:
             self.connection.post_multipart(uri='/rest/resources/',
@@ -733,14 +902,10 @@ class ConnectionTest(unittest.TestCase):
         else:
             self.fail()
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_return_response_and_body_when_response_status_200(self, mock_rm, mock_path_size,
-                                                                                     mock_copy, mock_mmap):
+    def test_post_multipart_should_return_response_and_body_when_response_status_200(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         response, body = self.connection.post_multipart(uri='/rest/resources/',
                                                         fields=None,
@@ -750,15 +915,11 @@ class ConnectionTest(unittest.TestCase):
         self.assertEqual(body, self.expected_response_body)
         self.assertEqual(response.status, 200)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
     @patch.object(json, 'loads')
-    def test_post_multipart_should_handle_json_load_exception(self, mock_json_loads, mock_rm, mock_path_size, mock_copy,
-                                                              mock_mmap):
+    def test_post_multipart_should_handle_json_load_exception(self, mock_json_loads, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
         mock_json_loads.side_effect = ValueError("Invalid JSON")
 
         response, body = self.connection.post_multipart(uri='/rest/resources/',
@@ -847,6 +1008,85 @@ class ConnectionTest(unittest.TestCase):
 
         mock_conn.close.assert_called_once()
 
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_notify_observers(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.connect_timings = (0.01, 0.02)
+        mock_response = mock_conn.getresponse.return_value
+        mock_response.status = 200
+        mock_response.getheader.return_value = None
+        mock_response.read.return_value = b'{"name": "resource"}'
+        observer = Mock()
+        self.connection.add_observer(observer)
+
+        self.connection.do_http('PUT', '/rest/server-hardware/1234567890?force=true', '{"a": 1}')
+
+        event = observer.on_request.call_args[0][0]
+        self.assertIs(observer.on_response.call_args[0][0], event)
+        self.assertEqual(event.method, 'PUT')
+        self.assertEqual(event.uri_template, '/rest/server-hardware/{id}')
+        self.assertEqual(event.collection, 'server-hardware')
+        self.assertEqual(event.status, 200)
+        self.assertEqual(event.bytes_out, 8)
+        self.assertEqual(event.bytes_in, 20)
+        self.assertEqual((event.connect_time, event.tls_time), (0.01, 0.02))
+        self.assertIsNotNone(event.ttfb)
+        self.assertGreaterEqual(event.total_time, event.ttfb)
+        self.assertFalse(event.reused_connection)
+        self.assertIsNone(mock_conn.connect_timings)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_notify_observers_of_retries(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200)
+        mock_response.read.return_value = b''
+        mock_conn.getresponse.side_effect = [BadStatusLine(0), mock_response]
+        observer = Mock()
+        self.connection.add_observer(observer)
+
+        self.connection.do_http('GET', '/rest/tasks', '')
+
+        failed_event = observer.on_retry.call_args[0][0]
+        self.assertEqual(failed_event.attempt, 1)
+        self.assertIsInstance(failed_event.error, BadStatusLine)
+        self.assertIsNone(failed_event.status)
+        self.assertEqual([args[0][0].attempt for args in observer.on_response.call_args_list], [1, 2])
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_ignore_observer_errors(self, mock_get_connection):
+        mock_response = mock_get_connection.return_value.getresponse.return_value
+        mock_response.status = 200
+        mock_response.read.return_value = b'data'
+        observer = Mock()
+        observer.on_response.side_effect = ValueError('observer error')
+        self.connection.add_observer(observer)
+
+        resp, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, 'data')
+
+    def test_remove_observer(self):
+        observer = Mock()
+        self.connection.add_observer(observer)
+
+        self.connection.remove_observer(observer)
+
+        self.assertEqual(self.connection._observers, ())
+
+    @patch.object(connection, 'get_connection')
+    def test_enable_metrics_should_count_requests(self, mock_get_connection):
+        mock_response = mock_get_connection.return_value.getresponse.return_value
+        mock_response.status = 200
+        mock_response.read.return_value = b''
+
+        metrics = self.connection.enable_metrics()
+        self.connection.do_http('GET', '/rest/enclosures', '')
+
+        self.assertIs(self.connection.enable_metrics(), metrics)
+        self.assertIs(self.connection.get_metrics(), metrics)
+        self.assertEqual(metrics.get_request_count('GET', 'enclosures', 200), 1)
+
     @patch.object(connection, 'get_connection')
     def test_do_http_with_bad_status_line(self, mock_get_connection):
 
@@ -861,16 +1101,29 @@ class ConnectionTest(unittest.TestCase):
         mock_response.status = 200
 
         with patch('time.sleep'):
-            resp, body = self.connection.do_http('POST', '/rest/test', 'body')
+            resp, body = self.connection.do_http('GET', '/rest/test', '')
 
         self.assertEqual(body, 'response data')
 
-        mock_conn.request.assert_called_with('POST', '/rest/test', 'body',
+        mock_conn.request.assert_called_with('GET', '/rest/test', '',
                                              {'Content-Type': 'application/json',
                                               'X-API-Version': 300,
                                               'Accept': 'application/json'})
 
-        mock_conn.close.assert_has_calls([call(), call()])
+        mock_conn.close.assert_has_calls([call()])
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_retry_post_with_bad_status_line(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.getresponse.side_effect = [BadStatusLine(0), Mock(status=200)]
+
+        with self.assertRaises(HPOneViewException) as context:
+            self.connection.do_http('POST', '/rest/test', 'body')
+
+        self.assertIn('Failure during POST request to /rest/test', context.exception.msg)
+        self.assertEqual(mock_conn.request.call_count, 1)
+        mock_sleep.assert_not_called()
 
     @patch.object(connection, 'get_connection')
     def test_do_http_with_timeout_error(self, mock_get_connection):
@@ -884,6 +1137,367 @@ class ConnectionTest(unittest.TestCase):
 
         self.assertTrue('timed out' in context.exception.msg)
 
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_parse_json_response_from_bytes(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        headers = {'Content-Type': 'application/json;charset=UTF-8'}
+        mock_response.getheader.side_effect = lambda name, default=None: headers.get(name, default)
+        mock_response.read.return_value = b'{"key": "value"}'
+        mock_conn.getresponse.return_value = mock_response
+        serializer = Mock()
+        serializer.loads.return_value = {'key': 'value'}
+        self.connection.set_serializer(serializer)
+
+        _, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, {'key': 'value'})
+        serializer.loads.assert_called_once_with(b'{"key": "value"}')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_keep_invalid_json_response_as_text(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.getheader.return_value = 'application/json'
+        mock_response.read.return_value = b'response data'
+        mock_conn.getresponse.return_value = mock_response
+
+        _, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, 'response data')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_keep_binary_response_as_bytes(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.getheader.return_value = 'application/octet-stream'
+        mock_response.read.return_value = b'\xff\xd8\xff'
+        mock_conn.getresponse.return_value = mock_response
+
+        _, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, b'\xff\xd8\xff')
+
+    def test_enable_compression(self):
+        self.connection.enable_compression()
+
+        self.assertEqual(self.connection._headers['Accept-Encoding'], 'gzip, deflate')
+
+    def test_disable_compression(self):
+        self.connection.enable_compression()
+        self.connection.disable_compression()
+
+        self.assertEqual(self.default_headers, self.connection._headers)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_decompress_gzip_response_in_chunks(self, mock_get_connection):
+        content = json.dumps({'members': [{'name': 'server %d' % i} for i in range(10000)]}).encode('utf-8')
+        compressed = io.BytesIO()
+        with gzip.GzipFile(fileobj=compressed, mode='wb') as gzip_file:
+            gzip_file.write(content)
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        headers = {'Content-Type': 'application/json', 'Content-Encoding': 'gzip'}
+        mock_response.getheader.side_effect = lambda name, default=None: headers.get(name, default)
+        mock_response.read.side_effect = io.BytesIO(compressed.getvalue()).read
+        mock_conn.getresponse.return_value = mock_response
+
+        _, body = self.connection.do_http('GET', '/rest/server-hardware', '')
+
+        self.assertEqual(len(body['members']), 10000)
+        self.assertTrue(all(args == (65536,) for args, _ in mock_response.read.call_args_list))
+        stats = self.connection.get_compression_stats()
+        self.assertEqual(stats.responses, 1)
+        self.assertEqual(stats.compressed_bytes, len(compressed.getvalue()))
+        self.assertEqual(stats.uncompressed_bytes, len(content))
+        self.assertEqual(stats.bytes_saved, len(content) - len(compressed.getvalue()))
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_decompress_deflate_response(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        headers = {'Content-Encoding': 'deflate'}
+        mock_response.getheader.side_effect = lambda name, default=None: headers.get(name, default)
+        mock_response.read.side_effect = io.BytesIO(zlib.compress(b'{"key": "value"}')).read
+        mock_conn.getresponse.return_value = mock_response
+
+        _, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, {'key': 'value'})
+
+    @patch.object(connection, 'get_connection')
+    def test_open_download_should_not_accept_compressed_files(self, mock_get_conn):
+        self.connection.enable_compression()
+        mock_conn = mock_get_conn.return_value
+        mock_conn.getresponse.return_value.status = 200
+
+        self.connection._open_download('/rest/download.zip')
+
+        expected_headers = dict(self.default_headers, **{'Accept-Encoding': 'identity'})
+        mock_conn.request.assert_called_once_with('GET', '/rest/download.zip', '', expected_headers)
+
+    @patch.object(connection, 'do_http')
+    def test_post_should_dump_body_with_serializer(self, mock_do_http):
+        mock_do_http.return_value = (Mock(status=200), {})
+        serializer = Mock()
+        serializer.dumps.return_value = '{"dumped": true}'
+        self.connection.set_serializer(serializer)
+
+        self.connection.post('/rest/test', {'dumped': True})
+
+        serializer.dumps.assert_called_once_with({'dumped': True})
+        self.assertEqual(mock_do_http.call_args[1]['body'], '{"dumped": true}')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_reuse_kept_alive_connection(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.read.return_value = b'{}'
+        mock_conn.getresponse.return_value = mock_response
+
+        self.connection.do_http('GET', '/rest/test', '')
+        self.connection.do_http('GET', '/rest/test', '')
+
+        mock_get_connection.assert_called_once_with()
+        mock_conn.close.assert_not_called()
+        self.assertEqual(mock_conn.request.call_count, 2)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_close_connection_when_response_will_close(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=True)
+        mock_response.read.return_value = b'{}'
+        mock_conn.getresponse.return_value = mock_response
+
+        self.connection.do_http('GET', '/rest/test', '')
+        self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(mock_get_connection.call_count, 2)
+        self.assertEqual(mock_conn.close.call_count, 2)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_close_connection_when_pool_is_disabled(self, mock_get_connection):
+        self.connection = connection(self.host, connection_pool=ConnectionPool(max_size=0))
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.read.return_value = b'{}'
+        mock_conn.getresponse.return_value = mock_response
+
+        self.connection.do_http('GET', '/rest/test', '')
+
+        mock_conn.close.assert_called_once_with()
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_reconnect_when_pooled_connection_is_stale(self, mock_get_connection, mock_sleep):
+        stale_conn = Mock()
+        stale_conn.request.side_effect = socket.error(104, 'Connection reset by peer')
+        new_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.read.return_value = b'{"key": "value"}'
+        new_conn.getresponse.return_value = mock_response
+        self.connection._connection_pool.release(self.connection._connection_pool_key(), stale_conn)
+
+        _, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, {'key': 'value'})
+        stale_conn.close.assert_called_once_with()
+        new_conn.request.assert_called_once_with('GET', '/rest/test', '', self.default_headers)
+        mock_sleep.assert_not_called()
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_resend_get_when_pooled_connection_closes(self, mock_get_connection, mock_sleep):
+        stale_conn = Mock()
+        stale_conn.getresponse.side_effect = BadStatusLine('')
+        new_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.read.return_value = b'{"key": "value"}'
+        new_conn.getresponse.return_value = mock_response
+        self.connection._connection_pool.release(self.connection._connection_pool_key(), stale_conn)
+
+        _, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, {'key': 'value'})
+        stale_conn.close.assert_called_once_with()
+        mock_sleep.assert_not_called()
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_resend_post_when_pooled_connection_closes(self, mock_get_connection, mock_sleep):
+        self.connection.set_retry_policy(None)
+        stale_conn = Mock()
+        stale_conn.getresponse.side_effect = BadStatusLine('')
+        self.connection._connection_pool.release(self.connection._connection_pool_key(), stale_conn)
+
+        self.assertRaises(HPOneViewException, self.connection.do_http, 'POST', '/rest/test', '{}')
+
+        stale_conn.request.assert_called_once_with('POST', '/rest/test', '{}', self.default_headers)
+        stale_conn.close.assert_called_with()
+        mock_get_connection.assert_not_called()
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_send_again_when_pooled_connection_times_out(self, mock_get_connection, mock_sleep):
+        self.connection.set_retry_policy(None)
+        stale_conn = Mock()
+        stale_conn.getresponse.side_effect = socket.timeout('timed out')
+        self.connection._connection_pool.release(self.connection._connection_pool_key(), stale_conn)
+
+        self.assertRaises(socket.timeout, self.connection.do_http, 'GET', '/rest/test', '')
+
+        self.assertEqual(stale_conn.request.call_count, 1)
+        mock_get_connection.assert_not_called()
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_close_connection_when_the_body_cannot_be_decompressed(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.getheader.side_effect = lambda name, default=None: {'Content-Encoding': 'gzip'}.get(name, default)
+        mock_response.read.side_effect = io.BytesIO(b'not compressed').read
+        mock_conn.getresponse.return_value = mock_response
+
+        self.assertRaises(zlib.error, self.connection.do_http, 'GET', '/rest/test', '')
+
+        mock_conn.close.assert_called_once_with()
+        self.assertEqual(self.connection._connection_pool.size(self.connection._connection_pool_key()), 0)
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_close_connection_when_the_download_fails(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.readinto.side_effect = socket.error(104, 'Connection reset by peer')
+        mock_conn.getresponse.return_value = mock_response
+
+        self.assertRaises(socket.error, self.connection.download_to_stream, Mock(), '/rest/download.zip')
+
+        mock_conn.close.assert_called_once_with()
+        self.assertEqual(self.connection._connection_pool.size(self.connection._connection_pool_key()), 0)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_raise_socket_error_of_new_connection(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.request.side_effect = socket.error(111, 'Connection refused')
+
+        self.assertRaises(socket.error, self.connection.do_http, 'GET', '/rest/test', '')
+
+        self.assertEqual(mock_conn.request.call_count, 5)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_retry_service_unavailable(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value = Mock()
+        unavailable = Mock(status=503, will_close=False)
+        unavailable.read.return_value = b''
+        unavailable.getheader.return_value = '2'
+        available = Mock(status=200, will_close=False)
+        available.read.return_value = b'{"key": "value"}'
+        mock_conn.getresponse.side_effect = [unavailable, available]
+
+        resp, body = self.connection.do_http('POST', '/rest/test', 'body')
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(body, {'key': 'value'})
+        mock_sleep.assert_called_once_with(2)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_retry_when_retry_policy_is_disabled(self, mock_get_connection, mock_sleep):
+        self.connection.set_retry_policy(None)
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.request.side_effect = socket.error(111, 'Connection refused')
+
+        self.assertRaises(socket.error, self.connection.do_http, 'GET', '/rest/test', '')
+
+        self.assertEqual(mock_conn.request.call_count, 1)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_fail_fast_when_the_circuit_is_open(self, mock_get_connection, mock_sleep):
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=1, circuit_failure_threshold=2))
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.request.side_effect = socket.error(110, 'Connection timed out')
+
+        self.assertRaises(socket.error, self.connection.do_http, 'GET', '/rest/test', '')
+        self.assertRaises(socket.error, self.connection.do_http, 'GET', '/rest/test', '')
+        self.assertRaises(HPOneViewCircuitOpen, self.connection.do_http, 'GET', '/rest/test', '')
+
+        self.assertEqual(mock_conn.request.call_count, 2)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_retry_service_unavailable(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value = Mock()
+        unavailable = Mock(status=503, will_close=False)
+        unavailable.read.return_value = b''
+        unavailable.getheader.return_value = '2'
+        available = Mock(status=200, will_close=False)
+        available.readinto.side_effect = self.__fake_readinto([b'111'])
+        mock_conn.getresponse.side_effect = [unavailable, available]
+        mock_stream = Mock()
+        mock_stream.fileno.side_effect = IOError
+
+        result = self.connection.download_to_stream(mock_stream, '/rest/download.zip')
+
+        self.assertTrue(result)
+        mock_stream.write.assert_called_once_with(b'111')
+        mock_sleep.assert_called_once_with(2)
+        self.assertEqual(mock_conn.request.call_count, 2)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_open_download_should_retry_too_many_requests_of_a_range(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value = Mock()
+        too_many_requests = Mock(status=429, will_close=False)
+        too_many_requests.read.return_value = b''
+        too_many_requests.getheader.return_value = None
+        partial_content = Mock(status=206, will_close=False)
+        mock_conn.getresponse.side_effect = [too_many_requests, partial_content]
+
+        conn, resp = self.connection._open_download('/rest/download.zip', custom_headers={'Range': 'bytes=0-0'})
+
+        self.assertIs(resp, partial_content)
+        self.assertEqual(mock_conn.request.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_open_download_should_not_retry_not_found(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.getresponse.return_value = Mock(status=404)
+        mock_conn.getresponse.return_value.read.return_value = json.dumps({'message': 'not found'}).encode('utf-8')
+
+        try:
+            self.connection._open_download('/rest/download.zip')
+        except HPOneViewException as e:
+            self.assertEqual(e.msg, 'not found')
+        else:
+            self.fail()
+        self.assertEqual(mock_conn.request.call_count, 1)
+        mock_conn.close.assert_called_once_with()
+        mock_sleep.assert_not_called()
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_release_connection_to_pool(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_response = Mock(status=200, will_close=False)
+        mock_response.readinto.side_effect = self.__fake_readinto([b'111'])
+        mock_conn.getresponse.return_value = mock_response
+
+        self.connection.download_to_stream(Mock(), '/rest/download.zip')
+
+        mock_conn.close.assert_not_called()
+        self.assertEqual(self.connection._connection_pool.size(self.connection._connection_pool_key()), 1)
+
+    def test_connections_share_the_given_pool(self):
+        pool = ConnectionPool()
+        conn1 = connection('10.0.0.1', connection_pool=pool)
+        conn2 = connection('10.0.0.2', connection_pool=pool)
+
+        self.assertIs(conn1._connection_pool, conn2._connection_pool)
+        self.assertNotEqual(conn1._connection_pool_key(), conn2._connection_pool_key())
+
     @patch.object(connection, 'get')
     @patch.object(connection, 'post')
     def test_login(self, mock_post, mock_get):
@@ -1029,6 +1643,131 @@ class ConnectionTest(unittest.TestCase):
         self.assertEqual(conn.port, 443)
         self.assertEqual(conn._context.protocol, ssl.PROTOCOL_TLSv1_2)
 
+    @patch.object(ssl.SSLContext, 'load_verify_locations')
+    def test_get_connection_should_reuse_ssl_context(self, mock_lvl):
+        self.connection.set_trusted_ssl_bundle('/test')
+
+        conn1 = self.connection.get_connection()
+        conn2 = self.connection.get_connection()
+
+        self.assertIs(conn1._context, conn2._context)
+        mock_lvl.assert_called_once_with('/test')
+
+    @patch.object(ssl.SSLContext, 'load_verify_locations')
+    def test_set_trusted_ssl_bundle_should_rebuild_ssl_context(self, mock_lvl):
+        context = self.connection.get_ssl_context()
+
+        self.connection.set_trusted_ssl_bundle('/test')
+
+        self.assertIsNot(context, self.connection.get_ssl_context())
+        self.assertEqual(self.connection.get_ssl_context().verify_mode, ssl.CERT_REQUIRED)
+        mock_lvl.assert_called_once_with('/test')
+
+    def test_get_connection_should_share_tls_sessions(self):
+        conn1 = self.connection.get_connection()
+        conn2 = self.connection.get_connection()
+
+        self.assertIs(conn1._tls_sessions, conn2._tls_sessions)
+
+    @unittest.skipUnless(TLS_SESSION_RESUMPTION_SUPPORTED, 'TLS session resumption not supported')
+    @patch('http.client.HTTPConnection.connect')
+    def test_https_connection_should_resume_tls_session(self, mock_connect):
+        context = Mock()
+        sessions = {}
+        first_socket = context.wrap_socket.return_value = Mock(session='session')
+
+        conn = ResumableHTTPSConnection('127.0.0.1', context=context, tls_sessions=sessions)
+        conn.connect()
+        context.wrap_socket.assert_called_once_with(ANY, server_hostname='127.0.0.1', session=None)
+        self.assertEqual(sessions, {'127.0.0.1': 'session'})
+        self.assertIs(conn.sock, first_socket)
+
+        conn = ResumableHTTPSConnection('127.0.0.1', context=context, tls_sessions=sessions)
+        conn.connect()
+        context.wrap_socket.assert_called_with(ANY, server_hostname='127.0.0.1', session='session')
+
+    @unittest.skipUnless(TLS_SESSION_RESUMPTION_SUPPORTED, 'TLS session resumption not supported')
+    @patch('http.client.HTTPConnection.connect')
+    def test_https_connection_should_resume_tls_session_by_tunnel_host(self, mock_connect):
+        context = Mock()
+        sessions = {'172.16.102.59': 'session'}
+
+        conn = ResumableHTTPSConnection('10.0.0.1', 3128, context=context, tls_sessions=sessions)
+        conn.set_tunnel('172.16.102.59', 443)
+        conn.connect()
+
+        context.wrap_socket.assert_called_once_with(ANY, server_hostname='172.16.102.59', session='session')
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_keep_paging_state_per_thread(self, mock_do_http):
+        mock_do_http.return_value = (Mock(status=200), {'nextPageUri': '/rest/resources?start=1', 'total': 2,
+                                                        'count': 1})
+        self.connection.get('/rest/resources')
+
+        paging_in_thread = {}
+
+        def get_in_thread():
+            paging_in_thread['nextPage'] = self.connection._paging.nextPage
+            paging_in_thread['numTotalRecords'] = self.connection._paging.numTotalRecords
+
+        thread = threading.Thread(target=get_in_thread)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(paging_in_thread, {'nextPage': None, 'numTotalRecords': 0})
+        self.assertEqual(self.connection._paging.nextPage, '/rest/resources?start=1')
+        self.assertEqual(self.connection._paging.numTotalRecords, 2)
+        self.assertEqual(self.connection._paging.numDisplayedRecords, 1)
+
+    @patch.object(connection, 'do_http')
+    def test_get_if_none_match_should_send_etag(self, mock_do_http):
+        mock_do_http.return_value = (Mock(status=200), {'eTag': '2'})
+
+        result = self.connection.get_if_none_match('/rest/resources/1', '1')
+
+        self.assertEqual(result, {'eTag': '2'})
+        mock_do_http.assert_called_once_with('GET', '/rest/resources/1', '', custom_headers={'If-None-Match': '1'})
+
+    @patch.object(connection, 'do_http')
+    def test_get_if_none_match_should_return_none_when_not_modified(self, mock_do_http):
+        mock_do_http.return_value = (Mock(status=304), '')
+
+        self.assertIsNone(self.connection.get_if_none_match('/rest/resources/1', '1'))
+
+    @patch.object(connection, 'do_http')
+    def test_get_if_none_match_should_raise_on_error(self, mock_do_http):
+        mock_do_http.return_value = (Mock(status=404), {'message': 'not found'})
+
+        self.assertRaises(HPOneViewException, self.connection.get_if_none_match, '/rest/resources/1', '1')
+
+    def test_set_header_should_replace_headers_dictionary(self):
+        headers = self.connection._headers
+
+        self.connection.disable_etag_validation()
+
+        self.assertIsNot(headers, self.connection._headers)
+        self.assertEqual(headers, self.default_headers)
+        self.assertEqual(self.connection._headers, self.default_headers_with_etag_validation_off)
+
+    def test_set_session_id_from_many_threads(self):
+        threads = [threading.Thread(target=self.connection.set_session_id, args=(str(i),)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn(self.connection.get_session_id(), [str(i) for i in range(20)])
+        self.assertEqual(set(self.connection._headers) - {'auth'}, set(self.default_headers))
+
+    @patch.object(connection, 'delete')
+    def test_logout_should_remove_auth_header(self, mock_delete):
+        self.connection.set_session_id('123')
+
+        self.connection.logout()
+
+        self.assertEqual(self.connection._headers, self.default_headers)
+        self.assertFalse(self.connection.get_session())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+
+from mock import patch, Mock
+from hpOneView.connection_pool import ConnectionPool
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(max_size=2, idle_timeout=60)
+        self.key = ('127.0.0.1', None, None, False)
+
+    def test_acquire_returns_none_when_empty(self):
+        self.assertIsNone(self.pool.acquire(self.key))
+
+    def test_acquire_returns_released_connection(self):
+        conn = Mock()
+        self.pool.release(self.key, conn)
+
+        self.assertEqual(self.pool.acquire(self.key), conn)
+        self.assertEqual(self.pool.size(self.key), 0)
+
+    def test_acquire_returns_most_recently_released_connection(self):
+        conn1, conn2 = Mock(), Mock()
+        self.pool.release(self.key, conn1)
+        self.pool.release(self.key, conn2)
+
+        self.assertEqual(self.pool.acquire(self.key), conn2)
+
+    def test_connections_are_grouped_by_key(self):
+        conn = Mock()
+        self.pool.release(self.key, conn)
+
+        self.assertIsNone(self.pool.acquire(('10.0.0.1', None, None, False)))
+        self.assertEqual(self.pool.acquire(self.key), conn)
+
+    def test_release_closes_connection_when_pool_is_full(self):
+        conns = [Mock(), Mock(), Mock()]
+        for conn in conns:
+            self.pool.release(self.key, conn)
+
+        self.assertEqual(self.pool.size(self.key), 2)
+        conns[2].close.assert_called_once_with()
+        conns[0].close.assert_not_called()
+
+    def test_release_closes_connection_when_pooling_is_disabled(self):
+        pool = ConnectionPool(max_size=0)
+        conn = Mock()
+        pool.release(self.key, conn)
+
+        conn.close.assert_called_once_with()
+        self.assertIsNone(pool.acquire(self.key))
+
+    @patch('time.time')
+    def test_acquire_closes_expired_connections(self, mock_time):
+        conn = Mock()
+        mock_time.return_value = 1000
+        self.pool.release(self.key, conn)
+
+        mock_time.return_value = 1061
+        self.assertIsNone(self.pool.acquire(self.key))
+        conn.close.assert_called_once_with()
+
+    @patch('time.time')
+    def test_acquire_keeps_connections_within_idle_timeout(self, mock_time):
+        conn = Mock()
+        mock_time.return_value = 1000
+        self.pool.release(self.key, conn)
+
+        mock_time.return_value = 1059
+        self.assertEqual(self.pool.acquire(self.key), conn)
+        conn.close.assert_not_called()
+
+    def test_clear_closes_all_idle_connections(self):
+        conn1, conn2 = Mock(), Mock()
+        self.pool.release(self.key, conn1)
+        self.pool.release(('10.0.0.1', None, None, False), conn2)
+
+        self.pool.clear()
+
+        conn1.close.assert_called_once_with()
+        conn2.close.assert_called_once_with()
+        self.assertEqual(self.pool.size(self.key), 0)
+
+    def test_clear_by_key(self):
+        conn1, conn2 = Mock(), Mock()
+        other_key = ('10.0.0.1', None, None, False)
+        self.pool.release(self.key, conn1)
+        self.pool.release(other_key, conn2)
+
+        self.pool.clear(self.key)
+
+        conn1.close.assert_called_once_with()
+        conn2.close.assert_not_called()
+        self.assertEqual(self.pool.size(other_key), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import unittest
+
+from mock import Mock
+from hpOneView.compression import CompressionStats
+from hpOneView.instrumentation import RequestEvent, RequestMetrics, RequestObserver, get_collection, get_uri_template
+
+
+class InstrumentationTest(unittest.TestCase):
+    def test_get_uri_template(self):
+        self.assertEqual(get_uri_template('/rest/server-hardware/30303437-3034-4D32-3230-313130304752/utilization'),
+                         '/rest/server-hardware/{id}/utilization')
+        self.assertEqual(get_uri_template('/rest/id-pools/ipv4/ranges/12?start=0'), '/rest/id-pools/ipv4/ranges/{id}')
+        self.assertEqual(get_uri_template('/rest/enclosures'), '/rest/enclosures')
+
+    def test_get_collection(self):
+        self.assertEqual(get_collection('/rest/server-hardware/1?fields=name'), 'server-hardware')
+        self.assertEqual(get_collection('/rest'), '')
+
+    def test_request_observer_methods_do_nothing(self):
+        observer = RequestObserver()
+        event = RequestEvent('GET', '/rest/tasks')
+
+        observer.on_request(event)
+        observer.on_response(event)
+        observer.on_retry(event, 1)
+
+
+class RequestMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = RequestMetrics(buckets=(0.1, 1))
+
+    def __event(self, method='GET', uri='/rest/enclosures', status=200, total_time=0.05, ttfb=0.01):
+        event = RequestEvent(method, uri)
+        event.status = status
+        event.total_time = total_time
+        event.ttfb = ttfb
+        event.bytes_out = 10
+        event.bytes_in = 100
+        return event
+
+    def test_get_request_count(self):
+        self.metrics.on_response(self.__event())
+        self.metrics.on_response(self.__event(status=404))
+        self.metrics.on_response(self.__event(uri='/rest/tasks/1234567890', status=None, ttfb=None))
+
+        self.assertEqual(self.metrics.get_request_count(), 3)
+        self.assertEqual(self.metrics.get_request_count(collection='enclosures'), 2)
+        self.assertEqual(self.metrics.get_request_count(status=404), 1)
+        self.assertEqual(self.metrics.get_request_count(status='error'), 1)
+
+    def test_to_prometheus(self):
+        self.metrics.on_response(self.__event(total_time=0.05))
+        self.metrics.on_response(self.__event(total_time=0.5))
+        self.metrics.on_retry(self.__event(), 1)
+
+        text = self.metrics.to_prometheus()
+
+        self.assertIn('# TYPE hponeview_requests_total counter\n', text)
+        self.assertIn('hponeview_requests_total{collection="enclosures",method="GET",status="200"} 2\n', text)
+        self.assertIn('hponeview_retries_total{collection="enclosures",method="GET"} 1\n', text)
+        self.assertIn('hponeview_response_bytes_total{collection="enclosures",method="GET"} 200\n', text)
+        self.assertIn('# TYPE hponeview_request_duration_seconds histogram\n', text)
+        self.assertIn('hponeview_request_duration_seconds_bucket{collection="enclosures",le="0.1",method="GET"} 1\n',
+                      text)
+        self.assertIn('hponeview_request_duration_seconds_bucket{collection="enclosures",le="1",method="GET"} 2\n', text)
+        self.assertIn('hponeview_request_duration_seconds_bucket{collection="enclosures",le="+Inf",method="GET"} 2\n',
+                      text)
+        self.assertIn('hponeview_request_duration_seconds_count{collection="enclosures",method="GET"} 2\n', text)
+
+    def test_to_prometheus_escapes_label_values(self):
+        self.metrics.on_response(self.__event(uri='/rest/a"b'))
+
+        self.assertIn('collection="a\\"b"', self.metrics.to_prometheus())
+
+    def test_export(self):
+        callback = Mock()
+        self.metrics.on_response(self.__event())
+
+        self.metrics.export(callback)
+
+        callback.assert_any_call('hponeview_requests_total',
+                                 {'method': 'GET', 'collection': 'enclosures', 'status': '200'}, 1)
+        callback.assert_any_call('hponeview_time_to_first_byte_seconds_count',
+                                 {'method': 'GET', 'collection': 'enclosures'}, 1)
+
+    def test_compression_stats_are_exported(self):
+        compression_stats = CompressionStats()
+        compression_stats.record(100, 1000)
+        metrics = RequestMetrics(compression_stats=compression_stats)
+
+        self.assertIn('hponeview_compression_saved_bytes_total 900\n', metrics.to_prometheus())
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock
+from hpOneView.inventory_store import InventoryStore, get_field_values
+from hpOneView.resources.resource import SyncResult
+
+
+def server(id, name, modified='2018-01-01T00:00:00.000Z', **fields):
+    resource = {'uri': '/rest/server-hardware/' + id, 'category': 'server-hardware', 'name': name,
+                'eTag': modified, 'modified': modified}
+    resource.update(fields)
+    return resource
+
+
+class InventoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = InventoryStore(':memory:', indexed_fields=['serialNumber', 'mpHostInfo.mpIpAddresses'])
+        self.resource = Mock(URI='/rest/server-hardware')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_first_refresh_should_get_all_resources(self):
+        self.resource.get_all.return_value = [server('1', 'SH1'), server('2', 'SH2')]
+
+        self.assertEqual(self.store.refresh(self.resource), 2)
+
+        self.resource.get_all.assert_called_once_with()
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.get('/rest/server-hardware/1'), server('1', 'SH1'))
+
+    def test_refresh_should_get_resources_modified_after_previous_refresh(self):
+        self.resource.get_all.return_value = [server('1', 'SH1', '2018-01-02T00:00:00.000Z'),
+                                              server('2', 'SH2', '2018-01-03T00:00:00.000Z')]
+        self.store.refresh(self.resource)
+        self.resource.get_all.return_value = [server('1', 'renamed', '2018-01-04T00:00:00.000Z')]
+
+        self.store.refresh(self.resource)
+
+        self.resource.get_all.assert_called_with(filter="modified gt '2018-01-03T00:00:00.000Z'")
+        self.assertEqual(self.store.get('/rest/server-hardware/1')['name'], 'renamed')
+        self.assertEqual(self.store.get_last_modified('/rest/server-hardware'), '2018-01-04T00:00:00.000Z')
+
+    def test_refresh_without_changes_should_keep_last_modified(self):
+        self.resource.get_all.return_value = [server('1', 'SH1', '2018-01-02T00:00:00.000Z')]
+        self.store.refresh(self.resource)
+        self.resource.get_all.return_value = []
+
+        self.assertEqual(self.store.refresh(self.resource), 0)
+        self.assertEqual(self.store.get_last_modified('/rest/server-hardware'), '2018-01-02T00:00:00.000Z')
+
+    def test_put_should_not_move_last_modified_of_collection(self):
+        self.resource.get_all.return_value = [server('1', 'SH1', '2018-01-02T00:00:00.000Z')]
+        self.store.refresh(self.resource)
+
+        self.store.put(server('2', 'SH2', '2018-01-09T00:00:00.000Z'))
+
+        self.assertEqual(self.store.get_last_modified('/rest/server-hardware'), '2018-01-02T00:00:00.000Z')
+
+    def test_refresh_with_prune_should_sync_the_stored_versions(self):
+        self.store.put(server('1', 'SH1', 'a'))
+        self.store.put(server('2', 'SH2', 'b'))
+        self.resource.sync.return_value = SyncResult(added=[server('3', 'SH3', 'c')], updated=[], deleted=['/rest/server-hardware/2'],
+                                                     unchanged=['/rest/server-hardware/1'], snapshot={})
+
+        self.assertEqual(self.store.refresh(self.resource, prune=True), 2)
+
+        self.resource.sync.assert_called_once_with({'/rest/server-hardware/1': 'a', '/rest/server-hardware/2': 'b'})
+        self.assertEqual(sorted(item['uri'] for item in self.store.get_all()),
+                         ['/rest/server-hardware/1', '/rest/server-hardware/3'])
+
+    def test_get_by_name_should_ignore_case(self):
+        self.store.put(server('1', 'SH1'))
+
+        self.assertEqual(self.store.get_by_name('sh1')['uri'], '/rest/server-hardware/1')
+        self.assertIsNone(self.store.get_by_name('SH1', category='enclosures'))
+        self.assertIsNone(self.store.get_by_name('SH2'))
+
+    def test_get_by_indexed_field(self):
+        self.store.put(server('1', 'SH1', serialNumber='ABC'))
+        self.store.put(server('2', 'SH2', serialNumber='DEF'))
+
+        self.assertEqual([item['name'] for item in self.store.get_by('serialNumber', 'abc')], ['SH1'])
+
+    def test_get_by_indexed_nested_list_field(self):
+        self.store.put(server('1', 'SH1', mpHostInfo={'mpIpAddresses': ['10.0.0.1', '10.0.0.2']}))
+
+        self.assertEqual(len(self.store.get_by('mpHostInfo.mpIpAddresses', '10.0.0.2')), 1)
+
+    def test_get_by_field_not_indexed_should_compare_stored_resources(self):
+        self.store.put(server('1', 'SH1', model='Gen10'))
+        self.store.put(server('2', 'SH2', model='Gen9'))
+
+        self.assertEqual([item['name'] for item in self.store.get_by('model', 'gen10')], ['SH1'])
+
+    def test_put_should_replace_indexed_values(self):
+        self.store.put(server('1', 'SH1', serialNumber='ABC'))
+        self.store.put(server('1', 'SH1', serialNumber='DEF'))
+
+        self.assertEqual(self.store.get_by('serialNumber', 'ABC'), [])
+        self.assertEqual(len(self.store.get_by('serialNumber', 'DEF')), 1)
+
+    def test_remove(self):
+        self.store.put(server('1', 'SH1', serialNumber='ABC'))
+
+        self.assertTrue(self.store.remove('/rest/server-hardware/1'))
+        self.assertFalse(self.store.remove('/rest/server-hardware/1'))
+        self.assertNotIn('/rest/server-hardware/1', self.store)
+        self.assertEqual(self.store.get_by('serialNumber', 'ABC'), [])
+
+    def test_get_all_by_category(self):
+        self.store.put(server('1', 'SH1'))
+        self.store.put({'uri': '/rest/enclosures/1', 'category': 'enclosures', 'name': 'E1'})
+
+        self.assertEqual([item['name'] for item in self.store.get_all('enclosures')], ['E1'])
+        self.assertEqual(len(self.store.get_all()), 2)
+
+    def test_get_snapshot_should_only_include_the_collection(self):
+        self.store.put(server('1', 'SH1', 'a'))
+        self.store.put({'uri': '/rest/server-hardware-types/1', 'eTag': 'b'})
+
+        self.assertEqual(self.store.get_snapshot('/rest/server-hardware'), {'/rest/server-hardware/1': 'a'})
+
+    def test_get_collections(self):
+        self.resource.get_all.return_value = []
+        self.store.refresh(self.resource)
+        self.store.put({'uri': '/rest/enclosures/1'})
+
+        self.assertEqual(self.store.get_collections(), ['/rest/server-hardware'])
+
+    def test_clear(self):
+        self.resource.get_all.return_value = [server('1', 'SH1')]
+        self.store.refresh(self.resource)
+
+        self.store.clear()
+
+        self.assertEqual(len(self.store), 0)
+        self.assertIsNone(self.store.get_last_modified('/rest/server-hardware'))
+
+
+class InventoryStoreFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'inventory.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_should_keep_resources_between_runs(self):
+        store = InventoryStore(self.path)
+        resource = Mock(URI='/rest/server-hardware')
+        resource.get_all.return_value = [server('1', 'SH1', '2018-01-02T00:00:00.000Z')]
+        store.refresh(resource)
+        store.close()
+
+        store = InventoryStore(self.path)
+        store.refresh(resource)
+        store.close()
+
+        resource.get_all.assert_called_with(filter="modified gt '2018-01-02T00:00:00.000Z'")
+
+    def test_should_index_stored_resources_when_fields_change(self):
+        store = InventoryStore(self.path)
+        store.put(server('1', 'SH1', serialNumber='ABC'))
+        store.close()
+
+        store = InventoryStore(self.path, indexed_fields=['serialNumber'])
+        self.assertEqual(len(store.get_by('serialNumber', 'ABC')), 1)
+        store.close()
+
+        store = InventoryStore(self.path)
+        self.assertEqual(store.indexed_fields, [])
+        self.assertEqual(len(store.get_by('serialNumber', 'ABC')), 1)
+        store.close()
+
+
+class GetFieldValuesTest(unittest.TestCase):
+    def test_get_field_values(self):
+        resource = {'a': {'b': [1, None, {'c': 2}]}, 'd': None, 'e': 'x'}
+
+        self.assertEqual(get_field_values(resource, 'a.b'), [1])
+        self.assertEqual(get_field_values(resource, 'd'), [])
+        self.assertEqual(get_field_values(resource, 'e'), ['x'])
+        self.assertEqual(get_field_values(resource, 'e.f'), [])
+        self.assertEqual(get_field_values(resource, 'missing'), [])
@@ -27,6 +27,7 @@ import mock
 
 from hpOneView.connection import connection
 from hpOneView.oneview_client import OneViewClient
+from hpOneView.retry_policy import RetryPolicy
 from hpOneView.resources.security.certificate_authority import CertificateAuthority
 from hpOneView.resources.data_services.metric_streaming import MetricStreaming
 from hpOneView.resources.facilities.power_devices import PowerDevices
@@ -381,6 +382,191 @@ class OneViewClientTest(unittest.TestCase):
         self.assertEqual(i3s.connection.get_host(), "172.16.102.50")
         self.assertEqual(client.connection.get_host(), "172.16.102.59")
 
+    @mock.patch.object(connection, 'login')
+    def test_create_image_streamer_client_shares_connection_pool(self, mock_login):
+
+        config = {"ip": "172.16.102.59",
+                  "image_streamer_ip": "172.16.102.50",
+                  "connection_pool": {"max_size": 4, "idle_timeout": 30},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        i3s = client.create_image_streamer_client()
+
+        self.assertIs(i3s.connection._connection_pool, client.connection._connection_pool)
+        self.assertEqual(client.connection._connection_pool.max_size, 4)
+        self.assertEqual(client.connection._connection_pool.idle_timeout, 30)
+
+    @mock.patch.object(connection, 'login')
+    def test_response_cache_is_disabled_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertIsNone(client.connection.get_response_cache())
+
+    @mock.patch.object(connection, 'login')
+    def test_response_cache_from_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "response_cache": {"max_size": 100, "ttl": 5},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_response_cache().max_size, 100)
+        self.assertEqual(client.connection.get_response_cache().ttl, 5)
+
+    @mock.patch.object(connection, 'login')
+    def test_page_workers_from_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "page_workers": 8,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_page_workers(), 8)
+
+    @mock.patch.object(connection, 'login')
+    def test_download_buffer_size_from_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "download_buffer_size": 8388608,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_download_buffer_size(), 8388608)
+
+    @mock.patch.object(connection, 'login')
+    def test_download_buffer_size_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_download_buffer_size(), 1048576)
+
+    @mock.patch.object(connection, 'login')
+    def test_download_workers_from_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "download_workers": 4,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_download_workers(), 4)
+
+    @mock.patch.object(connection, 'login')
+    def test_retry_policy_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_retry_policy().max_attempts, RetryPolicy.DEFAULT_MAX_ATTEMPTS)
+
+    @mock.patch.object(connection, 'login')
+    def test_retry_policy_from_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "retry_policy": {"max_attempts": 3, "deadline": 10, "circuit_failure_threshold": 5},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        retry_policy = client.connection.get_retry_policy()
+        self.assertEqual(retry_policy.max_attempts, 3)
+        self.assertEqual(retry_policy.deadline, 10)
+        self.assertIsNotNone(retry_policy.get_circuit_breaker('172.16.102.59'))
+
+    @mock.patch.object(connection, 'login')
+    def test_retry_policy_disabled_by_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "retry_policy": False,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_retry_policy().max_attempts, 1)
+
+    @mock.patch.object(connection, 'login')
+    def test_json_backend_from_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "json_backend": "json",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_serializer().name, 'json')
+
+    @mock.patch.object(connection, 'login')
+    def test_compression_from_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "compression": True,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection._headers.get('Accept-Encoding'), 'gzip, deflate')
+
+    @mock.patch.object(connection, 'login')
+    def test_compression_is_disabled_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertNotIn('Accept-Encoding', client.connection._headers)
+
+    @mock.patch.object(connection, 'login')
+    def test_metrics_from_config(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "metrics": {"buckets": [0.1, 1]},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_metrics().buckets, (0.1, 1))
+
+    @mock.patch.object(connection, 'login')
+    def test_metrics_are_disabled_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertIsNone(client.connection.get_metrics())
+
     def test_fc_networks_has_right_type(self):
         self.assertIsInstance(self._oneview.fc_networks, FcNetworks)
 
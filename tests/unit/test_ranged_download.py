@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from mock import Mock, patch
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.ranged_download import RangedDownload, read_into
+
+
+class FakeAppliance(object):
+    """
+    Answers the download requests of a connection with the given content, honoring the Range and If-Range headers
+    when ranges are supported.
+    """
+
+    def __init__(self, content, ranges_supported=True):
+        self.content = content
+        self.ranges_supported = ranges_supported
+        self.headers = {'ETag': '"1"'}
+        self.requested_ranges = []
+        self.if_range_headers = []
+        self.failures = {}
+        self._lock = threading.Lock()
+
+    def open_download(self, url, custom_headers=None):
+        byte_range = custom_headers.get('Range')
+        if_range = custom_headers.get('If-Range')
+        with self._lock:
+            self.requested_ranges.append(byte_range)
+            self.if_range_headers.append(if_range)
+
+        start, end = [int(value) for value in byte_range[len('bytes='):].split('-')]
+        if self.ranges_supported and if_range in (None, self.headers.get('ETag'), self.headers.get('Last-Modified')):
+            headers = {'Content-Range': 'bytes %d-%d/%d' % (start, end, len(self.content)),
+                       'Content-Length': str(end - start + 1)}
+            body = self.content[start:end + 1]
+            status = 206
+        else:
+            headers = {'Content-Length': str(len(self.content))}
+            body = self.content
+            status = 200
+        headers.update(self.headers)
+
+        return Mock(), self.__create_response(status, headers, body, self.failures.pop(byte_range, None))
+
+    def __create_response(self, status, headers, body, failure):
+        stream = io.BytesIO(body)
+
+        def readinto(buffer):
+            if failure is not None and stream.tell() >= failure[0]:
+                raise failure[1]
+            return stream.readinto(buffer)
+
+        response = Mock(status=status)
+        response.getheader.side_effect = lambda name, default=None: headers.get(name, default)
+        response.readinto.side_effect = readinto
+        response.read.side_effect = stream.read
+        return response
+
+
+class ReadIntoTest(unittest.TestCase):
+    def test_read_into_buffer(self):
+        stream = io.BytesIO(b'12345')
+        buffer = bytearray(3)
+
+        self.assertEqual(read_into(stream, buffer), 3)
+        self.assertEqual(buffer, bytearray(b'123'))
+
+    def test_read_into_buffer_from_response_without_readinto(self):
+        response = Mock(spec=['read'])
+        response.read.side_effect = io.BytesIO(b'12345').read
+        buffer = bytearray(3)
+
+        self.assertEqual(read_into(response, buffer), 3)
+        self.assertEqual(read_into(response, buffer), 2)
+        self.assertEqual(buffer[:2], bytearray(b'45'))
+        self.assertEqual(read_into(response, buffer), 0)
+
+
+class RangedDownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'backup.bkp')
+        self.content = bytes(bytearray(range(256))) * 40
+        self.appliance = FakeAppliance(self.content)
+        self.connection = Mock()
+        self.connection._open_download.side_effect = self.appliance.open_download
+        self.url = '/rest/backups/archive/backup'
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def __download(self, **kwargs):
+        return RangedDownload(self.connection, self.url, self.file_path, buffer_size=1000, **kwargs).run()
+
+    def __read_file(self, path):
+        with open(path, 'rb') as downloaded_file:
+            return downloaded_file.read()
+
+    def test_download_with_a_single_range(self):
+        result = self.__download()
+
+        self.assertTrue(result)
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(self.appliance.requested_ranges, ['bytes=0-0', 'bytes=0-10239'])
+        self.assertEqual(os.listdir(self.directory), ['backup.bkp'])
+
+    @patch('hpOneView.ranged_download.DOWNLOAD_MIN_PART_SIZE', 1024)
+    def test_download_ranges_concurrently(self):
+        self.__download(workers=4)
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(sorted(self.appliance.requested_ranges[1:]),
+                         ['bytes=0-2559', 'bytes=2560-5119', 'bytes=5120-7679', 'bytes=7680-10239'])
+
+    @patch('hpOneView.ranged_download.DOWNLOAD_MIN_PART_SIZE', 4096)
+    def test_download_ranges_of_at_least_the_minimum_part_size(self):
+        self.__download(workers=8)
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(len(self.appliance.requested_ranges[1:]), 2)
+
+    def test_download_with_a_single_stream_when_ranges_are_not_supported(self):
+        self.appliance.ranges_supported = False
+
+        self.__download(workers=4)
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(self.appliance.requested_ranges, ['bytes=0-0'])
+        self.assertEqual(os.listdir(self.directory), ['backup.bkp'])
+
+    def test_download_should_send_the_custom_headers(self):
+        self.__download(custom_headers={'Accept': 'application/octet-stream'})
+
+        _, kwargs = self.connection._open_download.call_args
+        self.assertEqual(kwargs['custom_headers']['Accept'], 'application/octet-stream')
+
+    def test_download_should_release_the_connections(self):
+        self.__download()
+
+        self.assertEqual(self.connection._release_connection.call_count, 2)
+
+    def test_download_should_report_progress(self):
+        progress_callback = Mock()
+
+        self.__download(progress_callback=progress_callback)
+
+        downloaded = [args[:2] for args, _ in progress_callback.call_args_list]
+        self.assertEqual(downloaded[0], (1000, 10240))
+        self.assertEqual(downloaded[-1], (10240, 10240))
+
+    @patch('time.sleep')
+    def test_download_should_retry_an_interrupted_range_from_its_last_byte(self, mock_sleep):
+        self.appliance.failures['bytes=0-10239'] = (3000, socket.error('Connection reset by peer'))
+
+        self.__download()
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(self.appliance.requested_ranges, ['bytes=0-0', 'bytes=0-10239', 'bytes=3000-10239'])
+        mock_sleep.assert_called_once_with(1)
+
+    @patch('time.sleep')
+    def test_download_should_keep_the_partial_file_when_the_attempts_are_exhausted(self, mock_sleep):
+        self.appliance.failures['bytes=0-10239'] = (3000, socket.error('Connection reset by peer'))
+        self.appliance.failures['bytes=3000-10239'] = (3000, socket.error('Connection reset by peer'))
+        self.appliance.failures['bytes=6000-10239'] = (4000, socket.error('Connection reset by peer'))
+
+        self.assertRaises(socket.error, self.__download)
+
+        self.assertFalse(os.path.exists(self.file_path))
+        with open(self.file_path + '.part.json') as state_file:
+            state = json.load(state_file)
+        self.assertEqual(state['ranges'], [[10000, 10239]])
+        self.assertEqual(self.__read_file(self.file_path + '.part')[:10000], self.content[:10000])
+
+    @patch('time.sleep')
+    def test_download_should_close_the_connections_of_interrupted_ranges(self, mock_sleep):
+        self.appliance.failures['bytes=0-10239'] = (3000, socket.error('Connection reset by peer'))
+        connections = []
+
+        def open_download(url, custom_headers=None):
+            conn, response = self.appliance.open_download(url, custom_headers)
+            connections.append(conn)
+            return conn, response
+
+        self.connection._open_download.side_effect = open_download
+
+        self.__download()
+
+        self.assertEqual([conn.close.called for conn in connections], [False, True, False])
+        self.assertEqual(self.connection._release_connection.call_count, 2)
+
+    @patch('hpOneView.ranged_download.DOWNLOAD_MIN_PART_SIZE', 1024)
+    def test_download_should_not_complete_while_ranges_are_missing(self):
+        # The ranges are left as they are, as if their downloads had stopped without an error
+        with patch.object(RangedDownload, '_RangedDownload__download_range'):
+            try:
+                self.__download(workers=4)
+            except HPOneViewException as e:
+                self.assertEqual(e.msg, '10240 bytes of /rest/backups/archive/backup were not downloaded')
+            else:
+                self.fail()
+
+        self.assertFalse(os.path.exists(self.file_path))
+        self.assertTrue(os.path.exists(self.file_path + '.part'))
+        with open(self.file_path + '.part.json') as state_file:
+            self.assertEqual(len(json.load(state_file)['ranges']), 4)
+
+    @patch('time.sleep')
+    def test_download_should_resume_a_partial_download(self, mock_sleep):
+        self.appliance.failures['bytes=0-10239'] = (3000, socket.error('Connection reset by peer'))
+        self.assertRaises(socket.error, self.__download, max_attempts=1)
+        self.appliance.requested_ranges = []
+
+        self.__download()
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(self.appliance.requested_ranges, ['bytes=0-0', 'bytes=3000-10239'])
+        self.assertEqual(self.appliance.if_range_headers[-2:], [None, '"1"'])
+        self.assertEqual(os.listdir(self.directory), ['backup.bkp'])
+
+    @patch('time.sleep')
+    def test_download_should_resume_with_the_last_modified_date_when_the_etag_is_weak(self, mock_sleep):
+        self.appliance.headers = {'ETag': 'W/"1"', 'Last-Modified': 'Mon, 01 Jan 2018 00:00:00 GMT'}
+        self.appliance.failures['bytes=0-10239'] = (3000, socket.error('Connection reset by peer'))
+        self.assertRaises(socket.error, self.__download, max_attempts=1)
+        self.appliance.requested_ranges = []
+
+        self.__download()
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(self.appliance.requested_ranges, ['bytes=0-0', 'bytes=3000-10239'])
+        self.assertEqual(self.appliance.if_range_headers[-1], 'Mon, 01 Jan 2018 00:00:00 GMT')
+
+    @patch('time.sleep')
+    def test_download_should_start_over_when_the_content_changed_with_the_same_size(self, mock_sleep):
+        self.appliance.failures['bytes=0-10239'] = (3000, socket.error('Connection reset by peer'))
+        self.assertRaises(socket.error, self.__download, max_attempts=1)
+        self.appliance.content = self.content[::-1]
+        self.appliance.headers = {'ETag': '"2"'}
+        self.appliance.requested_ranges = []
+
+        self.__download()
+
+        self.assertEqual(self.__read_file(self.file_path), self.content[::-1])
+        self.assertEqual(self.appliance.requested_ranges, ['bytes=0-0', 'bytes=0-10239'])
+
+    @patch('time.sleep')
+    def test_download_should_start_over_without_etag_nor_last_modified_date(self, mock_sleep):
+        self.appliance.headers = {}
+        self.appliance.failures['bytes=0-10239'] = (3000, socket.error('Connection reset by peer'))
+        self.assertRaises(socket.error, self.__download, max_attempts=1)
+        self.appliance.requested_ranges = []
+
+        self.__download()
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(self.appliance.requested_ranges, ['bytes=0-0', 'bytes=0-10239'])
+        self.assertEqual(self.appliance.if_range_headers[-2:], [None, None])
+
+    def test_download_should_raise_exception_when_the_content_changes_during_the_download(self):
+        original_open_download = self.appliance.open_download
+
+        def open_download(url, custom_headers=None):
+            result = original_open_download(url, custom_headers)
+            self.appliance.headers = {'ETag': '"2"'}
+            return result
+
+        self.connection._open_download.side_effect = open_download
+
+        try:
+            self.__download()
+        except HPOneViewException as e:
+            self.assertEqual(e.msg, 'The content of /rest/backups/archive/backup changed during the download')
+        else:
+            self.fail()
+        self.assertFalse(os.path.exists(self.file_path))
+
+    def test_download_should_raise_exception_when_a_range_starts_at_another_offset(self):
+        original_open_download = self.appliance.open_download
+
+        def open_download(url, custom_headers=None):
+            if custom_headers['Range'] == 'bytes=0-10239':
+                custom_headers = dict(custom_headers, Range='bytes=100-10239')
+            return original_open_download(url, custom_headers)
+
+        self.connection._open_download.side_effect = open_download
+
+        self.assertRaises(HPOneViewException, self.__download)
+        self.assertFalse(os.path.exists(self.file_path))
+
+    def test_download_should_ignore_the_partial_download_of_another_uri(self):
+        with open(self.file_path + '.part', 'wb') as partial_file:
+            partial_file.write(b'\0' * 10240)
+        with open(self.file_path + '.part.json', 'w') as state_file:
+            state_file.write(json.dumps({'url': '/rest/other', 'total': 10240, 'validator': '"1"',
+                                         'ranges': [[5000, 10239]]}))
+
+        self.__download()
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+        self.assertEqual(self.appliance.requested_ranges, ['bytes=0-0', 'bytes=0-10239'])
+
+    def test_download_should_replace_an_existing_file(self):
+        with open(self.file_path, 'wb') as existing_file:
+            existing_file.write(b'old content')
+
+        self.__download()
+
+        self.assertEqual(self.__read_file(self.file_path), self.content)
+
+    def test_download_should_raise_exception_when_a_range_is_not_returned(self):
+        responses = []
+
+        def open_download(url, custom_headers=None):
+            conn, response = self.appliance.open_download(url, custom_headers)
+            if responses:
+                response.status = 200
+            responses.append(response)
+            return conn, response
+
+        self.connection._open_download.side_effect = open_download
+
+        self.assertRaises(HPOneViewException, self.__download)
+
+    def test_download_should_raise_exception_when_the_size_does_not_match(self):
+        self.appliance.ranges_supported = False
+        self.appliance.content = self.content[:-1]
+        original_open_download = self.appliance.open_download
+
+        def open_download(url, custom_headers=None):
+            conn, response = original_open_download(url, custom_headers)
+            response.getheader.side_effect = lambda name, default=None: {'Content-Length': '10240'}.get(name, default)
+            return conn, response
+
+        self.connection._open_download.side_effect = open_download
+
+        try:
+            self.__download()
+        except HPOneViewException as e:
+            self.assertEqual(e.msg, 'Downloaded 10239 bytes of /rest/backups/archive/backup, but 10240 bytes were '
+                                    'expected')
+        else:
+            self.fail()
+        self.assertFalse(os.path.exists(self.file_path))
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import unittest
+
+from mock import patch
+from hpOneView.response_cache import ResponseCache
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(max_size=2, ttl=30)
+        self.key = ('/rest/enclosure-groups/1', 600)
+
+    def test_get_returns_none_when_not_cached(self):
+        self.assertEqual(self.cache.get(self.key), (None, False))
+
+    def test_get_returns_fresh_resource(self):
+        self.cache.set(self.key, {'eTag': '1'})
+
+        self.assertEqual(self.cache.get(self.key), ({'eTag': '1'}, True))
+
+    def test_get_returns_copy_of_resource(self):
+        resource = {'eTag': '1', 'name': 'EG'}
+        self.cache.set(self.key, resource)
+        resource['name'] = 'changed'
+
+        cached, _ = self.cache.get(self.key)
+        cached['name'] = 'changed again'
+
+        self.assertEqual(self.cache.get(self.key)[0]['name'], 'EG')
+
+    @patch('hpOneView.response_cache.time.time')
+    def test_get_reports_expired_resource(self, mock_time):
+        mock_time.return_value = 100
+        self.cache.set(self.key, {'eTag': '1'})
+        mock_time.return_value = 131
+
+        self.assertEqual(self.cache.get(self.key), ({'eTag': '1'}, False))
+
+    @patch('hpOneView.response_cache.time.time')
+    def test_refresh_restarts_time_to_live(self, mock_time):
+        mock_time.return_value = 100
+        self.cache.set(self.key, {'eTag': '1'})
+        mock_time.return_value = 131
+        self.cache.refresh(self.key)
+
+        self.assertTrue(self.cache.get(self.key)[1])
+
+    def test_least_recently_used_resource_is_evicted(self):
+        self.cache.set(('/rest/a', 600), {'eTag': 'a'})
+        self.cache.set(('/rest/b', 600), {'eTag': 'b'})
+        self.cache.get(('/rest/a', 600))
+        self.cache.set(('/rest/c', 600), {'eTag': 'c'})
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(('/rest/b', 600))[0])
+        self.assertIsNotNone(self.cache.get(('/rest/a', 600))[0])
+
+    def test_resources_are_keyed_by_api_version(self):
+        self.cache.set(('/rest/a', 500), {'eTag': 'a'})
+
+        self.assertIsNone(self.cache.get(('/rest/a', 600))[0])
+
+    def test_invalidate(self):
+        self.cache.set(self.key, {'eTag': '1'})
+        self.cache.invalidate(self.key)
+
+        self.assertIsNone(self.cache.get(self.key)[0])
+
+    def test_invalidate_uri_should_remove_all_api_versions(self):
+        self.cache.set(self.key, {'eTag': '1'})
+        self.cache.set(('/rest/enclosure-groups/1', 800), {'eTag': '1'})
+        self.cache.invalidate_uri('/rest/enclosure-groups/1')
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidate_path_should_remove_containing_resources(self):
+        self.cache.set(('/rest/server-hardware/1', 500), {'eTag': '1'})
+        self.cache.set(('/rest/server-hardware/1', 600), {'eTag': '1'})
+        self.cache.set(('/rest/server-hardware/1/environmentalConfiguration', 600), {'eTag': '1'})
+        self.cache.set(('/rest/server-hardware/10', 600), {'eTag': '1'})
+        self.cache.invalidate_path('/rest/server-hardware/1/powerState?force=true')
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.get(('/rest/server-hardware/1/environmentalConfiguration', 600))[0])
+        self.assertIsNotNone(self.cache.get(('/rest/server-hardware/10', 600))[0])
+
+    def test_invalidate_prefix_should_remove_resources_under_the_collection(self):
+        self.cache.set(('/rest/ethernet-networks', 600), {'eTag': '1'})
+        self.cache.set(('/rest/ethernet-networks/1', 500), {'eTag': '1'})
+        self.cache.set(('/rest/ethernet-networks/2/associatedProfiles', 600), {'eTag': '1'})
+        self.cache.set(('/rest/ethernet-networks-extra/1', 600), {'eTag': '1'})
+        self.cache.set(('/rest/fc-networks/1', 600), {'eTag': '1'})
+        self.cache.invalidate_prefix('/rest/ethernet-networks?filter=x')
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.get(('/rest/ethernet-networks-extra/1', 600))[0])
+        self.assertIsNotNone(self.cache.get(('/rest/fc-networks/1', 600))[0])
+
+    def test_clear(self):
+        self.cache.set(self.key, {'eTag': '1'})
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_max_size_zero_disables_cache(self):
+        cache = ResponseCache(max_size=0)
+        cache.set(self.key, {'eTag': '1'})
+
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import socket
+import unittest
+
+from email.utils import formatdate
+from http.client import BadStatusLine
+
+from mock import Mock, call, patch
+from hpOneView.exceptions import HPOneViewCircuitOpen
+from hpOneView.retry_policy import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=4, deadline=None, initial_delay=1, max_delay=3, jitter=0)
+        self.send = Mock()
+        patcher = patch('time.sleep')
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def __response(self, status, retry_after=None):
+        response = Mock(status=status)
+        response.getheader.side_effect = lambda name, default=None: retry_after if name == 'Retry-After' else default
+        return response, 'body'
+
+    def test_execute_returns_the_response(self):
+        self.send.return_value = self.__response(200)
+
+        resp, body = self.policy.execute('GET', 'host', self.send)
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(body, 'body')
+        self.mock_sleep.assert_not_called()
+
+    def test_execute_does_not_retry_error_statuses(self):
+        self.send.return_value = self.__response(500)
+
+        resp, _ = self.policy.execute('GET', 'host', self.send)
+
+        self.assertEqual(resp.status, 500)
+        self.assertEqual(self.send.call_count, 1)
+
+    def test_execute_retries_get_with_exponential_backoff(self):
+        self.send.side_effect = [socket.timeout('timed out'), BadStatusLine(0), socket.error(104, 'reset'),
+                                 self.__response(200)]
+
+        resp, _ = self.policy.execute('GET', 'host', self.send)
+
+        self.assertEqual(resp.status, 200)
+        self.mock_sleep.assert_has_calls([call(1), call(2), call(3)])
+
+    def test_execute_calls_on_retry_before_each_delay(self):
+        self.send.side_effect = [socket.timeout('timed out'), self.__response(503), self.__response(200)]
+        on_retry = Mock()
+
+        self.policy.execute('GET', 'host', self.send, on_retry=on_retry)
+
+        on_retry.assert_has_calls([call(1), call(2)])
+        self.assertEqual(on_retry.call_count, 2)
+
+    def test_execute_raises_the_last_error_when_the_attempts_are_exhausted(self):
+        self.send.side_effect = socket.timeout('timed out')
+
+        self.assertRaises(socket.timeout, self.policy.execute, 'GET', 'host', self.send)
+
+        self.assertEqual(self.send.call_count, 4)
+
+    def test_execute_does_not_retry_post_with_network_error(self):
+        self.send.side_effect = [socket.timeout('timed out'), self.__response(200)]
+
+        self.assertRaises(socket.timeout, self.policy.execute, 'POST', 'host', self.send)
+
+        self.assertEqual(self.send.call_count, 1)
+
+    def test_execute_retries_post_when_the_connection_was_refused(self):
+        self.send.side_effect = [socket.error(111, 'Connection refused'), self.__response(202)]
+
+        resp, _ = self.policy.execute('POST', 'host', self.send)
+
+        self.assertEqual(resp.status, 202)
+
+    def test_execute_retries_post_with_service_unavailable(self):
+        self.send.side_effect = [self.__response(503), self.__response(429), self.__response(202)]
+
+        resp, _ = self.policy.execute('POST', 'host', self.send)
+
+        self.assertEqual(resp.status, 202)
+        self.assertEqual(self.send.call_count, 3)
+
+    def test_execute_honors_retry_after(self):
+        self.send.side_effect = [self.__response(503, retry_after='7'), self.__response(200)]
+
+        self.policy.execute('GET', 'host', self.send)
+
+        self.mock_sleep.assert_called_once_with(7)
+
+    def test_execute_returns_the_last_response_when_the_attempts_are_exhausted(self):
+        self.send.return_value = self.__response(503)
+
+        resp, _ = self.policy.execute('GET', 'host', self.send)
+
+        self.assertEqual(resp.status, 503)
+        self.assertEqual(self.send.call_count, 4)
+
+    @patch('time.time')
+    def test_execute_stops_retrying_at_the_deadline(self, mock_time):
+        mock_time.return_value = 100
+        self.policy.deadline = 10
+        self.send.side_effect = [self.__response(503, retry_after='4'), self.__response(503, retry_after='11'),
+                                 self.__response(200)]
+
+        resp, _ = self.policy.execute('GET', 'host', self.send)
+
+        self.assertEqual(resp.status, 503)
+        self.assertEqual(self.send.call_count, 2)
+
+    def test_next_delay_with_jitter(self):
+        self.policy.jitter = 0.5
+
+        for attempt in range(1, 10):
+            delay = self.policy.next_delay(attempt)
+            expected = min(3, 2 ** (attempt - 1))
+            self.assertTrue(expected * 0.5 <= delay <= expected * 1.5)
+
+    def test_circuit_breakers_are_disabled_by_default(self):
+        self.assertIsNone(self.policy.get_circuit_breaker('host'))
+
+    def test_circuit_breaker_per_appliance(self):
+        self.policy.circuit_failure_threshold = 2
+
+        circuit_breaker = self.policy.get_circuit_breaker('host')
+
+        self.assertIs(self.policy.get_circuit_breaker('host'), circuit_breaker)
+        self.assertIsNot(self.policy.get_circuit_breaker('other host'), circuit_breaker)
+
+    def test_execute_stops_sending_requests_when_the_circuit_is_open(self):
+        self.policy.circuit_failure_threshold = 2
+        self.send.side_effect = socket.timeout('timed out')
+
+        self.assertRaises(HPOneViewCircuitOpen, self.policy.execute, 'GET', 'host', self.send)
+
+        self.assertEqual(self.send.call_count, 2)
+        self.assertRaises(HPOneViewCircuitOpen, self.policy.execute, 'GET', 'host', self.send)
+        self.assertEqual(self.send.call_count, 2)
+
+    def test_execute_counts_unavailable_responses_as_failures(self):
+        self.policy.circuit_failure_threshold = 3
+        self.send.return_value = self.__response(503)
+
+        self.assertRaises(HPOneViewCircuitOpen, self.policy.execute, 'GET', 'host', self.send)
+
+        self.assertEqual(self.send.call_count, 3)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.circuit_breaker = CircuitBreaker('host', failure_threshold=2, reset_timeout=30)
+
+    def test_opens_after_consecutive_failures(self):
+        self.circuit_breaker.record_failure()
+        self.assertFalse(self.circuit_breaker.is_open)
+
+        self.circuit_breaker.record_failure()
+
+        self.assertTrue(self.circuit_breaker.is_open)
+        self.assertRaises(HPOneViewCircuitOpen, self.circuit_breaker.before_request)
+
+    def test_success_resets_the_failures(self):
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_success()
+        self.circuit_breaker.record_failure()
+
+        self.assertFalse(self.circuit_breaker.is_open)
+        self.circuit_breaker.before_request()
+
+    @patch('time.time')
+    def test_lets_a_single_request_through_after_the_reset_timeout(self, mock_time):
+        mock_time.return_value = 100
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+        mock_time.return_value = 131
+
+        self.circuit_breaker.before_request()
+
+        self.assertRaises(HPOneViewCircuitOpen, self.circuit_breaker.before_request)
+
+    @patch('time.time')
+    def test_closes_when_the_trial_request_succeeds(self, mock_time):
+        mock_time.return_value = 100
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+        mock_time.return_value = 131
+        self.circuit_breaker.before_request()
+
+        self.circuit_breaker.record_success()
+
+        self.assertFalse(self.circuit_breaker.is_open)
+        self.circuit_breaker.before_request()
+
+    @patch('time.time')
+    def test_opens_again_when_the_trial_request_fails(self, mock_time):
+        mock_time.return_value = 100
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+        mock_time.return_value = 131
+        self.circuit_breaker.before_request()
+
+        self.circuit_breaker.record_failure()
+
+        self.assertRaises(HPOneViewCircuitOpen, self.circuit_breaker.before_request)
+        mock_time.return_value = 162
+        self.circuit_breaker.before_request()
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+    def test_parse_seconds(self):
+        self.assertEqual(parse_retry_after('120'), 120)
+
+    def test_parse_http_date(self):
+        with patch('time.time', return_value=1000000000):
+            self.assertEqual(parse_retry_after(formatdate(1000000030, usegmt=True)), 30)
+
+    def test_parse_date_in_the_past(self):
+        with patch('time.time', return_value=1000000000):
+            self.assertEqual(parse_retry_after(formatdate(999999000, usegmt=True)), 0)
+
+    def test_parse_invalid_value(self):
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
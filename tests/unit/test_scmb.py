@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import json
+import os
+import re
+import shutil
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+
+from collections import deque
+
+import mock
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.inventory_store import InventoryStore
+from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.response_cache import ResponseCache
+from hpOneView.scmb import ScmbListener, ScmbSubscriber, ResponseCacheInvalidator, InventoryStoreUpdater
+from hpOneView.scmb import TaskEventListener
+from hpOneView.scmb import create_amqp_connection, create_ssl_context, decode_message
+
+SERVER_URI = '/rest/server-hardware/1'
+
+
+def change(change_type, uri=SERVER_URI, resource=None, **fields):
+    message = {'changeType': change_type, 'resourceUri': uri, 'eTag': '2', 'resource': resource,
+               'timestamp': '2018-01-01T00:00:00.000Z'}
+    message.update(fields)
+    return json.dumps(message)
+
+
+class FakeAmqpMessage(object):
+    def __init__(self, body, routing_key, delivery_tag):
+        self.body = body
+        self.delivery_info = {'routing_key': routing_key}
+        self.delivery_tag = delivery_tag
+
+
+class FakeAmqpBroker(object):
+    """
+    In-process stand-in of the RabbitMQ broker of the appliance, with the part of the amqp.Connection interface used by
+    the subscriber. Messages are routed to the bound queues as by a topic exchange.
+    """
+
+    def __init__(self):
+        self.bindings = []
+        self.queues = {}
+        self.consumers = {}
+        self.acked = []
+        self.connections = []
+        self.published = 0
+        self.fail_next_drain = False
+        self._condition = threading.Condition()
+
+    def connect(self, host, ssl_context):
+        connection = FakeAmqpConnection(self)
+        self.connections.append((host, ssl_context, connection))
+        return connection
+
+    def publish(self, exchange, routing_key, body):
+        with self._condition:
+            self.published += 1
+            for queue, bound_exchange, pattern in self.bindings:
+                if bound_exchange == exchange and re.match(topic_to_regex(pattern), routing_key):
+                    self.queues[queue].append(FakeAmqpMessage(body, routing_key, self.published))
+            self._condition.notify_all()
+
+    def drain_events(self, timeout):
+        with self._condition:
+            if self.fail_next_drain:
+                self.fail_next_drain = False
+                raise socket.error('Connection reset by peer')
+            message, callback = self.__next_message()
+            if message is None:
+                self._condition.wait(timeout)
+                message, callback = self.__next_message()
+        if message is None:
+            raise socket.timeout()
+        callback(message)
+
+    def __next_message(self):
+        for queue, callback in self.consumers.items():
+            if self.queues[queue]:
+                return self.queues[queue].popleft(), callback
+        return None, None
+
+
+class FakeAmqpConnection(object):
+    def __init__(self, broker):
+        self.broker = broker
+        self.connected = False
+        self.closed = False
+
+    def connect(self):
+        self.connected = True
+
+    def channel(self):
+        return FakeAmqpChannel(self.broker)
+
+    def drain_events(self, timeout=None):
+        self.broker.drain_events(timeout)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAmqpChannel(object):
+    def __init__(self, broker):
+        self.broker = broker
+
+    def queue_declare(self, exclusive=False):
+        name = 'amq.gen-%d' % len(self.broker.queues)
+        self.broker.queues[name] = deque()
+        return name, 0, 0
+
+    def queue_bind(self, queue, exchange, routing_key):
+        self.broker.bindings.append((queue, exchange, routing_key))
+
+    def basic_consume(self, queue, callback):
+        self.broker.consumers[queue] = callback
+
+    def basic_ack(self, delivery_tag):
+        self.broker.acked.append(delivery_tag)
+
+
+def topic_to_regex(pattern):
+    words = [r'[^.]+' if word == '*' else '.*' if word == '#' else re.escape(word) for word in pattern.split('.')]
+    return '^' + r'\.'.join(words).replace(r'\..*', '(\\..*)?') + '$'
+
+
+class RecordingListener(ScmbListener):
+    def __init__(self):
+        self.messages = []
+        self.connection_count = 0
+        self.reconnected = threading.Event()
+        self.connection_lost = threading.Event()
+
+    def on_connected(self):
+        self.connection_count += 1
+        if self.connection_count > 1:
+            self.reconnected.set()
+
+    def on_message(self, message):
+        self.messages.append(message)
+
+    def on_connection_lost(self):
+        self.connection_lost.set()
+
+
+class DecodeMessageTest(unittest.TestCase):
+    def test_decode_message(self):
+        resource = {'uri': SERVER_URI, 'category': 'server-hardware', 'name': 'SH1'}
+
+        message = decode_message(change('Updated', resource=resource).encode('utf-8'),
+                                 'scmb.server-hardware.Updated.' + SERVER_URI)
+
+        self.assertEqual(message.change_type, 'Updated')
+        self.assertEqual(message.resource_uri, SERVER_URI)
+        self.assertEqual(message.etag, '2')
+        self.assertEqual(message.resource, resource)
+        self.assertEqual(message.timestamp, '2018-01-01T00:00:00.000Z')
+        self.assertEqual(message.category, 'server-hardware')
+
+    def test_decode_message_should_take_the_uri_of_the_resource(self):
+        message = decode_message(change('Created', uri=None, resource={'uri': SERVER_URI}))
+
+        self.assertEqual(message.resource_uri, SERVER_URI)
+
+    def test_category_should_come_from_routing_key_without_resource(self):
+        message = decode_message(change('Deleted'), 'scmb.enclosures.Deleted./rest/enclosures/1')
+
+        self.assertEqual(message.category, 'enclosures')
+
+    def test_decode_message_should_fail_when_not_an_object(self):
+        self.assertRaises(HPOneViewException, decode_message, '"quit"')
+
+
+class ResponseCacheInvalidatorTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+        self.cache.set((SERVER_URI, 600), {'uri': SERVER_URI})
+        self.invalidator = ResponseCacheInvalidator(self.cache)
+
+    def test_on_message_should_invalidate_the_resource(self):
+        self.invalidator.on_message(decode_message(change('Updated')))
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_on_connection_lost_should_clear_the_cache(self):
+        self.cache.set(('/rest/enclosures/1', 600), {'uri': '/rest/enclosures/1'})
+
+        self.invalidator.on_connection_lost()
+
+        self.assertEqual(len(self.cache), 0)
+
+
+class InventoryStoreUpdaterTest(unittest.TestCase):
+    def setUp(self):
+        self.store = InventoryStore(':memory:')
+        self.updater = InventoryStoreUpdater(self.store)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_updated_resource_should_be_replaced(self):
+        self.store.put({'uri': SERVER_URI, 'name': 'SH1'})
+
+        self.updater.on_message(decode_message(change('Updated', resource={'uri': SERVER_URI, 'name': 'renamed'})))
+
+        self.assertEqual(self.store.get(SERVER_URI)['name'], 'renamed')
+
+    def test_deleted_resource_should_be_removed(self):
+        self.store.put({'uri': SERVER_URI})
+
+        self.updater.on_message(decode_message(change('Deleted')))
+
+        self.assertNotIn(SERVER_URI, self.store)
+
+    def test_change_without_resource_should_remove_the_stored_one(self):
+        self.store.put({'uri': SERVER_URI})
+
+        self.updater.on_message(decode_message(change('Updated')))
+
+        self.assertNotIn(SERVER_URI, self.store)
+
+    def test_created_resource_should_be_stored_when_its_collection_is_refreshed(self):
+        self.store.refresh(mock.Mock(URI='/rest/server-hardware', **{'get_all.return_value': []}))
+
+        self.updater.on_message(decode_message(change('Created', resource={'uri': SERVER_URI})))
+
+        self.assertIn(SERVER_URI, self.store)
+
+    def test_created_resource_of_other_collection_should_be_ignored(self):
+        self.updater.on_message(decode_message(change('Created', resource={'uri': SERVER_URI})))
+
+        self.assertEqual(len(self.store), 0)
+
+
+class TaskEventListenerTest(unittest.TestCase):
+    def setUp(self):
+        self.listener = TaskEventListener()
+        self.listener.on_connected()
+
+    def task_change(self, state, uri='/rest/tasks/1'):
+        return decode_message(change('Updated', uri=uri, resource={'uri': uri, 'taskState': state}),
+                              'scmb.tasks.Updated.' + uri)
+
+    def test_wait_should_return_the_completed_tasks(self):
+        self.listener.on_message(self.task_change('Completed'))
+
+        self.assertEqual(self.listener.wait(['/rest/tasks/1', '/rest/tasks/2'], 5),
+                         {'/rest/tasks/1': {'uri': '/rest/tasks/1', 'taskState': 'Completed'}})
+
+    def test_wait_should_return_when_a_task_completes(self):
+        threading.Timer(0.05, self.listener.on_message, [self.task_change('Error')]).start()
+
+        self.assertEqual(list(self.listener.wait(['/rest/tasks/1'], 5)), ['/rest/tasks/1'])
+
+    def test_wait_should_ignore_running_tasks_and_other_resources(self):
+        self.listener.on_message(self.task_change('Running'))
+        self.listener.on_message(decode_message(change('Updated', resource={'uri': SERVER_URI, 'taskState': 'Completed'})))
+
+        self.assertEqual(self.listener.wait(['/rest/tasks/1', SERVER_URI], 0.01), {})
+
+    def test_wait_should_return_when_the_connection_is_lost(self):
+        threading.Timer(0.05, self.listener.on_connection_lost).start()
+
+        self.assertEqual(self.listener.wait(['/rest/tasks/1'], 5), {})
+        self.assertFalse(self.listener.available)
+
+    def test_wait_should_return_when_interrupted_with_the_wakeup_event_set(self):
+        wakeup = threading.Event()
+
+        def wake():
+            wakeup.set()
+            self.listener.interrupt()
+
+        threading.Timer(0.05, wake).start()
+
+        self.assertEqual(self.listener.wait(['/rest/tasks/1'], 5, wakeup), {})
+        self.assertTrue(self.listener.available)
+
+    @mock.patch.object(TaskEventListener, 'MAX_COMPLETED_TASKS', 2)
+    def test_should_keep_the_most_recent_completed_tasks(self):
+        for i in range(3):
+            self.listener.on_message(self.task_change('Completed', '/rest/tasks/%d' % i))
+
+        self.assertEqual(sorted(self.listener.wait(['/rest/tasks/0', '/rest/tasks/1', '/rest/tasks/2'], 0)),
+                         ['/rest/tasks/1', '/rest/tasks/2'])
+
+
+class ScmbSubscriberTest(unittest.TestCase):
+    def setUp(self):
+        self.broker = FakeAmqpBroker()
+        self.listener = RecordingListener()
+        self.subscriber = ScmbSubscriber('oneview.example.com', routing_keys=['scmb.server-hardware.#'],
+                                         connection_factory=self.broker.connect)
+        self.subscriber.add_listener(self.listener)
+
+    def tearDown(self):
+        self.subscriber.stop()
+
+    def publish(self, change_type, category='server-hardware', uri=SERVER_URI, body=None):
+        self.broker.publish('scmb', 'scmb.%s.%s.%s' % (category, change_type, uri), body or change(change_type, uri))
+
+    def test_connect_should_bind_a_queue_to_the_scmb_exchange(self):
+        self.subscriber.connect()
+
+        self.assertEqual(self.broker.connections[0][0], 'oneview.example.com')
+        self.assertEqual(self.broker.bindings, [('amq.gen-0', 'scmb', 'scmb.server-hardware.#')])
+
+    def test_listeners_should_be_notified_of_the_connection_state(self):
+        listener = mock.Mock(spec=ScmbListener)
+        self.subscriber.add_listener(listener)
+
+        self.subscriber.connect()
+        listener.on_connected.assert_called_once_with()
+        self.subscriber.close()
+        listener.on_connection_lost.assert_called_once_with()
+
+    def test_should_pass_the_messages_of_the_routing_keys_to_the_listeners(self):
+        self.subscriber.connect()
+        self.publish('Updated')
+        self.publish('Updated', 'enclosures', '/rest/enclosures/1')
+
+        self.broker.drain_events(0)
+
+        self.assertEqual([m.resource_uri for m in self.listener.messages], [SERVER_URI])
+        self.assertEqual(self.listener.messages[0].routing_key, 'scmb.server-hardware.Updated.' + SERVER_URI)
+        self.assertEqual(len(self.broker.acked), 1)
+
+    def test_invalid_message_should_be_acknowledged(self):
+        self.subscriber.connect()
+        self.publish('Updated', body='quit')
+
+        self.broker.drain_events(0)
+
+        self.assertEqual(self.listener.messages, [])
+        self.assertEqual(len(self.broker.acked), 1)
+
+    def test_failing_listener_should_not_prevent_the_others(self):
+        failing = mock.Mock(spec=ScmbListener)
+        failing.on_message.side_effect = ValueError('failure')
+        self.subscriber.remove_listener(self.listener)
+        self.subscriber.add_listener(failing)
+        self.subscriber.add_listener(self.listener)
+
+        self.subscriber.handle(decode_message(change('Updated')))
+
+        self.assertEqual(len(self.listener.messages), 1)
+
+    def test_removed_listener_should_not_receive_messages(self):
+        self.subscriber.remove_listener(self.listener)
+
+        self.subscriber.handle(decode_message(change('Updated')))
+
+        self.assertEqual(self.listener.messages, [])
+
+    @mock.patch.object(ScmbSubscriber, 'POLL_INTERVAL', 0.01)
+    def test_start_should_receive_messages_in_background(self):
+        received = threading.Event()
+        self.listener.on_message = lambda message: received.set()
+
+        # Connected first, so the queue is bound before the message is published
+        self.subscriber.connect()
+        self.subscriber.start()
+        self.publish('Created')
+
+        self.assertTrue(received.wait(5))
+        self.subscriber.stop(5)
+        self.assertTrue(self.broker.connections[0][2].closed)
+
+    @mock.patch.object(ScmbSubscriber, 'RECONNECT_DELAY', 0)
+    @mock.patch.object(ScmbSubscriber, 'POLL_INTERVAL', 0.01)
+    def test_lost_connection_should_notify_the_listeners_and_reconnect(self):
+        self.broker.fail_next_drain = True
+
+        self.subscriber.start()
+
+        self.assertTrue(self.listener.connection_lost.wait(5))
+        self.assertTrue(self.listener.reconnected.wait(5))
+        received = threading.Event()
+        self.listener.on_message = lambda message: received.set()
+        self.publish('Updated')
+        self.assertTrue(received.wait(5))
+        self.assertGreaterEqual(len(self.broker.connections), 2)
+        self.assertTrue(self.broker.connections[0][2].closed)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(TaskMonitor, 'get')
+    @mock.patch.object(ScmbSubscriber, 'POLL_INTERVAL', 0.01)
+    def test_task_monitor_should_wait_for_the_published_task_state(self, mock_get, mock_sleep):
+        task = {'uri': '/rest/tasks/1', 'name': 'Delete'}
+        mock_get.side_effect = [dict(task, taskState='Running'), dict(task, taskState='Completed')]
+        task_events = TaskEventListener()
+        oneview_connection = connection('127.0.0.1')
+        oneview_connection.set_task_events(task_events)
+        subscriber = ScmbSubscriber('oneview.example.com', routing_keys=['scmb.tasks.#'],
+                                    connection_factory=self.broker.connect)
+        subscriber.add_listener(task_events)
+        subscriber.connect()
+        subscriber.start()
+        self.addCleanup(subscriber.stop)
+        threading.Timer(0.05, self.publish, ['Updated', 'tasks', '/rest/tasks/1',
+                                             change('Updated', '/rest/tasks/1', dict(task, taskState='Completed'))]).start()
+
+        self.assertTrue(TaskMonitor(oneview_connection).wait_for_task(task, timeout=5))
+        self.assertEqual(mock_get.call_count, 2)
+        mock_sleep.assert_not_called()
+
+    @mock.patch('hpOneView.scmb.create_ssl_context')
+    def test_from_client_should_keep_the_response_cache_coherent(self, mock_create_ssl_context):
+        cache = ResponseCache()
+        cache.set((SERVER_URI, 600), {'uri': SERVER_URI})
+        oneview_client = mock.Mock()
+        oneview_client.connection.get_host.return_value = 'oneview.example.com:443'
+        oneview_client.connection.get_response_cache.return_value = cache
+
+        subscriber = ScmbSubscriber.from_client(oneview_client, '/tmp', alias_name='scmb')
+        subscriber.handle(decode_message(change('Updated')))
+
+        mock_create_ssl_context.assert_called_once_with(oneview_client, '/tmp', 'scmb')
+        self.assertEqual(subscriber._host, 'oneview.example.com')
+        self.assertEqual(len(cache), 0)
+
+    @mock.patch('hpOneView.scmb.create_ssl_context')
+    def test_from_client_should_give_task_events_to_the_connection(self, mock_create_ssl_context):
+        oneview_client = mock.Mock()
+        oneview_client.connection.get_host.return_value = 'oneview.example.com'
+        oneview_client.connection.get_response_cache.return_value = None
+
+        subscriber = ScmbSubscriber.from_client(oneview_client, '/tmp', routing_keys=['scmb.enclosures.#'])
+
+        task_events = oneview_client.connection.set_task_events.call_args[0][0]
+        self.assertIsInstance(task_events, TaskEventListener)
+        self.assertEqual(subscriber._routing_keys, ['scmb.enclosures.#', 'scmb.tasks.#'])
+
+
+class CreateSslContextTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.oneview_client = mock.Mock()
+        self.oneview_client.certificate_authority.get.return_value = 'CA'
+        key_pair = {'base64SSLCertData': 'CERT', 'base64SSLKeyData': 'KEY'}
+        self.oneview_client.certificate_rabbitmq.get_key_pair.return_value = key_pair
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @mock.patch('hpOneView.scmb.ssl')
+    def test_create_ssl_context_should_load_the_client_key_pair(self, mock_ssl):
+        context = create_ssl_context(self.oneview_client, self.directory)
+
+        mock_ssl.create_default_context.assert_called_once_with(cafile=os.path.join(self.directory, 'caroot.pem'))
+        context.load_cert_chain.assert_called_once_with(os.path.join(self.directory, 'client.pem'),
+                                                        os.path.join(self.directory, 'key.pem'))
+        with open(os.path.join(self.directory, 'key.pem')) as key_file:
+            self.assertEqual(key_file.read(), 'KEY')
+        if os.name == 'posix':
+            self.assertEqual(stat.S_IMODE(os.stat(os.path.join(self.directory, 'key.pem')).st_mode), 0o600)
+
+    @mock.patch('hpOneView.scmb.ssl')
+    def test_create_ssl_context_should_generate_a_missing_key_pair(self, mock_ssl):
+        certificate_rabbitmq = self.oneview_client.certificate_rabbitmq
+        certificate_rabbitmq.get_key_pair.side_effect = [HPOneViewException('Not found'),
+                                                         {'base64SSLCertData': 'CERT', 'base64SSLKeyData': 'KEY'}]
+
+        create_ssl_context(self.oneview_client, self.directory)
+
+        certificate_rabbitmq.generate.assert_called_once_with({'commonName': 'default',
+                                                               'type': 'RabbitMqClientCertV2'})
+
+
+class CreateAmqpConnectionTest(unittest.TestCase):
+    def test_should_fail_when_amqp_is_not_installed(self):
+        with mock.patch.dict(sys.modules, {'amqp': None}):
+            self.assertRaises(HPOneViewException, create_amqp_connection, 'oneview.example.com', None)
+
+    def test_should_authenticate_with_the_client_certificate(self):
+        amqp = mock.Mock()
+        with mock.patch.dict(sys.modules, {'amqp': amqp}):
+            create_amqp_connection('oneview.example.com', 'context')
+
+        amqp.Connection.assert_called_once_with('oneview.example.com:5671', login_method='EXTERNAL', ssl='context')
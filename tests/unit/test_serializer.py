@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import sys
+import unittest
+
+from mock import patch
+from hpOneView.exceptions import HPOneViewValueError
+from hpOneView.serializer import JsonSerializer, OrjsonSerializer, UjsonSerializer
+from hpOneView.serializer import get_serializer, is_json_content_type
+
+try:
+    import orjson  # noqa: F401
+    ORJSON_INSTALLED = True
+except ImportError:
+    ORJSON_INSTALLED = False
+
+try:
+    import ujson  # noqa: F401
+    UJSON_INSTALLED = True
+except ImportError:
+    UJSON_INSTALLED = False
+
+
+class SerializerTestMixin(object):
+    def test_loads_bytes(self):
+        self.assertEqual(self.serializer.loads(b'{"name": "Enclosure", "members": [1, 2]}'),
+                         {'name': 'Enclosure', 'members': [1, 2]})
+
+    def test_loads_text(self):
+        self.assertEqual(self.serializer.loads('{"uri": "/rest/enclosures/1"}'), {'uri': '/rest/enclosures/1'})
+
+    def test_loads_utf8_bytes(self):
+        self.assertEqual(self.serializer.loads(u'{"name": "Gehäuse"}'.encode('utf-8')), {'name': u'Gehäuse'})
+
+    def test_loads_invalid_document(self):
+        self.assertRaises(ValueError, self.serializer.loads, b'Not a JSON document')
+
+    def test_dumps_round_trip(self):
+        value = {'uri': '/rest/enclosures/1', 'count': 2, 'members': [None, True, 1.5]}
+
+        dumped = self.serializer.dumps(value)
+
+        self.assertIsInstance(dumped, str)
+        self.assertEqual(JsonSerializer().loads(dumped), value)
+
+    def test_dumps_non_string_keys(self):
+        self.assertEqual(JsonSerializer().loads(self.serializer.dumps({1: 'one'})), {'1': 'one'})
+
+
+class JsonSerializerTest(SerializerTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.serializer = JsonSerializer()
+
+
+@unittest.skipUnless(ORJSON_INSTALLED, 'orjson is not installed')
+class OrjsonSerializerTest(SerializerTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.serializer = OrjsonSerializer()
+
+
+@unittest.skipUnless(UJSON_INSTALLED, 'ujson is not installed')
+class UjsonSerializerTest(SerializerTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.serializer = UjsonSerializer()
+
+
+class GetSerializerTest(unittest.TestCase):
+    def test_get_json_serializer(self):
+        self.assertIsInstance(get_serializer('json'), JsonSerializer)
+
+    @patch.dict(sys.modules, {'orjson': None, 'ujson': None})
+    def test_get_serializer_falls_back_to_json(self):
+        self.assertEqual(get_serializer().name, 'json')
+
+    @patch.dict(sys.modules, {'orjson': None})
+    def test_get_serializer_with_a_backend_not_installed(self):
+        self.assertRaises(HPOneViewValueError, get_serializer, 'orjson')
+
+    def test_get_serializer_with_an_unknown_backend(self):
+        self.assertRaises(HPOneViewValueError, get_serializer, 'yaml')
+
+    @unittest.skipUnless(ORJSON_INSTALLED, 'orjson is not installed')
+    def test_get_serializer_prefers_orjson(self):
+        self.assertEqual(get_serializer().name, 'orjson')
+
+
+class IsJsonContentTypeTest(unittest.TestCase):
+    def test_json_content_types(self):
+        self.assertTrue(is_json_content_type('application/json'))
+        self.assertTrue(is_json_content_type('application/json; charset=UTF-8'))
+        self.assertTrue(is_json_content_type('application/problem+json'))
+
+    def test_other_content_types(self):
+        self.assertFalse(is_json_content_type('application/octet-stream'))
+        self.assertFalse(is_json_content_type('text/plain'))
+        self.assertFalse(is_json_content_type(None))